@@ -14,13 +14,13 @@ from .core.SpecificPopulation import PoissonPopulation, SpikeSourceArray, TimedA
 from .core.SpecificProjection import DecodingProjection, CurrentInjection
 from .core.Dendrite import Dendrite
 from .core.Random import Uniform, DiscreteUniform, Normal, LogNormal, Gamma, Exponential
-from .core.IO import save, load, load_parameter, load_parameters, save_parameters
+from .core.IO import save, load, load_parameter, load_parameters, save_parameters, save_state, load_state
 from .core.Utils import sparse_random_matrix
 from .core.Monitor import Monitor, BoldMonitor, raster_plot, histogram, population_rate, smoothed_rate, mean_fr
+from .core.Profiler import get_profile, reset_profile, enable_profiling
+from .core.Estimate import estimate
 from .core.Network import Network, parallel_run
-from .parser.report.Report import report
 from .models import *
-from .extensions import *
 
 # Cython modules
 try:
@@ -40,5 +40,24 @@ from .generator import compile
 __version__ = '4.6'
 __release__ = '4.6.8.1'
 
-core.Global._print( 'ANNarchy ' + __version__ + ' (' + __release__ + \
-                    ') on ' + sys.platform + ' (' + os.name + ').' )
+# The report generators and the extensions are only imported when they are first used.
+_lazy_objects = {
+    'report': 'ANNarchy.parser.report.Report',
+    'Spike2RatePopulation': 'ANNarchy.extensions.hybrid',
+    'Rate2SpikePopulation': 'ANNarchy.extensions.hybrid',
+}
+
+# "from ANNarchy import *" exports the same names as before, including the deferred ones
+__all__ = [name for name in list(globals().keys()) if not name.startswith('_')] + list(_lazy_objects.keys())
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        if name in _lazy_objects:
+            import importlib
+            obj = getattr(importlib.import_module(_lazy_objects[name]), name)
+            globals()[name] = obj
+            return obj
+        raise AttributeError("module 'ANNarchy' has no attribute '" + name + "'")
+else: # module-level __getattr__ is not supported
+    from .parser.report.Report import report
+    from .extensions.hybrid import *
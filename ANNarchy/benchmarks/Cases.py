@@ -0,0 +1,210 @@
+#===============================================================================
+#
+#     Cases.py
+#
+#     This file is part of ANNarchy.
+#
+#     Copyright (C) 2013-2016  Julien Vitay <julien.vitay@gmail.com>,
+#     Helge Uelo Dinkelbach <helge.dinkelbach@gmail.com>
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     ANNarchy is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#===============================================================================
+"""
+Definition of the benchmark networks.
+
+Each case is a function receiving the size of the network (number of neurons, or of pixels for the convolution) which declares the populations, projections and monitors in the default network. It can return a function, called after the compilation, e.g. to start structural plasticity. The weights and random distributions are fixed so that two runs of the same case simulate the same network.
+"""
+import numpy as np
+
+from ANNarchy.core.Neuron import Neuron
+from ANNarchy.core.Synapse import Synapse
+from ANNarchy.core.Population import Population
+from ANNarchy.core.Projection import Projection
+from ANNarchy.core.Monitor import Monitor
+from ANNarchy.core.Random import Normal, Uniform
+from ANNarchy.core.SpecificPopulation import PoissonPopulation
+
+# Rate-coded neuron with noise, so that the network does not settle
+RateNeuron = Neuron(
+    parameters="""
+        tau = 10.0
+        baseline = 0.0
+    """,
+    equations="""
+        tau * dv/dt + v = baseline + sum(exc) + Uniform(-0.1, 0.1)
+        r = pos(v)
+    """
+)
+
+# Conductance-based integrate-and-fire neuron of Vogels & Abbott (2005)
+COBA = Neuron(
+    parameters="""
+        El = -60.0  : population
+        Vr = -60.0  : population
+        Erev_exc = 0.0  : population
+        Erev_inh = -80.0  : population
+        Vt = -50.0   : population
+        tau = 20.0   : population
+        tau_exc = 5.0   : population
+        tau_inh = 10.0  : population
+        I = 20.0 : population
+    """,
+    equations="""
+        tau * dv/dt = (El - v) + g_exc * (Erev_exc - v) + g_inh * (Erev_inh - v ) + I
+
+        tau_exc * dg_exc/dt = - g_exc
+        tau_inh * dg_inh/dt = - g_inh
+    """,
+    spike="v > Vt",
+    reset="v = Vr",
+    refractory=5.0
+)
+
+# Current-based variant of the same network
+CUBA = Neuron(
+    parameters="""
+        El = -49.0  : population
+        Vr = -60.0  : population
+        Vt = -50.0   : population
+        tau = 20.0   : population
+        tau_exc = 5.0   : population
+        tau_inh = 10.0  : population
+    """,
+    equations="""
+        tau * dv/dt = (El - v) + g_exc + g_inh
+
+        tau_exc * dg_exc/dt = - g_exc
+        tau_inh * dg_inh/dt = - g_inh
+    """,
+    spike="v > Vt",
+    reset="v = Vr",
+    refractory=5.0
+)
+
+# Online STDP with event-driven traces
+STDP = Synapse(
+    parameters="""
+        tau_pre = 20.0 : projection
+        tau_post = 20.0 : projection
+        cApre = 0.01 : projection
+        cApost = 0.0105 : projection
+        wmax = 0.01 : projection
+    """,
+    equations="""
+        tau_pre * dApre/dt = -Apre : event-driven
+        tau_post * dApost/dt = -Apost : event-driven
+    """,
+    pre_spike="""
+        g_target += w
+        Apre += cApre * wmax
+        w = clip(w - Apost, 0.0 , wmax)
+    """,
+    post_spike="""
+        Apost += cApost * wmax
+        w = clip(w + Apre, 0.0 , wmax)
+    """
+)
+
+def rate_dense(size):
+    "Rate-coded population with all-to-all recurrent connections."
+    pop = Population(size, RateNeuron)
+    proj = Projection(pop, pop, 'exc')
+    proj.connect_all_to_all(weights=Uniform(-1.0/size, 1.0/size))
+
+def rate_sparse(size):
+    "Rate-coded population with 5% recurrent connection probability."
+    pop = Population(size, RateNeuron)
+    proj = Projection(pop, pop, 'exc')
+    proj.connect_fixed_probability(probability=0.05, weights=Uniform(-1.0/(0.05*size), 1.0/(0.05*size)))
+
+def _spiking_network(size, neuron, we, wi):
+    "Recurrent network of 80% excitatory and 20% inhibitory neurons with 2% connection probability."
+    nb_exc = int(0.8 * size)
+    pop = Population(size, neuron)
+    pop.v = Normal(-55.0, 5.0)
+    exc = Projection(pop[:nb_exc], pop, 'exc')
+    exc.connect_fixed_probability(probability=0.02, weights=we)
+    inh = Projection(pop[nb_exc:], pop, 'inh')
+    inh.connect_fixed_probability(probability=0.02, weights=wi)
+
+def coba(size):
+    "Conductance-based spiking network (Vogels & Abbott, 2005)."
+    _spiking_network(size, COBA, we=6.0/10.0 * 4000.0/size, wi=67.0/10.0 * 4000.0/size)
+
+def cuba(size):
+    "Current-based spiking network (Vogels & Abbott, 2005)."
+    _spiking_network(size, CUBA, we=(60.0 * 0.27 / 10.0) * 4000.0/size, wi=(-20.0 * 4.5 / 10.0) * 4000.0/size)
+
+def stdp(size):
+    "Poisson inputs projecting with online STDP on a population of spiking neurons (Song et al., 2000)."
+    inp = PoissonPopulation(size, rates=10.0)
+    pop = Population(max(1, size//10), COBA)
+    proj = Projection(inp, pop, 'exc', STDP)
+    proj.connect_all_to_all(weights=Uniform(0.0, 0.01))
+
+def structural(size):
+    "Rate-coded population whose sparse recurrent connections are pruned and created during the simulation."
+    # Can only be declared once structural plasticity is enabled
+    StructuralSynapse = Synapse(
+        parameters="""
+            tau_utility = 100.0
+        """,
+        equations="""
+            tau_utility * dutility/dt = pre.r * post.r - utility : init=0.0
+        """,
+        creating="pre.r * post.r > 0.5 : proba = 0.1, w = 0.01",
+        pruning="utility < 0.001 : proba = 0.1"
+    )
+    pop = Population(size, RateNeuron)
+    pop.baseline = Uniform(0.0, 1.0)
+    proj = Projection(pop, pop, 'exc', StructuralSynapse)
+    proj.connect_fixed_probability(probability=0.05, weights=0.01)
+
+    def start():
+        proj.start_pruning(period=10.0)
+        proj.start_creating(period=10.0)
+    return start
+
+def convolution(size):
+    "Square image convolved by a 3x3 filter, then max-pooled over 2x2 regions."
+    from ANNarchy.extensions.convolution import Convolution, Pooling
+    side = 2 * max(2, int(np.sqrt(size)) // 2)
+    inp = Population((side, side), RateNeuron)
+    conv = Population((side, side), RateNeuron)
+    pool = Population((side//2, side//2), RateNeuron)
+    kernel = np.array([[-1.0, 0.0, 1.0], [-2.0, 0.0, 2.0], [-1.0, 0.0, 1.0]])
+    Convolution(inp, conv, 'exc', weights=kernel, method='filter')
+    Pooling(conv, pool, 'exc', operation='max')
+
+def recording(size):
+    "Rate-coded and spiking populations recorded at every step."
+    rate = Population(size, RateNeuron)
+    Projection(rate, rate, 'exc').connect_fixed_number_pre(number=10, weights=0.01)
+    spiking = Population(size, COBA)
+    spiking.v = Normal(-55.0, 5.0)
+    Monitor(rate, ['v', 'r'])
+    Monitor(spiking, ['spike', 'v', 'g_exc'])
+
+# name: (function, default sizes, needs structural plasticity)
+CASES = {
+    'rate_dense': (rate_dense, [250, 1000, 2000], False),
+    'rate_sparse': (rate_sparse, [1000, 4000, 16000], False),
+    'coba': (coba, [1000, 4000, 16000], False),
+    'cuba': (cuba, [1000, 4000, 16000], False),
+    'stdp': (stdp, [1000, 4000, 8000], False),
+    'structural': (structural, [250, 1000, 2000], True),
+    'convolution': (convolution, [4096, 65536, 262144], False),
+    'recording': (recording, [1000, 4000, 16000], False),
+}
@@ -0,0 +1,106 @@
+#===============================================================================
+#
+#     Worker.py
+#
+#     This file is part of ANNarchy.
+#
+#     Copyright (C) 2013-2016  Julien Vitay <julien.vitay@gmail.com>,
+#     Helge Uelo Dinkelbach <helge.dinkelbach@gmail.com>
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     ANNarchy is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#===============================================================================
+"""
+Runs a single benchmark in a fresh interpreter.
+
+The run is described by a JSON dictionary read on the standard input (case, size, threads, duration, dt, seed and output). The measurements are written in the JSON file ``output``. The command-line arguments are left to ``compile()``, e.g. ``--no-cache``.
+"""
+import sys
+import json
+import time
+import resource
+
+def _peak_memory():
+    "Peak resident set size of the process in bytes."
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on OS X
+    return peak if sys.platform == "darwin" else 1024 * peak
+
+def _size_in_bytes(objects):
+    "Memory allocated on the C++ side by the objects (the shared projections do not report it)."
+    return int(sum(obj.cyInstance.size_in_bytes() for obj in objects if hasattr(obj.cyInstance, 'size_in_bytes')))
+
+def run(spec):
+    "Builds, compiles and simulates the case described by spec and returns the measurements."
+    import ANNarchy.core.Global as Global
+    from ANNarchy.core.Simulate import simulate
+    from ANNarchy.generator.Compiler import compile
+    from ANNarchy.benchmarks.Cases import CASES
+
+    build, _, structural = CASES[spec['case']]
+
+    Global.setup(
+        dt=spec['dt'],
+        seed=spec['seed'],
+        num_threads=spec['threads'],
+        structural_plasticity=structural
+    )
+
+    # Declaration of the network (the connection patterns are only stored)
+    t0 = time.time()
+    start = build(spec['size'])
+    t_build = time.time() - t0
+
+    compile(silent=True)
+    if start is not None:
+        start()
+    timings = Global._network[0]['timings']
+
+    t0 = time.time()
+    simulate(spec['duration'])
+    t_simulate = time.time() - t0
+
+    populations = Global._network[0]['populations']
+    projections = Global._network[0]['projections']
+    monitors = Global._network[0]['monitors']
+    nb_steps = int(spec['duration'] / spec['dt'])
+
+    return {
+        'case': spec['case'],
+        'size': spec['size'],
+        'threads': spec['threads'],
+        'neurons': int(sum(pop.size for pop in populations)),
+        'synapses': int(sum(proj.nb_synapses for proj in projections if hasattr(proj.cyInstance, 'nb_synapses'))),
+        'time': {
+            'build': t_build,
+            'code_generation': timings['code_generation'],
+            'compilation': timings['compilation'],
+            'connect': timings['connect'],
+            'instantiate': timings['instantiate'],
+            'simulate': t_simulate,
+            'step': t_simulate / max(1, nb_steps),
+        },
+        'memory': {
+            'populations': _size_in_bytes(populations),
+            'projections': _size_in_bytes(projections),
+            'monitors': _size_in_bytes(monitors),
+            'peak_rss': _peak_memory(),
+        }
+    }
+
+if __name__ == '__main__':
+    spec = json.load(sys.stdin)
+    result = run(spec)
+    with open(spec['output'], 'w') as wfile:
+        json.dump(result, wfile)
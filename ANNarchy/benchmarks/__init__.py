@@ -0,0 +1,216 @@
+#===============================================================================
+#
+#     __init__.py
+#
+#     This file is part of ANNarchy.
+#
+#     Copyright (C) 2013-2016  Julien Vitay <julien.vitay@gmail.com>,
+#     Helge Uelo Dinkelbach <helge.dinkelbach@gmail.com>
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     ANNarchy is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#===============================================================================
+"""
+Benchmark suite of ANNarchy.
+
+The suite measures a set of reference networks (rate-coded dense and sparse networks, COBA/CUBA spiking networks, STDP, structural plasticity, convolution/pooling and a recording-heavy network) for several sizes and numbers of threads. Each run is performed in a fresh interpreter and a temporary directory, and measures separately the declaration of the network, the code generation, the compilation, the creation of the synapses, the rest of the instantiation and the simulation, as well as the allocated memory.
+
+From the command line::
+
+    python -m ANNarchy.benchmarks --cases coba rate_sparse --threads 1 2 4 --output results.json
+    python -m ANNarchy.benchmarks --output new.json --baseline results.json
+
+or from Python::
+
+    from ANNarchy.benchmarks import run_benchmarks, compare_results
+    results = run_benchmarks(cases=['coba'], sizes=[4000])
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import tempfile
+import subprocess
+import multiprocessing
+
+from .Cases import CASES
+
+# Measurements compared against the baseline
+TIME_METRICS = ['compilation', 'connect', 'instantiate', 'simulate']
+MEMORY_METRICS = ['populations', 'projections', 'monitors']
+
+def environment():
+    "Returns a description of the machine and of the software versions, stored with the results."
+    import numpy
+    import ANNarchy
+    return {
+        'annarchy': ANNarchy.__release__,
+        'python': platform.python_version(),
+        'numpy': numpy.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'cpu_count': multiprocessing.cpu_count(),
+        'date': time.strftime('%Y-%m-%d %H:%M:%S'),
+    }
+
+def run_case(case, size, threads=1, duration=1000.0, dt=0.1, seed=42, use_cache=False):
+    """
+    Runs one benchmark in a separate process and returns its measurements.
+
+    *Parameters*:
+
+    * **case**: name of the case (see ``CASES``).
+    * **size**: size of the network.
+    * **threads**: number of OpenMP threads (default: 1).
+    * **duration**: simulated duration in milliseconds (default: 1000.0).
+    * **dt**: discretization step in milliseconds (default: 0.1).
+    * **seed**: seed of the random number generators (default: 42).
+    * **use_cache**: if False (default), the shared build cache is bypassed so that the compilation time is measured.
+
+    The result is a dictionary with the keys 'case', 'size', 'threads', 'neurons', 'synapses', 'time' (dictionary of durations in seconds) and 'memory' (dictionary of sizes in bytes).
+    """
+    if not case in CASES.keys():
+        raise ValueError('run_case(): unknown case ' + str(case) + ', available cases are ' + str(sorted(CASES.keys())))
+
+    directory = tempfile.mkdtemp(prefix='annarchy_benchmark_')
+    try:
+        spec = {
+            'case': case,
+            'size': int(size),
+            'threads': int(threads),
+            'duration': float(duration),
+            'dt': float(dt),
+            'seed': int(seed),
+            'output': os.path.join(directory, 'result.json'),
+        }
+        command = [sys.executable, '-m', 'ANNarchy.benchmarks.Worker']
+        if not use_cache:
+            command.append('--no-cache')
+
+        process = subprocess.Popen(command, cwd=directory, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+        log, _ = process.communicate(json.dumps(spec).encode('utf-8'))
+        if process.returncode != 0 or not os.path.isfile(spec['output']):
+            raise RuntimeError('The benchmark ' + case + ' (size=' + str(size) + ', threads=' + str(threads) + ') failed:\n' + log.decode('utf-8', 'replace'))
+
+        with open(spec['output'], 'r') as rfile:
+            return json.load(rfile)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+def run_benchmarks(cases=None, sizes=None, threads=None, duration=1000.0, dt=0.1, seed=42, repeat=1, use_cache=False, output=None, verbose=True):
+    """
+    Runs the benchmark suite and returns the results.
+
+    *Parameters*:
+
+    * **cases**: list of case names (default: all cases).
+    * **sizes**: list of network sizes used for all cases (default: the sizes defined by each case).
+    * **threads**: list of numbers of threads (default: [1]).
+    * **duration**: simulated duration in milliseconds (default: 1000.0).
+    * **dt**: discretization step in milliseconds (default: 0.1).
+    * **seed**: seed of the random number generators (default: 42).
+    * **repeat**: number of runs of each configuration. The minimum of each duration over the runs is kept (default: 1).
+    * **use_cache**: if False (default), the shared build cache is bypassed.
+    * **output**: name of the JSON file where the results are saved (default: None).
+    * **verbose**: prints the measurements after each run (default: True).
+
+    The results are a dictionary with the keys 'environment', 'settings' and 'results' (list of the measurements returned by ``run_case()``).
+    """
+    if cases is None:
+        cases = sorted(CASES.keys())
+    if threads is None:
+        threads = [1]
+
+    results = []
+    for case in cases:
+        if not case in CASES.keys():
+            raise ValueError('run_benchmarks(): unknown case ' + str(case) + ', available cases are ' + str(sorted(CASES.keys())))
+        for size in (sizes if sizes is not None else CASES[case][1]):
+            for nb_threads in threads:
+                runs = [run_case(case, size, nb_threads, duration, dt, seed, use_cache) for _ in range(repeat)]
+                result = runs[0]
+                for key in result['time'].keys():
+                    result['time'][key] = min(run['time'][key] for run in runs)
+                result['repeat'] = repeat
+                results.append(result)
+                if verbose:
+                    print(format_result(result))
+
+    data = {
+        'environment': environment(),
+        'settings': {'duration': duration, 'dt': dt, 'seed': seed, 'repeat': repeat, 'use_cache': use_cache},
+        'results': results,
+    }
+    if output is not None:
+        save_results(data, output)
+
+    return data
+
+def save_results(data, filename):
+    "Saves the results of ``run_benchmarks()`` in a JSON file."
+    with open(filename, 'w') as wfile:
+        json.dump(data, wfile, indent=2, sort_keys=True)
+
+def load_results(filename):
+    "Loads results saved by ``save_results()``."
+    with open(filename, 'r') as rfile:
+        return json.load(rfile)
+
+def format_result(result):
+    "Returns a one-line summary of a measurement."
+    return '%(case)-12s size=%(size)-8d threads=%(threads)-3d ' % result + \
+           ' '.join('%s=%.3fs' % (key, result['time'][key]) for key in ['build', 'code_generation'] + TIME_METRICS) + \
+           ' memory=%.1fMB peak=%.1fMB' % (
+                sum(result['memory'][key] for key in MEMORY_METRICS) / 1024.0**2,
+                result['memory']['peak_rss'] / 1024.0**2
+           )
+
+def compare_results(results, baseline, tolerance=0.1, min_time=0.01):
+    """
+    Compares results with a baseline and returns the regressions.
+
+    Configurations (case, size, threads) which are not present in both sets are ignored.
+
+    *Parameters*:
+
+    * **results**: results of ``run_benchmarks()``.
+    * **baseline**: reference results, e.g. loaded with ``load_results()``.
+    * **tolerance**: relative increase considered as a regression (default: 0.1, i.e. 10%).
+    * **min_time**: durations shorter than this value (in seconds) in the baseline are too noisy to be compared (default: 0.01).
+
+    The regressions are returned as a list of dictionaries with the keys 'case', 'size', 'threads', 'metric', 'baseline', 'value' and 'ratio'.
+    """
+    reference = {}
+    for result in baseline['results']:
+        reference[(result['case'], result['size'], result['threads'])] = result
+
+    regressions = []
+    for result in results['results']:
+        key = (result['case'], result['size'], result['threads'])
+        if not key in reference.keys():
+            continue
+
+        values = [('time.' + metric, reference[key]['time'][metric], result['time'][metric], min_time) for metric in TIME_METRICS]
+        values += [('memory.' + metric, reference[key]['memory'][metric], result['memory'][metric], 0) for metric in MEMORY_METRICS]
+
+        for metric, old, new, threshold in values:
+            if old > threshold and new > (1.0 + tolerance) * old:
+                regressions.append({
+                    'case': key[0], 'size': key[1], 'threads': key[2],
+                    'metric': metric, 'baseline': old, 'value': new, 'ratio': new / old
+                })
+
+    return regressions
@@ -0,0 +1,73 @@
+#===============================================================================
+#
+#     __main__.py
+#
+#     This file is part of ANNarchy.
+#
+#     Copyright (C) 2013-2016  Julien Vitay <julien.vitay@gmail.com>,
+#     Helge Uelo Dinkelbach <helge.dinkelbach@gmail.com>
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     ANNarchy is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#===============================================================================
+"""
+Command-line interface of the benchmark suite: ``python -m ANNarchy.benchmarks --help``.
+
+The exit code is 1 when a regression against the baseline is detected.
+"""
+import sys
+import argparse
+
+from . import CASES, run_benchmarks, load_results, compare_results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m ANNarchy.benchmarks', description='ANNarchy benchmark suite.')
+    parser.add_argument("--cases", nargs='+', default=None, choices=sorted(CASES.keys()), help="Cases to run (default: all).")
+    parser.add_argument("--sizes", nargs='+', type=int, default=None, help="Network sizes (default: the sizes of each case).")
+    parser.add_argument("--threads", nargs='+', type=int, default=[1], help="Numbers of OpenMP threads (default: 1).")
+    parser.add_argument("--duration", type=float, default=1000.0, help="Simulated duration in ms (default: 1000).")
+    parser.add_argument("--dt", type=float, default=0.1, help="Discretization step in ms (default: 0.1).")
+    parser.add_argument("--seed", type=int, default=42, help="Seed of the random number generators (default: 42).")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per configuration, the fastest is kept (default: 1).")
+    parser.add_argument("--use-cache", action="store_true", default=False, dest="use_cache", help="Uses the shared build cache (the compilation is then not measured).")
+    parser.add_argument("-o", "--output", default=None, help="JSON file where the results are saved.")
+    parser.add_argument("--baseline", default=None, help="JSON file of previous results to compare with.")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="Relative increase reported as a regression (default: 0.1).")
+    options = parser.parse_args(argv)
+
+    results = run_benchmarks(
+        cases=options.cases,
+        sizes=options.sizes,
+        threads=options.threads,
+        duration=options.duration,
+        dt=options.dt,
+        seed=options.seed,
+        repeat=options.repeat,
+        use_cache=options.use_cache,
+        output=options.output
+    )
+
+    if options.baseline is None:
+        return 0
+
+    regressions = compare_results(results, load_results(options.baseline), tolerance=options.tolerance)
+    for reg in regressions:
+        print('REGRESSION %(case)s size=%(size)d threads=%(threads)d %(metric)s: %(baseline).4g -> %(value).4g (x%(ratio).2f)' % reg)
+    if len(regressions) == 0:
+        print('No regression against', options.baseline)
+        return 0
+    return 1
+
+if __name__ == '__main__':
+    sys.exit(main())
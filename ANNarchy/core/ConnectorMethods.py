@@ -24,15 +24,21 @@
 import numpy as np
 
 from ANNarchy.core import Global
-from ANNarchy.core.Random import Uniform
+from ANNarchy.core.Random import Uniform, RandomDistribution
 from ANNarchy.core.PopulationView import PopulationView
-from ANNarchy.parser.report.LatexParser import _process_random
 
 try:
     from ANNarchy.core.cython_ext import *
 except Exception as e:
     Global._print(e)
 
+def _process_random(val):
+    "Transforms a connector attribute (weights, delays) into a string representation"
+    if isinstance(val, RandomDistribution):
+        return val.latex()
+    else:
+        return str(val)
+
 ################################
 ## Connector methods
 ################################
@@ -156,7 +162,7 @@ def connect_dog(self, amp_pos, sigma_pos, amp_neg, sigma_neg, delays=0.0, limit=
     self._store_connectivity( dog, (amp_pos, sigma_pos, amp_neg, sigma_neg, delays, limit, allow_self_connections,  "lil", "post_to_pre"), delays,  "lil", "post_to_pre")
     return self
 
-def connect_fixed_probability(self, probability, weights, delays=0.0, allow_self_connections=False, force_multiple_weights=False, storage_format="lil", storage_order="post_to_pre"):
+def connect_fixed_probability(self, probability, weights, delays=0.0, allow_self_connections=False, force_multiple_weights=False, storage_format="lil", storage_order="post_to_pre", seed=None):
     """
     Builds a probabilistic connection pattern between the two populations.
 
@@ -170,6 +176,7 @@ def connect_fixed_probability(self, probability, weights, delays=0.0, allow_self
     * **allow_self_connections** : defines if self-connections are allowed (default=False).
     * **force_multiple_weights**: if a single value is provided for ``weights`` and there is no learning, a single weight value will be used for the whole projection instead of one per synapse. Setting ``force_multiple_weights`` to True ensures that a value per synapse will be used.
     * **storage_format**: for some of the default connection patterns ANNarchy provide different storage formats. For all-to-all we support list-of-list ("lil") or compressed sparse row ("csr"), by default lil is chosen.
+    * **seed**: seed of the random number generators used to build the connectivity, without changing their state in the script. Projections connected with the same arguments and seed between populations of the same geometry get the same synapses, which are then stored only once (default: None, the global random state is used).
     """
     if self.pre!=self.post:
         allow_self_connections = True
@@ -180,10 +187,10 @@ def connect_fixed_probability(self, probability, weights, delays=0.0, allow_self
     if isinstance(weights, (int, float)) and not force_multiple_weights:
         self._single_constant_weight = True
 
-    self._store_connectivity( fixed_probability, (probability, weights, delays, allow_self_connections, storage_format, storage_order), delays, storage_format, storage_order)
+    self._store_connectivity( fixed_probability, (probability, weights, delays, allow_self_connections, storage_format, storage_order), delays, storage_format, storage_order, seed=seed)
     return self
 
-def connect_fixed_number_pre(self, number, weights, delays=0.0, allow_self_connections=False, force_multiple_weights=False, storage_format="lil", storage_order="post_to_pre"):
+def connect_fixed_number_pre(self, number, weights, delays=0.0, allow_self_connections=False, force_multiple_weights=False, storage_format="lil", storage_order="post_to_pre", seed=None):
     """
     Builds a connection pattern between the two populations with a fixed number of pre-synaptic neurons.
 
@@ -196,6 +203,7 @@ def connect_fixed_number_pre(self, number, weights, delays=0.0, allow_self_conne
     * **delays**: either a single value for all synapses or a RandomDistribution object (default = dt)
     * **allow_self_connections** : defines if self-connections are allowed (default=False).
     * **force_multiple_weights**: if a single value is provided for ``weights`` and there is no learning, a single weight value will be used for the whole projection instead of one per synapse. Setting ``force_multiple_weights`` to True ensures that a value per synapse will be used.
+    * **seed**: seed of the random number generators used to build the connectivity, without changing their state in the script. Projections connected with the same arguments and seed between populations of the same geometry get the same synapses, which are then stored only once (default: None, the global random state is used).
     """
     if self.pre!=self.post:
         allow_self_connections = True
@@ -209,10 +217,10 @@ def connect_fixed_number_pre(self, number, weights, delays=0.0, allow_self_conne
     if isinstance(weights, (int, float)) and not force_multiple_weights:
         self._single_constant_weight = True
 
-    self._store_connectivity( fixed_number_pre, (number, weights, delays, allow_self_connections, storage_format, storage_order), delays, storage_format, storage_order)
+    self._store_connectivity( fixed_number_pre, (number, weights, delays, allow_self_connections, storage_format, storage_order), delays, storage_format, storage_order, seed=seed)
     return self
 
-def connect_fixed_number_post(self, number, weights=1.0, delays=0.0, allow_self_connections=False, force_multiple_weights=False):
+def connect_fixed_number_post(self, number, weights=1.0, delays=0.0, allow_self_connections=False, force_multiple_weights=False, seed=None):
     """
     Builds a connection pattern between the two populations with a fixed number of post-synaptic neurons.
 
@@ -225,6 +233,7 @@ def connect_fixed_number_post(self, number, weights=1.0, delays=0.0, allow_self_
     * **delays**: either a single value for all synapses or a RandomDistribution object (default = dt)
     * **allow_self_connections** : defines if self-connections are allowed (default=False)
     * **force_multiple_weights**: if a single value is provided for ``weights`` and there is no learning, a single weight value will be used for the whole projection instead of one per synapse. Setting ``force_multiple_weights`` to True ensures that a value per synapse will be used.
+    * **seed**: seed of the random number generators used to build the connectivity, without changing their state in the script. Projections connected with the same arguments and seed between populations of the same geometry get the same synapses, which are then stored only once (default: None, the global random state is used).
     """
     if self.pre!=self.post:
         allow_self_connections = True
@@ -238,7 +247,7 @@ def connect_fixed_number_post(self, number, weights=1.0, delays=0.0, allow_self_
     if isinstance(weights, (int, float)) and not force_multiple_weights:
         self._single_constant_weight = True
 
-    self._store_connectivity( fixed_number_post, (number, weights, delays, allow_self_connections, "lil", "post_to_pre"), delays, "lil", "post_to_pre")
+    self._store_connectivity( fixed_number_post, (number, weights, delays, allow_self_connections, "lil", "post_to_pre"), delays, "lil", "post_to_pre", seed=seed)
     return self
 
 def connect_with_func(self, method, **args):
@@ -424,7 +433,7 @@ def connect_from_file(self, filename):
     """
     Builds the connectivity matrix using data saved using the Projection.save_connectivity() method (not save()!).
 
-    Admissible file formats are compressed Numpy files (.npz), gunzipped binary text files (.gz) or binary text files.
+    Admissible file formats are compressed Numpy files (.npz), gunzipped binary text files (.gz), binary text files or the flat binary format (.bin). The latter is memory-mapped, so that the connectivity is read from disk only once.
 
     *Parameters*:
 
@@ -437,6 +446,11 @@ def connect_from_file(self, filename):
     # Create an empty LIL object
     lil = LILConnectivity()
 
+    # Flat binary format
+    from ANNarchy.core.IO import _is_binary_file
+    if _is_binary_file(filename):
+        return self._connect_from_binary_file(lil, filename)
+
     # Load the data
     from ANNarchy.core.IO import _load_data
     try:
@@ -481,3 +495,76 @@ def connect_from_file(self, filename):
     self._store_connectivity(self._load_from_lil, (lil,), lil.max_delay if lil.uniform_delay > 0 else lil.delay)
 
     return self
+
+def _connect_from_binary_file(self, lil, filename):
+    """
+    Fills *lil* from a file saved in the flat binary format. The arrays are memory-mapped
+    and copied in a single pass into the LIL object.
+    """
+    from ANNarchy.core.IO import _open_binary_file
+    try:
+        header, data = _open_binary_file(filename)
+    except Exception as e:
+        Global._print(e)
+        Global._error('connect_from_file(): Unable to load the data', filename, 'into the projection.')
+
+    if header['dt'] != Global.config['dt'] and header['max_delay'] > 0:
+        Global._warning('connect_from_file(): the connectivity was saved with dt =', header['dt'], ', the delays (in steps) will be different.')
+
+    try:
+        lil.load_csr(data['post_ranks'], data['row_ptr'], data['pre_ranks'], data.get('w', None), data.get('delay', None))
+        if header['w'] is not None:
+            self._single_constant_weight = True
+            lil.w = [[header['w']]]
+        lil.max_delay = header['max_delay']
+        lil.uniform_delay = header['uniform_delay']
+
+    except Exception as e:
+        Global._print(e)
+        Global._error('Unable to load the data', filename, 'into the projection.')
+
+    # Store the synapses
+    self.connector_name = "From File"
+    self.connector_description = "From File"
+    if lil.uniform_delay == -1 and lil.max_delay > 1:
+        # Non-uniform delays are stored in the LIL object: only their maximum is needed here.
+        delay = [[lil.max_delay * Global.config['dt']]]
+    else:
+        delay = max(lil.max_delay, 0) * Global.config['dt']
+    self._store_connectivity(self._load_from_lil, (lil,), delay)
+
+    return self
+
+def _connectivity_key(self):
+    """
+    Returns a key identifying the synapses (post- and pre-synaptic ranks) built by the connector, or None if they can not be shared with other projections.
+
+    Two projections with the same key get identical ranks: the same connector was called with the same arguments between populations (or views) of the same geometry. The random connectors need a seed for that. The weights and delays drawn by the connector are part of the arguments but they are not shared: each projection still stores its own values.
+    """
+    # Only the connectors of ANNarchy, whose result only depends on their arguments (and seed)
+    random_connectors = [fixed_probability, fixed_number_pre, fixed_number_post]
+    if not self._connection_method in [one_to_one, all_to_all, gaussian, dog] + random_connectors:
+        return None
+    if self._connection_method in random_connectors and self._connection_seed is None:
+        return None
+
+    def _value(arg):
+        "Hashable representation of an argument, TypeError if there is none (e.g. arrays)."
+        if isinstance(arg, RandomDistribution):
+            return (arg.__class__.__name__, tuple((name, _value(val)) for name, val in sorted(vars(arg).items())))
+        if arg is None or isinstance(arg, (bool, int, float, str)):
+            return arg
+        raise TypeError
+
+    def _population(pop):
+        "Geometry of a population, ranks of a view."
+        if isinstance(pop, PopulationView):
+            return (pop.population.geometry, tuple(pop.ranks))
+        return (pop.geometry, None)
+
+    try:
+        args = tuple(_value(arg) for arg in self._connection_args)
+    except TypeError:
+        return None
+
+    return (self._connection_method.__name__, args, self._connection_seed, _population(self.pre), _population(self.post))
@@ -0,0 +1,305 @@
+#===============================================================================
+#
+#     Estimate.py
+#
+#     This file is part of ANNarchy.
+#
+#     Copyright (C) 2013-2016  Julien Vitay <julien.vitay@gmail.com>,
+#     Helge Uelo Dinkelbach <helge.dinkelbach@gmail.com>
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     ANNarchy is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#===============================================================================
+import re
+import math
+import numpy as np
+
+import ANNarchy.core.Global as Global
+from .PopulationView import PopulationView
+
+# Overhead of an empty std::vector (begin, end and capacity pointers)
+_VECTOR_BYTES = 24
+# Overhead of a node of std::map (three pointers, color and padding)
+_MAP_NODE_BYTES = 48
+
+def estimate(net=None, firing_rate=10.0):
+    """
+    Estimates the memory footprint and the computational cost of a network before ``compile()``.
+
+    The number of synapses is predicted from the parameters of the connector (e.g. ``p * pre.size * post.size`` for ``connect_fixed_probability()``, ``number * post.size`` for ``connect_fixed_number_pre()``) without creating them. The number of bytes allocated on the C++ side is then derived from the attributes of the neuron and synapse models, the storage format, the floating-point precision and the delays. The costs per simulation step are rough orders of magnitude, obtained by counting the arithmetic operations in the equations.
+
+    The result is a dictionary of columns which can be passed directly to ``pandas.DataFrame``:
+
+    * **type**: 'pop' for populations, 'proj' for projections or 'monitor'.
+    * **name**: name of the object.
+    * **size**: number of neurons, predicted number of synapses or number of recorded values per step.
+    * **bytes**: predicted memory footprint after ``compile()``.
+    * **growth**: memory added per second of simulated time (recorded data).
+    * **flops**: floating-point operations per simulation step.
+    * **traffic**: bytes read or written per simulation step.
+
+    Example::
+
+        net = Network()
+        net.add([pop, proj])
+        est = estimate(net)
+        print(sum(est['bytes']) / 1024**3, 'GB')
+
+    *Parameters*:
+
+    * **net**: ``Network`` instance to analyse (default: the global network).
+    * **firing_rate**: mean firing rate in Hz assumed for spiking neurons, determining the number of synaptic events and of recorded spikes (default: 10.0).
+    """
+    from .Network import Network
+    net_id = net.id if isinstance(net, Network) else 0
+
+    precision = 4 if Global.config['precision'] == "float" else 8
+    # expected number of spikes per neuron and step
+    spike_proba = firing_rate * Global.config['dt'] / 1000.0
+
+    columns = {'type': [], 'name': [], 'size': [], 'bytes': [], 'growth': [], 'flops': [], 'traffic': []}
+    def add(obj_type, name, size, nb_bytes, growth, flops, traffic):
+        columns['type'].append(obj_type)
+        columns['name'].append(name)
+        columns['size'].append(int(size))
+        columns['bytes'].append(int(nb_bytes))
+        columns['growth'].append(int(growth))
+        columns['flops'].append(int(flops))
+        columns['traffic'].append(int(traffic))
+
+    synapses = {}
+    for proj in Global._network[net_id]['projections']:
+        synapses[proj] = _nb_synapses(proj)
+
+    # The ranks of identical projections are stored once
+    from ANNarchy.generator.Compiler import share_connectivity
+    share_connectivity(Global._network[net_id]['projections'])
+
+    for pop in Global._network[net_id]['populations']:
+        add('pop', pop.name, pop.size, *_population_cost(pop, precision, spike_proba))
+
+    for proj in Global._network[net_id]['projections']:
+        add('proj', proj.name, synapses[proj], *_projection_cost(proj, synapses[proj], precision, spike_proba))
+
+    for mon in Global._network[net_id]['monitors']:
+        add('monitor', mon.name + ' on ' + mon.object.name, *_monitor_cost(mon, synapses, precision, spike_proba))
+
+    for key in ['size', 'bytes', 'growth', 'flops', 'traffic']:
+        columns[key] = np.array(columns[key], dtype=np.int64)
+
+    return columns
+
+def _nb_operations(code):
+    "Rough number of floating-point operations in an equation or a block of statements."
+    if not code:
+        return 0
+    code = ' '.join(code) if isinstance(code, list) else str(code)
+    # the assignment itself is not counted, but ODEs cost at least one operation
+    return len(re.findall(r'[\+\-\*/]', code)) + len(re.findall(r'[a-zA-Z_]\w*\s*\(', code))
+
+def _attributes(description, locality):
+    "Names of the parameters and variables with the given locality."
+    return [var['name'] for var in description['parameters'] + description['variables'] if var['locality'] == locality]
+
+def _population_cost(pop, precision, spike_proba):
+    "Memory, growth, flops and traffic of a population."
+    desc = pop.neuron_type.description
+    nb_local = len(_attributes(desc, 'local'))
+    nb_global = len(_attributes(desc, 'global'))
+    nb_sums = len(desc['targets'])
+    nb_rd = len(desc['random_distributions'])
+
+    nb_bytes = pop.size * (nb_local + nb_sums + nb_rd) * precision + (nb_local + nb_sums + nb_rd) * _VECTOR_BYTES
+    nb_bytes += nb_global * precision
+
+    if pop.neuron_type.type == 'spike':
+        # spiked (int), last_spike (long int), refractory and refractory_remaining (int)
+        nb_bytes += pop.size * (4 + 8 + 4 + 4)
+        if pop.max_delay > 1:
+            nb_bytes += pop.max_delay * (pop.size * spike_proba * 4 + _VECTOR_BYTES)
+    elif pop.max_delay > 1:
+        # ring buffer of the delayed firing rates
+        nb_bytes += pop.max_delay * (pop.size * precision + _VECTOR_BYTES)
+
+    flops = pop.size * (sum(_nb_operations(var['eq']) for var in desc['variables'] if var['locality'] == 'local') + nb_rd)
+    flops += sum(_nb_operations(var['eq']) for var in desc['variables'] if var['locality'] == 'global')
+    traffic = pop.size * (2 * len([var for var in desc['variables'] if var['locality'] == 'local']) + nb_local + nb_sums + nb_rd) * precision
+
+    return nb_bytes, 0, flops, traffic
+
+def _overlap(pre, post):
+    "Number of neurons belonging to both the pre- and post-synaptic populations (or views)."
+    pre_pop = pre.population if isinstance(pre, PopulationView) else pre
+    post_pop = post.population if isinstance(post, PopulationView) else post
+    if not pre_pop is post_pop:
+        return 0
+    pre_ranks = pre.ranks if isinstance(pre, PopulationView) else range(pre.size)
+    post_ranks = post.ranks if isinstance(post, PopulationView) else range(post.size)
+    return len(set(pre_ranks) & set(post_ranks))
+
+def _nb_synapses(proj):
+    "Predicts the number of synapses created by the connector of the projection."
+    pre_size = proj.pre.size
+    post_size = proj.post.size
+
+    # Shared projections (convolution, pooling, copy)
+    connector = getattr(proj, 'connector_name', None)
+    if connector == "Pooling":
+        return post_size * int(np.prod(proj.extent))
+    if getattr(proj, '_operation_type', None) == 'convolve':
+        kernel = np.array(proj.weights)
+        return post_size * (kernel[0].size if proj.multiple else kernel.size)
+    if getattr(proj, '_operation_type', None) == 'copy':
+        return _nb_synapses(proj.projection)
+
+    if proj._connection_method is None:
+        Global._error('estimate(): the projection between ' + proj.pre.name + ' and ' + proj.post.name + ' is declared but not connected.')
+
+    method = proj._connection_method.__name__
+    args = proj._connection_args
+
+    if method == 'one_to_one':
+        return post_size
+    elif method == 'all_to_all':
+        return pre_size * post_size - (0 if args[2] else _overlap(proj.pre, proj.post))
+    elif method == 'fixed_probability':
+        return int(round(args[0] * (pre_size * post_size - (0 if args[3] else _overlap(proj.pre, proj.post)))))
+    elif method == 'fixed_number_pre':
+        return args[0] * post_size
+    elif method == 'fixed_number_post':
+        return args[0] * pre_size
+    elif method in ['gaussian', 'dog']:
+        # the synapses lie in a hypersphere of the normalized coordinates
+        if method == 'gaussian':
+            sigma, limit = args[1], args[3]
+        else:
+            sigma, limit = max(args[1], args[3]), args[5]
+        radius = sigma * math.sqrt(-2.0 * math.log(limit))
+        dim = proj.pre.dimension
+        volume = math.pi**(dim/2.0) / math.gamma(dim/2.0 + 1.0) * radius**dim
+        return int(min(1.0, volume) * pre_size * post_size)
+    elif method == '_load_from_lil':
+        return args[0].nb_synapses
+    elif method == '_load_from_matrix':
+        weights = args[0]
+        return int(sum(1 for row in weights for val in row if val is not None))
+    elif method == '_load_from_sparse':
+        return args[0].nnz
+
+    Global._warning('estimate(): the number of synapses created by', method, 'can not be predicted, assuming all-to-all connectivity.')
+    return pre_size * post_size
+
+def _projection_cost(proj, nb_synapses, precision, spike_proba):
+    "Memory, growth, flops and traffic of a projection."
+    post_size = proj.post.size
+
+    # Shared projections only store the kernel and the coordinates of the receptive fields
+    if getattr(proj, 'connector_name', None) == "Pooling" or getattr(proj, '_operation_type', None) in ['convolve', 'copy']:
+        kernel = getattr(proj, 'weights', None)
+        nb_bytes = (np.array(kernel).size * precision if kernel is not None else 0) + post_size * (proj.pre.dimension * 4 + _VECTOR_BYTES)
+        return nb_bytes, 0, 2 * nb_synapses, nb_synapses * (4 + precision)
+
+    desc = proj.synapse_type.description
+    csr = proj._storage_format == "csr"
+
+    # Connectivity
+    if csr:
+        nb_bytes = (post_size + 1) * 4 + nb_synapses * 4
+    elif proj._shared_connectivity is not None:
+        nb_bytes = 2 * 8 # references to the ranks of the original projection
+    else:
+        nb_bytes = post_size * (4 + _VECTOR_BYTES) + nb_synapses * 4
+
+    # Synaptic attributes
+    local_attr = _attributes(desc, 'local')
+    if proj._has_single_weight() and 'w' in local_attr:
+        local_attr.remove('w')
+        nb_bytes += precision
+
+    # Traces depending only on the pre- or post-synaptic spikes are stored once per neuron
+    from ANNarchy.generator.Utils import neuron_traces
+    for name, side in neuron_traces(proj).items():
+        if name in local_attr:
+            local_attr.remove(name)
+            nb_bytes += (proj.pre.size if side == 'pre' else post_size) * precision
+    nb_bytes += len(local_attr) * (nb_synapses * precision + (0 if csr else post_size * _VECTOR_BYTES))
+    nb_bytes += len(_attributes(desc, 'semiglobal')) * post_size * precision
+    nb_bytes += len(_attributes(desc, 'global')) * precision
+
+    # Non-uniform delays are stored for each synapse
+    if proj.uniform_delay == -1 and proj.max_delay > 0:
+        nb_bytes += nb_synapses * 4 + (0 if csr else post_size * _VECTOR_BYTES)
+
+    # Spiking synapses also store the inverse connectivity (pre-synaptic rank -> synapses)
+    if desc['type'] == 'spike':
+        nb_bytes += nb_synapses * 8 + proj.pre.size * (_MAP_NODE_BYTES + _VECTOR_BYTES)
+
+    # Transmission
+    weight = 0 if proj._has_single_weight() else precision
+    if desc['type'] == 'spike':
+        events = nb_synapses * spike_proba
+        flops = events * max(1, _nb_operations(desc.get('raw_pre_spike')))
+        traffic = events * (4 + weight + precision)
+        if desc.get('raw_post_spike'):
+            flops += nb_synapses * spike_proba * _nb_operations(desc['raw_post_spike'])
+            traffic += nb_synapses * spike_proba * (4 + weight)
+    else:
+        flops = nb_synapses * (1 + _nb_operations(desc.get('raw_psp')))
+        traffic = nb_synapses * (4 + weight + precision) + post_size * precision
+
+    # Synaptic plasticity (event-driven variables are only updated at spike times)
+    local_eqs = [var for var in desc['variables'] if var['locality'] == 'local' and not 'event-driven' in var['flags']]
+    flops += nb_synapses * sum(_nb_operations(var['eq']) for var in local_eqs)
+    traffic += nb_synapses * len(local_eqs) * 2 * precision
+    semiglobal_eqs = [var for var in desc['variables'] if var['locality'] == 'semiglobal']
+    flops += post_size * sum(_nb_operations(var['eq']) for var in semiglobal_eqs)
+
+    return nb_bytes, 0, flops, traffic
+
+def _monitor_cost(mon, synapses, precision, spike_proba):
+    "Number of recorded values per step, memory, growth, flops and traffic of a monitor."
+    from .Projection import Projection
+    from .Dendrite import Dendrite
+    from .Monitor import REDUCE_NONE, REDUCE_HIST, REDUCE_QUANTILES
+
+    obj = mon.object
+    if isinstance(obj, Projection):
+        values = synapses.get(obj, 0) * len(mon.variables)
+    elif isinstance(obj, Dendrite):
+        values = synapses.get(obj.proj, 0) / max(1, obj.proj.post.size) * len(mon.variables)
+    else:
+        values = 0
+        for var in mon.variables:
+            if var == 'spike':
+                # spike times are stored as long int
+                values += obj.size * spike_proba * 8.0 / precision
+            elif var in obj.neuron_type.description['global']:
+                values += 1
+            else:
+                values += obj.size
+
+    records_per_second = 1000.0 / mon._period
+    if mon._reduce_code == REDUCE_HIST: # one count per bin
+        growth = records_per_second * 8 * int(mon._reduce_args[0]) * len(mon.variables)
+    elif mon._reduce_code == REDUCE_QUANTILES:
+        growth = records_per_second * 8 * len(mon._reduce_args) * len(mon.variables)
+    elif mon._reduce_code != REDUCE_NONE: # single statistic
+        growth = records_per_second * 8 * len(mon.variables)
+    else:
+        growth = records_per_second * values * precision
+    if mon._window is not None:
+        # ring buffer of fixed size
+        return values, 2 * mon._window / mon._period * values * precision, 0, 0, values * precision
+
+    return values, 0, growth, 0, values * precision
@@ -22,6 +22,7 @@
 #
 #===============================================================================
 import sys, os
+import json
 import traceback
 import numpy as np
 
@@ -41,7 +42,8 @@ _network = [
         'monitors': [],
         'instance': None,
         'compiled': False,
-        'directory': os.getcwd() + "/annarchy/"
+        'directory': os.getcwd() + "/annarchy/",
+        'timings': {}
     },
 ]
 # Configuration
@@ -411,7 +413,8 @@ def _add_network():
             'monitors': [],
             'instance': None,
             'compiled': False,
-            'directory': os.getcwd() + "/annarchy/"
+            'directory': os.getcwd() + "/annarchy/",
+            'timings': {}
         }
     )
 
@@ -575,6 +578,21 @@ def include_path():
 
     return paths
 
+def _load_user_config():
+    """
+    Returns the user-defined configuration stored in ``~/.config/ANNarchy/annarchy.json``, or the default compiler settings if the file does not exist.
+    """
+    user_config = {
+        'openmp': {
+            'compiler': 'clang++' if sys.platform == "darwin" else 'g++',
+            'flags' : "-march=native -O2",
+        }
+    }
+    if os.path.exists(os.path.expanduser('~/.config/ANNarchy/annarchy.json')):
+        with open(os.path.expanduser('~/.config/ANNarchy/annarchy.json'), 'r') as rfile:
+            user_config = json.load(rfile)
+    return user_config
+
 
 ################################
 ## Printing
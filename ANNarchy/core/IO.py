@@ -495,6 +495,95 @@ def load(filename, populations=True, projections=True, net_id=0):
                 proj._load_proj_data(desc[proj.name])
 
 
+def save_state(filename, net_id=0):
+    """
+    Saves the complete state of a compiled network into a binary checkpoint file.
+
+    Contrary to ``save()``, the data is written directly by the C++ core and contains everything needed to continue the simulation exactly as it would have run: parameters and variables, connectivity and synaptic variables, delay queues, spike history (``last_spike``, timestamps of event-driven synapses), the state of the random number generators and the current time.
+
+    * If the file name ends with '.gz', the checkpoint is compressed using gzip.
+
+    *Parameters*:
+
+    * **filename**: filename, may contain relative or absolute path.
+
+    Example::
+
+        simulate(1000.)
+        save_state('checkpoint.state')
+        ...
+        load_state('checkpoint.state') # continues at t = 1000 ms
+
+    .. note::
+
+        The checkpoint can only be restored into the same network (same populations and projections), e.g. after the script was restarted. Recorded data (monitors) is not part of the checkpoint.
+    """
+    if not Global._network[net_id]['compiled']:
+        Global._error('save_state(): the network is not compiled yet.')
+        return
+
+    if not Global._check_paradigm('openmp'):
+        Global._error('save_state(): checkpoints are only available for the openMP paradigm.')
+        return
+
+    # Check if the repertory exist
+    (path, fname) = os.path.split(filename)
+    if not path == '':
+        if not os.path.isdir(path):
+            Global._print('Creating folder', path)
+            os.mkdir(path)
+
+    if os.path.splitext(fname)[1] == '.gz':
+        import gzip, shutil
+        tmp_filename = filename + '.tmp'
+        Global._network[net_id]['instance'].save_state(tmp_filename)
+        with open(tmp_filename, 'rb') as r_file, gzip.open(filename, 'wb') as w_file:
+            shutil.copyfileobj(r_file, w_file)
+        os.remove(tmp_filename)
+    else:
+        Global._network[net_id]['instance'].save_state(filename)
+
+def load_state(filename, net_id=0):
+    """
+    Restores the complete state of the network from a checkpoint file created with ``save_state()``.
+
+    *Parameters*:
+
+    * **filename**: filename, may contain relative or absolute path.
+    """
+    if not Global._network[net_id]['compiled']:
+        Global._error('load_state(): the network is not compiled yet.')
+        return
+
+    if not Global._check_paradigm('openmp'):
+        Global._error('load_state(): checkpoints are only available for the openMP paradigm.')
+        return
+
+    if not os.path.isfile(filename):
+        Global._error('load_state(): the file', filename, 'does not exist.')
+        return
+
+    if os.path.splitext(filename)[1] == '.gz':
+        import gzip, shutil
+        tmp_filename = filename + '.tmp'
+        with gzip.open(filename, 'rb') as r_file, open(tmp_filename, 'wb') as w_file:
+            shutil.copyfileobj(r_file, w_file)
+        res = Global._network[net_id]['instance'].load_state(tmp_filename)
+        os.remove(tmp_filename)
+    else:
+        res = Global._network[net_id]['instance'].load_state(filename)
+
+    if res == -1:
+        Global._error('load_state(): ' + filename + ' is not a valid checkpoint file.')
+    elif res > 0:
+        objects = Global._network[net_id]['populations'] + Global._network[net_id]['projections']
+        Global._error('load_state(): the checkpoint does not match the network, the state of ' + objects[res-1].name + ' could not be restored.')
+
+    # The connectivity may have been changed by structural plasticity
+    for proj in Global._network[net_id]['projections']:
+        if proj.initialized and hasattr(proj.cyInstance, 'post_rank'):
+            proj.post_ranks = proj.cyInstance.post_rank()
+
 def _net_description(populations, projections, net_id=0):
     """
     Returns a dictionary containing the requested network data.
@@ -529,3 +618,91 @@ def _net_description(populations, projections, net_id=0):
     }
 
     return network_desc
+
+# Binary connectivity files (Projection.save_connectivity / connect_from_file)
+_BINARY_MAGIC = b'ANNBIN01'
+_BINARY_ALIGNMENT = 64
+
+def _is_binary_file(filename):
+    """
+    Returns True if *filename* starts with the magic number of the binary format.
+    """
+    try:
+        with open(filename, mode='rb') as r_file:
+            return r_file.read(len(_BINARY_MAGIC)) == _BINARY_MAGIC
+    except IOError:
+        return False
+
+def _create_binary_file(filename, header, arrays):
+    """
+    Creates a binary file made of a small JSON header followed by flat arrays and
+    returns writable memory maps onto these arrays, so that the data can be copied
+    by the C++ core directly into the file.
+
+    *Parameters:*
+
+    * **filename**: path to the file.
+    * **header**: dictionary of scalar values (must be JSON serializable).
+    * **arrays**: list of (name, dtype, size) tuples.
+
+    Layout: magic number (8 bytes), length of the header (uint64), the JSON header
+    and the arrays, each one starting at an offset aligned to 64 bytes.
+    """
+    import json
+
+    # Compute the offsets: the header size depends on the offsets, so we iterate
+    # until the JSON description fits before the first array.
+    desc = dict(header)
+    start = 0
+    while True:
+        offset = start
+        desc['arrays'] = {}
+        for name, dtype, size in arrays:
+            desc['arrays'][name] = {'dtype': np.dtype(dtype).str, 'size': int(size), 'offset': offset}
+            offset += int(size) * np.dtype(dtype).itemsize
+            offset += (-offset) % _BINARY_ALIGNMENT
+        encoded = json.dumps(desc).encode('utf-8')
+        min_start = len(_BINARY_MAGIC) + 8 + len(encoded)
+        min_start += (-min_start) % _BINARY_ALIGNMENT
+        if min_start <= start:
+            break
+        start = min_start
+
+    # Header
+    with open(filename, mode='wb') as w_file:
+        w_file.write(_BINARY_MAGIC)
+        w_file.write(np.uint64(len(encoded)).tobytes())
+        w_file.write(encoded)
+        w_file.truncate(max(offset, start))
+
+    # Memory maps onto the arrays
+    data = {}
+    for name, dtype, size in arrays:
+        if size == 0:
+            data[name] = np.zeros(0, dtype=dtype)
+        else:
+            data[name] = np.memmap(filename, dtype=dtype, mode='r+', offset=desc['arrays'][name]['offset'], shape=(int(size),))
+    return data
+
+def _open_binary_file(filename):
+    """
+    Opens a file created with _create_binary_file() and returns the header
+    together with read-only memory maps onto the stored arrays (nothing is
+    read from disk until the arrays are accessed).
+    """
+    import json
+
+    with open(filename, mode='rb') as r_file:
+        if r_file.read(len(_BINARY_MAGIC)) != _BINARY_MAGIC:
+            Global._error('The file', filename, 'is not a valid ANNarchy binary file.')
+            return None, None
+        length = int(np.frombuffer(r_file.read(8), dtype=np.uint64)[0])
+        header = json.loads(r_file.read(length).decode('utf-8'))
+
+    data = {}
+    for name, desc in header.pop('arrays').items():
+        if desc['size'] == 0:
+            data[name] = np.zeros(0, dtype=desc['dtype'])
+        else:
+            data[name] = np.memmap(filename, dtype=desc['dtype'], mode='r', offset=desc['offset'], shape=(desc['size'],))
+    return header, data
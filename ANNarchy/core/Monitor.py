@@ -31,12 +31,23 @@ import numpy as np
 import re
 import sys
 
+# Codes of the reductions computed by the C++ recorders (see Monitor::reduce() in MonitorTemplate)
+REDUCE_NONE = 0
+REDUCE_MEAN = 1
+REDUCE_STD = 2
+REDUCE_SUM = 3
+REDUCE_MIN = 4
+REDUCE_MAX = 5
+REDUCE_HIST = 6
+REDUCE_QUANTILES = 7
+REDUCE_COUNT = 8
+
 class Monitor(object):
     """
     Monitoring class allowing to record easily parameters or variables from Population, PopulationView and Dendrite objects.
     """
 
-    def __init__(self, obj, variables=[], period=None, period_offset=None, start=True, net_id=0):
+    def __init__(self, obj, variables=[], period=None, period_offset=None, start=True, net_id=0, reduce=None, window=None):
         """
         *Parameters*:
 
@@ -50,6 +61,10 @@ class Monitor(object):
 
         * **start**: defines if the recording should start immediately (default: True). If not, you should later start the recordings with the ``start()`` method.
 
+        * **reduce**: statistic computed over the recorded neurons at each recording instead of storing the individual values (only for Population(View) objects, default: None). One of ``'mean'``, ``'std'``, ``'sum'``, ``'min'``, ``'max'``, ``'hist(bins, min, max)'`` or ``'quantiles'`` (quartiles, or ``'quantiles(0.1, 0.9)'`` for specific quantiles). The ``spike`` variable requires ``'count'``, which records the number of spikes emitted at each step. Global variables are recorded unchanged.
+
+        * **window**: duration in ms of the most recent period which is kept in memory (default: None, everything is kept until ``get()`` is called). The recordings are stored in a fixed circular buffer, from which ``get(keep=True)`` copies the last recordings in a single block without emptying it. For projections, the values of all recorded dendrites are concatenated.
+
         Example::
 
             m = Monitor(pop, ['g_exc', 'v', 'spike'], period=10.0)
@@ -58,6 +73,19 @@ class Monitor(object):
 
             m = Monitor(pop, ['sum(exc)', 'r'])
 
+        When only population statistics are needed, the reduction can be performed during the simulation::
+
+            m = Monitor(pop, 'v', reduce='mean')
+            simulate(100.0)
+            v_mean = m.get('v') # shape (1000,)
+
+        For closed-loop experiments, only the last recordings can be kept::
+
+            m = Monitor(pop, 'r', window=500.0)
+            for trial in range(100):
+                simulate(100.0)
+                r = m.get('r', keep=True) # last 500 ms, shape (5000, pop.size)
+
         """
         # Object to record (Population, PopulationView, Dendrite)
         self.object = obj
@@ -96,6 +124,18 @@ class Monitor(object):
             else:
                 self._period_offset = period_offset
 
+        # Reduction over the recorded neurons
+        self._reduce = reduce
+        self._reduce_code, self._reduce_args = self._parse_reduce(reduce)
+
+        # Circular buffer
+        self._window = window
+        if window is not None:
+            if Global.config['paradigm'] != "openmp":
+                Global._error('Monitor: recording windows are only available for the openMP paradigm.')
+            if window < self._period:
+                Global._error('Monitor: the window must be longer than the period of recording.')
+
         # Warn users when recording projections
         if isinstance(self.object, Projection) and self._period == Global.config['dt']:
             Global._warning('Monitor(): it is a bad idea to record synaptic variables of a projection at each time step!')
@@ -162,6 +202,46 @@ class Monitor(object):
             self.cyInstance.clear()
 
 
+    def _parse_reduce(self, reduce):
+        "Returns the code of the reduction used by the C++ recorder (see Monitor::reduce()) and its arguments."
+        if reduce is None:
+            return REDUCE_NONE, []
+
+        if not isinstance(self.object, (Population, PopulationView)):
+            Global._error('Monitor: reductions are only possible for Population or PopulationView objects.')
+        if Global.config['paradigm'] != "openmp":
+            Global._error('Monitor: reductions are only available for the openMP paradigm.')
+
+        if 'spike' in self.variables:
+            if reduce != 'count':
+                Global._error("Monitor: the spike variable can only be reduced with reduce='count'.")
+            if len(self.variables) > 1:
+                Global._error("Monitor: spikes reduced with 'count' must be recorded in a separate monitor.")
+            return REDUCE_COUNT, []
+
+        codes = {'mean': REDUCE_MEAN, 'std': REDUCE_STD, 'sum': REDUCE_SUM, 'min': REDUCE_MIN, 'max': REDUCE_MAX}
+        if reduce in codes.keys():
+            return codes[reduce], []
+
+        name = reduce.split('(')[0].strip()
+        try:
+            args = [float(arg) for arg in re.findall(r"\((.*)\)", reduce)[0].split(',')] if '(' in reduce else []
+        except (IndexError, ValueError):
+            Global._error('Monitor: the arguments of the reduction', reduce, 'must be numbers.')
+
+        if name == 'hist':
+            if len(args) != 3 or args[0] < 1 or args[2] <= args[1]:
+                Global._error("Monitor: histograms are defined by reduce='hist(bins, min, max)', e.g. 'hist(20, -80.0, 40.0)'.")
+            return REDUCE_HIST, args
+        elif name == 'quantiles':
+            if args == []:
+                args = [0.0, 0.25, 0.5, 0.75, 1.0]
+            if any([q < 0.0 or q > 1.0 for q in args]):
+                Global._error('Monitor: quantiles must be between 0 and 1.')
+            return REDUCE_QUANTILES, args
+
+        Global._error('Monitor: unknown reduction', reduce)
+
     def _add_variable(self, var):
         if not var in self.variables:
             self.variables.append(var)
@@ -190,6 +270,11 @@ class Monitor(object):
         period_offset = int(self._period_offset/Global.config['dt'])
         offset = Global.get_current_step(self.net_id) % period
         self.cyInstance = getattr(Global._network[self.net_id]['instance'], 'PopRecorder'+str(self.object.id)+'_wrapper')(self.ranks, period, period_offset, offset)
+        if self._reduce is not None:
+            self.cyInstance.reduce = self._reduce_code
+            self.cyInstance.reduce_args = self._reduce_args
+        if self._window is not None:
+            self.cyInstance.window = int(self._window/Global.config['dt'])
         Global._network[self.net_id]['instance'].add_recorder(self.cyInstance)
 
         for var in self.variables:
@@ -218,6 +303,8 @@ class Monitor(object):
 
         # Create the wrapper
         self.cyInstance = getattr(Global._network[self.net_id]['instance'], 'ProjRecorder'+str(proj_id)+'_wrapper')(self.idx, period, period_offset, offset)
+        if self._window is not None:
+            self.cyInstance.window = int(self._window/Global.config['dt'])
 
         # Add the monitor to the network
         Global._network[self.net_id]['instance'].add_recorder(self.cyInstance)
@@ -365,7 +452,7 @@ class Monitor(object):
         """
 
         def reshape_recording(self, data):
-            if not reshape:
+            if not reshape or self._reduce is not None:
                 return data
             else:
                 return data.reshape((data.shape[0],) + self.object.geometry)
@@ -420,6 +507,10 @@ class Monitor(object):
 
 
     def _get_population(self, pop, name, keep):
+        if self._reduce is not None and (name == 'spike' or name.startswith('_sum_') or name in pop.neuron_type.description['local']):
+            return self._get_reduced(name, keep)
+        if self._window is not None and name != 'spike':
+            return self._get_window(name, keep)
         try:
             data = getattr(self.cyInstance, name)
             if not keep:
@@ -427,12 +518,42 @@ class Monitor(object):
         except:
             data = []
 
+        if name == 'spike' and self._window is not None:
+            # the C++ recorder only forgets old spikes from time to time
+            first_step = Global.get_current_step(self.net_id) - self.cyInstance.window
+            data = {n: [t for t in times if t >= first_step] for n, times in data.items()}
+
         if name is not 'spike':
             return np.array(data)
         else:
             return data
 
+    def _get_reduced(self, name, keep):
+        "Reduced recordings have one value per recording for mean/std/sum/min/max/count."
+        if self._window is not None:
+            data = self._get_window(name, keep)
+        else:
+            try:
+                data = np.array(getattr(self.cyInstance, name + '_reduced'))
+                if not keep:
+                    getattr(self.cyInstance, 'clear_' + name + '_reduced')()
+            except:
+                data = np.array([])
+
+        if self._reduce_code in [REDUCE_HIST, REDUCE_QUANTILES]:
+            return data
+        return data.reshape(data.shape[0])
+
+    def _get_window(self, name, keep):
+        "The recordings are copied from the circular buffer, which is emptied unless keep is True."
+        data = self.cyInstance.get_window(name)
+        if not keep:
+            self.cyInstance.clear_window(name)
+        return data
+
     def _get_dendrite(self, proj, name, keep):
+        if self._window is not None:
+            return self._get_window(name, keep)
         try:
             data = getattr(self.cyInstance, name)
             if not keep:
@@ -491,6 +612,8 @@ class Monitor(object):
         times = []; ranks=[]
         if not 'spike' in self.variables:
             Global._error('Monitor: spike was not recorded')
+        if self._reduce is not None:
+            Global._error("Monitor: the spikes were reduced to counts, use get('spike') instead.")
 
         # Get data
         if not spikes:
@@ -536,6 +659,8 @@ class Monitor(object):
         """
         if not 'spike' in self.variables:
             Global._error('Monitor: spike was not recorded')
+        if self._reduce is not None:
+            Global._error("Monitor: the spikes were reduced to counts, use get('spike') instead.")
 
         # Get data
         if not spikes:
@@ -591,6 +716,8 @@ class Monitor(object):
         """
         if not 'spike' in self.variables:
             Global._error('Monitor: spike was not recorded')
+        if self._reduce is not None:
+            Global._error("Monitor: the spikes were reduced to counts, use get('spike') instead.")
 
         # Get data
         if not spikes:
@@ -637,6 +764,8 @@ class Monitor(object):
         """
         if not 'spike' in self.variables:
             Global._error('Monitor: spike was not recorded')
+        if self._reduce is not None:
+            Global._error("Monitor: the spikes were reduced to counts, use get('spike') instead.")
 
         # Get data
         if not spikes:
@@ -681,6 +810,8 @@ class Monitor(object):
         """
         if not 'spike' in self.variables:
             Global._error('Monitor: spike was not recorded')
+        if self._reduce is not None:
+            Global._error("Monitor: the spikes were reduced to counts, use get('spike') instead.")
 
         # Get data
         if not spikes:
@@ -170,6 +170,7 @@ class Network(object):
             pop.name = obj.name
             pop.class_name = obj.class_name
             pop.init = obj.init
+            pop._schedules = dict(obj._schedules)
             pop.enabled = obj.enabled
             if not obj.enabled: # Also copy the enabled state:
                 pop.disable()
@@ -206,9 +207,10 @@ class Network(object):
             proj.id = obj.id
             proj.name = obj.name
             proj.init = obj.init
+            proj._schedules = dict(obj._schedules)
 
             # Copy the synapses if they are already created
-            proj._store_connectivity(obj._connection_method, obj._connection_args, obj._connection_delay, obj._storage_format)
+            proj._store_connectivity(obj._connection_method, obj._connection_args, obj._connection_delay, obj._storage_format, seed=obj._connection_seed)
 
             # Add the copy to the local network
             Global._network[self.id]['projections'].append(proj)
@@ -228,7 +230,7 @@ class Network(object):
                 except:
                     pass
             # Create a copy of the monitor
-            m = Monitor(obj.object, variables=obj.variables, period=obj._period, start=obj._start, net_id=self.id)
+            m = Monitor(obj.object, variables=obj.variables, period=obj._period, start=obj._start, net_id=self.id, reduce=obj._reduce, window=obj._window)
 
             # there is a bad mismatch between object ids:
             #
@@ -500,6 +502,26 @@ class Network(object):
         """
         IO.save(filename, populations, projections, self.id)
 
+    def save_state(self, filename):
+        """
+        Saves a checkpoint of the network by calling ANNarchy.core.IO.save_state().
+
+        *Parameters*:
+
+        * **filename**: filename, may contain relative or absolute path.
+        """
+        IO.save_state(filename, self.id)
+
+    def load_state(self, filename):
+        """
+        Restores a checkpoint of the network by calling ANNarchy.core.IO.load_state().
+
+        *Parameters*:
+
+        * **filename**: filename, may contain relative or absolute path.
+        """
+        IO.load_state(filename, self.id)
+
 def parallel_run(method, networks=None, number=0, max_processes=-1, measure_time=False, sequential=False, same_seed=False, **args):
     """
     Allows to run multiple networks in parallel using multiprocessing.
@@ -22,7 +22,6 @@
 #
 #===============================================================================
 from ANNarchy.core.Global import _error, _warning, _objects
-from ANNarchy.parser.AnalyseNeuron import analyse_neuron
 from ANNarchy.core.PopulationView import PopulationView
 import numpy as np
 
@@ -83,6 +82,7 @@ class Neuron(object):
     def _analyse(self):
         # Analyse the neuron type
         if not self.description:
+            from ANNarchy.parser.AnalyseNeuron import analyse_neuron
             self.description = analyse_neuron(self)
 
     def __repr__(self):
@@ -174,6 +174,9 @@ class Population(object):
         # Recorded variables
         self._monitor = None
 
+        # Input schedules: name -> (steps, values)
+        self._schedules = {}
+
         # Is overwritten by SpecificPopulations
         self._specific_template = {}
 
@@ -230,6 +233,10 @@ class Population(object):
         if self.neuron_type.type == 'spike':
             getattr(self.cyInstance, 'compute_firing_rate')(self._compute_mean_fr)
 
+        # Input schedules
+        for name, (steps, values) in self._schedules.items():
+            getattr(self.cyInstance, 'set_schedule_'+name)(steps, values)
+
     def size_in_bytes(self):
         """
         Returns the size of allocated memory on the C++ side. Please note that this does not contain monitored data and works only if compile() was invoked.
@@ -394,6 +401,35 @@ class Population(object):
             err_msg = """Population.set(): either the variable '%(attr)s' does not exist in the population '%(pop)s', or the provided array does not have the right size."""
             Global._error(err_msg  % { 'attr': attribute, 'pop': self.name } )
 
+    def view(self, name, writable=False):
+        """
+        Returns a NumPy array sharing its memory with the C++ vector of a local attribute, without copying it.
+
+        Contrary to ``pop.r``, which copies the data each time, the view always reflects the current values: it can be retrieved once after ``compile()`` and read after each call to ``simulate()``. Call ``copy()`` on it to keep the values of a given time step. Only numerical local attributes of CPU simulations can be viewed.
+
+        Example::
+
+            rates = pop.view('r')
+            for trial in range(100):
+                simulate(10.0)
+                control(rates.mean())
+
+        *Parameters*:
+
+        * **name**: name of the local parameter or variable.
+        * **writable**: if True, values written into the array are directly used by the simulation (default: False, the array is read-only).
+        """
+        if not self.initialized:
+            Global._error('Population.view(): the network must be compiled first.')
+        if not name in self.neuron_type.description['local']:
+            Global._error('Population.view(): ' + name + ' is not a local attribute of the population ' + self.name + '.')
+        if not hasattr(self.cyInstance, 'view_' + name):
+            Global._error('Population.view(): the attribute ' + name + ' of the population ' + self.name + ' can not be accessed without copy (only numerical attributes are supported with the openMP paradigm).')
+
+        data = getattr(self.cyInstance, 'view_' + name)().reshape(self.geometry)
+        data.flags.writeable = writable
+        return data
+
     def __len__(self):
         """
         Number of neurons in the population.
@@ -531,6 +567,65 @@ class Population(object):
         if self.initialized:
             getattr(self.cyInstance, 'compute_firing_rate')(self._compute_mean_fr)
 
+    ################################
+    ## Input schedules
+    ################################
+    def schedule(self, name, times, values):
+        """
+        Assigns a sequence of values to a parameter or variable at the given times.
+
+        The schedule is stored in the generated code and the values are assigned at the beginning of the corresponding simulation steps, so ``simulate()`` runs in a single call instead of being split by ``@every`` callbacks.
+
+        Example::
+
+            pop.schedule('I', times=[100., 200., 300.], values=[1.0, 0.0, 0.5])
+            simulate(500.)
+
+        The code applying the schedule is generated by ``compile()``: the attribute must be scheduled once before compilation. Calling the method again after compilation replaces its schedule, the times already elapsed being ignored. If the time is set backwards (``reset()``, ``set_time()``), the schedule is applied again from the new time.
+
+        This method is not available on CUDA yet.
+
+        *Parameters*:
+
+        * **name**: name of the parameter or variable.
+        * **times**: increasing list of times in ms.
+        * **values**: list of values, one per time. For a local attribute, each value is either a single value for all neurons or an array with the size or geometry of the population.
+        """
+        if Global._check_paradigm('cuda'):
+            Global._error('schedule() is not supported on CUDA yet.')
+
+        if not name in self.attributes:
+            Global._error('Population.schedule():', name, 'is not an attribute of the population', self.name)
+
+        if len(times) != len(values):
+            Global._error('Population.schedule(): times and values must have the same length.')
+
+        steps = np.round(np.array(times, dtype=float) / Global.config['dt']).astype(np.int64)
+        if np.any(np.diff(steps) < 0):
+            Global._error('Population.schedule(): the times must be increasing.')
+
+        # One array per change for local attributes
+        if name in self.neuron_type.description['local']:
+            data = []
+            for value in values:
+                value = np.array(value)
+                if value.size == 1:
+                    data.append(np.full(self.size, value.item()))
+                elif value.size == self.size:
+                    data.append(value.reshape(self.size))
+                else:
+                    Global._error('Population.schedule(): the values of', name, 'must be single values or have the size of the population', self.size)
+            values = data
+        else:
+            values = list(values)
+
+        if self.initialized:
+            if not hasattr(self.cyInstance, 'set_schedule_'+name):
+                Global._error('Population.schedule():', name, 'was not scheduled before compile(), its schedule can not be generated anymore.')
+            getattr(self.cyInstance, 'set_schedule_'+name)(steps, values)
+
+        self._schedules[name] = (steps, values)
+
     ################################
     ## Access to individual neurons
     ################################
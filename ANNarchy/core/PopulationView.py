@@ -41,6 +41,9 @@ class PopulationView(object):
         self.ranks = ranks
         self.size = len(self.ranks)
 
+        # Contiguous copy of the ranks passed to the indexed accessors of the C++ core
+        self._ranks_buffer = np.ascontiguousarray(self.ranks, dtype=np.int32).reshape(-1)
+
         # For people using Individual neuron
         if self.size == 1:
             self.rank = self.ranks[0]
@@ -143,6 +146,8 @@ class PopulationView(object):
             * *name*: name of the parameter/variable.
         """
         if name in self.population.attributes:
+            if self.population.initialized and hasattr(self.population.cyInstance, 'get_indexed_'+name):
+                return getattr(self.population.cyInstance, 'get_indexed_'+name)(self._ranks_buffer)
             all_val = getattr(self.population, name).reshape(self.population.size)
             return all_val[self.ranks]
         else:
@@ -184,6 +189,13 @@ class PopulationView(object):
             else:
                 getattr(self.population.cyInstance, 'set_single_'+name)(rank, value)
 
+        def _set_indexed(name, values):
+            "Sets the values of all neurons of the view in a single call. Returns False if the accessor is not available."
+            if not self.population.initialized or not hasattr(self.population.cyInstance, 'set_indexed_'+name):
+                return False
+            getattr(self.population.cyInstance, 'set_indexed_'+name)(self._ranks_buffer, np.ascontiguousarray(values, dtype=self._attribute_dtype(name)))
+            return True
+
         for val_key in value.keys():
             if hasattr(self.population, val_key):
                 # Check the value
@@ -197,8 +209,9 @@ class PopulationView(object):
                         Global._error("Global attributes can only have one value in a population.")
                         return None
                     # Assign the value
-                    for idx, rk in enumerate(self.ranks):
-                        _set_single(val_key, rk, value[val_key][idx])
+                    if not _set_indexed(val_key, value[val_key]):
+                        for idx, rk in enumerate(self.ranks):
+                            _set_single(val_key, rk, value[val_key][idx])
 
                 elif isinstance(value[val_key], list): # list
                     if len(value[val_key]) != self.size:
@@ -208,16 +221,26 @@ class PopulationView(object):
                         Global._error("Global attributes can only have one value in a population.")
                         return None
                     # Assign the value
-                    for idx, rk in enumerate(self.ranks):
-                        _set_single(val_key, rk, value[val_key][idx])
+                    if not _set_indexed(val_key, value[val_key]):
+                        for idx, rk in enumerate(self.ranks):
+                            _set_single(val_key, rk, value[val_key][idx])
 
                 else: # single value
+                    if val_key in self.population.neuron_type.description['local'] and _set_indexed(val_key, np.full(self.size, value[val_key])):
+                        continue
                     for rk in self.ranks:
                         _set_single(val_key, rk, value[val_key])
             else:
                 Global._error("the population has no attribute called ", val_key)
                 return None
 
+    def _attribute_dtype(self, name):
+        "NumPy type corresponding to the C++ type of the attribute."
+        for attr in self.population.neuron_type.description['parameters'] + self.population.neuron_type.description['variables']:
+            if attr['name'] == name:
+                return {'double': np.float64, 'float': np.float32, 'int': np.int32, 'bool': np.bool_}.get(attr['ctype'], None)
+        return None
+
     ################################
     ## Access to weighted sums
     ################################
@@ -0,0 +1,95 @@
+#===============================================================================
+#
+#     Profiler.py
+#
+#     This file is part of ANNarchy.
+#
+#     Copyright (C) 2013-2016  Julien Vitay <julien.vitay@gmail.com>,
+#     Helge Uelo Dinkelbach <helge.dinkelbach@gmail.com>
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     ANNarchy is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#===============================================================================
+import numpy as np
+
+import ANNarchy.core.Global as Global
+
+def _profiler(net_id, caller):
+    "Returns the Cython module of the network if it was compiled with profiling."
+    if not Global._network[net_id]['compiled']:
+        Global._error(caller + '(): the network is not compiled yet.')
+
+    if not Global.config['profiling'] or not Global._check_paradigm('openmp'):
+        Global._error(caller + '(): the network must be compiled with compile(profile_enabled=True) using the openMP paradigm.')
+
+    return Global._network[net_id]['instance']
+
+def get_profile(net_id=0):
+    """
+    Returns the timings measured since the compilation (or the last call to ``reset_profile()``) for each object and each phase of the simulation step.
+
+    The network has to be compiled with ``compile(profile_enabled=True)``. The samples are not stored: only their number, mean, standard deviation, minimum, maximum and a histogram on a logarithmic scale are updated during the simulation.
+
+    The result is a dictionary of columns which can be passed directly to ``pandas.DataFrame``:
+
+    * **type**: 'net' for the whole network, 'pop' for populations or 'proj' for projections.
+    * **name**: name of the object ('network' for the whole network).
+    * **function**: measured phase: 'step' (whole step, neural or synaptic update), 'psp' (synaptic transmission), 'neur_step', 'proj_step', 'rng' (random numbers), 'gops' (global operations such as mean(r)) or 'record'.
+    * **label**: description of the object.
+    * **count**: number of measurements.
+    * **mean**, **std**, **min**, **max**, **total**: statistics of the measurements in microseconds.
+    * **histogram**: number of measurements in each of the 32 bins. The bin *k* contains the durations between 2**(k-10) and 2**(k-9) microseconds, the first and last bins also contain the smaller or larger ones.
+
+    Example::
+
+        compile(profile_enabled=True)
+        simulate(1000.0)
+        profile = get_profile()
+        slowest = np.argmax(profile['total'])
+        print(profile['name'][slowest], profile['function'][slowest])
+    """
+    instance = _profiler(net_id, 'get_profile')
+
+    descriptors = instance.profile_descriptors()
+    statistics = np.array(instance.profile_statistics(), dtype=np.float64).reshape((len(descriptors), 6))
+
+    return {
+        'type': [desc[0] for desc in descriptors],
+        'name': [desc[1] for desc in descriptors],
+        'function': [desc[2] for desc in descriptors],
+        'label': [desc[3] for desc in descriptors],
+        'count': statistics[:, 0].astype(np.int64),
+        'mean': statistics[:, 1],
+        'std': statistics[:, 2],
+        'min': statistics[:, 3],
+        'max': statistics[:, 4],
+        'total': statistics[:, 5],
+        'histogram': [np.array(histo, dtype=np.int64) for histo in instance.profile_histograms()]
+    }
+
+def reset_profile(net_id=0):
+    """
+    Clears the measurements of the profiler.
+    """
+    _profiler(net_id, 'reset_profile').profile_reset()
+
+def enable_profiling(enabled=True, net_id=0):
+    """
+    Enables or disables the measurements of the profiler during the simulation, without recompiling the network.
+
+    *Parameters*:
+
+    * **enabled**: if False, the next simulation steps are not measured (default: True).
+    """
+    _profiler(net_id, 'enable_profiling').profile_set_enabled(enabled)
@@ -22,7 +22,7 @@
 #
 #===============================================================================
 import numpy as np
-import math, os
+import math, os, random
 import copy, inspect
 
 from ANNarchy.core import Global
@@ -153,8 +153,12 @@ class Projection(object):
         self._connection_method = None
         self._connection_args = None
         self._connection_delay = None
+        self._connection_seed = None
         self._connector = None
 
+        # Projection whose connectivity is reused in the generated code (set by compile())
+        self._shared_connectivity = None
+
         # List of post ranks is full by default, will be changed when the weights are created
         self.post_ranks = list(range(self.post.size))
 
@@ -172,6 +176,9 @@ class Projection(object):
         self.connector_name = "Specific"
         self.connector_description = "Specific"
 
+        # Input schedules: name -> (steps, values)
+        self._schedules = {}
+
         # Overwritten by derived classes, to add
         # additional code
         self._specific_template = {}
@@ -205,6 +212,8 @@ class Projection(object):
     _load_from_sparse = ConnectorMethods._load_from_sparse
     connect_from_file = ConnectorMethods.connect_from_file
     _load_from_lil = ConnectorMethods._load_from_lil
+    _connect_from_binary_file = ConnectorMethods._connect_from_binary_file
+    _connectivity_key = ConnectorMethods._connectivity_key
 
     def _copy(self, pre, post):
         "Returns a copy of the projection when creating networks.  Internal use only."
@@ -227,6 +236,10 @@ class Projection(object):
             if not name in ['w']:
                 self.__setattr__(name, val)
 
+        # Input schedules
+        for name, (steps, values) in self._schedules.items():
+            getattr(self.cyInstance, 'set_schedule_'+name)(steps, values)
+
     def _connect(self, module):
         """
         Builds up dendrites either from list or dictionary. Called by instantiate().
@@ -235,23 +248,36 @@ class Projection(object):
             Global._error('The projection between ' + self.pre.name + ' and ' + self.post.name + ' is declared but not connected.')
 
         proj = getattr(module, 'proj'+str(self.id)+'_wrapper')
-        self.cyInstance = proj(self._connection_method(*((self.pre, self.post,) + self._connection_args)))
+        if self._connection_seed is None:
+            synapses = self._connection_method(*((self.pre, self.post,) + self._connection_args))
+        else:
+            # The connector draws from seeded generators, the random state of the script is restored afterwards
+            np_state, py_state = np.random.get_state(), random.getstate()
+            np.random.seed(self._connection_seed)
+            random.seed(self._connection_seed)
+            try:
+                synapses = self._connection_method(*((self.pre, self.post,) + self._connection_args))
+            finally:
+                np.random.set_state(np_state)
+                random.setstate(py_state)
+        self.cyInstance = proj(synapses)
 
         # Access the list of postsynaptic neurons
         self.post_ranks = self.cyInstance.post_rank()
 
 
-    def _store_connectivity(self, method, args, delay, storage_format="lil", storage_order="post_to_pre"):
+    def _store_connectivity(self, method, args, delay, storage_format="lil", storage_order="post_to_pre", seed=None):
         """
         Store connectivity data. This function is called from cython_ext.Connectors module.
         """
         if self._connection_method != None:
-            Global._warning("Projection ", self.proj.name, " was already connected ... data will be overwritten.")
+            Global._warning("Projection ", self.name, " was already connected ... data will be overwritten.")
 
         # Store connectivity pattern parameters
         self._connection_method = method
         self._connection_args = args
         self._connection_delay = delay
+        self._connection_seed = seed
         self._storage_format = storage_format
         self._storage_order = storage_order
 
@@ -344,7 +370,7 @@ class Projection(object):
         if self.cyInstance == None:
             Global._warning("Access 'nb_synapses' attribute of a Projection is only valid after compile()")
             return 0
-        return sum([self.cyInstance.nb_synapses(n) for n in range(self.size)])
+        return int(self._flat_row_ptr()[-1])
 
 
     @property
@@ -411,19 +437,42 @@ class Projection(object):
     ################################
     ## Access to attributes
     ################################
-    def get(self, name):
+    def get(self, name, flat=False):
         """
         Returns a list of parameters/variables values for each dendrite in the projection.
 
         The list will have the same length as the number of actual dendrites (self.size), so it can be smaller than the size of the postsynaptic population. Use self.post_ranks to indice it.
 
+        With ``flat=True``, the values of a local attribute are instead returned as a single 1D NumPy array with one element per synapse, in the storage order: the synapses of the first dendrite (``post_ranks[0]``) come first, in the order of their pre-synaptic ranks. The values of a semiglobal attribute are returned as a 1D array with one element per dendrite::
+
+            w = proj.get('w', flat=True)
+            proj.set({'w': np.clip(w + 0.1, 0.0, 1.0)}, flat=True)
+
         *Parameters*:
 
         * **name**: the name of the parameter or variable
+        * **flat**: if True, the values are returned as a flat NumPy array (default: False).
         """
-        return self.__getattr__(name)
+        if not flat:
+            return self.__getattr__(name)
+
+        if not self.initialized:
+            Global._error('Projection.get(): flat arrays can only be accessed after compilation.')
+
+        if name in self.synapse_type.description['local']:
+            nb_synapses = int(self._flat_row_ptr()[-1])
+            if name == "w" and self._has_single_weight():
+                return np.full(nb_synapses, self.cyInstance.get_w())
+            if hasattr(self.cyInstance, 'get_flat_'+name):
+                return getattr(self.cyInstance, 'get_flat_'+name)(nb_synapses)
+            values = [np.array(getattr(self.cyInstance, 'get_dendrite_'+name)(idx)) for idx in range(len(self.post_ranks))]
+            return np.concatenate(values) if len(values) > 0 else np.zeros(0)
+        elif name in self.synapse_type.description['semiglobal']:
+            return np.array(self.__getattr__(name))
+        else:
+            return self.__getattr__(name)
 
-    def set(self, value):
+    def set(self, value, flat=False):
         """
         Sets the parameters/variables values for each dendrite in the projection.
 
@@ -439,21 +488,22 @@ class Projection(object):
 
         * a list or 1D numpy array of the same length as the number of actual dendrites (self.size). The synapses of each postsynaptic neuron will take the same value.
 
-        .. warning::
-
-            It not possible to set different values to each synapse using this method. One should iterate over the dendrites::
+        With ``flat=True``, the values of local attributes can also be provided as a 1D array with one element per synapse (``proj.nb_synapses``), in the storage order returned by ``get(name, flat=True)``.
 
-                for dendrite in proj.dendrites:
-                    dendrite.w = np.ones(dendrite.size)
+        Single values and random distributions are written to all synapses at once by the C++ object.
 
         *Parameter*:
 
         * **value**: a dictionary with the name of the parameter/variable as key.
+        * **flat**: if True, arrays given for local attributes contain one value per synapse (default: False).
 
         """
 
         for name, val in value.items():
-            self.__setattr__(name, val)
+            if flat and name in self.synapse_type.description['local'] and isinstance(val, (list, np.ndarray)):
+                self._set_flat_cython_attribute(name, val)
+            else:
+                self.__setattr__(name, val)
 
     def __getattr__(self, name):
         " Method called when accessing an attribute."
@@ -508,6 +558,35 @@ class Projection(object):
         """
         return getattr(self.cyInstance, 'get_'+attribute)()
 
+    def view(self, name, writable=False):
+        """
+        Gives access to the C++ storage of an attribute without copying it.
+
+        For a local attribute (e.g. ``w``), a list with one NumPy array per post-synaptic neuron (in the order of ``post_ranks``) is returned. For a semiglobal attribute, a single array with one value per post-synaptic neuron is returned. Only numerical attributes of projections stored in the default LIL format on CPUs can be viewed.
+
+        The arrays always reflect the current values. They become invalid when synapses are created or pruned, or when a whole dendrite is assigned with a different number of synapses: ``view()`` has to be called again in these cases.
+
+        *Parameters*:
+
+        * **name**: name of the local or semiglobal attribute.
+        * **writable**: if True, values written into the arrays are directly used by the simulation (default: False, the arrays are read-only).
+        """
+        if not self.initialized:
+            Global._error('Projection.view(): the network must be compiled first.')
+
+        if name in self.synapse_type.description['semiglobal'] and hasattr(self.cyInstance, 'view_' + name):
+            views = getattr(self.cyInstance, 'view_' + name)()
+            views.flags.writeable = writable
+            return views
+
+        if name in self.synapse_type.description['local'] and hasattr(self.cyInstance, 'view_dendrite_' + name):
+            views = [getattr(self.cyInstance, 'view_dendrite_' + name)(idx) for idx in range(len(self.post_ranks))]
+            for data in views:
+                data.flags.writeable = writable
+            return views
+
+        Global._error('Projection.view(): the attribute ' + name + ' of the projection ' + self.name + ' can not be accessed without copy (only numerical local or semiglobal attributes of LIL projections with the openMP paradigm, excluding constant weights and traces stored per neuron, are supported).')
+
     def _set_cython_attribute(self, attribute, value):
         """
         Sets the value of the given attribute for all post-synaptic neurons in the projection,
@@ -538,7 +617,10 @@ class Projection(object):
                 Global._error('The projection has', self.size, 'post-synaptic neurons, the list must have the same size.')
         # A Random Distribution is given
         elif isinstance(value, RandomDistribution):
-            if attribute in self.synapse_type.description['local']:
+            if attribute in self.synapse_type.description['local'] and hasattr(self.cyInstance, 'set_flat_'+attribute):
+                # One draw for all synapses, copied in a single pass
+                getattr(self.cyInstance, 'set_flat_'+attribute)(value.get_values(int(self._flat_row_ptr()[-1])))
+            elif attribute in self.synapse_type.description['local']:
                 for idx, n in enumerate(self.post_ranks):
                     getattr(self.cyInstance, 'set_dendrite_'+attribute)(idx, value.get_values(self.cyInstance.nb_synapses(idx)))
             elif attribute in self.synapse_type.description['semiglobal']:
@@ -549,6 +631,8 @@ class Projection(object):
         else:
             if attribute == "w" and self._has_single_weight():
                 getattr(self.cyInstance, 'set_'+attribute)(value)
+            elif attribute in self.synapse_type.description['local'] and hasattr(self.cyInstance, 'fill_'+attribute):
+                getattr(self.cyInstance, 'fill_'+attribute)(value)
             elif attribute in self.synapse_type.description['local']:
                 for idx, n in enumerate(self.post_ranks):
                     getattr(self.cyInstance, 'set_dendrite_'+attribute)(idx, value*np.ones(self.cyInstance.nb_synapses(idx)))
@@ -557,6 +641,38 @@ class Projection(object):
             else:
                 getattr(self.cyInstance, 'set_'+attribute)(value)
 
+    def _set_flat_cython_attribute(self, attribute, value):
+        """
+        Sets the values of a local attribute from a flat array with one element per synapse, in storage order.
+        """
+        row_ptr = self._flat_row_ptr()
+        value = np.asarray(value).reshape(-1)
+        if value.shape[0] != row_ptr[-1]:
+            Global._error('Projection.set(): the projection has ' + str(row_ptr[-1]) + ' synapses, the flat array of ' + attribute + ' has ' + str(value.shape[0]) + ' elements.')
+
+        if attribute == "w" and self._has_single_weight():
+            if value.shape[0] == 0: # no synapse, the single weight is kept
+                return
+            if not np.all(value == value[0]):
+                Global._error('Projection.set(): the projection uses a single weight, all values of w must be equal.')
+            self.cyInstance.set_w(value[0])
+        elif hasattr(self.cyInstance, 'set_flat_'+attribute):
+            getattr(self.cyInstance, 'set_flat_'+attribute)(value)
+        else:
+            for idx in range(len(self.post_ranks)):
+                getattr(self.cyInstance, 'set_dendrite_'+attribute)(idx, value[row_ptr[idx]:row_ptr[idx+1]])
+
+    def _flat_row_ptr(self):
+        """
+        Offsets of the synapses of each dendrite in the flat arrays (one more element than post_ranks, the last one is the number of synapses).
+        """
+        row_ptr = np.zeros(len(self.post_ranks) + 1, dtype=np.int64)
+        if hasattr(self.cyInstance, 'flat_row_ptr'):
+            self.cyInstance.flat_row_ptr(row_ptr)
+        else:
+            row_ptr[1:] = np.cumsum([self.cyInstance.nb_synapses(idx) for idx in range(len(self.post_ranks))])
+        return row_ptr
+
     def _get_flag(self, attribute):
         "flags such as learning, transmission"
         return getattr(self.cyInstance, '_get_'+attribute)()
@@ -747,6 +863,8 @@ class Projection(object):
 
         * If the file name is '.mat', the data will be saved as a Matlab 7.2 file. Scipy must be installed.
 
+        * If the file name ends with '.bin', the data will be saved in a flat binary CSR format (post-synaptic ranks, row pointers, pre-synaptic ranks, weights and delays) which is written directly from the C++ core and memory-mapped when loading. This is the recommended format for very large projections.
+
         * Otherwise, the data will be pickled into a simple binary text file using pickle.
 
         *Parameters*:
@@ -769,6 +887,11 @@ class Projection(object):
 
         extension = os.path.splitext(fname)[1]
 
+        if extension == '.bin':
+            Global._debug("Saving connectivity in binary format...")
+            self._save_connectivity_binary(filename)
+            return
+
         # Gathering the data
         data = {
                 'name': self.name,
@@ -832,37 +955,90 @@ class Projection(object):
             return
 
 
+    def _save_connectivity_binary(self, filename):
+        """
+        Saves the connectivity in the flat binary format (see IO._create_binary_file()).
+
+        The arrays are memory-mapped and filled by the bulk accessors of the C++ object
+        if available, otherwise they are gathered dendrite per dendrite.
+        """
+        from ANNarchy.core.IO import _create_binary_file
+
+        size = len(self.post_ranks)
+        nb_synapses = sum([self.cyInstance.nb_synapses(n) for n in range(size)])
+        single_weight = self._has_single_weight()
+        nonuniform_delay = self.uniform_delay == -1 and self.max_delay > 1
+
+        header = {
+            'name': self.name,
+            'size': size,
+            'nb_synapses': nb_synapses,
+            'max_delay': self.max_delay,
+            'uniform_delay': self.uniform_delay,
+            'dt': Global.config['dt'],
+            'w': float(self.cyInstance.get_w()) if single_weight else None
+        }
+        arrays = [
+            ('post_ranks', np.int32, size),
+            ('row_ptr', np.int64, size + 1),
+            ('pre_ranks', np.int32, nb_synapses),
+        ]
+        if not single_weight:
+            arrays.append(('w', np.float64, nb_synapses))
+        if nonuniform_delay:
+            arrays.append(('delay', np.int32, nb_synapses))
+
+        data = _create_binary_file(filename, header, arrays)
+
+        data['post_ranks'][:] = self.post_ranks
+        if hasattr(self.cyInstance, 'flat_pre_rank'):
+            self.cyInstance.flat_row_ptr(data['row_ptr'])
+            self.cyInstance.flat_pre_rank(data['pre_ranks'])
+            if not single_weight:
+                self.cyInstance.flat_w(data['w'])
+            if nonuniform_delay:
+                self.cyInstance.flat_delay(data['delay'])
+        else:
+            offset = 0
+            data['row_ptr'][0] = 0
+            for n in range(size):
+                nb = self.cyInstance.nb_synapses(n)
+                data['row_ptr'][n+1] = offset + nb
+                data['pre_ranks'][offset:offset+nb] = self.cyInstance.pre_rank(n)
+                if not single_weight:
+                    data['w'][offset:offset+nb] = self.cyInstance.get_dendrite_w(n)
+                if nonuniform_delay:
+                    data['delay'][offset:offset+nb] = self.cyInstance.get_dendrite_delay(n)
+                offset += nb
+
+        for arr in data.values():
+            if isinstance(arr, np.memmap):
+                arr.flush()
+
     def receptive_fields(self, variable = 'w', in_post_geometry = True):
         """
         Gathers all receptive fields within this projection.
 
+        The receptive field of each post-synaptic neuron has the geometry of the pre-synaptic population (non-existing synapses are replaced by zeros). The receptive fields are tiled in a single 2D array following the geometry of the post-synaptic population. Only the existing synapses are visited.
+
         *Parameters*:
 
         * **variable**: name of the variable
         * **in_post_geometry**: if False, the data will be plotted as square grid. (default = True)
         """
+        pre_geometry = self._flat_geometry(self.pre.population if isinstance(self.pre, PopulationView) else self.pre)
+        post = self.post.population if isinstance(self.post, PopulationView) else self.post
         if in_post_geometry:
-            x_size = self.post.geometry[1]
-            y_size = self.post.geometry[0]
+            post_geometry = self._flat_geometry(post)
         else:
-            x_size = int( math.floor(math.sqrt(self.post.size)) )
-            y_size = int( math.ceil(math.sqrt(self.post.size)) )
-
+            x_size = int( math.floor(math.sqrt(post.size)) )
+            post_geometry = (int( math.ceil(post.size / float(x_size)) ), x_size)
 
-        def get_rf(rank): # TODO: IMPROVE
-            res = np.zeros( self.pre.size )
-            for n in range(len(self.post_ranks)):
-                if self.post_ranks[n] == n:
-                    pre_ranks = self.cyInstance.pre_rank(n)
-                    data = getattr(self.cyInstance, 'get_dendrite_'+variable)(rank)
-                    for j in range(len(pre_ranks)):
-                        res[pre_ranks[j]] = data[j]
-            return res.reshape(self.pre.geometry)
+        post_ranks, pre_ranks, values = self._flat_connectivity(variable)
 
-        res = np.zeros((1, x_size*self.pre.geometry[1]))
-        for y in range ( y_size ):
-            row = np.concatenate(  [ get_rf(self.post.rank_from_coordinates( (y, x) ) ) for x in range ( x_size ) ], axis = 1)
-            res = np.concatenate((res, row))
+        res = np.zeros((post_geometry[0] * pre_geometry[0], post_geometry[1] * pre_geometry[1]))
+        res[(post_ranks // post_geometry[1]) * pre_geometry[0] + pre_ranks // pre_geometry[1],
+            (post_ranks % post_geometry[1]) * pre_geometry[1] + pre_ranks % pre_geometry[1]] = values
 
         return res
 
@@ -874,30 +1050,113 @@ class Projection(object):
 
         If PopulationViews were used for creating the projection, the matrix is expanded to the whole populations by default.
 
+        For large projections, ``to_sparse()`` avoids the allocation of the dense matrix.
+
         *Parameters*:
 
         * **fill**: value to put in the matrix when there is no connection (default: 0.0).
         """
-        if isinstance(self.pre, PopulationView):
-            size_pre = self.pre.population.size
+        if not self.initialized:
+            Global._error('The connectivity matrix can only be accessed after compilation')
+            return []
+
+        size_pre, size_post = self._full_sizes()
+        post_ranks, pre_ranks, values = self._flat_connectivity('w')
+
+        res = np.full((size_post, size_pre), fill, dtype=np.float64)
+        res[post_ranks, pre_ranks] = values
+        return res
+
+    def to_sparse(self, variable='w', format='csr'):
+        """
+        Returns the connectivity of the projection as a scipy sparse matrix, without creating a dense matrix.
+
+        The first index of the matrix represents post-synaptic neurons, the second the pre-synaptic ones. If PopulationViews were used for creating the projection, the matrix is expanded to the whole populations.
+
+        Example::
+
+            W = proj.to_sparse()
+            print(W.nnz, W.shape)
+            print(W.sum(axis=1)) # total weight received by each post-synaptic neuron
+
+        *Parameters*:
+
+        * **variable**: name of the synaptic attribute stored in the matrix (default: 'w'). Semiglobal and global attributes are repeated for each synapse.
+        * **format**: 'csr' (default) or 'coo'.
+        """
+        try:
+            from scipy.sparse import csr_matrix, coo_matrix
+        except:
+            Global._error("Projection.to_sparse(): scipy is not installed, sparse matrices can not be created.")
+            return None
+
+        if not self.initialized:
+            Global._error('Projection.to_sparse(): the network must be compiled first.')
+
+        if not format in ['csr', 'coo']:
+            Global._error('Projection.to_sparse(): the format must be either "csr" or "coo", not ' + str(format) + '.')
+
+        size_pre, size_post = self._full_sizes()
+        row_ptr = self._flat_row_ptr()
+        post_ranks, pre_ranks, values = self._flat_connectivity(variable, row_ptr)
+
+        if format == 'coo':
+            return coo_matrix((values, (post_ranks, pre_ranks)), shape=(size_post, size_pre))
+
+        # The dendrites are stored in increasing post-synaptic order: the row pointer is only expanded
+        ranks = np.array(self.post_ranks, dtype=np.int64)
+        if np.all(ranks[1:] > ranks[:-1]):
+            counts = np.zeros(size_post, dtype=np.int64)
+            counts[ranks] = np.diff(row_ptr)
+            indptr = np.zeros(size_post + 1, dtype=np.int64)
+            np.cumsum(counts, out=indptr[1:])
+            return csr_matrix((values, pre_ranks, indptr), shape=(size_post, size_pre))
+
+        return coo_matrix((values, (post_ranks, pre_ranks)), shape=(size_post, size_pre)).tocsr()
+
+    def _full_sizes(self):
+        "Sizes of the pre- and post-synaptic populations (the whole populations for PopulationViews)."
+        size_pre = self.pre.population.size if isinstance(self.pre, PopulationView) else self.pre.size
+        size_post = self.post.population.size if isinstance(self.post, PopulationView) else self.post.size
+        return size_pre, size_post
+
+    @staticmethod
+    def _flat_geometry(pop):
+        "Geometry of a population as (height, width): 1D populations are a single row, the dimensions after the first one are flattened."
+        if len(pop.geometry) == 1:
+            return (1, pop.geometry[0])
+        return (pop.geometry[0], int(np.prod(pop.geometry[1:])))
+
+    def _flat_connectivity(self, variable='w', row_ptr=None):
+        """
+        Returns the post-synaptic ranks, pre-synaptic ranks and values of variable for all synapses, as three flat arrays in storage order.
+        """
+        if not self.initialized:
+            Global._error('The connectivity can only be accessed after compilation.')
+
+        if row_ptr is None:
+            row_ptr = self._flat_row_ptr()
+        nb_synapses = int(row_ptr[-1])
+
+        post_ranks = np.repeat(np.array(self.post_ranks, dtype=np.int64), np.diff(row_ptr))
+
+        pre_ranks = np.zeros(nb_synapses, dtype=np.int32)
+        if hasattr(self.cyInstance, 'flat_pre_rank'):
+            self.cyInstance.flat_pre_rank(pre_ranks)
         else:
-            size_pre = self.pre.size
-        if isinstance(self.post, PopulationView):
-            size_post = self.post.population.size
+            for idx in range(len(self.post_ranks)):
+                pre_ranks[row_ptr[idx]:row_ptr[idx+1]] = self.cyInstance.pre_rank(idx)
+
+        if variable in self.synapse_type.description['local']:
+            values = self.get(variable, flat=True)
+        elif variable in self.synapse_type.description['semiglobal']:
+            values = np.repeat(self.get(variable, flat=True), np.diff(row_ptr))
+        elif variable in self.synapse_type.description['global']:
+            values = np.full(nb_synapses, self.get(variable))
         else:
-            size_post = self.post.size
+            Global._error('The projection ' + self.name + ' has no synaptic attribute called ' + str(variable) + '.')
 
-        res = np.ones((size_post, size_pre)) * fill
-        for rank in self.post_ranks:
-            idx = self.post_ranks.index(rank)
-            try:
-                preranks = self.cyInstance.pre_rank(idx)
-                w = self.cyInstance.get_dendrite_w(idx)
-            except:
-                Global._error('The connectivity matrix can only be accessed after compilation')
-                return []
-            res[rank, preranks] = w
-        return res
+        return post_ranks, pre_ranks, values
 
 
     ################################
@@ -1033,6 +1292,46 @@ class Projection(object):
                 Global._warning('load(): the variable', var, 'does not exist in the current version of the network, skipping it.')
                 continue
 
+    ################################
+    ## Input schedules
+    ################################
+    def schedule(self, name, times, values):
+        """
+        Assigns a sequence of values to a parameter or variable at the given times.
+
+        A single value is scheduled at each time: it is assigned to all synapses (local attributes) or all dendrites (semiglobal attributes). As for ``Population.schedule()``, the values are assigned inside the simulation loop, the attribute must be scheduled once before ``compile()`` and calling the method again after compilation replaces its schedule.
+
+        Example::
+
+            proj.schedule('eta', times=[0., 1000.], values=[0.01, 0.0])
+
+        *Parameters*:
+
+        * **name**: name of the parameter or variable.
+        * **times**: increasing list of times in ms.
+        * **values**: list of values, one per time.
+        """
+        if Global._check_paradigm('cuda'):
+            Global._error('schedule() is not supported on CUDA yet.')
+
+        if not name in self.attributes:
+            Global._error('Projection.schedule():', name, 'is not an attribute of the projection', self.name)
+
+        values = np.array(values)
+        if values.ndim != 1 or len(times) != len(values):
+            Global._error('Projection.schedule(): one single value per time is expected.')
+
+        steps = np.round(np.array(times, dtype=float) / Global.config['dt']).astype(np.int64)
+        if np.any(np.diff(steps) < 0):
+            Global._error('Projection.schedule(): the times must be increasing.')
+
+        if self.initialized:
+            if not hasattr(self.cyInstance, 'set_schedule_'+name):
+                Global._error('Projection.schedule():', name, 'was not scheduled before compile(), its schedule can not be generated anymore.')
+            getattr(self.cyInstance, 'set_schedule_'+name)(steps, values)
+
+        self._schedules[name] = (steps, values)
+
     ################################
     ## Structural plasticity
     ################################
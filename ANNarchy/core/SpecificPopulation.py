@@ -26,8 +26,6 @@ from ANNarchy.core.Neuron import Neuron
 import ANNarchy.core.Global as Global
 
 import numpy as np
-from scipy.special import erf
-from scipy.optimize import newton
 
 class SpecificPopulation(Population):
     """
@@ -397,6 +395,15 @@ class TimedArray(SpecificPopulation):
         int get_period()
 """ % {'float_prec': Global.config['precision']}
 
+        self._specific_template['save_state_additional'] = """
+        _write_state(os, _t);
+        _write_state(os, _block);
+"""
+        self._specific_template['load_state_additional'] = """
+        _read_state(is, _t);
+        _read_state(is, _block);
+"""
+
         self._specific_template['reset_additional'] ="""
         _t = 0;
         _block = 0;
@@ -783,6 +790,19 @@ class SpikeSourceArray(SpecificPopulation):
         this->recompute_spike_times();
 """
 
+        self._specific_template['save_state_additional'] = """
+        _write_state(os, _t);
+        _write_state(os, spike_times);
+        _write_state(os, next_spike);
+        _write_state(os, idx_next_spike);
+"""
+        self._specific_template['load_state_additional'] = """
+        _read_state(is, _t);
+        _read_state(is, spike_times);
+        _read_state(is, next_spike);
+        _read_state(is, idx_next_spike);
+"""
+
         self._specific_template['update_variables'] = """
         if(_active){
             spiked.clear();
@@ -991,6 +1011,9 @@ class HomogeneousCorrelatedSpikeTrains(SpecificPopulation):
         Authors: Romain Brette (brette@di.ens.fr) and Dan Goodman (goodman@di.ens.fr)
         Licence: CeCILL
         """
+        from scipy.special import erf
+        from scipy.optimize import newton
+
         def _rectified_gaussian(mu, sigma):
             """
             Calculates the mean and standard deviation for a rectified Gaussian distribution.
@@ -127,21 +127,26 @@ class DecodingProjection(SpecificProjection):
         self._specific_template['declare_additional'] = """
     // Window
     int window = %(window)s;
-    std::deque< std::vector< %(float_prec)s > > rates_history ;
+    WindowedSum< %(float_prec)s > rates_history ;
+    std::vector< %(float_prec)s > rates ;
+    std::vector< int > rates_ranks ;
 """ % { 'window': int(self.window/Global.config['dt']), 'float_prec': Global.config['precision'] }
 
         self._specific_template['init_additional'] = """
-        rates_history = std::deque< std::vector< %(float_prec)s > >(%(window)s, std::vector< %(float_prec)s >(%(post_size)s, 0.0));
+        rates_history.init(%(post_size)s, %(window)s);
+        rates = std::vector< %(float_prec)s >(%(post_size)s, 0.0);
+        rates_ranks = std::vector< int >();
 """ % { 'window': int(self.window/Global.config['dt']),'post_size': self.post.size, 'float_prec': Global.config['precision'] }
 
         self._specific_template['psp_code'] = """
         if (pop%(id_post)s._active){
-            std::vector< std::pair<int, int> > inv_post;
-            std::vector< %(float_prec)s > rates = std::vector< %(float_prec)s >(%(post_size)s, 0.0);
+            // Remove the oldest step of the window
+            rates_history.step();
+
             // Iterate over all incoming spikes
             for(int _idx_j = 0; _idx_j < pop%(id_pre)s.spiked.size(); _idx_j++){
                 rk_j = pop%(id_pre)s.spiked[_idx_j];
-                inv_post = inv_pre_rank[rk_j];
+                const std::vector< std::pair<int, int> > &inv_post = inv_pre_rank[rk_j];
                 nb_post = inv_post.size();
                 // Iterate over connected post neurons
                 for(int _idx_i = 0; _idx_i < nb_post; _idx_i++){
@@ -150,17 +155,21 @@ class DecodingProjection(SpecificProjection):
                     j = inv_post[_idx_i].second;
 
                     // Increase the post-synaptic conductance
+                    if (rates[post_rank[i]] == 0.0)
+                        rates_ranks.push_back(post_rank[i]);
                     rates[post_rank[i]] +=  %(weight)s;
                 }
             }
 
-            rates_history.push_front(rates);
-            rates_history.pop_back();
+            // Store the rates of the current step in the window
+            for(int _idx = 0; _idx < rates_ranks.size(); _idx++){
+                rates_history.add(rates_ranks[_idx], rates[rates_ranks[_idx]]);
+                rates[rates_ranks[_idx]] = 0.0;
+            }
+            rates_ranks.clear();
+
             for(int i=0; i<post_rank.size(); i++){
-                sum = 0.0;
-                for(int step=0; step<window; step++){
-                    sum += rates_history[step][post_rank[i]];
-                }
+                sum = rates_history.total[post_rank[i]];
                 pop%(id_post)s._sum_%(target)s[post_rank[i]] += sum /float(window) * 1000. / dt / float(pre_rank[i].size());
             }
         } // active
@@ -22,7 +22,6 @@
 #
 #===============================================================================
 import ANNarchy.core.Global as Global
-from ANNarchy.parser.AnalyseSynapse import analyse_synapse
 
 class Synapse(object):
     """
@@ -98,6 +97,7 @@ class Synapse(object):
     def _analyse(self):
         # Analyse the synapse type
         if not self.description:
+            from ANNarchy.parser.AnalyseSynapse import analyse_synapse
             self.description = analyse_synapse(self)
 
     def __add__(self, synapse):  
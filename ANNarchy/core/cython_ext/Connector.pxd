@@ -1,6 +1,7 @@
 # distutils: language = c++
 from libcpp.vector cimport vector
 from libcpp cimport bool
+from libc.stdint cimport int64_t
 from sympy.mpmath.matrices.matrices import _matrix
 
 cdef class LILConnectivity:
@@ -23,6 +24,7 @@ cdef class LILConnectivity:
     # Insert methods
     cpdef add(self, int rk, r, w, d)
     cpdef push_back(self, int rk, vector[int] r, vector[double] w, vector[double] d)
+    cpdef load_csr(self, const int[::1] post_ranks, const int64_t[::1] row_ptr, const int[::1] pre_ranks, const double[::1] w, const int[::1] d)
 
     # Access methods
     cpdef int get_max_delay(self)
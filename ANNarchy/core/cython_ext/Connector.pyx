@@ -2,6 +2,7 @@
 
 from libcpp.vector cimport vector
 from libcpp cimport bool
+from libc.stdint cimport int64_t
 
 import numpy as np
 cimport numpy as np
@@ -200,6 +201,38 @@ cdef class LILConnectivity:
         self.size += 1
         self.nb_synapses += r.size()
 
+    cpdef load_csr(self, const int[::1] post_ranks, const int64_t[::1] row_ptr, const int[::1] pre_ranks, const double[::1] w, const int[::1] d):
+        """
+        Fills the container in one pass from flat CSR arrays, e. g. memory-mapped from a file written by Projection.save_connectivity(). Each row is copied directly from the arrays into the vectors of the container, which is then passed as it is to the C++ core by _load_from_lil().
+
+        *w* can be None if the projection uses a single weight, *d* is None for uniform delays (already given in steps).
+        """
+        cdef int i, nb_post = post_ranks.shape[0]
+        cdef int64_t beg, end
+
+        self.post_rank.clear()
+        if nb_post > 0:
+            self.post_rank.assign(&post_ranks[0], &post_ranks[0] + nb_post)
+        self.pre_rank = vector[vector[int]](nb_post)
+        if w is not None:
+            self.w = vector[vector[double]](nb_post)
+        if d is not None:
+            self.delay = vector[vector[int]](nb_post)
+
+        for i in range(nb_post):
+            beg = row_ptr[i]
+            end = row_ptr[i+1]
+            if end == beg:
+                continue
+            self.pre_rank[i].assign(&pre_ranks[beg], &pre_ranks[beg] + (end-beg))
+            if w is not None:
+                self.w[i].assign(&w[beg], &w[beg] + (end-beg))
+            if d is not None:
+                self.delay[i].assign(&d[beg], &d[beg] + (end-beg))
+
+        self.size = nb_post
+        self.nb_synapses = row_ptr[nb_post]
+
     cpdef int get_max_delay(self):
         return self.max_delay
 
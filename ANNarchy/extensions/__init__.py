@@ -1 +1,2 @@
-from .hybrid import *
\ No newline at end of file
+# The extensions are imported on demand, e.g. "from ANNarchy.extensions.hybrid import *".
+# Spike2RatePopulation and Rate2SpikePopulation are also exported by the ANNarchy package.
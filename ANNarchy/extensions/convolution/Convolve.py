@@ -29,13 +29,14 @@ from ANNarchy.core.Projection import Projection
 
 from ANNarchy.generator.Utils import tabify
 from .Utils import SharedSynapse
+from .ConvolveTemplate import fft_template_omp, fft_fill_row_constant, fft_fill_row_border
 
 # Indices used for each dimension
 indices = ['i', 'j', 'k', 'l', 'm', 'n']
 
 class Convolution(Projection):
 
-    def __init__(self, pre, post, target, weights, psp="pre.r * w", operation="sum", delays=0.0, method='filter', keep_last_dimension=False, multiple=False, padding=0.0, subsampling=None):
+    def __init__(self, pre, post, target, weights, psp="pre.r * w", operation="sum", delays=0.0, method='filter', keep_last_dimension=False, multiple=False, padding=0.0, subsampling=None, engine='direct', update_period=None, name=None, copied=False):
         """
         Builds the shared connection pattern that will perform a convolution of the weights kernel on the pre-synaptic population.
 
@@ -73,13 +74,33 @@ class Convolution(Projection):
         * **padding**: value to be used for the rates outside the pre-synaptic population. If it is a floating value, the pre-synaptic population is virtually extended with this value above its boundaries. If it is equal to 'border', the values on the boundaries are repeated. Default: 0.0.
 
         * **subsampling**: list for each post-synaptic neuron of coordinates in the pre-synaptic population defining the center of the kernel/filter. Default: None.
+
+        * **engine**: implementation of the convolution in the generated code. 'direct' (default) loops over the kernel for each post-synaptic neuron. 'gemm' gathers the pre-synaptic patches once per step (im2col) and multiplies them with all filters in a cache-blocked matrix product, which is much faster for banks of filters. 'gemm' is only available for the 'sum' operation with the default psp ``pre.r * w``. 'fft' computes the convolution with real FFTs, whose cost does not depend on the size of the kernel: it is meant for wide kernels (e.g. lateral interactions in neural fields). 'fft' is only available for a single 1D or 2D kernel, populations of the same geometry, the 'sum' operation and the default psp.
+
+        * **update_period**: with the 'fft' engine, period in ms at which the convolution is computed again. In between, the last result is used. Default: every step.
         """
         self._operation_type = 'convolve'
+        self.psp = psp
+        self.operation = operation
         self.method = method
         self.keep_last_dimension = keep_last_dimension
         self.multiple = multiple
         self.padding = padding
         self.subsampling = subsampling
+        self.engine = engine
+        self.update_period = update_period
+
+        if not engine in ['direct', 'gemm', 'fft']:
+            Global._error('Convolution: the engine must be either "direct", "gemm" or "fft".')
+
+        if engine in ['gemm', 'fft']:
+            if operation != "sum":
+                Global._error('Convolution: the "' + engine + '" engine can only be used with the "sum" operation.')
+            if not psp.replace(' ', '') in ['pre.r*w', 'w*pre.r']:
+                Global._error('Convolution: the "' + engine + '" engine can only be used with the psp "pre.r * w".')
+
+        if update_period is not None and engine != 'fft':
+            Global._warning('Convolution: update_period is only used by the "fft" engine.')
 
         # Create the description, but it will not be used for generation
         Projection.__init__(
@@ -87,7 +108,9 @@ class Convolution(Projection):
             pre,
             post,
             target,
-            synapse=SharedSynapse(psp=psp, operation=operation)
+            synapse=SharedSynapse(psp=psp, operation=operation),
+            name=name,
+            copied=copied
         )
 
         # Process the weights
@@ -148,6 +171,13 @@ class Convolution(Projection):
                 print("Convolution:", self.dim_pre, '*', self.dim_kernel, '->', self.dim_post)
                 Global._error('Convolution: For multiple filters, the last dimension of the post-synaptic population must have as many neurons as there are filters.')
 
+        # The FFT engine computes a full convolution of the population with a single kernel
+        if self.engine == 'fft':
+            if self.multiple or not self.dim_kernel in [1, 2] or self.dim_pre != self.dim_kernel or self.dim_post != self.dim_kernel:
+                Global._error('Convolution: the "fft" engine can only be used with a single 1D or 2D kernel on populations of the same dimension.')
+            if self.pre.geometry != self.post.geometry or self.subsampling:
+                Global._error('Convolution: the "fft" engine can only be used when the pre- and post-synaptic populations have the same geometry (no sub-sampling).')
+
 
         # Generate the pre-synaptic coordinates
         if not self.multiple:
@@ -155,12 +185,13 @@ class Convolution(Projection):
         else:
             self._generate_pre_coordinates_bank()
 
-        # Finish building the synapses
-        self._create()
+        # Finish building the synapses (the connectivity of copies is stored by the network)
+        if not copied:
+            self._create()
 
     def _copy(self, pre, post):
         "Returns a copy of the projection when creating networks.  Internal use only."
-        raise NotImplementedError
+        return Convolution(pre=pre, post=post, target=self.target, weights=self.weights, psp=self.psp, operation=self.operation, delays=self.delays, method=self.method, keep_last_dimension=self.keep_last_dimension, multiple=self.multiple, padding=self.padding, subsampling=self.subsampling, engine=self.engine, update_period=self.update_period, name=self.name, copied=True)
 
     def _create(self):
         # create fake LIL object, just for compilation.
@@ -194,6 +225,13 @@ class Convolution(Projection):
         # Define the list of postsynaptic neurons
         self.post_ranks = list(range(self.post.size))
 
+        # Pre-synaptic ranks of the patches for the im2col/GEMM engine
+        if self.engine == 'gemm':
+            self.cyInstance.set_im2col_idx(self._im2col_indices())
+        elif self.engine == 'direct':
+            interior = self._interior_mask()
+            self.cyInstance.set_interior_border(list(np.flatnonzero(interior)), list(np.flatnonzero(~interior)))
+
         # Set delays after instantiation
         if self.delays > 0.0:
             self.cyInstance.set_delay(self.delays/Global.config['dt'])
@@ -340,6 +378,33 @@ class Convolution(Projection):
         # Save the result
         self.pre_coordinates = coords
 
+    def _im2col_indices(self):
+        """
+        Returns the flattened table of pre-synaptic ranks used by the 'gemm' engine: one row per patch (post-synaptic position) and one column per element of the kernel, in the order of ``weights.reshape(-1)`` (of a single filter for a bank). Elements outside the pre-synaptic population are -1 (replaced by the padding value), or the closest border for ``padding='border'``.
+
+        For a bank of filters, the post-synaptic neurons sharing the same center (all filters at a position) use the same patch.
+        """
+        kernel_shape = self.weights.shape[1:] if self.multiple else self.weights.shape
+        nb_filters = self.weights.shape[0] if self.multiple else 1
+
+        centers = np.array(self.pre_coordinates, dtype=np.int64)[::nb_filters, :self.dim_pre]
+        taps = np.array(list(np.ndindex(*kernel_shape)), dtype=np.int64).reshape((-1, len(kernel_shape)))
+
+        coords = np.repeat(centers[:, np.newaxis, :], taps.shape[0], axis=1)
+        valid = np.ones(coords.shape[:2], dtype=bool)
+        for dim in range(len(kernel_shape)):
+            offset = taps[:, dim] - self._center_filter(kernel_shape[dim])
+            coords[:, :, dim] += -offset if self.method == 'convolution' else offset
+            if isinstance(self.padding, str): # 'border'
+                coords[:, :, dim] = np.clip(coords[:, :, dim], 0, self.pre.geometry[dim] - 1)
+            else:
+                valid &= (coords[:, :, dim] >= 0) & (coords[:, :, dim] < self.pre.geometry[dim])
+
+        ranks = np.full(coords.shape[:2], -1, dtype=np.int64)
+        ranks[valid] = np.ravel_multi_index(tuple(coords[valid].T), self.pre.geometry)
+
+        return list(ranks.reshape(-1).astype(np.int32))
+
     ################################
     # Code generation
     ################################
@@ -350,20 +415,39 @@ class Convolution(Projection):
         # Filter definition
         filter_definition, filter_pyx_definition = self._filter_definition()
 
-        # Convolve_code
+        # Convolve_code: with bound checks for the border, without for the interior
         if not self.multiple:
             convolve_code, sum_code = self._generate_convolve_code()
+            interior_code, _ = self._generate_convolve_code(bounds=False)
         else:
             convolve_code, sum_code = self._generate_bank_code()
+            interior_code, _ = self._generate_bank_code(bounds=False)
 
         if Global._check_paradigm("openmp"):
-            self._generate_omp(filter_definition, filter_pyx_definition, convolve_code, sum_code)
+            self._generate_omp(filter_definition, filter_pyx_definition, convolve_code, sum_code, interior_code=interior_code)
+
+            # The engines return the Python statement keeping their data up to date with w
+            update_w = ""
+            if self.engine == 'gemm':
+                update_w = self._generate_gemm_omp()
+            elif self.engine == 'fft':
+                update_w = self._generate_fft_omp()
+            elif self._separable_candidate():
+                update_w = self._generate_separable_omp()
+
+            self._specific_template['wrapper_access_connectivity'] += """
+    def set_w(self, value):
+        proj%(id_proj)s.set_w( value )
+        %(update_w)s
+    def set_dendrite_w(self, int rank, value):
+        self.set_w(value)
+""" % {'id_proj': self.id, 'update_w': update_w}
         elif Global._check_paradigm("cuda"):
             raise NotImplementedError
         else:
             raise NotImplementedError
 
-    def _generate_omp(self, filter_definition, filter_pyx_definition, convolve_code, sum_code, kernel=True):
+    def _generate_omp(self, filter_definition, filter_pyx_definition, convolve_code, sum_code, kernel=True, interior_code=None):
         """
         OpenMP code generation.
         """
@@ -444,12 +528,8 @@ class Convolution(Projection):
     # Local variable w
     def get_w(self):
         return proj%(id_proj)s.get_w()
-    def set_w(self, value):
-        proj%(id_proj)s.set_w( value )
     def get_dendrite_w(self, int rank):
         return proj%(id_proj)s.get_w()
-    def set_dendrite_w(self, int rank, value):
-        proj%(id_proj)s.set_w(value)
     def get_synapse_w(self, int rank_post, int rank_pre):
         return 0.0
     def set_synapse_w(self, int rank_post, int rank_pre, %(float_prec)s value):
@@ -467,7 +547,7 @@ class Convolution(Projection):
         omp_code = ""
         if Global.config['num_threads'] > 1:
             omp_code = """
-        #pragma omp parallel for private(sum, rk_pre, coord) %(psp_schedule)s""" % {'psp_schedule': "" if not 'psp_schedule' in self._omp_config.keys() else self._omp_config['psp_schedule']}
+        #pragma omp parallel for private(sum, rk_pre) %(psp_schedule)s""" % {'psp_schedule': "" if not 'psp_schedule' in self._omp_config.keys() else self._omp_config['psp_schedule']}
 
         # HD ( 16.10.2015 ):
         # pre-load delayed firing rate in a local array, so we
@@ -482,19 +562,58 @@ class Convolution(Projection):
         else:
             pre_load_r = ""
 
-        # Compute sum
-        wsum =  """
+        # Compute sum: the post-synaptic neurons whose receptive field lies entirely inside the
+        # pre-synaptic population do not need any bound check
+        if interior_code is None:
+            wsum =  """
         if ( _transmission && pop%(id_pre)s._active ) {
-        std::vector<int> coord;
 """ + pre_load_r + """
         %(omp_code)s
         for(int i = 0; i < %(size_post)s; i++){
-            coord = pre_rank[i];
+            const int* coord = pre_rank[i].data();
 """ + convolve_code + """
             pop%(id_post)s._sum_%(target)s[i] += """ + sum_code + """;
         } // for
         } // if
 """
+        else:
+            wsum =  """
+        if ( _transmission && pop%(id_pre)s._active ) {
+""" + pre_load_r + """
+        // Interior
+        %(omp_code)s
+        for(int _n = 0; _n < _interior_rank.size(); _n++){
+            int i = _interior_rank[_n];
+            const int* coord = pre_rank[i].data();
+""" + interior_code + """
+            pop%(id_post)s._sum_%(target)s[i] += """ + sum_code + """;
+        } // for
+
+        // Border
+        %(omp_code)s
+        for(int _n = 0; _n < _border_rank.size(); _n++){
+            int i = _border_rank[_n];
+            const int* coord = pre_rank[i].data();
+""" + convolve_code + """
+            pop%(id_post)s._sum_%(target)s[i] += """ + sum_code + """;
+        } // for
+        } // if
+"""
+            self._specific_template['declare_connectivity_matrix'] += """
+    // Post-synaptic neurons with the receptive field inside (interior) or crossing (border) the pre-synaptic population
+    std::vector<int> _interior_rank;
+    std::vector<int> _border_rank;
+"""
+            self._specific_template['access_connectivity_matrix'] += """
+    void set_interior_border(std::vector<int> interior, std::vector<int> border) { _interior_rank = interior; _border_rank = border; }
+"""
+            self._specific_template['export_connectivity'] += """
+        void set_interior_border(vector[int], vector[int])
+"""
+            self._specific_template['wrapper_access_connectivity'] += """
+    def set_interior_border(self, interior, border):
+        proj%(id_proj)s.set_interior_border(interior, border)
+""" % {'id_proj': self.id}
 
         self._specific_template['psp_code'] = wsum % \
         {   'id_proj': self.id,
@@ -506,6 +625,306 @@ class Convolution(Projection):
         }
         self._specific_template['size_in_bytes'] = "//TODO:\n"
 
+    def _separable_candidate(self):
+        """
+        The separable fast path can be used for single 2D kernels applied on 2D populations with the default psp, the sum (or mean) operation and the automatic sub-sampling. Whether the kernel really has a rank of 1 is checked each time the weights are set.
+        """
+        return not self.multiple and self.dim_kernel == 2 and self.dim_pre == 2 and self.dim_post == 2 \
+            and self.synapse_type.operation in ['sum', 'mean'] and self.psp.replace(' ', '') in ['pre.r*w', 'w*pre.r'] \
+            and not self.subsampling
+
+    def _generate_separable_omp(self):
+        """
+        Adds the separable fast path to the direct code: when the kernel is the outer product of a vertical and a horizontal 1D kernel (e.g. a Gaussian), the convolution is computed by a horizontal pass over all pre-synaptic rows followed by a vertical pass, i.e. O(kh + kw) operations per neuron instead of O(kh * kw). The general code is used otherwise.
+
+        Returns the statement of the wrapper updating the decomposition when w is set.
+        """
+        sample_y = int(self.pre.geometry[0] / self.post.geometry[0])
+        sample_x = int(self.pre.geometry[1] / self.post.geometry[1])
+        ids = {
+            'id_proj': self.id,
+            'id_pre': self.pre.id,
+            'id_post': self.post.id,
+            'target': self.target,
+            'float_prec': Global.config['precision'],
+            'pre_h': self.pre.geometry[0], 'pre_w': self.pre.geometry[1],
+            'post_h': self.post.geometry[0], 'post_w': self.post.geometry[1],
+            'kernel_h': self.weights.shape[0], 'kernel_w': self.weights.shape[1],
+            'center_h': self._center_filter(self.weights.shape[0]), 'center_w': self._center_filter(self.weights.shape[1]),
+            'offset_y': int((sample_y-1)/2), 'sample_y': sample_y,
+            'offset_x': int((sample_x-1)/2), 'sample_x': sample_x,
+            'operator': '-' if self.method == 'convolution' else '+',
+            'omp_code': "#pragma omp parallel for" if Global.config['num_threads'] > 1 else "",
+            'pre_r': "pop%(id_pre)s._delayed_r[delay-1]" % {'id_pre': self.pre.id} if self.delays > Global.config['dt'] else "pop%(id_pre)s.r" % {'id_pre': self.pre.id},
+            'mean': " / %(size)s" % {'size': self.weights.size} if self.synapse_type.operation == "mean" else "",
+        }
+
+        # Out-of-bounds coordinates in the two passes
+        if isinstance(self.padding, str): # 'border'
+            ids['check_x'] = "if (x < 0) x = 0; if (x > %(max)s) x = %(max)s;" % {'max': self.pre.geometry[1] - 1}
+            ids['check_y'] = "if (y < 0) y = 0; if (y > %(max)s) y = %(max)s;" % {'max': self.pre.geometry[0] - 1}
+        else:
+            ids['check_x'] = "if ((x < 0) || (x > %(max)s)) { s += _sep_v[b] * %(padding)s; continue; }" % {'max': self.pre.geometry[1] - 1, 'padding': self.padding}
+            ids['check_y'] = "if ((y < 0) || (y > %(max)s)) { s += _sep_u[a] * %(padding)s * _sep_v_sum; continue; }" % {'max': self.pre.geometry[0] - 1, 'padding': self.padding}
+
+        self._specific_template['declare_connectivity_matrix'] += """
+    // Separable kernel: w = outer(_sep_u, _sep_v)
+    bool _separable;
+    std::vector<%(float_prec)s> _sep_u;
+    std::vector<%(float_prec)s> _sep_v;
+    %(float_prec)s _sep_v_sum;
+    std::vector<%(float_prec)s> _sep_tmp;
+""" % ids
+
+        self._specific_template['access_connectivity_matrix'] += """
+    void set_separable(bool separable, std::vector<%(float_prec)s> u, std::vector<%(float_prec)s> v) {
+        _separable = separable;
+        _sep_u = u;
+        _sep_v = v;
+        _sep_v_sum = 0.0;
+        for(int b = 0; b < v.size(); b++)
+            _sep_v_sum += v[b];
+        _sep_tmp = std::vector<%(float_prec)s>(%(pre_h)s * %(post_w)s, 0.0);
+    }
+""" % ids
+
+        self._specific_template['export_connectivity'] += """
+        void set_separable(bool, vector[%(float_prec)s], vector[%(float_prec)s])
+""" % ids
+
+        # The rank of the kernel is checked each time the weights are set
+        self._specific_template['wrapper_access_connectivity'] += """
+    def _update_separable(self, value):
+        u, s, vt = np.linalg.svd(np.array(value, dtype=np.float64))
+        separable = s[0] > 0.0 and (s.shape[0] == 1 or s[1] <= 1e-10 * s[0])
+        proj%(id_proj)s.set_separable(separable, u[:, 0] * np.sqrt(s[0]), vt[0, :] * np.sqrt(s[0]))
+""" % ids
+        self._specific_template['wrapper_init_connectivity'] += """
+        self._update_separable(weights)
+"""
+
+        separable_code = """
+        if ( _transmission && pop%(id_pre)s._active ) {
+        const %(float_prec)s* _pre_r = %(pre_r)s.data();
+        %(float_prec)s* _tmp = _sep_tmp.data();
+
+        // Horizontal pass on all pre-synaptic rows, for the columns of the centers
+        %(omp_code)s
+        for(int y = 0; y < %(pre_h)s; y++) {
+            for(int jc = 0; jc < %(post_w)s; jc++) {
+                int cx = %(offset_x)s + %(sample_x)s * jc;
+                %(float_prec)s s = 0.0;
+                for(int b = 0; b < %(kernel_w)s; b++) {
+                    int x = cx %(operator)s (b - %(center_w)s);
+                    %(check_x)s
+                    s += _sep_v[b] * _pre_r[y * %(pre_w)s + x];
+                }
+                _tmp[y * %(post_w)s + jc] = s;
+            }
+        }
+
+        // Vertical pass for the rows of the centers
+        %(omp_code)s
+        for(int ic = 0; ic < %(post_h)s; ic++) {
+            int cy = %(offset_y)s + %(sample_y)s * ic;
+            for(int jc = 0; jc < %(post_w)s; jc++) {
+                %(float_prec)s s = 0.0;
+                for(int a = 0; a < %(kernel_h)s; a++) {
+                    int y = cy %(operator)s (a - %(center_h)s);
+                    %(check_y)s
+                    s += _sep_u[a] * _tmp[y * %(post_w)s + jc];
+                }
+                pop%(id_post)s._sum_%(target)s[ic * %(post_w)s + jc] += s%(mean)s;
+            }
+        }
+        } // if
+""" % ids
+
+        self._specific_template['psp_code'] = """
+        if (_separable) {
+""" + separable_code + """
+        } else {
+""" + self._specific_template['psp_code'] + """
+        }
+"""
+
+        return "self._update_separable(value)"
+
+    def _generate_gemm_omp(self):
+        """
+        Replaces the computation of the weighted sums by the im2col/GEMM engine.
+
+        The pre-synaptic patches are gathered once per step into a (nb_patches x kernel_size) matrix, which is multiplied with the (nb_filters x kernel_size) matrix of the filters. Both matrices are row-major, so the innermost loop is a contiguous dot product. The patches are processed by blocks so that a block of filters stays in cache.
+
+        Returns the statement of the wrapper updating the flattened filters when w is set.
+        """
+        nb_filters = self.weights.shape[0] if self.multiple else 1
+        ids = {
+            'id_proj': self.id,
+            'id_pre': self.pre.id,
+            'id_post': self.post.id,
+            'target': self.target,
+            'float_prec': Global.config['precision'],
+            'nb_patches': int(self.post.size / nb_filters),
+            'nb_filters': nb_filters,
+            'kernel_size': int(self.weights.size / nb_filters),
+            'padding': 0.0 if isinstance(self.padding, str) else self.padding,
+            'omp_code': "#pragma omp parallel for" if Global.config['num_threads'] > 1 else "",
+            # 16 kB of filters per block (half of a common L1 cache)
+            'block_k': max(1, int(16384 / (nb_filters * (4 if Global.config['precision'] == "float" else 8)))),
+            'block_p': 64,
+        }
+
+        self._specific_template['declare_connectivity_matrix'] += """
+    // im2col/GEMM engine
+    std::vector<int> _im2col_idx;
+    std::vector<%(float_prec)s> _im2col;
+    std::vector<%(float_prec)s> _w_gemm;
+""" % ids
+
+        self._specific_template['access_connectivity_matrix'] += """
+    // im2col/GEMM engine
+    void set_im2col_idx(std::vector<int> idx) { _im2col_idx = idx; _im2col = std::vector<%(float_prec)s>(idx.size(), 0.0); }
+    void set_w_gemm(std::vector<%(float_prec)s> value) { _w_gemm = value; }
+""" % ids
+
+        self._specific_template['export_connectivity'] += """
+        # im2col/GEMM engine
+        void set_im2col_idx(vector[int])
+        void set_w_gemm(vector[%(float_prec)s])
+""" % ids
+
+        self._specific_template['wrapper_access_connectivity'] += """
+    # im2col/GEMM engine
+    def set_im2col_idx(self, idx):
+        proj%(id_proj)s.set_im2col_idx(idx)
+""" % ids
+
+        # The flattened filters have to follow the modifications of w
+        self._specific_template['wrapper_init_connectivity'] += """
+        proj%(id_proj)s.set_w_gemm(np.array(weights, dtype=np.float64).reshape((%(nb_filters)s, -1)).T.reshape(-1))
+""" % ids
+
+        if self.delays > Global.config['dt']:
+            ids['pre_r'] = "pop%(id_pre)s._delayed_r[delay-1]" % ids
+        else:
+            ids['pre_r'] = "pop%(id_pre)s.r" % ids
+
+        self._specific_template['psp_prefix'] = ""
+        self._specific_template['psp_code'] = """
+        if ( _transmission && pop%(id_pre)s._active ) {
+        const %(float_prec)s* _pre_r = %(pre_r)s.data();
+        const int* _idx = _im2col_idx.data();
+        %(float_prec)s* _col = _im2col.data();
+        const %(float_prec)s* _w = _w_gemm.data();
+        %(float_prec)s* _sum = pop%(id_post)s._sum_%(target)s.data();
+
+        // im2col: gather the pre-synaptic patches
+        %(omp_code)s
+        for(int p = 0; p < %(nb_patches)s; p++) {
+            for(int k = 0; k < %(kernel_size)s; k++) {
+                int rk_pre = _idx[p*%(kernel_size)s + k];
+                _col[p*%(kernel_size)s + k] = (rk_pre < 0) ? %(padding)s : _pre_r[rk_pre];
+            }
+        }
+
+        // GEMM: sum[p, :] += sum_k patch[p, k] * w[k, :]. w is stored transposed, so that the
+        // innermost loop runs over the contiguous filters of a position. The rows of w are
+        // processed by blocks fitting in the L1 cache, reused for a block of patches.
+        %(omp_code)s
+        for(int p0 = 0; p0 < %(nb_patches)s; p0 += %(block_p)s) {
+            int p1 = std::min(p0 + %(block_p)s, %(nb_patches)s);
+            for(int k0 = 0; k0 < %(kernel_size)s; k0 += %(block_k)s) {
+                int k1 = std::min(k0 + %(block_k)s, %(kernel_size)s);
+                for(int p = p0; p < p1; p++) {
+                    const %(float_prec)s* _patch = _col + p*%(kernel_size)s;
+                    %(float_prec)s* _out = _sum + p*%(nb_filters)s;
+                    for(int k = k0; k < k1; k++) {
+                        const %(float_prec)s _pre = _patch[k];
+                        const %(float_prec)s* _filters = _w + k*%(nb_filters)s;
+                        for(int f = 0; f < %(nb_filters)s; f++) {
+                            _out[f] += _pre * _filters[f];
+                        }
+                    }
+                }
+            }
+        }
+        } // if
+""" % ids
+
+        return "proj%(id_proj)s.set_w_gemm(np.array(value, dtype=np.float64).reshape((%(nb_filters)s, -1)).T.reshape(-1))" % ids
+
+    def _generate_fft_omp(self):
+        """
+        Replaces the computation of the weighted sums by the FFT engine.
+
+        The pre-synaptic population, padded by the size of the kernel with the padding value (or its border), is transformed with 2D real FFTs. The product with the cached spectrum of the kernel is transformed back and the valid part is the result. The cost is O(N log N) per update instead of O(N K) for the direct loops.
+
+        Returns the statement of the wrapper updating the spectrum of the kernel when w is set.
+        """
+        # 1D populations are processed as a single row
+        pre_h, pre_w = (1, self.pre.geometry[0]) if self.dim_pre == 1 else self.pre.geometry
+        kernel_h, kernel_w = (1, self.weights.shape[0]) if self.dim_kernel == 1 else self.weights.shape
+
+        # Center of the kernel applied as a filter (the convolution is a filter with the flipped kernel)
+        center_h, center_w = self._center_filter(kernel_h), self._center_filter(kernel_w)
+        if self.method == 'convolution':
+            center_h, center_w = kernel_h - 1 - center_h, kernel_w - 1 - center_w
+
+        # Power-of-two transforms at least as large as the padded population
+        lp_y, lp_x = pre_h + kernel_h - 1, pre_w + kernel_w - 1
+        ny = 1 << int(np.ceil(np.log2(lp_y)))
+        nx = max(2, 1 << int(np.ceil(np.log2(lp_x))))
+
+        if self.update_period is None:
+            period = 1
+        else:
+            period = max(1, int(round(self.update_period / Global.config['dt'])))
+
+        ids = {
+            'id_proj': self.id,
+            'id_pre': self.pre.id,
+            'id_post': self.post.id,
+            'target': self.target,
+            'float_prec': Global.config['precision'],
+            'size_post': self.post.size,
+            'pre_h': pre_h, 'pre_w': pre_w,
+            'post_h': pre_h, 'post_w': pre_w,
+            'kernel_h': kernel_h, 'kernel_w': kernel_w,
+            'top': center_h, 'left': center_w,
+            'lp_y': lp_y, 'lp_x': lp_x,
+            'ny': ny, 'nx': nx, 'hx': nx // 2, 'mx': nx // 2 + 1,
+            'scale': nx * ny,
+            'period': period,
+            # The circular convolution with the flipped filter computes the correlation
+            'flip': "[::-1, ::-1]" if self.method == 'filter' else "",
+            'padding': 0.0 if isinstance(self.padding, str) else self.padding,
+            'omp_parallel': "#pragma omp parallel" if Global.config['num_threads'] > 1 else "",
+            'omp_for': "#pragma omp for" if Global.config['num_threads'] > 1 else "",
+        }
+        if self.delays > Global.config['dt']:
+            ids['pre_r'] = "pop%(id_pre)s._delayed_r[delay-1]" % ids
+        else:
+            ids['pre_r'] = "pop%(id_pre)s.r" % ids
+        if isinstance(self.padding, str): # 'border'
+            ids['fill_row'] = fft_fill_row_border % ids
+        else:
+            ids['fill_row'] = fft_fill_row_constant % ids
+
+        for key in ['declare_connectivity_matrix', 'access_connectivity_matrix', 'export_connectivity', 'wrapper_access_connectivity']:
+            self._specific_template[key] += fft_template_omp[key] % ids
+        self._specific_template['include_additional'] = fft_template_omp['include_additional']
+
+        # The spectrum of the kernel has to follow the modifications of w
+        self._specific_template['wrapper_init_connectivity'] += """
+        self._update_fft(weights)
+"""
+
+        self._specific_template['psp_prefix'] = ""
+        self._specific_template['psp_code'] = fft_template_omp['psp_code'] % ids
+
+        return "self._update_fft(value)"
+
     ################################
     ### Utilities
     ################################
@@ -537,10 +956,36 @@ class Convolution(Projection):
 
         return txt
 
-    def _generate_convolve_code(self):
+    def _replace_outside_rates(self, increment, outside):
+        "Replaces the pre-synaptic rate in the psp by the padding value when the coordinates are outside of the population."
+        for rate in ['pop%(id_pre)s.r[rk_pre]' % {'id_pre': self.pre.id}, 'delayed_r[rk_pre]']:
+            increment = increment.replace(rate, '(' + outside + ' ? ' + str(self.padding) + ' : ' + rate + ')')
+        return increment
+
+    def _interior_mask(self):
+        """
+        Returns for each post-synaptic neuron whether its receptive field lies entirely inside the pre-synaptic population, in which case no bound check is needed.
+        """
+        kernel_shape = self.weights.shape[1:] if self.multiple else self.weights.shape
+        coords = np.array(self.pre_coordinates, dtype=np.int64).reshape((self.post.size, -1))
+
+        interior = np.ones(self.post.size, dtype=bool)
+        for dim in range(len(kernel_shape)):
+            center = self._center_filter(kernel_shape[dim])
+            if self.method == 'convolution':
+                low, high = coords[:, dim] - (kernel_shape[dim] - 1 - center), coords[:, dim] + center
+            else:
+                low, high = coords[:, dim] - center, coords[:, dim] + (kernel_shape[dim] - 1 - center)
+            interior &= (low >= 0) & (high <= self.pre.geometry[dim] - 1)
+        return interior
 
+    def _generate_convolve_code(self, bounds=True):
+        """
+        Generates the loops over the kernel for a single post-synaptic neuron. Without bounds, the coordinates are not checked against the geometry of the pre-synaptic population (interior neurons).
+        """
         # Operation to be performed: sum, max, min, mean
         operation = self.synapse_type.operation
+        outside = None
 
         # Main code
         code = tabify("sum = 0.0;", 3)
@@ -564,19 +1009,20 @@ class Convolution(Projection):
                 code += tabify("""int %(index)s_pre = coord[%(dim)s];""" % { 'id_proj': self.id, 'index': indices[dim], 'dim': dim}, 1)
 
             # Check indices
-            if operation in ['sum', 'mean']:
+            if not bounds:
+                pass
+            elif operation in ['sum', 'mean']:
                 if isinstance(self.padding, str): # 'border'
                         code += tabify("""
                 if (%(index)s_pre < 0) %(index)s_pre = 0 ;
                 if (%(index)s_pre > %(max_size)s) %(index)s_pre = %(max_size)s ;
                 """ % { 'index': indices[dim], 'dim': dim, 'max_size': self.pre.geometry[dim] -1}, dim)
                 else:
+                    # the padding value replaces the pre-synaptic rate outside
                     code += tabify("""
-                if ((%(index)s_pre < 0) || (%(index)s_pre > %(max_size)s)){
-                    sum += %(padding)s;
-                    continue;
-                }
-                """ % { 'index': indices[dim], 'padding': self.padding, 'max_size': self.pre.geometry[dim] -1}, dim)
+                bool _outside_%(index)s = %(previous)s(%(index)s_pre < 0) || (%(index)s_pre > %(max_size)s);
+                """ % { 'index': indices[dim], 'previous': '' if outside is None else outside + ' || ', 'max_size': self.pre.geometry[dim] -1}, dim)
+                    outside = '_outside_' + indices[dim]
 
             else: # min, max
                 code += """
@@ -587,7 +1033,7 @@ class Convolution(Projection):
 
         # Compute pre-synaptic rank
         code += tabify("""
-                rk_pre = %(value)s;""" % {'value': self._coordinates_to_rank('pre', self.pre.geometry)}, dim)
+                rk_pre = %(value)s;""" % {'value': self._coordinates_to_rank('pre', self.pre.geometry) if outside is None else outside + ' ? 0 : ' + self._coordinates_to_rank('pre', self.pre.geometry)}, dim)
 
         # Compute the increment
         index = ""
@@ -612,10 +1058,14 @@ class Convolution(Projection):
                 'delayed_r[rk_pre]'
             )
 
+        # Padding
+        if outside is not None:
+            increment = self._replace_outside_rates(increment, outside)
+
         # Apply the operation
         if operation == "sum":
             code += tabify("""
-                sum += %(increment)s""" % {'increment': increment.replace('w'+inner_idx, 'inner_line')}, dim)
+                sum += %(increment)s""" % {'increment': increment.replace('w'+inner_idx+'[', 'inner_line[')}, dim)
         elif operation == "max":
             code += tabify("""
                 %(float_prec)s _psp = %(increment)s
@@ -654,10 +1104,13 @@ class Convolution(Projection):
 
         return impl_code, sum_code
 
-    def _generate_bank_code(self):
-
+    def _generate_bank_code(self, bounds=True):
+        """
+        Same as _generate_convolve_code() for a bank of filters: the filter is selected by the last coordinate of the post-synaptic neuron.
+        """
         # Operation to be performed: sum, max, min, mean
         operation = self.synapse_type.operation
+        outside = None
 
         # Main code
         code = tabify("sum = 0.0;", 3)
@@ -675,19 +1128,20 @@ class Convolution(Projection):
                 code += tabify("""int %(index)s_pre = coord[%(dim)s];""" % { 'id_proj': self.id, 'index': indices[dim], 'dim': dim}, 1)
 
             # Check indices
-            if operation in ['sum', 'mean']:
+            if not bounds:
+                pass
+            elif operation in ['sum', 'mean']:
                 if isinstance(self.padding, str): # 'border'
                     code += tabify("""
             if (%(index)s_pre < 0) %(index)s_pre = 0 ;
             if (%(index)s_pre > %(max_size)s) %(index)s_pre = %(max_size)s ;
             """ % { 'index': indices[dim], 'dim': dim, 'max_size': self.pre.geometry[dim] -1}, 1+dim)
                 else:
+                    # the padding value replaces the pre-synaptic rate outside
                     code += tabify("""
-            if ((%(index)s_pre < 0) || (%(index)s_pre > %(max_size)s)) {
-                sum += %(padding)s;
-                continue;
-            }
-            """ % { 'index': indices[dim], 'padding': self.padding, 'max_size': self.pre.geometry[dim] -1}, 1+dim)
+            bool _outside_%(index)s = %(previous)s(%(index)s_pre < 0) || (%(index)s_pre > %(max_size)s);
+            """ % { 'index': indices[dim], 'previous': '' if outside is None else outside + ' || ', 'max_size': self.pre.geometry[dim] -1}, 1+dim)
+                    outside = '_outside_' + indices[dim]
 
             else: # min, max
                 code += tabify("""
@@ -698,7 +1152,7 @@ class Convolution(Projection):
 
         # Compute pre-synaptic rank
         code +=tabify("""
-            rk_pre = %(value)s;""" % {'value': self._coordinates_to_rank('pre', self.pre.geometry)}, 1+dim)
+            rk_pre = %(value)s;""" % {'value': self._coordinates_to_rank('pre', self.pre.geometry) if outside is None else outside + ' ? 0 : ' + self._coordinates_to_rank('pre', self.pre.geometry)}, 1+dim)
 
         # Compute the increment
         index = "[coord["+str(self.dim_pre)+"]]"
@@ -722,6 +1176,10 @@ class Convolution(Projection):
                 'delayed_r[rk_pre]'
             )
 
+        # Padding
+        if outside is not None:
+            increment = self._replace_outside_rates(increment, outside)
+
         # Apply the operation
         if operation == "sum":
             code += tabify("""
@@ -762,6 +1220,14 @@ class Convolution(Projection):
     ##############################
     ## Override useless methods
     ##############################
+    def reset(self, attributes=-1, synapses=False):
+        """
+        Resets the parameters and variables of the projection (see ``Projection.reset()``). With the 'fft' engine, the cached result is also discarded.
+        """
+        Projection.reset(self, attributes, synapses)
+        if self.engine == 'fft' and self.initialized:
+            self.cyInstance.reset_fft()
+
     def _data(self):
         "Disable saving."
         desc = {}
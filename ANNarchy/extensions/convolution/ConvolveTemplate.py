@@ -21,3 +21,213 @@
 #     along with this program.  If not, see <http://www.gnu.org/licenses/>.
 #
 # =============================================================================
+
+# FFT engine of Convolution. The pre-synaptic population is padded by the size of the kernel
+# (Lp_y x Lp_x) and transformed with power-of-two FFTs (Ny x Nx). The rows are real and are
+# transformed with a complex FFT of half length, so that only Nx/2+1 columns are stored.
+fft_template_omp = {
+    'include_additional': """#include <complex>
+#include <cmath>""",
+
+    'declare_connectivity_matrix': """
+    // FFT engine: spectrum of the padded pre-synaptic population (Ny x Nx/2+1, row-major),
+    // scaled spectrum of the kernel (Nx/2+1 x Ny, column-major) and cached result
+    std::vector< std::complex<double> > _fft_spectrum;
+    std::vector< std::complex<double> > _fft_kernel;
+    std::vector< std::complex<double> > _fft_tw_x;
+    std::vector< std::complex<double> > _fft_tw_y;
+    std::vector< std::complex<double> > _fft_rot;
+    std::vector<int> _fft_rev_x;
+    std::vector<int> _fft_rev_y;
+    std::vector<double> _fft_out;
+    long int _fft_step;
+""",
+
+    'access_connectivity_matrix': """
+    // FFT engine
+    void set_fft_kernel(std::vector<double> re, std::vector<double> im) {
+        if (_fft_spectrum.empty()) {
+            _fft_spectrum = std::vector< std::complex<double> >(%(ny)s * %(mx)s, std::complex<double>(0.0, 0.0));
+            _fft_out = std::vector<double>(%(size_post)s, 0.0);
+            _fft_tables(%(hx)s, _fft_rev_x, _fft_tw_x);
+            _fft_tables(%(ny)s, _fft_rev_y, _fft_tw_y);
+            _fft_rot = std::vector< std::complex<double> >(%(mx)s);
+            for(int k = 0; k < %(mx)s; k++)
+                _fft_rot[k] = std::polar(1.0, -2.0 * std::acos(-1.0) * k / %(nx)s);
+        }
+        _fft_kernel = std::vector< std::complex<double> >(re.size());
+        for(int k = 0; k < re.size(); k++)
+            _fft_kernel[k] = std::complex<double>(re[k], im[k]);
+        // the result has to be computed again with the new weights
+        _fft_step = 0;
+    }
+
+    // The result is computed again at the next step
+    void reset_fft() { _fft_step = 0; }
+
+    // Bit-reversal permutation and twiddle factors of a transform of size n
+    void _fft_tables(int n, std::vector<int> &rev, std::vector< std::complex<double> > &tw) {
+        int bits = 0;
+        while ((1 << bits) < n)
+            bits++;
+        rev = std::vector<int>(n, 0);
+        for(int i = 0; i < n; i++)
+            for(int b = 0; b < bits; b++)
+                if (i & (1 << b))
+                    rev[i] |= 1 << (bits - 1 - b);
+        tw = std::vector< std::complex<double> >(std::max(1, n/2));
+        for(int k = 0; k < n/2; k++)
+            tw[k] = std::polar(1.0, -2.0 * std::acos(-1.0) * k / n);
+    }
+
+    // In-place radix-2 transform: exp(-2i pi nk/n) (forward) or exp(+2i pi nk/n) (inverse, not normalized)
+    void _fft(std::complex<double>* a, int n, const std::vector<int> &rev, const std::vector< std::complex<double> > &tw, bool inverse) {
+        for(int i = 0; i < n; i++)
+            if (i < rev[i])
+                std::swap(a[i], a[rev[i]]);
+        const double sign = inverse ? -1.0 : 1.0;
+        for(int len = 2; len <= n; len <<= 1) {
+            int half = len >> 1;
+            int step = n / len;
+            for(int i = 0; i < n; i += len) {
+                for(int k = 0; k < half; k++) {
+                    double wr = tw[k*step].real(), wi = sign * tw[k*step].imag();
+                    double br = a[i+k+half].real(), bi = a[i+k+half].imag();
+                    std::complex<double> t(wr * br - wi * bi, wr * bi + wi * br);
+                    a[i+k+half] = a[i+k] - t;
+                    a[i+k] += t;
+                }
+            }
+        }
+    }
+
+    // Spectrum X (Nx/2+1 values) of a real row from the transform z of its (even, odd) pairs
+    void _rfft_post(const std::complex<double>* z, std::complex<double>* X) {
+        for(int k = 0; k < %(mx)s; k++) {
+            std::complex<double> a = z[k %% %(hx)s];
+            std::complex<double> b = std::conj(z[(%(hx)s - k) %% %(hx)s]);
+            std::complex<double> even = 0.5 * (a + b);
+            std::complex<double> odd = std::complex<double>(0.0, -0.5) * (a - b);
+            X[k] = even + _fft_rot[k] * odd;
+        }
+    }
+
+    // Inverse of _rfft_post (scaled by Nx once transformed back)
+    void _irfft_pre(const std::complex<double>* X, std::complex<double>* z) {
+        for(int k = 0; k < %(hx)s; k++) {
+            std::complex<double> a = X[k];
+            std::complex<double> b = std::conj(X[%(hx)s - k]);
+            std::complex<double> odd = (a - b) * std::conj(_fft_rot[k]);
+            z[k] = (a + b) + std::complex<double>(0.0, 1.0) * odd;
+        }
+    }
+""",
+
+    'export_connectivity': """
+        # FFT engine
+        void set_fft_kernel(vector[double], vector[double])
+        void reset_fft()
+""",
+
+    # The spectrum of the kernel is computed by numpy each time the weights are set
+    'wrapper_access_connectivity': """
+    # FFT engine
+    def _update_fft(self, value):
+        kernel = np.array(value, dtype=np.float64).reshape((%(kernel_h)s, %(kernel_w)s))%(flip)s
+        padded = np.zeros((%(ny)s, %(nx)s))
+        padded[:%(kernel_h)s, :%(kernel_w)s] = kernel
+        spectrum = (np.fft.rfft2(padded) / %(scale)s).T.reshape(-1)
+        proj%(id_proj)s.set_fft_kernel(spectrum.real, spectrum.imag)
+    def reset_fft(self):
+        proj%(id_proj)s.reset_fft()
+""",
+
+    'psp_code': """
+        if ( _transmission && pop%(id_pre)s._active ) {
+        if (_fft_step %% %(period)s == 0) {
+        const %(float_prec)s* _pre_r = %(pre_r)s.data();
+        std::complex<double>* _spec = _fft_spectrum.data();
+        const std::complex<double>* _kernel = _fft_kernel.data();
+        double* _out = _fft_out.data();
+
+        // Real transforms of the padded pre-synaptic rows
+        %(omp_parallel)s
+        {
+        std::vector<double> _row(%(nx)s, 0.0);
+        std::vector< std::complex<double> > _z(%(hx)s);
+        %(omp_for)s
+        for(int p = 0; p < %(lp_y)s; p++) {
+%(fill_row)s
+            for(int n = 0; n < %(hx)s; n++)
+                _z[n] = std::complex<double>(_row[2*n], _row[2*n+1]);
+            _fft(_z.data(), %(hx)s, _fft_rev_x, _fft_tw_x, false);
+            _rfft_post(_z.data(), _spec + p * %(mx)s);
+        }
+        }
+
+        // Column transforms, product with the kernel and inverse column transforms
+        %(omp_parallel)s
+        {
+        std::vector< std::complex<double> > _col(%(ny)s);
+        %(omp_for)s
+        for(int k = 0; k < %(mx)s; k++) {
+            for(int y = 0; y < %(lp_y)s; y++)
+                _col[y] = _spec[y * %(mx)s + k];
+            for(int y = %(lp_y)s; y < %(ny)s; y++)
+                _col[y] = std::complex<double>(0.0, 0.0);
+            _fft(_col.data(), %(ny)s, _fft_rev_y, _fft_tw_y, false);
+            for(int y = 0; y < %(ny)s; y++)
+                _col[y] *= _kernel[k * %(ny)s + y];
+            _fft(_col.data(), %(ny)s, _fft_rev_y, _fft_tw_y, true);
+            // only the rows of the result are needed
+            for(int i = 0; i < %(post_h)s; i++)
+                _spec[(i + %(kernel_h)s - 1) * %(mx)s + k] = _col[i + %(kernel_h)s - 1];
+        }
+        }
+
+        // Inverse real transforms of the rows of the result
+        %(omp_parallel)s
+        {
+        std::vector< std::complex<double> > _z(%(hx)s);
+        %(omp_for)s
+        for(int i = 0; i < %(post_h)s; i++) {
+            _irfft_pre(_spec + (i + %(kernel_h)s - 1) * %(mx)s, _z.data());
+            _fft(_z.data(), %(hx)s, _fft_rev_x, _fft_tw_x, true);
+            const double* _res = reinterpret_cast<const double*>(_z.data());
+            for(int j = 0; j < %(post_w)s; j++)
+                _out[i * %(post_w)s + j] = _res[j + %(kernel_w)s - 1];
+        }
+        }
+        } // update
+        _fft_step++;
+
+        for(int i = 0; i < %(size_post)s; i++)
+            pop%(id_post)s._sum_%(target)s[i] += _fft_out[i];
+        } // if
+""",
+}
+
+# Padded row p of the pre-synaptic population for the FFT engine, either with a constant
+# value or by repeating the border
+fft_fill_row_constant = """            int sy = p - %(top)s;
+            if ((sy < 0) || (sy >= %(pre_h)s)) {
+                for(int x = 0; x < %(lp_x)s; x++)
+                    _row[x] = %(padding)s;
+            } else {
+                const %(float_prec)s* _src = _pre_r + sy * %(pre_w)s;
+                for(int x = 0; x < %(left)s; x++)
+                    _row[x] = %(padding)s;
+                for(int x = 0; x < %(pre_w)s; x++)
+                    _row[%(left)s + x] = _src[x];
+                for(int x = %(left)s + %(pre_w)s; x < %(lp_x)s; x++)
+                    _row[x] = %(padding)s;
+            }"""
+
+fft_fill_row_border = """            int sy = std::min(std::max(p - %(top)s, 0), %(pre_h)s - 1);
+            const %(float_prec)s* _src = _pre_r + sy * %(pre_w)s;
+            for(int x = 0; x < %(left)s; x++)
+                _row[x] = _src[0];
+            for(int x = 0; x < %(pre_w)s; x++)
+                _row[%(left)s + x] = _src[x];
+            for(int x = %(left)s + %(pre_w)s; x < %(lp_x)s; x++)
+                _row[x] = _src[%(pre_w)s - 1];"""
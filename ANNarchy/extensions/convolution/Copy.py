@@ -32,54 +32,88 @@ from .Utils import SharedSynapse
 
 class CopyProjection(Projection):
     """
-    Creates a virtual connection pattern reusing the weights and delays of an already-defined projection.
+    Creates a virtual connection pattern reusing the connectivity and the weights of an already-defined projection.
 
-    Although the original projection can be learnable, this one can not. Changes in the original weights will be reflected in this projection. The only possible modifications are ``psp`` and ``operation``.
+    The copy does not allocate any synapse: the generated code reads the indices and the weights of the original projection, so that replicated networks (e.g. identical cortical columns) store their connectivity only once. Although the original projection can be learnable, this one can not. Changes in the original weights (by learning or by ``set()``) will be reflected in this projection. The only possible modifications are ``psp`` and ``operation``.
 
     The pre- and post-synaptic populations of each projection must have the same geometry.
+
+    Regular projections connected with the same connector and arguments already share their indices automatically, but not their weights.
+
+    .. note::
+
+        The signature changed from ``CopyProjection(projection)`` to ``CopyProjection(pre, post, target, projection, ...)``.
     """
-    def __init__(self, projection):
+    def __init__(self, pre, post, target, projection, psp=None, operation=None, name=None, copied=False):
         """
-        Constructor
-
         *Parameters*:
 
-        * **projection**: the projection to reuse.
+        * **pre**: pre-synaptic population (either its name or a ``Population`` object).
+
+        * **post**: post-synaptic population (either its name or a ``Population`` object).
+
+        * **target**: type of the connection.
+
+        * **projection**: the projection to reuse. It must be a regular rate-coded projection, already connected with uniform delays.
+
+        * **psp**: synaptic transmission, e.g. "pre.r * w" (default: the psp of the original projection).
+
+        * **operation**: operation applied on the synaptic inputs, "sum", "max", "min" or "mean" (default: the operation of the original projection).
         """
         self._operation_type = 'copy'
         self.projection = projection
 
-        # Create the description, but it will not be used for generation
-        Projection.__init__(
-            self,
-            pre=projection.pre,
-            post=projection.post,
-            target=projection.target,
-            synapse = SharedSynapse(psp=projection.psp, operation=projection.operation),
-            name=projection.name,
-            copied=True
-        )
-
         # Sanity checks
         if not isinstance(self.projection, Projection):
-            Global._error('CopyProjection: You must provide an existing projection to copy().')
+            Global._error('CopyProjection: You must provide an existing projection to copy.')
 
-        if isinstance(self.projection, (ConvolutionProjection, PoolingProjection)):
+        if isinstance(self.projection, (Convolution, Pooling, CopyProjection)):
             Global._error('CopyProjection: You can only copy regular projections, not shared projections.')
 
+        if self.projection._connection_method is None:
+            Global._error('CopyProjection: the projection to copy must be connected first.')
+
+        if self.projection.synapse_type.type != 'rate':
+            Global._error('CopyProjection: only rate-coded projections can be copied.')
+
+        if self.projection._storage_format != "lil":
+            Global._error('CopyProjection: only projections stored as lists of lists (lil) can be copied.')
+
+        if not isinstance(self.projection._connection_delay, (int, float)):
+            Global._error('CopyProjection: only projections with uniform delays can be copied.')
+
+        self.psp = psp if psp is not None else self.projection.synapse_type.description['raw_psp']
+        self.operation = operation if operation is not None else self.projection.synapse_type.operation
+
+        # Create the description, but it will not be used for generation
+        Projection.__init__(
+            self,
+            pre,
+            post,
+            target,
+            synapse=SharedSynapse(psp=self.psp, operation=self.operation),
+            name=name,
+            copied=copied
+        )
+
         if not self.pre.geometry == self.projection.pre.geometry or not self.post.geometry == self.projection.post.geometry:
             Global._error('CopyProjection: When copying a projection, the geometries must be the same.')
 
+        # The transmission delay is the one of the original projection
+        self.delays = self.projection._connection_delay
+
         # Dummy weights
         self.weights = None
         self.pre_coordinates = []
 
-        # Finish building the synapses
-        self._create()
+        # Finish building the synapses (the connectivity of copies is stored by the network)
+        if not copied:
+            self._create()
 
     def _copy(self, pre, post):
         "Returns a copy of the projection when creating networks. Internal use only."
-        raise NotImplementedError
+        # The projections keep their ids in a network, so the copy reads the network's instance of the original projection
+        return CopyProjection(pre=pre, post=post, target=self.target, projection=self.projection, psp=self.psp, operation=self.operation, name=self.name, copied=True)
 
     def _create(self):
         # create fake LIL object, just for compilation.
@@ -92,8 +126,8 @@ class CopyProjection(Projection):
         lil = LILConnectivity()
         lil.max_delay = self.delays
         lil.uniform_delay = self.delays
-        self.connector_name = "Convolution"
-        self.connector_description = "Convolution"
+        self.connector_name = "Copy"
+        self.connector_description = "Copy of proj" + str(self.projection.id)
         self._store_connectivity(self._load_from_lil, (lil, ), self.delays)
 
     def _connect(self, module):
@@ -103,12 +137,12 @@ class CopyProjection(Projection):
         if not self._connection_method:
             Global._error('CopyProjection: The projection between ' + self.pre.name + ' and ' + self.post.name + ' is declared but not connected.')
 
-        # Create the Cython instance
+        # Create the Cython instance: no synapse is allocated
         proj = getattr(module, 'proj'+str(self.id)+'_wrapper')
         self.cyInstance = proj(self.weights, self.pre_coordinates)
 
         # Define the list of postsynaptic neurons
-        self.post_ranks = list(range(self.post.size))
+        self.post_ranks = self.cyInstance.post_rank()
 
         # Set delays after instantiation
         if self.delays > 0.0:
@@ -125,7 +159,7 @@ class CopyProjection(Projection):
         else:
             raise NotImplementedError
 
-    def generate_omp(self):
+    def _generate_omp(self):
         """
         Code generation of CopyProjection object for the openMP paradigm.
         """
@@ -139,6 +173,15 @@ class CopyProjection(Projection):
             }
             copy_proj_dict[key] = value
 
+        # The weight of the original projection is a single value or a list of lists
+        single_weight = self.projection._has_single_weight() or 'w' in self.projection.synapse_type.description['global']
+        if single_weight:
+            for accessor in ["get_w()", "get_dendrite_w(rank)", "get_synapse_w(rank_post, rank_pre)"]:
+                copy_proj_dict['wrapper_access_connectivity'] = copy_proj_dict['wrapper_access_connectivity'].replace(
+                    "proj%(id_copy)s.%(accessor)s" % {'id_copy': self.projection.id, 'accessor': accessor},
+                    "proj%(id_copy)s.w" % {'id_copy': self.projection.id}
+                )
+
         # Update specific template
         self._specific_template.update(copy_proj_dict)
 
@@ -152,7 +195,7 @@ class CopyProjection(Projection):
         psp = self.synapse_type.description['psp']['cpp']  % {
             'id_pre': self.pre.id,
             'id_post': self.post.id,
-            'local_index':'[i][j]',
+            'local_index': '' if single_weight else '[i][j]',
             'global_index': '[i]',
             'pre_index': '[pre_rank[i][j]]',
             'post_index': '[post_rank[i]]',
@@ -163,9 +206,8 @@ class CopyProjection(Projection):
         # Take delays into account if any
         if self.delays > Global.config['dt']:
             psp = psp.replace(
-                'pop%(id_pre)s.r[rk_pre]' % {'id_pre': self.pre.id},
-                'pop%(id_pre)s._delayed_r[delay-1][rk_pre]' % {'id_pre': self.pre.id}
-                # TODO HD: wouldn't it be much better to reduce delay globaly, instead of the substraction here???
+                'pop%(id_pre)s.r[' % {'id_pre': self.pre.id},
+                'pop%(id_pre)s._delayed_r[delay-1][' % {'id_pre': self.pre.id}
             )
 
         # Select template for operation to be performed: sum, max, min, mean
@@ -175,15 +217,17 @@ class CopyProjection(Projection):
             Global._error("CopyProjection: the operation ", self.synapse_type.operation, ' is not available.')
 
         # Finalize code
-        self.generator['omp']['body_compute_psp'] = sum_code % {
+        self._specific_template['psp_code'] = sum_code % {
             'id_proj': self.id, 'target': self.target,
             'id_pre': self.pre.id, 'name_pre': self.pre.name,
             'id_post': self.post.id, 'name_post': self.post.name,
             'id': self.projection.id,
             'float_prec': Global.config['precision'],
             'omp_code': omp_code,
-            'psp': psp
+            'psp': psp,
+            'weights': "%(float_prec)s w" % {'float_prec': Global.config['precision']} if single_weight else "const std::vector< std::vector<%(float_prec)s> > &w" % {'float_prec': Global.config['precision']},
         }
+        self._specific_template['size_in_bytes'] = "// the synapses belong to proj%(id)s\n" % {'id': self.projection.id}
 
     def _generate_cuda(self):
         """
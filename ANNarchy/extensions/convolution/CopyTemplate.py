@@ -23,25 +23,41 @@
 # =============================================================================
 
 copy_proj_template = {
+    # The copy reads the connectivity of the original projection
+    'include_additional': """#include "proj%(id_copy)s.hpp"
+extern ProjStruct%(id_copy)s proj%(id_copy)s;""",
     # Declare the connectivity matrix
     'declare_connectivity_matrix': "",
     # Accessors for the connectivity matrix
-    'access_connectivity_matrix': "",
+    'access_connectivity_matrix': """
+    // Connectivity of the original projection
+    std::vector<int> get_post_rank() { return proj%(id_copy)s.post_rank; }
+    std::vector< std::vector<int> > get_pre_rank() { return proj%(id_copy)s.pre_rank; }
+    int nb_synapses(int n) { return proj%(id_copy)s.pre_rank[n].size(); }
+""",
     # No initiaization of the connectivity matrix
     'init_connectivity_matrix': "",
     # Export the connectivity matrix
-    'export_connectivity': "",
-    # Initialize the wrapper connectivity matrix
-    'wrapper_init_connectivity': "",
+    'export_connectivity': """
+        # Connectivity
+        vector[int] get_post_rank()
+        vector[vector[int]] get_pre_rank()
+""",
+    # Arguments to the wrapper constructor
+    'wrapper_args': "weights, coords",
+    # Initialize the wrapper connectivity matrix: nothing to allocate
+    'wrapper_init_connectivity': """
+        pass
+""",
     # Delays
     'wrapper_init_delay': "",
     # Wrapper access to connectivity matrix
     'wrapper_access_connectivity': """
     # Connectivity
     def post_rank(self):
-        return proj%(id_copy)s.get_post_rank()
+        return proj%(id_proj)s.get_post_rank()
     def pre_rank(self, int n):
-        return proj%(id_copy)s.get_pre_rank()[n]
+        return proj%(id_proj)s.get_pre_rank()[n]
     # Local variable w
     def get_w(self):
         return proj%(id_copy)s.get_w()
@@ -60,14 +76,21 @@ copy_proj_template = {
     'wrapper_access_parameters_variables' : "",
     # Variables for the psp code
     'psp_prefix': """
-        int rk_pre;
-        %(float_prec)s sum=0.0;"""
+        %(float_prec)s sum=0.0;""",
+    # Override the monitor to avoid recording the weights
+    'monitor_class': "",
+    'monitor_export': "",
+    'monitor_wrapper': ""
 }
 
+# The connectivity and the weights are references to the ones of the original projection
 copy_sum_template = {
     'sum': """
     // proj%(id_proj)s: %(name_pre)s -> %(name_post)s with target %(target)s, copied from proj%(id)s
-    if(pop%(id_post)s._active){
+    if( _transmission && pop%(id_post)s._active ){
+        const std::vector<int> &post_rank = proj%(id)s.post_rank;
+        const std::vector< std::vector<int> > &pre_rank = proj%(id)s.pre_rank;
+        %(weights)s = proj%(id)s.w;
         %(omp_code)s
         for(int i = 0; i < post_rank.size(); i++){
             sum = 0.0;
@@ -80,11 +103,16 @@ copy_sum_template = {
 """,
     'max': """
     // proj%(id_proj)s: %(name_pre)s -> %(name_post)s with target %(target)s, copied from proj%(id)s
-    if(pop%(id_post)s._active){
+    if( _transmission && pop%(id_post)s._active ){
+        const std::vector<int> &post_rank = proj%(id)s.post_rank;
+        const std::vector< std::vector<int> > &pre_rank = proj%(id)s.pre_rank;
+        %(weights)s = proj%(id)s.w;
         %(omp_code)s
         for(int i = 0; i < post_rank.size(); i++){
-            sum = %(psp)s;
-            for(int j = 0; j < pre_rank[i].size(); j++){
+            if (pre_rank[i].empty())
+                continue;
+            { int j = 0; sum = %(psp)s; }
+            for(int j = 1; j < pre_rank[i].size(); j++){
                 if(%(psp)s > sum){
                     sum = %(psp)s ;
                 }
@@ -95,11 +123,16 @@ copy_sum_template = {
 """,
     'min': """
     // proj%(id_proj)s: %(name_pre)s -> %(name_post)s with target %(target)s, copied from proj%(id)s
-    if(pop%(id_post)s._active){
+    if( _transmission && pop%(id_post)s._active ){
+        const std::vector<int> &post_rank = proj%(id)s.post_rank;
+        const std::vector< std::vector<int> > &pre_rank = proj%(id)s.pre_rank;
+        %(weights)s = proj%(id)s.w;
         %(omp_code)s
         for(int i = 0; i < post_rank.size(); i++){
-            sum = %(psp)s;
-            for(int j = 0; j < pre_rank[i].size(); j++){
+            if (pre_rank[i].empty())
+                continue;
+            { int j = 0; sum = %(psp)s; }
+            for(int j = 1; j < pre_rank[i].size(); j++){
                 if(%(psp)s < sum){
                     sum = %(psp)s ;
                 }
@@ -110,9 +143,14 @@ copy_sum_template = {
 """,
     'mean': """
     // proj%(id_proj)s: %(name_pre)s -> %(name_post)s with target %(target)s, copied from proj%(id)s
-    if(pop%(id_post)s._active){
+    if( _transmission && pop%(id_post)s._active ){
+        const std::vector<int> &post_rank = proj%(id)s.post_rank;
+        const std::vector< std::vector<int> > &pre_rank = proj%(id)s.pre_rank;
+        %(weights)s = proj%(id)s.w;
         %(omp_code)s
         for(int i = 0; i < post_rank.size(); i++){
+            if (pre_rank[i].empty())
+                continue;
             sum = 0.0;
             for(int j = 0; j < pre_rank[i].size(); j++){
                 sum += %(psp)s ;
@@ -27,6 +27,7 @@ from ANNarchy.core import Global
 from ANNarchy.generator.Utils import tabify
 
 from copy import deepcopy
+import numpy as np
 
 from .PoolingTemplate import *
 from .Utils import SharedSynapse
@@ -43,7 +44,7 @@ class Pooling(Projection):
     one, over which the result of the operation on firing rates will be
     assigned to sum(target).
     """
-    def __init__(self, pre, post, target, operation="max", extent=None, delays=0.0, name=None, copied=False):
+    def __init__(self, pre, post, target, operation="max", extent=None, delays=0.0, stride=None, engine='direct', name=None, copied=False):
         """
         :param pre: pre-synaptic population (either its name or a ``Population`` object).
         :param post: post-synaptic population (either its name or a ``Population`` object).
@@ -53,8 +54,20 @@ class Pooling(Projection):
                        dimension, the product of this extent with the number of neurons in the post-synaptic population
                        must be equal to the number of pre-synaptic neurons.
         :param delays: synaptic delay in ms
+        :param stride: distance in each dimension between the pooling areas of two neighbouring post-synaptic neurons,
+                       expressed in the geometry of the pre-synaptic population. Pooling areas overlap if the stride is
+                       smaller than the extent. Default: the extent (no overlap).
+        :param engine: implementation of the pooling in the generated code. 'direct' (default) loops over the pooling
+                       area of each post-synaptic neuron. 'separable' pools each dimension after the other on
+                       contiguous lines of the pre-synaptic population, without bound checks, using running
+                       maxima/minima (van Herk/Gil-Werman) or running sums for overlapping areas. 'separable' is only
+                       available with openMP.
         """
         self.operation = operation
+        self.engine = engine
+
+        if not engine in ['direct', 'separable']:
+            Global._error('Pooling: the engine must be either "direct" or "separable".')
 
         Projection.__init__(
             self,
@@ -90,6 +103,14 @@ class Pooling(Projection):
         if len(self.extent) < self.pre.dimension:
             Global._error('SharedProjection: You must provide a tuple for the extent of the pooling operation.')
 
+        # process stride
+        self.stride_init = stride
+        if stride is None:
+            stride = self.extent
+        elif not isinstance(stride, tuple) or len(stride) < self.pre.dimension:
+            Global._error('Pooling: You must provide a tuple for the stride of the pooling operation.')
+        self.stride = [int(s) for s in stride]
+
         # process delays
         self.delays = delays
 
@@ -112,7 +133,7 @@ class Pooling(Projection):
 
     def _copy(self, pre, post):
         "Returns a copy of the projection when creating networks.  Internal use only."
-        return PoolingProjection(pre=pre, post=post, target=self.target, operation=self.operation, extent=self.extent_init, delays=self.delays, name=self.name, copied=True)
+        return Pooling(pre=pre, post=post, target=self.target, operation=self.operation, extent=self.extent_init, delays=self.delays, stride=self.stride_init, engine=self.engine, name=self.name, copied=True)
 
     def _create(self):
         """
@@ -151,6 +172,7 @@ class Pooling(Projection):
     def _generate_extent_coordinates(self):
         """
         Generates for each post-neuron the position of the top-left corner, where the pooling should be applied.
+        Neighbouring corners are separated by the stride.
 
         :return:  a list for each post neuron of the corresponding top-left coordinates
         """
@@ -159,17 +181,17 @@ class Pooling(Projection):
         if self.dim_pre == 1:
             rk = 0
             for i in range(self.post.geometry[0]):
-                coords[rk] = [i * self.extent[0]]
+                coords[rk] = [i * self.stride[0]]
                 rk += 1
         elif self.dim_pre == 2:
             rk = 0
             for i in range(self.post.geometry[0]):
                 if self.dim_post > 1:
                     for j in range(self.post.geometry[1]):
-                        coords[rk] = [i * self.extent[0], j * self.extent[1]]
+                        coords[rk] = [i * self.stride[0], j * self.stride[1]]
                         rk += 1
                 else: # over the whole second axis
-                    coords[rk] = [i * self.extent[0], 0]
+                    coords[rk] = [i * self.stride[0], 0]
                     rk += 1
 
         elif self.dim_pre == 3:
@@ -178,10 +200,10 @@ class Pooling(Projection):
                 for j in range(self.post.geometry[1]):
                     if self.dim_post > 2:
                         for k in range(self.post.geometry[2]):
-                            coords[rk] = [i * self.extent[0], j * self.extent[1], k * self.extent[2]]
+                            coords[rk] = [i * self.stride[0], j * self.stride[1], k * self.stride[2]]
                             rk += 1
                     else: # over the whole third axis
-                        coords[rk] = [i * self.extent[0], j * self.extent[1], 0]
+                        coords[rk] = [i * self.stride[0], j * self.stride[1], 0]
                         rk += 1
 
         elif self.dim_pre == 4: # TODO: post has less than 4 dimensions
@@ -190,7 +212,7 @@ class Pooling(Projection):
                 for j in range(self.post.geometry[1]):
                     for k in range(self.post.geometry[2]):
                         for l in range(self.post.geometry[3]):
-                            coords[rk] = [i * self.extent[0], j * self.extent[1], k * self.extent[2], l * self.extent[3]]
+                            coords[rk] = [i * self.stride[0], j * self.stride[1], k * self.stride[2], l * self.stride[3]]
                             rk += 1
         # Save the result
         self.pre_coordinates = coords
@@ -205,7 +227,11 @@ class Pooling(Projection):
         # Generate the code
         if Global._check_paradigm("openmp"):
             self._generate_omp(convolve_code, sum_code)
+            if self.engine == 'separable':
+                self._generate_separable_omp()
         elif Global._check_paradigm("cuda"):
+            if self.engine == 'separable':
+                Global._warning('Pooling: the "separable" engine is not available on CUDA, the direct implementation is used.')
             self._generate_cuda(convolve_code, sum_code)
         else:
             Global._error("PoolingProjection: not implemented for the configured paradigm")
@@ -223,7 +249,7 @@ class Pooling(Projection):
         if self.synapse_type.operation == "min":
             sum_default = "std::numeric_limits<%(float_prec)s>::max()" % {'float_prec': Global.config['precision']}
         elif self.synapse_type.operation == "max":
-            sum_default = "std::numeric_limits<%(float_prec)s>::min()" % {'float_prec': Global.config['precision']}
+            sum_default = "-std::numeric_limits<%(float_prec)s>::max()" % {'float_prec': Global.config['precision']}
 
         code = """
             sum = %(sum_default)s;
@@ -342,7 +368,7 @@ class Pooling(Projection):
         if self.synapse_type.operation == "min":
             sum_default = "std::numeric_limits<%(float_prec)s>::max()" % {'float_prec': Global.config['precision']}
         elif self.synapse_type.operation == "max":
-            sum_default = "std::numeric_limits<%(float_prec)s>::min()" % {'float_prec': Global.config['precision']}
+            sum_default = "-std::numeric_limits<%(float_prec)s>::max()" % {'float_prec': Global.config['precision']}
 
         # Specific template for generation
         pool_dict = deepcopy(pooling_template_omp)
@@ -405,6 +431,283 @@ class Pooling(Projection):
                                                }
         self._specific_template['size_in_bytes'] = "//TODO:\n"
 
+    def _separable_passes(self):
+        """
+        Returns the description of the passes of the 'separable' engine, one per pooled dimension, from the last
+        dimension to the first one. Each pass reduces the size of its dimension from the pre-synaptic to the
+        post-synaptic geometry in the array left by the previous pass: the dimensions before it still have the
+        pre-synaptic sizes (outer), the dimensions after it already have the post-synaptic sizes (inner).
+        """
+        sizes_in = list(self.pre.geometry)
+        sizes_out = [self.post.geometry[d] if d < self.dim_post else 1 for d in range(self.dim_pre)]
+
+        passes = []
+        for dim in reversed(range(self.dim_pre)):
+            extent, stride = int(self.extent[dim]), int(self.stride[dim])
+            # Nothing to pool in this dimension
+            if extent == 1 and stride == 1 and sizes_in[dim] == sizes_out[dim]:
+                continue
+
+            outer = int(np.prod(sizes_in[:dim]))
+            inner = int(np.prod(sizes_out[dim+1:]))
+
+            # Running maxima/sums only pay off for overlapping areas of a few elements
+            running = stride < extent and extent > 3
+
+            # With running maxima/sums, the pooled dimension is padded with the neutral element up to the last
+            # complete pooling area, and to a multiple of the extent for the blocks of the running maxima.
+            length = max(sizes_in[dim], (sizes_out[dim] - 1) * stride + extent)
+            if running:
+                length = extent * int(np.ceil(length / float(extent)))
+
+            passes.append({
+                'dim': dim,
+                'size_in': sizes_in[dim], 'size_out': sizes_out[dim],
+                'extent': extent, 'stride': stride,
+                'outer': outer, 'inner': inner,
+                'length': length,
+                'running': running,
+            })
+
+        # Pooling over a single neuron: at least one pass copies the rates
+        if len(passes) == 0:
+            passes.append({
+                'dim': 0,
+                'size_in': sizes_in[0], 'size_out': sizes_out[0],
+                'extent': 1, 'stride': 1,
+                'outer': 1, 'inner': int(np.prod(sizes_out[1:])),
+                'length': sizes_in[0],
+                'running': False,
+            })
+        return passes
+
+    def _generate_separable_omp(self):
+        """
+        Replaces the loops over the pooling areas by the 'separable' engine: the pooling is applied on each dimension
+        after the other. A pass combines whole rows of the already pooled inner dimensions, which are contiguous in
+        memory, so that the innermost loops have neither bound checks nor branches.
+        """
+        operation = self.synapse_type.operation
+        float_prec = Global.config['precision']
+
+        identity = {
+            'max': "-std::numeric_limits<%(float_prec)s>::max()" % {'float_prec': float_prec},
+            'min': "std::numeric_limits<%(float_prec)s>::max()" % {'float_prec': float_prec},
+            'sum': "0.0",
+            'mean': "0.0",
+        }[operation]
+        combine = {
+            'max': "std::max(%(a)s, %(b)s)",
+            'min': "std::min(%(a)s, %(b)s)",
+        }.get(operation, "(%(a)s + %(b)s)")
+
+        if self.delays > Global.config['dt']:
+            pre_r = "pop%(id_pre)s._delayed_r[%(delay)s]" % {'id_pre': self.pre.id, 'delay': str(int(self.delays/Global.config['dt'])-1)}
+        else:
+            pre_r = "pop%(id_pre)s.r" % {'id_pre': self.pre.id}
+
+        passes = self._separable_passes()
+
+        declare = ""
+        code = """
+        if ( _transmission && pop%(id_pre)s._active ) {
+""" % {'id_pre': self.pre.id}
+        for idx, desc in enumerate(passes):
+            last = (idx == len(passes) - 1)
+            ids = dict(desc)
+            ids.update({
+                'float_prec': float_prec,
+                'identity': identity,
+                'idx': idx,
+                'src': pre_r + ".data()" if idx == 0 else "_pool_buffer_%(idx)s.data()" % {'idx': idx-1},
+                'omp_parallel': "#pragma omp parallel" if Global.config['num_threads'] > 1 else "",
+                'omp_for': "#pragma omp for" if Global.config['num_threads'] > 1 else "",
+            })
+
+            # The last pass adds its result to the post-synaptic sums
+            if last:
+                ids['dst'] = "pop%(id_post)s._sum_%(target)s.data()" % {'id_post': self.post.id, 'target': self.target}
+                scale = ""
+                if operation == "mean":
+                    scale = " / %(size)s" % {'size': int(np.prod(self.extent[:self.dim_pre]))}
+                ids['store'] = "_out[n] += (%(value)s)" + scale + ";"
+            else:
+                ids['dst'] = "_pool_buffer_%(idx)s.data()" % ids
+                ids['store'] = "_out[n] = %(value)s;"
+                declare += """
+    std::vector<%(float_prec)s> _pool_buffer_%(idx)s;""" % ids
+                self._specific_template['wrapper_init_connectivity'] += """
+        proj%(id_proj)s.init_pool_buffer_%(idx)s()
+""" % {'id_proj': self.id, 'idx': idx}
+                self._specific_template['access_connectivity_matrix'] += """
+    void init_pool_buffer_%(idx)s() { _pool_buffer_%(idx)s = std::vector<%(float_prec)s>(%(size)s, 0.0); }
+""" % {'idx': idx, 'float_prec': float_prec, 'size': desc['outer'] * desc['size_out'] * desc['inner']}
+                self._specific_template['export_connectivity'] += """
+        void init_pool_buffer_%(idx)s()
+""" % {'idx': idx}
+
+            # The pooling areas are combined directly. The areas lying entirely inside the population (the first
+            # nb_full ones) have a constant size, the others are cut by the end of the population.
+            if not desc['running']:
+                ids['nb_full'] = max(0, min(desc['size_out'], (desc['size_in'] - desc['extent']) // desc['stride'] + 1))
+                if desc['inner'] == 1:
+                    # The areas of a line are processed together, so that their combinations are independent
+                    ids['store'] = ids['store'].replace('[n]', '[c]') % {'value': '_acc[c]'}
+                    ids['cut'] = ""
+                    if ids['nb_full'] < desc['size_out']:
+                        ids['cut'] = """
+            for(int c = %(nb_full)s; c < %(size_out)s; c++) {
+                int _kmax = std::max(0, std::min(%(extent)s, %(size_in)s - c * %(stride)s));
+                for(int k = 0; k < _kmax; k++)
+                    _acc[c] = %(combine)s;
+            }""" % dict(ids, combine=combine % {'a': '_acc[c]', 'b': '_src[c * %(stride)s + k]' % ids})
+                    code += """
+        // Dimension %(dim)s: %(size_in)s -> %(size_out)s (extent %(extent)s, stride %(stride)s)
+        %(omp_parallel)s
+        {
+        std::vector<%(float_prec)s> _acc(%(size_out)s);
+        %(omp_for)s
+        for(int _o = 0; _o < %(outer)s; _o++) {
+            const %(float_prec)s* _src = %(src)s + _o * %(size_in)s;
+            %(float_prec)s* _out = %(dst)s + _o * %(size_out)s;
+            for(int c = 0; c < %(size_out)s; c++)
+                _acc[c] = %(identity)s;
+            for(int k = 0; k < %(extent)s; k++)
+                for(int c = 0; c < %(nb_full)s; c++)
+                    _acc[c] = %(combine)s;%(cut)s
+            for(int c = 0; c < %(size_out)s; c++)
+                %(store)s
+        }
+        }
+""" % dict(ids, combine=combine % {'a': '_acc[c]', 'b': '_src[c * %(stride)s + k]' % ids})
+                    continue
+
+                # The pooled dimension is traversed by rows of the inner dimensions, which are contiguous
+                ids['store'] = ids['store'] % {'value': '_acc[n]'}
+                ids['combine'] = combine % {'a': '_acc[n]', 'b': '_row[n]'}
+                ids['area'] = """
+            for(int n = 0; n < %(inner)s; n++)
+                _acc[n] = %(identity)s;
+            for(int k = 0; k < %%(kmax)s; k++) {
+                const %(float_prec)s* _row = _src + k * %(inner)s;
+                for(int n = 0; n < %(inner)s; n++)
+                    _acc[n] = %(combine)s;
+            }
+            for(int n = 0; n < %(inner)s; n++)
+                %(store)s""" % ids
+                if ids['nb_full'] == desc['size_out']:
+                    areas = ids['area'] % {'kmax': desc['extent']}
+                else:
+                    areas = """
+            if (c < %(nb_full)s) {%(area_full)s
+            } else {
+            int _kmax = std::max(0, std::min(%(extent)s, %(size_in)s - c * %(stride)s));%(area_cut)s
+            }""" % dict(ids, area_full=ids['area'] % {'kmax': desc['extent']}, area_cut=ids['area'] % {'kmax': '_kmax'})
+                code += """
+        // Dimension %(dim)s: %(size_in)s -> %(size_out)s (extent %(extent)s, stride %(stride)s)
+        %(omp_parallel)s
+        {
+        std::vector<%(float_prec)s> _acc(%(inner)s);
+        %(omp_for)s
+        for(int _l = 0; _l < %(outer)s * %(size_out)s; _l++) {
+            int _o = _l / %(size_out)s;
+            int c = _l %% %(size_out)s;
+            const %(float_prec)s* _src = %(src)s + (_o * %(size_in)s + c * %(stride)s) * %(inner)s;
+            %(float_prec)s* _out = %(dst)s + (_o * %(size_out)s + c) * %(inner)s;
+%(areas)s
+        }
+        }
+""" % dict(ids, areas=areas)
+                continue
+
+            # Overlapping areas: the inner dimensions are processed by chunks of columns,
+            # the rows after the end of the population are replaced by the neutral element
+            ids['chunk'] = min(desc['inner'], 256)
+            ids['nb_chunks'] = int(np.ceil(desc['inner'] / float(ids['chunk'])))
+            ids['row'] = "((%%(x)s) < %(size_in)s ? _src + (%%(x)s) * %(inner)s : _pad.data())" % ids
+            if operation in ['max', 'min']:
+                # van Herk/Gil-Werman: running maxima from the start (_g) and to the end (_h) of blocks of the
+                # extent size, the area starting at a is covered by the end of a block and the start of the next one
+                ids['store'] = ids['store'] % {'value': combine % {'a': '_h0[n]', 'b': '_g1[n]'}}
+                ids['buffers'] = """
+        std::vector<%(float_prec)s> _g(%(length)s * %(chunk)s);
+        std::vector<%(float_prec)s> _h(%(length)s * %(chunk)s);""" % ids
+                ids['pool'] = """
+            for(int b = 0; b < %(length)s; b += %(extent)s) {
+                const %(float_prec)s* _first = %(row_first)s;
+                for(int n = 0; n < _width; n++)
+                    _g[b * %(chunk)s + n] = _first[n];
+                for(int k = 1; k < %(extent)s; k++) {
+                    const %(float_prec)s* _row = %(row_k)s;
+                    %(float_prec)s* _cur = _g.data() + (b + k) * %(chunk)s;
+                    for(int n = 0; n < _width; n++)
+                        _cur[n] = %(combine_g)s;
+                }
+                const %(float_prec)s* _end = %(row_end)s;
+                for(int n = 0; n < _width; n++)
+                    _h[(b + %(extent)s - 1) * %(chunk)s + n] = _end[n];
+                for(int k = %(extent)s - 2; k >= 0; k--) {
+                    const %(float_prec)s* _row = %(row_k)s;
+                    %(float_prec)s* _cur = _h.data() + (b + k) * %(chunk)s;
+                    for(int n = 0; n < _width; n++)
+                        _cur[n] = %(combine_h)s;
+                }
+            }
+            for(int c = 0; c < %(size_out)s; c++) {
+                const %(float_prec)s* _h0 = _h.data() + c * %(stride)s * %(chunk)s;
+                const %(float_prec)s* _g1 = _g.data() + (c * %(stride)s + %(extent)s - 1) * %(chunk)s;
+                %(float_prec)s* _out = _dst + c * %(inner)s;
+                for(int n = 0; n < _width; n++)
+                    %(store)s
+            }""" % dict(ids,
+                    row_first=ids['row'] % {'x': 'b'},
+                    row_k=ids['row'] % {'x': 'b + k'},
+                    row_end=ids['row'] % {'x': 'b + %(extent)s - 1' % ids},
+                    combine_g=combine % {'a': '_cur[n - %(chunk)s]' % ids, 'b': '_row[n]'},
+                    combine_h=combine % {'a': '_cur[n + %(chunk)s]' % ids, 'b': '_row[n]'})
+            else:
+                # Running sums (in double precision)
+                ids['store'] = ids['store'] % {'value': '_p1[n] - _p0[n]'}
+                ids['buffers'] = """
+        std::vector<double> _p((%(length)s + 1) * %(chunk)s, 0.0);""" % ids
+                ids['pool'] = """
+            for(int x = 0; x < %(length)s; x++) {
+                const %(float_prec)s* _row = %(row_x)s;
+                double* _cur = _p.data() + (x + 1) * %(chunk)s;
+                for(int n = 0; n < _width; n++)
+                    _cur[n] = _cur[n - %(chunk)s] + _row[n];
+            }
+            for(int c = 0; c < %(size_out)s; c++) {
+                const double* _p0 = _p.data() + c * %(stride)s * %(chunk)s;
+                const double* _p1 = _p.data() + (c * %(stride)s + %(extent)s) * %(chunk)s;
+                %(float_prec)s* _out = _dst + c * %(inner)s;
+                for(int n = 0; n < _width; n++)
+                    %(store)s
+            }""" % dict(ids, row_x=ids['row'] % {'x': 'x'})
+
+            code += """
+        // Dimension %(dim)s: %(size_in)s -> %(size_out)s (extent %(extent)s, stride %(stride)s)
+        %(omp_parallel)s
+        {
+        std::vector<%(float_prec)s> _pad(%(chunk)s, %(identity)s);%(buffers)s
+        %(omp_for)s
+        for(int _l = 0; _l < %(outer)s * %(nb_chunks)s; _l++) {
+            int _o = _l / %(nb_chunks)s;
+            int _n0 = (_l %% %(nb_chunks)s) * %(chunk)s;
+            int _width = std::min(%(chunk)s, %(inner)s - _n0);
+            const %(float_prec)s* _src = %(src)s + _o * %(size_in)s * %(inner)s + _n0;
+            %(float_prec)s* _dst = %(dst)s + _o * %(size_out)s * %(inner)s + _n0;
+%(pool)s
+        }
+        }
+""" % ids
+        code += """
+        } // if
+"""
+        self._specific_template['declare_connectivity_matrix'] += declare + "\n"
+        self._specific_template['psp_prefix'] = ""
+        self._specific_template['psp_code'] = code
+
     def _generate_cuda(self, convolve_code, sum_code):
         """
         Update the ProjectionGenerator._specific_template structure and bypass the standard CUDA code generation.
@@ -229,8 +229,8 @@ struct PopStruct%(id)s{
     // Local variable r
     std::vector< %(float_prec)s > r ;
 
-    // Store the last spikes
-    std::vector< std::vector<long int> > last_spikes;
+    // Spike counts over the window
+    WindowedSum<int> spike_window;
 
     int get_size() { return size; }
     void set_size(int value) { size = value; }
@@ -256,7 +256,7 @@ struct PopStruct%(id)s{
         size = %(size)s;
         _active = true;
 
-        last_spikes = std::vector< std::vector<long int> >(size, std::vector<long int>());
+        spike_window.init(size, (int)(window/dt) + 1);
     }
 
     void update_rng() {
@@ -266,29 +266,20 @@ struct PopStruct%(id)s{
     void update() {
         // Updating the local variables of Spike2Rate population %(id)s
         if(_active){
-            int pop%(id)s_nb, pop%(id)s_out;
-            %(omp_code)s
-            for(int i = 0; i < size; i++){
-                // Increase when spiking
-                if (pop%(id_pre)s.last_spike[i] == t-1){
-                   last_spikes[i].push_back(t-1);
-                }
-                pop%(id)s_nb = 0;
-                pop%(id)s_out = -1;
-                for(int j=0; j < last_spikes[i].size(); j++){
-                    if(last_spikes[i][j] >= t -1 - (long int)(window/dt) ){
-                        pop%(id)s_nb++;
-                    }
-                    else{
-                        pop%(id)s_out = j;
-                    }
-                }
+            // The window may have been modified
+            if (spike_window.window != (int)(window/dt) + 1)
+                spike_window.init(size, (int)(window/dt) + 1);
 
-                if (pop%(id)s_out > -1){
-                    last_spikes[i].erase(last_spikes[i].begin());
-                }
+            // Count the spikes emitted in the previous step
+            spike_window.step();
+            for(int i = 0; i < size; i++){
+                if (pop%(id_pre)s.last_spike[i] == t-1)
+                    spike_window.add(i, 1);
+            }
 
-                r[i] += dt*(1000.0/scaling / window * %(float_prec)s(pop%(id)s_nb) - r[i] ) / smooth;
+            %(omp_code)s
+            for(int i = 0; i < size; i++){
+                r[i] += dt*(1000.0/scaling / window * %(float_prec)s(spike_window.total[i]) - r[i] ) / smooth;
             }
         }
     }
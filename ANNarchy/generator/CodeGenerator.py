@@ -113,10 +113,12 @@ class CodeGenerator(object):
                functions/ objects, which should be accessible from Python
             * for each population a seperate header file, contain semantic
               logic of a population respectively neuron object (filename:
-              pop<id>).
+              pop<id>). With openMP, the methods called at each step are
+              defined in a separate source file (pop<id>.cpp), compiled
+              independently.
             * for each projection a seperate header file, contain semantic
               logic of a projection respectively synapse object (filename:
-              proj<id>)
+              proj<id>), and a source file proj<id>.cpp with openMP.
         """
         if Global.config['verbose']:
             if Global.config['paradigm'] == "openmp":
@@ -279,7 +281,7 @@ class CodeGenerator(object):
         include_omp = "#include <omp.h>" if Global.config['num_threads'] > 1 else ""
 
         if Global.config['paradigm'] == "openmp":
-            from .Template.BaseTemplate import omp_header_template, built_in_functions, integer_power_cpu
+            from .Template.BaseTemplate import omp_header_template, built_in_functions, integer_power_cpu, windowed_sum_template, windowed_sum_state, schedule_template, schedule_state
             return omp_header_template % {
                 'float_prec': Global.config['precision'],
                 'pop_struct': pop_struct,
@@ -289,10 +291,12 @@ class CodeGenerator(object):
                 'custom_func': custom_func,
                 'custom_constant': custom_constant,
                 'built_in': built_in_functions + integer_power_cpu % {'float_prec': Global.config['precision']},
+                'windowed_sum': windowed_sum_template + windowed_sum_state,
+                'schedule': schedule_template + schedule_state,
                 'include_omp': include_omp
             }
         elif Global.config['paradigm'] == "cuda":
-            from .Template.BaseTemplate import cuda_header_template, built_in_functions
+            from .Template.BaseTemplate import cuda_header_template, built_in_functions, windowed_sum_template
             return cuda_header_template % {
                 'float_prec': Global.config['precision'],
                 'pop_struct': pop_struct,
@@ -301,6 +305,8 @@ class CodeGenerator(object):
                 'proj_ptr': proj_ptr,
                 'custom_func': custom_func,
 		'built_in': built_in_functions,
+                'windowed_sum': windowed_sum_template,
+                'schedule': "",
                 'custom_constant': custom_constant
             }
         else:
@@ -440,6 +446,12 @@ void set_%(name)s(%(float_prec)s value){
             if 'gops_update' in pop.keys():
                 update_globalops += pop['gops_update']
 
+        # Input schedules
+        update_schedules = ""
+        for desc in self._pop_desc + self._proj_desc:
+            if 'schedule_update' in desc.keys():
+                update_schedules += desc['schedule_update']
+
         # Reset presynaptic sums
         reset_sums = self._body_resetcomputesum_pop()
 
@@ -506,6 +518,9 @@ void set_%(name)s(%(float_prec)s value){
             # custom constants
             custom_constant, _ = self._body_custom_constants()
 
+            # checkpointing
+            save_state, load_state = self._body_state()
+
             from .Template.BaseTemplate import omp_body_template
             base_dict = {
                 'float_prec': Global.config['precision'],
@@ -517,6 +532,7 @@ void set_%(name)s(%(float_prec)s value){
                 'run_until': run_until,
                 'compute_sums' : compute_sums,
                 'reset_sums' : reset_sums,
+                'update_schedules' : update_schedules,
                 'update_neuron' : update_neuron,
                 'update_globalops' : update_globalops,
                 'update_synapse' : update_synapse,
@@ -526,6 +542,8 @@ void set_%(name)s(%(float_prec)s value){
                 'structural_plasticity': structural_plasticity,
                 'set_number_threads' : number_threads,
                 'custom_constant': custom_constant,
+                'save_state': save_state,
+                'load_state': load_state
             }
 
             base_dict.update(prof_dict)
@@ -729,6 +747,30 @@ void set_%(name)s(%(float_prec)s value){
             'custom_constant': custom_constant
         }
 
+    def _body_state(self):
+        """
+        Calls of the save_state()/load_state() methods of the population and
+        projection structs, each object is stored in a chunk named after the
+        object (see IO.save_state()). loadState() returns the 1-based index of
+        the first object which could not be restored.
+        """
+        objects = [('pop', pop) for pop in self._populations] + [('proj', proj) for proj in self._projections]
+
+        save_code = ""
+        load_code = ""
+        for idx, (prefix, obj) in enumerate(objects):
+            ids = {
+                'obj': prefix + str(obj.id),
+                'name': obj.name.replace('\\', '\\\\').replace('"', '\\"'),
+                'idx': idx + 1
+            }
+            save_code += """    _save_state_chunk(ofs, "%(name)s", %(obj)s);
+""" % ids
+            load_code += """    if(!_load_state_chunk(ifs, "%(name)s", %(obj)s)) return %(idx)s;
+""" % ids
+
+        return save_code, load_code
+
     def _body_computesum_proj(self):
         """
         Call the copmpute_psp() method of Projection structs, only in case of
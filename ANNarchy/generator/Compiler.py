@@ -28,6 +28,8 @@ import time
 import re
 import json
 import argparse
+import hashlib
+import multiprocessing
 import numpy as np
 
 # ANNarchy core informations
@@ -40,6 +42,9 @@ from .Sanity import check_structure
 # e.g. extra_libs = ['-lopencv_core', '-lopencv_video']
 extra_libs = []
 
+# The version banner is printed by the first compile() of the session, not by import ANNarchy
+_banner_printed = False
+
 def _folder_management(annarchy_dir, profile_enabled, clean, net_id):
     """
     ANNarchy is provided as a python package. For compilation a local folder
@@ -89,6 +94,7 @@ def setup_parser():
 
     group = parser.add_argument_group('General')
     group.add_argument("-c", "--clean", help="Forces recompilation.", action="store_true", default=False, dest="clean")
+    group.add_argument("--no-cache", help="Does not use the shared build cache.", action="store_true", default=False, dest="no_cache")
     group.add_argument("-d", "--debug", help="Compilation with debug symbols and additional checks.", action="store_true", default=False, dest="debug")
     group.add_argument("-v", "--verbose", help="Shows all messages.", action="store_true", default=None, dest="verbose")
     group.add_argument("--prec", help="Set the floating precision used.", action="store", type=str, default=None, dest="precision")
@@ -194,9 +200,18 @@ def compile(
         debug_build = options.debug  # debug build
     Global.config["debug"] = debug_build
 
+    # Version banner
+    global _banner_printed
+    if not silent and not _banner_printed:
+        Global._print('ANNarchy ' + ANNarchy.__version__ + ' (' + ANNarchy.__release__ + ') on ' + sys.platform + ' (' + os.name + ').')
+        _banner_printed = True
+
     # Clean
     clean = options.clean # enforce rebuild
 
+    # Shared build cache: bypassed when a rebuild is enforced
+    use_cache = not (options.clean or options.no_cache)
+
     # Populations to compile
     if populations is None: # Default network
         populations = Global._network[net_id]['populations']
@@ -264,7 +279,8 @@ def compile(
                         profile_enabled=profile_enabled,
                         populations=populations,
                         projections=projections,
-                        net_id=net_id)
+                        net_id=net_id,
+                        use_cache=use_cache)
     compiler.generate()
 
 def python_environment():
@@ -331,11 +347,49 @@ def python_environment():
 
     return py_version, py_major, python_include, python_lib, python_libpath, cython
 
+def cython_version():
+    """
+    Version of Cython, which is part of the key of the build cache: the wrappers generated by different versions are not interchangeable.
+    """
+    try:
+        import Cython
+        return Cython.__version__
+    except ImportError:
+        return ""
+
+def share_connectivity(projections):
+    """
+    Detects the projections built with the same connector, arguments (and seed for the random connectors) between populations of the same geometry, as in replicated columns. Each one references the post- and pre-synaptic ranks of the first projection of its group in the generated code (``_shared_connectivity``) instead of allocating its own. The weights and other synaptic attributes are not shared.
+
+    The ranks are only shared on CPUs, with the lil format and without structural plasticity, as they are never modified in that case.
+    """
+    from ANNarchy.core.Projection import Projection
+
+    originals = {}
+    for proj in projections:
+        proj._shared_connectivity = None
+
+        # Specific projections generate their own connectivity
+        if type(proj) is not Projection:
+            continue
+        if Global.config['paradigm'] != "openmp" or Global.config['structural_plasticity']:
+            continue
+        if proj._storage_format != "lil" or proj._storage_order != "post_to_pre":
+            continue
+
+        key = proj._connectivity_key()
+        if key is None:
+            continue
+        if key in originals:
+            proj._shared_connectivity = originals[key]
+        else:
+            originals[key] = proj
+
 class Compiler(object):
     " Main class to generate C++ code efficiently"
 
     def __init__(self, annarchy_dir, clean, compiler, compiler_flags, silent, cuda_config, debug_build, profile_enabled,
-                 populations, projections, net_id):
+                 populations, projections, net_id, use_cache=True):
 
         # Store arguments
         self.annarchy_dir = annarchy_dir
@@ -349,17 +403,10 @@ class Compiler(object):
         self.populations = populations
         self.projections = projections
         self.net_id = net_id
+        self.use_cache = use_cache
 
         # Get user-defined config
-        self.user_config = {
-            'openmp': {
-                'compiler': 'clang++' if sys.platform == "darwin" else 'g++',
-                'flags' : "-march=native -O2",
-            }
-        }
-        if os.path.exists(os.path.expanduser('~/.config/ANNarchy/annarchy.json')):
-            with open(os.path.expanduser('~/.config/ANNarchy/annarchy.json'), 'r') as rfile:
-                self.user_config = json.load(rfile)
+        self.user_config = Global._load_user_config()
 
 
     def generate(self):
@@ -368,7 +415,12 @@ class Compiler(object):
         # Check that everything is allright in the structure of the network.
         check_structure(self.populations, self.projections)
 
+        # Identical projections store their connectivity only once
+        share_connectivity(self.projections)
+
         # Generate the code
+        timings = Global._network[self.net_id]['timings']
+        t0 = time.time()
         self.code_generation()
 
         # Generate the Makefile
@@ -376,10 +428,18 @@ class Compiler(object):
 
         # Copy the files if needed
         changed = self.copy_files()
+        timings['code_generation'] = time.time() - t0
 
         # Perform compilation if something has changed
+        t0 = time.time()
         if changed or not os.path.isfile(self.annarchy_dir + '/ANNarchyCore' + str(self.net_id) + '.so'):
-            self.compilation()
+            cache_dir = self.cache_directory()
+            if cache_dir is None:
+                self.compilation()
+            elif not self.load_from_cache(cache_dir):
+                self.compilation()
+                self.store_in_cache(cache_dir)
+        timings['compilation'] = time.time() - t0
 
         Global._network[self.net_id]['compiled'] = True
 
@@ -419,18 +479,119 @@ class Compiler(object):
                 if file == 'Makefile':
                     continue
                 basename, extension = os.path.splitext(file)
-                if not extension in ['h', 'hpp', 'cpp', 'cu']: # ex: .o
+                if not extension in ['.h', '.hpp', '.cpp', '.cu']: # ex: .o
                     continue
                 if not os.path.isfile(self.annarchy_dir+'/generate/net'+ str(self.net_id) + '/' + file):
                     if file.startswith('ANNarchyCore'):
                         continue
                     os.remove(self.annarchy_dir+'/build/net'+ str(self.net_id) + '/' + file)
-                    if os.path.isfile(self.annarchy_dir+'/build/net'+ str(self.net_id) + '/' + basename + '.o'):
-                        os.remove(self.annarchy_dir+'/build/net'+ str(self.net_id) + '/' + basename + '.o')
+                    for obj_ext in ['.o', '.d']:
+                        if os.path.isfile(self.annarchy_dir+'/build/net'+ str(self.net_id) + '/' + basename + obj_ext):
+                            os.remove(self.annarchy_dir+'/build/net'+ str(self.net_id) + '/' + basename + obj_ext)
                     changed = True
 
         return changed
 
+    def cache_directory(self):
+        """
+        Returns the folder of the shared build cache where the library corresponding to the generated code is stored, or None if the cache is disabled.
+
+        The cache is located in ``~/.cache/ANNarchy/`` (or the ``path`` entry of the ``cache`` section in ``~/.config/ANNarchy/annarchy.json``). Each library is stored in a subfolder whose name is a hash of:
+
+        * the generated sources, including the Makefile which holds the compiler, its flags and the include paths.
+        * the Cython definitions of ANNarchy's extensions.
+        * the ANNarchy release, the Python version and ABI, the Cython and NumPy versions and the platform.
+        """
+        cache_config = self.user_config.get('cache', {})
+        if not self.use_cache or not cache_config.get('enabled', True):
+            return None
+
+        root = os.path.expanduser(cache_config.get('path', '~/.cache/ANNarchy'))
+
+        key = hashlib.sha256()
+
+        # Environment
+        environment = [
+            ANNarchy.__release__,
+            Global.config['paradigm'],
+            sys.platform,
+            sys.version,
+            getattr(sys, 'abiflags', ''),
+            cython_version(),
+            np.__version__,
+        ]
+        key.update('\n'.join(environment).encode('utf-8'))
+
+        # Generated sources and Makefile
+        generate_dir = self.annarchy_dir + '/generate/net' + str(self.net_id) + '/'
+        for file in sorted(os.listdir(generate_dir)):
+            key.update(file.encode('utf-8'))
+            with open(generate_dir + file, 'rb') as rfile:
+                key.update(rfile.read())
+
+        # Cython definitions included by the wrapper
+        cython_ext = ANNarchy.__path__[0] + '/core/cython_ext/'
+        for file in sorted(os.listdir(cython_ext)):
+            if file.endswith('.pxd') or file.endswith('.hpp'):
+                with open(cython_ext + file, 'rb') as rfile:
+                    key.update(rfile.read())
+
+        return root + '/' + key.hexdigest()
+
+    def load_from_cache(self, cache_dir):
+        """
+        Copies the library from the shared build cache into the compilation folder. Returns False if the library has not been compiled yet.
+        """
+        libname = 'ANNarchyCore' + str(self.net_id) + '.so'
+        if not os.path.isfile(cache_dir + '/' + libname):
+            return False
+
+        if Global.config['verbose']:
+            Global._print('Loading', libname, 'from the build cache', cache_dir)
+
+        # Hard link if possible, copy otherwise. The make rule replaces the file with mv, so the cached library is never modified.
+        target = self.annarchy_dir + '/' + libname
+        tmp_target = target + '.tmp' + str(os.getpid())
+        try:
+            try:
+                os.link(cache_dir + '/' + libname, tmp_target)
+            except OSError:
+                shutil.copy(cache_dir + '/' + libname, tmp_target)
+            os.rename(tmp_target, target)
+        except (IOError, OSError) as e:
+            if Global.config['verbose']:
+                Global._print('Can not use the build cache:', e)
+            return False
+
+        with open(self.annarchy_dir + '/compilation', 'w') as wfile:
+            wfile.write("1")
+
+        if not self.silent:
+            msg = 'Compiling'
+            if self.net_id > 0:
+                msg += ' network ' + str(self.net_id)
+            Global._print(msg + '... OK (build cache)')
+
+        return True
+
+    def store_in_cache(self, cache_dir):
+        """
+        Stores the freshly compiled library in the shared build cache. Failures (read-only or full disk) are ignored.
+        """
+        libname = 'ANNarchyCore' + str(self.net_id) + '.so'
+        tmp_target = cache_dir + '/' + libname + '.tmp' + str(os.getpid())
+        try:
+            if not os.path.exists(cache_dir):
+                os.makedirs(cache_dir)
+            # Atomic replacement, as several processes may share the cache
+            shutil.copy(self.annarchy_dir + '/' + libname, tmp_target)
+            os.rename(tmp_target, cache_dir + '/' + libname)
+        except (IOError, OSError) as e:
+            if os.path.isfile(tmp_target):
+                os.remove(tmp_target)
+            if Global.config['verbose']:
+                Global._print('Can not store the library in the build cache:', e)
+
     def compilation(self):
         """ Create ANNarchyCore.so and py extensions if something has changed. """
         # STDOUT
@@ -449,8 +610,14 @@ class Compiler(object):
         # Start the compilation
         verbose = "> compile_stdout.log 2> compile_stderr.log" if not Global.config["verbose"] else ""
 
+        # Number of parallel jobs: the number of threads if set, all available cores otherwise
+        if Global.config['num_threads'] > 1:
+            jobs = Global.config['num_threads']
+        else:
+            jobs = multiprocessing.cpu_count()
+
         # Start the compilation process
-        make_process = subprocess.Popen("make all -j4" + verbose, shell=True)
+        make_process = subprocess.Popen("make all -j" + str(jobs) + " " + verbose, shell=True)
 
         # Check for errors
         if make_process.wait() != 0:
@@ -545,6 +712,13 @@ class Compiler(object):
         # ANNarchy.__path__ provides the installation directory
         path_to_cython_ext = ANNarchy.__path__[0]+'/core/cython_ext/'
 
+        # Object files: one per population and projection (openMP only), the
+        # monitors, the main simulation loop and the Cython wrapper.
+        objects = ['ANNarchy.o', 'Recorder.o']
+        objects += ['pop' + str(pop.id) + '.o' for pop in self.populations]
+        objects += ['proj' + str(proj.id) + '.o' for proj in self.projections]
+        objects.append('ANNarchyCore' + str(self.net_id) + '.o')
+
         # Gather all Makefile flags
         makefile_flags = {
             'compiler': self.compiler,
@@ -563,7 +737,8 @@ class Compiler(object):
             'python_libpath': python_libpath,
             'numpy_include': numpy_include,
             'net_id': self.net_id,
-            'cython_ext': path_to_cython_ext
+            'cython_ext': path_to_cython_ext,
+            'objects': ' '.join(objects)
         }
 
         # Create Makefiles depending on the target platform and parallel framework
@@ -609,6 +784,10 @@ def _instantiate(net_id, import_id=-1, cuda_config=None, user_config=None):
     if Global.config['verbose']:
         Global._print('Loading library...', libname, libpath)
 
+    # Wall-clock times of the instantiation phases, read by the benchmarks
+    timings = Global._network[net_id]['timings']
+    t_start = time.time()
+
     # Import the Cython library
     try:
         cython_module = imp.load_dynamic(
@@ -650,6 +829,7 @@ def _instantiate(net_id, import_id=-1, cuda_config=None, user_config=None):
             Global._print('Creating', pop.name, 'took', (time.time()-t0)*1000, 'milliseconds')
 
     # Instantiate projections
+    t_connect = time.time()
     for proj in Global._network[net_id]['projections']:
         if Global.config['verbose']:
             Global._print('Creating projection from', proj.pre.name, 'to', proj.post.name, 'with target="', proj.target, '"')
@@ -661,6 +841,7 @@ def _instantiate(net_id, import_id=-1, cuda_config=None, user_config=None):
 
         if Global.config['show_time']:
             Global._print('Creating the projection took', (time.time()-t0)*1000, 'milliseconds')
+    timings['connect'] = time.time() - t_connect
 
     # Finish to initialize the network
     cython_module.pyx_create(Global.config['dt'], Global.config['seed'])
@@ -692,3 +873,5 @@ def _instantiate(net_id, import_id=-1, cuda_config=None, user_config=None):
     # Start the monitors
     for monitor in Global._network[net_id]['monitors']:
         monitor._init_monitoring()
+
+    timings['instantiate'] = time.time() - t_start - timings['connect']
@@ -24,7 +24,7 @@
 from ANNarchy.core import Global
 from ANNarchy.core.Monitor import BoldMonitor
 from ANNarchy.generator.Template import MonitorTemplate as RecTemplate
-from ANNarchy.generator.Utils import tabify
+from ANNarchy.generator.Utils import tabify, neuron_traces
 
 
 class MonitorGenerator(object):
@@ -61,16 +61,21 @@ class MonitorGenerator(object):
             record_base_class
         """
         record_class = ""
+        record_body = ""
         # We generate for each of the population/projection in the network
         # a record class, containing by default all variables. The recording
         # is then enabled or disabled.
         for pop in self._populations:
-            record_class += self._pop_recorder_class(pop)
+            decl, body = self._pop_recorder_class(pop)
+            record_class += decl
+            record_body += body
 
         for proj in self._projections:
-            record_class += self._proj_recorder_class(proj)
+            decl, body = self._proj_recorder_class(proj)
+            record_class += decl
+            record_body += body
 
-        code = RecTemplate.record_base_class % {'record_classes': record_class}
+        code = RecTemplate.record_base_class % {'record_classes': record_class, 'omp_min': Global.OMP_MIN_NB_NEURONS}
 
         # The approach for default populations/projections is not
         # feasible for specific monitors, so we handle them extra
@@ -88,13 +93,20 @@ class MonitorGenerator(object):
         with open(self._annarchy_dir+'/generate/net'+str(self._net_id)+'/Recorder.h', 'w') as ofile:
             ofile.write(code)
 
+        # The recording methods are compiled in their own translation unit (openMP only)
+        if Global.config['paradigm'] == "openmp":
+            with open(self._annarchy_dir+'/generate/net'+str(self._net_id)+'/Recorder.cpp', 'w') as ofile:
+                ofile.write('#include "ANNarchy.h"\n' + record_body)
+
     def _pop_recorder_class(self, pop):
         """
         Creates population recording class code.
 
         Returns:
 
-            * complete code as string
+            * class declaration and out-of-class definitions of the
+              recording methods (empty if the paradigm does not define
+              them) as strings
 
         Templates:
 
@@ -181,6 +193,9 @@ class MonitorGenerator(object):
                 determine_size += """size_in_bytes += sizeof(std::vector<%(type)s>) * %(name)s.capacity();\t//%(name)s\n
 for(auto it=%(name)s.begin(); it!= %(name)s.end(); it++) {
     size_in_bytes += it->capacity() * sizeof(%(type)s);
+}
+for(auto it=%(name)s_reduced.begin(); it!= %(name)s_reduced.end(); it++) {
+    size_in_bytes += it->capacity() * sizeof(double);
 }""" % ids
 
         # Spike events
@@ -188,11 +203,14 @@ for(auto it=%(name)s.begin(); it!= %(name)s.end(); it++) {
             struct_code += """
     // Local variable %(name)s
     std::map<int, std::vector< %(type)s > > %(name)s ;
+    std::vector< std::vector< double > > %(name)s_reduced ;
+    RecordWindow *%(name)s_window ;
     bool record_%(name)s ;
     void clear_spike() {
         for ( auto it = spike.begin(); it != spike.end(); it++ ) {
             it->second.clear();
         }
+        spike_reduced.clear();
     }
 """ % {'type' : 'long int', 'name': 'spike'}
 
@@ -208,6 +226,7 @@ for(auto it=%(name)s.begin(); it!= %(name)s.end(); it++) {
                 this->%(name)s[this->ranks[i]]=std::vector<%(type)s>();
             }
         }
+        this->%(name)s_window = &this->windows_["%(name)s"];
         this->record_%(name)s = false; """ % {'id': pop.id, 'type' : 'long int', 'name': 'spike'}
 
             recording_code += RecTemplate.recording_spike_tpl[Global.config['paradigm']] % {'id': pop.id, 'type' : 'int', 'name': 'spike'}
@@ -221,7 +240,8 @@ for(auto it=%(name)s.begin(); it!= %(name)s.end(); it++) {
             'determine_size': tabify(determine_size, 2),
             'clear_monitor_code': tabify(clear_code, 2)
         }
-        return tpl_code % ids
+        body_code = template['body'] % ids if 'body' in template.keys() else ""
+        return tpl_code % ids, body_code
 
     def _proj_recorder_class(self, proj):
         """
@@ -229,7 +249,9 @@ for(auto it=%(name)s.begin(); it!= %(name)s.end(); it++) {
 
         Returns:
 
-            * complete code as string
+            * class declaration and out-of-class definitions of the
+              recording methods (empty if the paradigm does not define
+              them) as strings
 
         Templates:
 
@@ -244,7 +266,7 @@ for(auto it=%(name)s.begin(); it!= %(name)s.end(); it++) {
 
         # Specific template
         if 'monitor_class' in proj._specific_template.keys():
-            return proj._specific_template['monitor_class']
+            return proj._specific_template['monitor_class'], ""
 
         init_code = ""
         recording_code = ""
@@ -270,10 +292,16 @@ for(auto it=%(name)s.begin(); it!= %(name)s.end(); it++) {
             # Get the initialization code
             init_code += template[locality]['init'] % {'type' : var['ctype'], 'name': var['name']}
             
-            # Get the recording code
+            # Get the recording code (variables stored per neuron are accessed like synaptic ones)
+            if var['name'] in neuron_traces(proj):
+                dendrite = 'proj%(id)s.get_dendrite_%(name)s(this->ranks[i])' % {'id': proj.id, 'name': var['name']}
+            else:
+                dendrite = 'proj%(id)s.%(name)s[this->ranks[i]]' % {'id': proj.id, 'name': var['name']}
             if proj._storage_format == "lil":
-                recording_code += template[locality]['recording'] % {'id': proj.id, 'type' : var['ctype'], 'name': var['name']}
+                recording_code += template[locality]['recording'] % {'id': proj.id, 'type' : var['ctype'], 'name': var['name'], 'dendrite': dendrite}
             else:
                 Global._warning("Monitor: variable "+ var['name'] + " cannot be recorded for a projection using the csr format...")
 
-        return template['struct'] % {'id': proj.id, 'init_code': init_code, 'recording_code': recording_code, 'struct_code': struct_code}
+        ids = {'id': proj.id, 'init_code': init_code, 'recording_code': recording_code, 'struct_code': struct_code}
+        body_code = template['body'] % ids if 'body' in template.keys() else ""
+        return template['struct'] % ids, body_code
@@ -441,18 +441,19 @@ class CUDAGenerator(PopulationGenerator):
         if pop.neuron_type.description['type'] == 'spike':
             declare_FR = """
     // Mean Firing rate
-    std::vector< std::queue<long int> > _spike_history;
+    WindowedSum<int> _spike_history;
     long int _mean_fr_window;
     %(float_prec)s _mean_fr_rate;
     void compute_firing_rate( %(float_prec)s window){
         if(window>0.0){
             _mean_fr_window = int(window/dt);
             _mean_fr_rate = %(float_prec)s(1000./%(float_prec)s(window));
+            _spike_history.init(size, _mean_fr_window);
         }
     };""" % {'float_prec': Global.config['precision']}
             init_FR = """
         // Mean Firing Rate
-        _spike_history = std::vector< std::queue<long int> >(size, std::queue<long int>());
+        _spike_history.init(size, 1);
         _mean_fr_window = 0;
         _mean_fr_rate = 1.0;"""
 
@@ -681,21 +682,18 @@ class CUDAGenerator(PopulationGenerator):
         if pop.neuron_type.description['type'] == 'spike':
             mean_FR_update = """
         if ( _mean_fr_window > 0) {
-            // Update the queues
-            r_dirty = false;
-
-            for ( int i = 0; i < spike_count; i++ ) {
-                _spike_history[spiked[i]].push(t);
-                r_dirty = true; // the queue changed the length
+            // Remove the oldest step of the window
+            _spike_history.step();
+            r_dirty = (_spike_history.expired.size() > 0);
+            for ( auto it = _spike_history.expired.begin(); it != _spike_history.expired.end(); it++ ) {
+                r[it->first] = _mean_fr_rate * %(float_prec)s(_spike_history.total[it->first]);
             }
 
-            // Recalculate the mean firing rate
-            for (int i = 0; i < size; i++ ) {
-                while((_spike_history[i].size() != 0)&&(_spike_history[i].front() <= t - _mean_fr_window)){
-                    _spike_history[i].pop(); // Suppress spikes outside the window
-                    r_dirty = true; // the queue changed the length
-                }
-                r[i] = _mean_fr_rate * float(_spike_history[i].size());
+            // Add the new spikes
+            for ( int i = 0; i < spike_count; i++ ) {
+                _spike_history.add(spiked[i], 1);
+                r[spiked[i]] = _mean_fr_rate * %(float_prec)s(_spike_history.total[spiked[i]]);
+                r_dirty = true;
             }
 
             // transfer to device
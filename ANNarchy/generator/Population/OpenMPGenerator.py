@@ -118,6 +118,9 @@ class OpenMPGenerator(PopulationGenerator):
         determine_size_in_bytes = self._determine_size_in_bytes(pop)
         clear_container = self._clear_container(pop)
 
+        # Checkpointing
+        save_state, load_state = self._save_load_state(pop)
+
         # Profiling
         if self._prof_gen:
             include_profile = """#include "Profiling.h"\n"""
@@ -175,8 +178,12 @@ class OpenMPGenerator(PopulationGenerator):
         if 'update_global_ops' in pop._specific_template.keys():
             update_global_ops = pop._specific_template['update_global_ops']
 
-        # Fill the template
-        code = self._templates['population_header'] % {
+        # Input schedules are added to the specific templates as well
+        declare_schedules, update_schedules = self._schedules(pop)
+        declare_additional += declare_schedules
+
+        # Fill the templates
+        pop_dict = {
             # some information for
             'annarchy_version': __release__,
             #'time_stamp': '{:%Y-%b-%d %H:%M:%S}'.format(datetime.datetime.now()),
@@ -214,12 +221,18 @@ class OpenMPGenerator(PopulationGenerator):
             'update_global_ops': update_global_ops,
             'stop_condition': stop_condition,
             'determine_size': determine_size_in_bytes,
-            'clear_container': clear_container
+            'clear_container': clear_container,
+            'save_state': save_state,
+            'load_state': load_state
         }
+        code = self._templates['population_header'] % pop_dict
+        body = self._templates['population_body'] % pop_dict
 
-        # Store the complete header definition in a single file
+        # Store the header definition and the simulation kernels in separate files
         with open(annarchy_dir+'/generate/net'+str(self._net_id)+'/pop'+str(pop.id)+'.hpp', 'w') as ofile:
             ofile.write(code)
+        with open(annarchy_dir+'/generate/net'+str(self._net_id)+'/pop'+str(pop.id)+'.cpp', 'w') as ofile:
+            ofile.write(body)
 
         # Basic informations common to all populations
         pop_desc = {
@@ -243,8 +256,33 @@ class OpenMPGenerator(PopulationGenerator):
         if len(pop.global_operations) > 0:
             pop_desc['gops_update'] = """    pop%(id)s.update_global_ops();\n""" % {'id': pop.id}
 
+        if update_schedules != "":
+            pop_desc['schedule_update'] = """    pop%(id)s.update_schedules();\n""" % {'id': pop.id}
+
         return pop_desc
 
+    def _schedules(self, pop):
+        """
+        Declares the input schedules set with Population.schedule() and the
+        update_schedules() method assigning their values.
+
+        Returns:
+            * declaration code (struct members and accessors)
+            * update code (empty if nothing is scheduled)
+        """
+        declare = ""
+        update = ""
+        for name in sorted(pop._schedules.keys()):
+            var = [attr for attr in pop.neuron_type.description['parameters'] + pop.neuron_type.description['variables'] if attr['name'] == name][0]
+            ids = {'name': name, 'type': var['ctype']}
+            declare += self._templates['attribute_schedule'][var['locality']]['declare'] % ids
+            update += self._templates['attribute_schedule'][var['locality']]['update'] % ids
+
+        if update != "":
+            declare += self._templates['attribute_schedule']['method'] % {'update': update}
+
+        return declare, update
+
     def _init_random_dist(self, pop):
         """
         Initialize random distribution sources.
@@ -478,49 +516,126 @@ class OpenMPGenerator(PopulationGenerator):
     ##################################################
     # Mean firing rate
     ##################################################
+    def _save_load_state(self, pop):
+        """
+        Generate the body of the save_state() and load_state() methods, which
+        (de-)serialize all containers of the population: parameters, variables,
+        spike and refractory arrays, delay queues, firing rate history and
+        random distributions. Specific populations can add their own members
+        with the fields 'save_state_additional'/'load_state_additional'.
+        """
+        from ANNarchy.generator.Utils import tabify
+
+        members = ['_active']
+        text_members = []
+
+        # Parameters and variables
+        for var in pop.neuron_type.description['parameters'] + pop.neuron_type.description['variables']:
+            if not var['name'] in members:
+                members.append(var['name'])
+
+        # Post-synaptic sums or conductances
+        if pop.neuron_type.type == 'rate':
+            for target in sorted(list(set(pop.neuron_type.description['targets'] + pop.targets))):
+                members.append('_sum_' + target)
+        else:
+            try:
+                all_targets = set(pop.neuron_type.description['targets'] + pop.targets)
+            except TypeError:
+                all_targets = set(pop.neuron_type.description['targets'] + pop.targets[0])
+            for target in sorted(list(all_targets)):
+                if not 'g_'+target in members:
+                    members.append('g_'+target)
+
+        # Global operations
+        for op in pop.global_operations:
+            members.append('_%(op)s_%(var)s' % {'op': op['function'], 'var': op['variable']})
+
+        # Random distributions
+        for rd in pop.neuron_type.description['random_distributions']:
+            members.append(rd['name'])
+            text_members.append('dist_' + rd['name'])
+
+        # Spiking neurons
+        if pop.neuron_type.type == 'spike':
+            members += ['last_spike', 'spiked']
+            if pop.neuron_type.refractory or pop.refractory:
+                members.append('refractory_remaining')
+            members += ['_spike_history', '_mean_fr_window', '_mean_fr_rate']
+
+        # Delayed variables
+        if pop.max_delay > 1:
+            for var in pop.delayed_variables:
+                members.append('_delayed_' + var)
+            if pop.neuron_type.type == 'spike':
+                members.append('_delayed_spike')
+
+        # Input schedules
+        for name in sorted(pop._schedules.keys()):
+            members.append('_schedule_' + name)
+
+        save_code = ""
+        load_code = ""
+        for name in members:
+            save_code += "_write_state(os, %(name)s);\n" % {'name': name}
+            load_code += "_read_state(is, %(name)s);\n" % {'name': name}
+        for name in text_members:
+            save_code += "_write_state_text(os, %(name)s);\n" % {'name': name}
+            load_code += "_read_state_text(is, %(name)s);\n" % {'name': name}
+
+        if 'save_state_additional' in pop._specific_template.keys():
+            save_code += pop._specific_template['save_state_additional']
+        if 'load_state_additional' in pop._specific_template.keys():
+            load_code += pop._specific_template['load_state_additional']
+
+        return tabify(save_code, 2), tabify(load_code, 2)
+
     def _init_fr(self, pop):
         "Declares arrays for computing the mean FR of a spiking neuron"
         declare_FR = ""; init_FR = ""
         if pop.neuron_type.description['type'] == 'spike':
             declare_FR = """
     // Mean Firing rate
-    std::vector< std::queue<long int> > _spike_history;
+    WindowedSum<int> _spike_history;
     long int _mean_fr_window;
     %(float_prec)s _mean_fr_rate;
     void compute_firing_rate(%(float_prec)s window){
         if(window>0.0){
             _mean_fr_window = int(window/dt);
             _mean_fr_rate = 1000./window;
+            _spike_history.init(size, _mean_fr_window);
         }
     };""" % {'float_prec': Global.config['precision']}
             init_FR = """
         // Mean Firing Rate
-        _spike_history = std::vector< std::queue<long int> >(size, std::queue<long int>());
+        _spike_history.init(size, 1);
         _mean_fr_window = 0;
         _mean_fr_rate = 1.0;"""
 
         return declare_FR, init_FR
 
     def _update_fr(self, pop):
-        "Computes the average firing rate based on history"
-        mean_FR_push = ""; mean_FR_update = ""
+        """
+        Computes the average firing rate based on history. Only the neurons which emitted a spike
+        in the current step or whose oldest spike left the window are updated.
+        """
+        mean_FR_update = ""
         if pop.neuron_type.description['type'] == 'spike':
-            mean_FR_push = """
-                    // Update the mean firing rate
-                    if(_mean_fr_window> 0)
-                        _spike_history[i].push(t);
-            """
             mean_FR_update = """
-                // Update the mean firing rate
-                if(_mean_fr_window> 0){
-                    while((_spike_history[i].size() != 0)&&(_spike_history[i].front() <= t - _mean_fr_window)){
-                        _spike_history[i].pop(); // Suppress spikes outside the window
-                    }
-                    r[i] = _mean_fr_rate * float(_spike_history[i].size());
+            // Update the mean firing rate
+            if(_mean_fr_window > 0){
+                _spike_history.step();
+                for(auto it = _spike_history.expired.begin(); it != _spike_history.expired.end(); it++){
+                    r[it->first] = _mean_fr_rate * %(float_prec)s(_spike_history.total[it->first]);
+                }
+                for(int _idx = 0; _idx < spiked.size(); _idx++){
+                    _spike_history.add(spiked[_idx], 1);
+                    r[spiked[_idx]] = _mean_fr_rate * %(float_prec)s(_spike_history.total[spiked[_idx]]);
                 }
-            """
+            }
+""" % {'float_prec': Global.config['precision']}
 
-        return mean_FR_push, mean_FR_update
+        return mean_FR_update
 
     ##################################################
     # Global operations
@@ -540,11 +655,17 @@ class OpenMPGenerator(PopulationGenerator):
             _%(op)s_%(var)s = %(op)s_value(%(var)s.data(), size);
 """ % {'op': op['function'], 'var': op['variable']}
 
-        return """
+        final_code = """
     if ( _active ){
 %(code)s
     }""" % {'code': code}
 
+        # if profiling enabled, annotate with profiling code
+        if self._prof_gen:
+            final_code = self._prof_gen.annotate_update_globalops(pop, final_code)
+
+        return final_code
+
     def _update_random_distributions(self, pop):
         """
         Generate the C++ for drawing pseudo-random numbers in each step.
@@ -725,7 +846,7 @@ class OpenMPGenerator(PopulationGenerator):
 """ % {'reset': eq['cpp'] % {'id': pop.id, 'local_index': "[i]", 'semiglobal_index': '', 'global_index': ''}}
 
         # Mean Firing rate
-        mean_FR_push, mean_FR_update = self._update_fr(pop)
+        mean_FR_update = self._update_fr(pop)
 
         # Gather code
         spike_gather = """
@@ -742,14 +863,10 @@ class OpenMPGenerator(PopulationGenerator):
 
                     // Refractory period
                     %(refrac_inc)s
-                    %(mean_FR_push)s
                 }
-                %(mean_FR_update)s
 """% {'condition' : cond,
       'reset': reset,
       'refrac_inc': refrac_inc,
-      'mean_FR_push': mean_FR_push,
-      'mean_FR_update': mean_FR_update,
       'omp_critical_code': omp_critical_code}
 
         code += spike_gather
@@ -764,11 +881,13 @@ class OpenMPGenerator(PopulationGenerator):
             for(int i = 0; i < size; i++){
 %(code)s
             }
+%(mean_FR_update)s
         } // active
 """ % {
        'code': code,
        'global_code': global_code,
-       'omp_code': omp_code
+       'omp_code': omp_code,
+       'mean_FR_update': mean_FR_update
        }
 
         # if profiling enabled, annotate with profiling code
@@ -97,19 +97,13 @@ struct PopStruct%(id)s{
     }
 
     // Method to draw new random numbers
-    void update_rng() {
-%(update_rng)s
-    }
+    void update_rng();
 
     // Method to update global operations on the population (min/max/mean...)
-    void update_global_ops() {
-%(update_global_ops)s
-    }
+    void update_global_ops();
 
     // Method to enqueue output variables in case outgoing projections have non-zero delay
-    void update_delay() {
-%(update_delay)s
-    }
+    void update_delay();
 
     // Method to dynamically change the size of the queue for delayed variables
     void update_max_delay(int value) {
@@ -117,9 +111,7 @@ struct PopStruct%(id)s{
     }
 
     // Main method to update neural variables
-    void update() {
-%(update_variables)s
-    }
+    void update();
 
     %(stop_condition)s
 
@@ -134,9 +126,51 @@ struct PopStruct%(id)s{
     void clear() {
 %(clear_container)s
     }
+
+    // Checkpointing: write/read all containers (see ANNarchy.h)
+    void save_state(std::ostream& os);
+    void load_state(std::istream& is);
 };
 """
 
+# The methods called at each simulation step are compiled in a
+# separate translation unit (popX.cpp), so that a change in the
+# equations only requires to recompile this population.
+population_body = """/*
+ *  ANNarchy-version: %(annarchy_version)s
+ */
+#include "ANNarchy.h"
+
+// Method to draw new random numbers
+void PopStruct%(id)s::update_rng() {
+%(update_rng)s
+}
+
+// Method to update global operations on the population (min/max/mean...)
+void PopStruct%(id)s::update_global_ops() {
+%(update_global_ops)s
+}
+
+// Method to enqueue output variables in case outgoing projections have non-zero delay
+void PopStruct%(id)s::update_delay() {
+%(update_delay)s
+}
+
+// Main method to update neural variables
+void PopStruct%(id)s::update() {
+%(update_variables)s
+}
+
+// Checkpointing: write/read all containers (see ANNarchy.h)
+void PopStruct%(id)s::save_state(std::ostream& os) {
+%(save_state)s
+}
+
+void PopStruct%(id)s::load_state(std::istream& is) {
+%(load_state)s
+}
+"""
+
 # c like definition of neuron attributes, whereas 'local' is used if values can vary across
 # neurons, consequently 'global' is used if values are common to all neurons.Currently two
 # types of sets are defined: openmp and cuda. In cuda case additional 'dirty' flags are
@@ -208,6 +242,46 @@ attribute_cpp_init = {
 """
 }
 
+# Input schedules of neuron attributes (Population.schedule()), applied at the
+# beginning of each step by update_schedules(). Local attributes receive one
+# value per neuron, global ones a single value.
+#
+# Parameters:
+#
+#    type: data type of the variable (double, float, int ...)
+#    name: name of the variable
+#
+attribute_schedule = {
+    'local': {
+        'declare': """
+    // Schedule of %(name)s
+    Schedule< std::vector< %(type)s > > _schedule_%(name)s;
+    void set_schedule_%(name)s(std::vector<long int> steps, std::vector< std::vector< %(type)s > > values) { _schedule_%(name)s.set(steps, values, t); }
+""",
+        'update': """
+        if(_schedule_%(name)s.due(t))
+            %(name)s = _schedule_%(name)s.current();
+"""
+    },
+    'global': {
+        'declare': """
+    // Schedule of %(name)s
+    Schedule< %(type)s > _schedule_%(name)s;
+    void set_schedule_%(name)s(std::vector<long int> steps, std::vector< %(type)s > values) { _schedule_%(name)s.set(steps, values, t); }
+""",
+        'update': """
+        if(_schedule_%(name)s.due(t))
+            %(name)s = _schedule_%(name)s.current();
+"""
+    },
+    'method': """
+    // Assigns the scheduled values of the current step
+    void update_schedules() {
+%(update)s
+    }
+"""
+}
+
 attribute_delayed = {
     'local': {
         'init': """
@@ -339,10 +413,12 @@ spike_specific = {
 # Final dictionary
 openmp_templates = {
     'population_header': population_header,
+    'population_body': population_body,
     'attr_decl': attribute_decl,
     'attr_acc': attribute_acc,
     'attribute_cpp_init': attribute_cpp_init,
     'attribute_delayed': attribute_delayed,
+    'attribute_schedule': attribute_schedule,
     'rng': cpp_11_rng,
 
     'rate_psp': rate_psp,
@@ -75,10 +75,12 @@ class CPP11Profile(ProfileGenerator):
         declare = """
     Measurement* measure_step;
     Measurement* measure_rng;
+    Measurement* measure_gops;
 """
         init = """        // Profiling
         measure_step = Profiling::get_instance()->register_function("pop", "%(name)s", %(id)s, "step", "%(label)s");
         measure_rng = Profiling::get_instance()->register_function("pop", "%(name)s", %(id)s, "rng", "%(label)s");
+        measure_gops = Profiling::get_instance()->register_function("pop", "%(name)s", %(id)s, "gops", "%(label)s");
 """ % {'name': pop.name, 'id': pop.id, 'label': pop.name}
 
         return declare, init
@@ -192,6 +194,22 @@ class CPP11Profile(ProfileGenerator):
 """
         return prof_code % prof_dict
 
+    def annotate_update_globalops(self, pop, code):
+        """
+        annotate the update of global operations (min/max/mean...)
+        """
+        prof_dict = {
+            'code': code,
+            'prof_begin': cpp11_profile_template['update_gops']['before'],
+            'prof_end': cpp11_profile_template['update_gops']['after']
+        }
+        prof_code = """
+        %(prof_begin)s
+%(code)s
+        %(prof_end)s
+"""
+        return prof_code % prof_dict
+
     def _generate_header(self):
         """
         generate Profiling.h
@@ -94,6 +94,10 @@ class ProfileGenerator(object):
         "Implemented by child class"
         raise NotImplementedError
 
+    def annotate_update_globalops(self, pop, code):
+        "Implemented by child class"
+        raise NotImplementedError
+
     def _generate_header(self):
         "Implemented by child class"
         raise NotImplementedError
\ No newline at end of file
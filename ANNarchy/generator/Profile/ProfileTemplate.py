@@ -381,69 +381,87 @@ cpp11_profile_header = """
     #define debug_cout(x)
 #endif
 
+/**
+ *  @brief      Timings of one function
+ *  @details    The samples (in us) are not stored, only streaming statistics
+ *              are updated (Welford's algorithm for mean and variance) together
+ *              with a histogram on a logarithmic scale: the bin k contains the
+ *              samples in [2^(k-10), 2^(k-9)[ us, the first and last bins also
+ *              contain the smaller and larger values.
+ */
 class Measurement{
     std::string _type;
     std::string _label;
-    std::vector<double> _raw_data;
 
+    long int _count;
     double _mean;
+    double _m2;
+    double _min;
+    double _max;
     double _std;
+    std::vector<long int> _histogram;
+
+    bool _running;
     std::chrono::time_point<std::chrono::steady_clock> _start;
     std::chrono::time_point<std::chrono::steady_clock> _stop;
 
 public:
+    static const int nb_bins = 32;
+    static bool enabled;    ///< sampling can be switched on/off at runtime
+
     Measurement(std::string type, std::string label) {
         debug_cout("Create Measurement object");
         _type = type;
         _label = label;
-        _mean = 0.0;
-        _std = 0.0;
-        _raw_data = std::vector<double>();
+        _running = false;
+        reset();
     }
 
     ~Measurement() {
         debug_cout("Destroy Measurement object");
-        _raw_data.clear();
     }
 
     inline void start_wall_time() {
+        if ( !enabled )
+            return;
+        _running = true;
         _start = std::chrono::steady_clock::now();
     }
 
     inline void stop_wall_time() {
+        if ( !_running )
+            return;
         _stop = std::chrono::steady_clock::now();
-        std::chrono::duration<float> dur = _stop - _start;
-        _raw_data.push_back( dur.count() * 1000 * 1000); // duration is in sec
+        _running = false;
+        std::chrono::duration<double> dur = _stop - _start;
+        add_sample( dur.count() * 1000 * 1000 ); // duration is in sec
+    }
+
+    inline void add_sample(double value) {
+        _count++;
+        double delta = value - _mean;
+        _mean += delta / double(_count);
+        _m2 += delta * (value - _mean);
+        _min = std::min(_min, value);
+        _max = std::max(_max, value);
+
+        int bin = (value > 0.0) ? int(floor(log2(value))) + 10 : 0;
+        _histogram[ std::max(0, std::min(bin, nb_bins-1)) ]++;
     }
 
     void reset() {
         debug_cout("Reset Measurement object");
-        _raw_data.clear();
+        _count = 0;
         _mean = 0.0;
+        _m2 = 0.0;
         _std = 0.0;
+        _min = INFINITY;
+        _max = -INFINITY;
+        _histogram = std::vector<long int>(nb_bins, 0);
     }
 
     void evaluate() {
-        if (_raw_data.empty())
-            return;
-
-        double sum = 0.0;
-        int num_elem = _raw_data.size();
-
-        // mean over all times
-        for( auto it = _raw_data.begin(); it != _raw_data.end(); it++ ) {
-            sum += *it;
-        }
-
-        _mean = double(sum) / double(num_elem);
-
-        // variance over all times
-        double var = 0;
-        for( auto it = _raw_data.begin(); it != _raw_data.end(); it++ ) {
-            var += (*it-_mean)*(*it-_mean);
-        }
-
-        _std = sqrt(var/double(num_elem));
+        _std = (_count > 0) ? sqrt(_m2 / double(_count)) : 0.0;
     }
 
     friend std::ostream& operator << (std::ostream& stream, const Measurement& measure);
@@ -472,24 +490,21 @@ class Profiling {
         debug_cout("Create Profiling instance.");
 
         _profiler_start = std::chrono::steady_clock::now();
-        _out_file.open("%(result_file)s", std::ofstream::out | std::ofstream::trunc);
-        _out_file << "<root>" << std::endl;
-
-        %(config_xml)s
     }
 
 public:
     /**
      *  @brief  Destructor
+     *  @details The summary of all measurements is written at exit.
      */
     ~Profiling() {
         debug_cout("Destroy Profiling instance.");
 
+        evaluate();
+        store();
+
         for(auto it = _datasets.begin(); it != _datasets.end(); it++ )
             delete *it;
-
-        _out_file << "</root>" << std::endl;
-        _out_file.close();
     }
 
     /**
@@ -566,50 +581,95 @@ public:
             (*it)->evaluate();
     }
 
-    void store() {
-        //
-        // To ensure, that the network related datasets are written first, we run two times
-        // across the list ...
-        //
-        for( auto it = _identifier.begin(); it != _identifier.end(); it++ ) {
-            if ( _datasets[it->second]->_raw_data.empty() || (_datasets[it->second]->_type.compare("net")!=0 ) )
-                continue;    // nothing recorded, omit dataset
-
-            _out_file << "  <dataset>" << std::endl;
-            _out_file << "    <obj_type>" << _datasets[it->second]->_type << "</obj_type>" << std::endl;
-            _out_file << "    <name>" << it->first.first << "</name>" << std::endl;
-            _out_file << "    <func>" << it->first.second << "</func>" << std::endl;
-            _out_file << "    <label>" << it->first.second << "</label>" << std::endl; // for top level objects "label" is equal to "func"
-            _out_file << "    <mean>" << std::fixed << std::setprecision(4) << _datasets[it->second]->_mean << "</mean>"<< std::endl;
-            _out_file << "    <std>" << std::fixed << std::setprecision(4) << _datasets[it->second]->_std << "</std>"<< std::endl;
+    /**
+     *  @brief      Enable or disable the sampling without recompiling.
+     */
+    void set_enabled(bool enabled) {
+        Measurement::enabled = enabled;
+    }
 
-            _out_file << "    <raw_data>";
-            for(auto it2 = _datasets[it->second]->_raw_data.begin(); it2 != _datasets[it->second]->_raw_data.end(); it2++)
-                _out_file << std::fixed << std::setprecision(4) << *it2 << " ";
-            _out_file << "</raw_data>" << std::endl;
+    bool is_enabled() {
+        return Measurement::enabled;
+    }
 
-            _out_file << "  </dataset>" << std::endl;
+    /**
+     *  @brief      Descriptors (type, object, function, label) of the registered functions.
+     *  @details    The order is the same as for get_statistics() and get_histograms().
+     */
+    std::vector< std::vector<std::string> > get_descriptors() {
+        std::vector< std::vector<std::string> > result;
+        for( auto it = _identifier.begin(); it != _identifier.end(); it++ ) {
+            Measurement* measure = _datasets[it->second];
+            std::string label = (measure->_type.compare("net")==0) ? it->first.second : measure->_label; // for top level objects "label" is equal to "func"
+            result.push_back({ measure->_type, it->first.first, it->first.second, label });
         }
+        return result;
+    }
 
+    /**
+     *  @brief      Number of samples, mean, standard deviation, minimum, maximum and total time (in us) of the registered functions.
+     */
+    std::vector< std::vector<double> > get_statistics() {
+        evaluate();
+        std::vector< std::vector<double> > result;
         for( auto it = _identifier.begin(); it != _identifier.end(); it++ ) {
-            if ( _datasets[it->second]->_raw_data.empty() || (_datasets[it->second]->_type.compare("net")==0 ) )
-                continue;    // nothing recorded, omit dataset
+            Measurement* measure = _datasets[it->second];
+            if ( measure->_count == 0 )
+                result.push_back({ 0.0, 0.0, 0.0, 0.0, 0.0, 0.0 });
+            else
+                result.push_back({ double(measure->_count), measure->_mean, measure->_std, measure->_min, measure->_max, measure->_mean * double(measure->_count) });
+        }
+        return result;
+    }
 
-            _out_file << "  <dataset>" << std::endl;
-            _out_file << "    <obj_type>" << _datasets[it->second]->_type << "</obj_type>" << std::endl;
-            _out_file << "    <name>" << it->first.first << "</name>" << std::endl;
-            _out_file << "    <func>" << it->first.second << "</func>" << std::endl;
-            _out_file << "    <label>" << _datasets[it->second]->_label << "</label>" << std::endl;
-            _out_file << "    <mean>" << std::fixed << std::setprecision(4) << _datasets[it->second]->_mean << "</mean>"<< std::endl;
-            _out_file << "    <std>" << std::fixed << std::setprecision(4) << _datasets[it->second]->_std << "</std>"<< std::endl;
+    /**
+     *  @brief      Logarithmic histograms of the registered functions (see Measurement).
+     */
+    std::vector< std::vector<long int> > get_histograms() {
+        std::vector< std::vector<long int> > result;
+        for( auto it = _identifier.begin(); it != _identifier.end(); it++ )
+            result.push_back(_datasets[it->second]->_histogram);
+        return result;
+    }
 
-            _out_file << "    <raw_data>";
-            for(auto it2 = _datasets[it->second]->_raw_data.begin(); it2 != _datasets[it->second]->_raw_data.end(); it2++)
-                _out_file << std::fixed << std::setprecision(4) << *it2 << " ";
-            _out_file << "</raw_data>" << std::endl;
+    void store() {
+        _out_file.open("%(result_file)s", std::ofstream::out | std::ofstream::trunc);
+        _out_file << "<root>" << std::endl;
 
-            _out_file << "  </dataset>" << std::endl;
+        %(config_xml)s
+
+        //
+        // To ensure, that the network related datasets are written first, we run two times
+        // across the list ...
+        //
+        for ( int net = 1; net >= 0; net-- ) {
+            for( auto it = _identifier.begin(); it != _identifier.end(); it++ ) {
+                Measurement* measure = _datasets[it->second];
+                if ( measure->_count == 0 || ((measure->_type.compare("net")==0) != (net==1)) )
+                    continue;    // nothing recorded, omit dataset
+
+                _out_file << "  <dataset>" << std::endl;
+                _out_file << "    <obj_type>" << measure->_type << "</obj_type>" << std::endl;
+                _out_file << "    <name>" << it->first.first << "</name>" << std::endl;
+                _out_file << "    <func>" << it->first.second << "</func>" << std::endl;
+                _out_file << "    <label>" << ((net==1) ? it->first.second : measure->_label) << "</label>" << std::endl;
+                _out_file << "    <count>" << measure->_count << "</count>"<< std::endl;
+                _out_file << "    <mean>" << std::fixed << std::setprecision(4) << measure->_mean << "</mean>"<< std::endl;
+                _out_file << "    <std>" << std::fixed << std::setprecision(4) << measure->_std << "</std>"<< std::endl;
+                _out_file << "    <min>" << std::fixed << std::setprecision(4) << measure->_min << "</min>"<< std::endl;
+                _out_file << "    <max>" << std::fixed << std::setprecision(4) << measure->_max << "</max>"<< std::endl;
+
+                _out_file << "    <histogram>";
+                for(auto it2 = measure->_histogram.begin(); it2 != measure->_histogram.end(); it2++)
+                    _out_file << *it2 << " ";
+                _out_file << "</histogram>" << std::endl;
+
+                _out_file << "  </dataset>" << std::endl;
+            }
         }
+
+        _out_file << "</root>" << std::endl;
+        _out_file.close();
     }
 
     friend std::ostream& operator << (std::ostream& stream, const Profiling& profiling);
@@ -617,11 +677,11 @@ public:
 
 // out stream operators
 inline std::ostream& operator << (std::ostream& stream, const Measurement& measure) {
-    if ( measure._raw_data.empty() )
+    if ( measure._count == 0 )
         return stream;
 
     stream << "mean: " << measure._mean << " us, "
-           << "std: " << measure._std << " ( over " << measure._raw_data.size() << " measurements )";
+           << "std: " << measure._std << " ( over " << measure._count << " measurements )";
 
     return stream;
 }
@@ -642,6 +702,7 @@ cpp11_profile_template = {
     'include': """// Profiling
 #include "Profiling.h"
 std::unique_ptr<Profiling> Profiling::_instance(nullptr);
+bool Measurement::enabled = true;
 """,
     'init': """
     //initialize profiler, create singleton instance
@@ -700,15 +761,9 @@ std::unique_ptr<Profiling> Profiling::_instance(nullptr);
     'step_post': """// after
     measure->stop_wall_time();
     """,
-    'run_pre': """
-    Profiling::get_instance()->reset();
-    """,
-    'run_post': """
-    Profiling::get_instance()->evaluate();
-    Profiling::get_instance()->store();
-    std::cout << "profiling results: " << std::endl;
-    std::cout << *Profiling::get_instance() << std::endl;
-    """,
+    # the measurements are accumulated until reset_profile() and written at exit
+    'run_pre': "",
+    'run_post': "",
     
     #
     # Execute the profile in each Object (i. e. populations, projections)
@@ -728,6 +783,10 @@ std::unique_ptr<Profiling> Profiling::_instance(nullptr);
         'before' : "measure_rng->start_wall_time();",
         'after' : "measure_rng->stop_wall_time();"
     },
+    'update_gops':{
+        'before' : "measure_gops->start_wall_time();",
+        'after' : "measure_gops->stop_wall_time();"
+    },
     'spike_prop': {
         'before' : "measure_prop->start_wall_time();",
         'after' : "measure_prop->stop_wall_time();"
@@ -1021,6 +1080,7 @@ cuda_profile_template = {
     'include': """// Profiling
 #include "Profiling.h"
 std::unique_ptr<Profiling> Profiling::_instance(nullptr);
+bool Measurement::enabled = true;
 """,
     'init': """
     //initialize profiler, create singleton instance
@@ -63,8 +63,8 @@ class Connectivity(object):
 
         Returns:
 
-            a dictionary containing the following fields: *declare*, *init*,
-            *accessor*, *declare_inverse*, *init_inverse*
+            a dictionary containing the following fields: *include*, *declare*,
+            *init*, *accessor*, *declare_inverse*, *init_inverse*
 
         TODO:
 
@@ -74,6 +74,7 @@ class Connectivity(object):
         """
         declare_inverse_connectivity_matrix = ""
         init_inverse_connectivity_matrix = ""
+        include_connectivity_matrix = ""
 
         # Retrieve the templates
         connectivity_matrix_tpl = self._templates['connectivity_matrix']
@@ -94,6 +95,12 @@ class Connectivity(object):
             'target': proj.target
         }
 
+        # The ranks of an identical projection are reused (see Compiler.share_connectivity())
+        if proj._shared_connectivity is not None:
+            shared_tpl = self._templates['shared_connectivity_matrix']
+            include_connectivity_matrix = shared_tpl['include'] % {'id_shared': proj._shared_connectivity.id}
+            declare_connectivity_matrix = shared_tpl['declare'] % {'id_shared': proj._shared_connectivity.id}
+
         # Weight array
         declare_connectivity_matrix += weight_matrix_tpl['declare'] % {'float_prec': Global.config['precision']}
         access_connectivity_matrix += weight_matrix_tpl['accessor'] % {'float_prec': Global.config['precision']}
@@ -118,6 +125,7 @@ class Connectivity(object):
             init_inverse_connectivity_matrix = proj._specific_template['init_inverse_connectivity_matrix']
 
         return {
+            'include': include_connectivity_matrix,
             'declare' : declare_connectivity_matrix,
             'init' : init_connectivity_matrix,
             'accessor' : access_connectivity_matrix,
@@ -34,6 +34,22 @@ connectivity_matrix = {
     std::vector< std::vector<int> > get_pre_rank() { return pre_rank; }
     void set_pre_rank(std::vector< std::vector<int> > ranks) { pre_rank = ranks; }
     int nb_synapses(int n) { return pre_rank[n].size(); }
+    // Bulk export in CSR order (row_ptr must hold post_rank.size()+1 elements)
+    void flat_row_ptr(long* row_ptr) {
+        long offset = 0;
+        for(int i = 0; i < pre_rank.size(); i++) {
+            row_ptr[i] = offset;
+            offset += pre_rank[i].size();
+        }
+        row_ptr[pre_rank.size()] = offset;
+    }
+    void flat_pre_rank(int* ranks) {
+        long offset = 0;
+        for(int i = 0; i < pre_rank.size(); i++) {
+            std::copy(pre_rank[i].begin(), pre_rank[i].end(), ranks + offset);
+            offset += pre_rank[i].size();
+        }
+    }
 """,
     'init': """
 """,
@@ -44,6 +60,8 @@ connectivity_matrix = {
         void set_post_rank(vector[int])
         void set_pre_rank(vector[vector[int]])
         void inverse_connectivity_matrix()
+        void flat_row_ptr(long*)
+        void flat_pre_rank(int*)
 """,
     'pyx_wrapper_args': "synapses",
     'pyx_wrapper_init': """
@@ -68,9 +86,36 @@ connectivity_matrix = {
     def set_pre_rank(self, val):
         proj%(id_proj)s.set_pre_rank(val)
         proj%(id_proj)s.inverse_connectivity_matrix()
+    def flat_row_ptr(self, long[::1] row_ptr):
+        proj%(id_proj)s.flat_row_ptr(&row_ptr[0])
+    def flat_pre_rank(self, int[::1] ranks):
+        if ranks.shape[0] > 0:
+            proj%(id_proj)s.flat_pre_rank(&ranks[0])
 """
 }
 
+# Connectivity of a projection identical to proj%(id_shared)s (see Compiler.share_connectivity()):
+# the ranks are references to the ones of proj%(id_shared)s, which is initialized first.
+# The other fields are the ones of connectivity_matrix.
+shared_connectivity_matrix = dict(connectivity_matrix)
+shared_connectivity_matrix.update({
+    'include': """#include "proj%(id_shared)s.hpp"
+extern ProjStruct%(id_shared)s proj%(id_shared)s;
+""",
+    'declare': """
+    // Connectivity (shared with proj%(id_shared)s)
+    std::vector<int> &post_rank = proj%(id_shared)s.post_rank;
+    std::vector< std::vector< int > > &pre_rank = proj%(id_shared)s.pre_rank;
+""",
+    'pyx_wrapper_init': """
+        cdef LIL syn = synapses
+        cdef int size = syn.size
+        cdef int nb_post = syn.post_rank.size()
+        proj%(id_proj)s.set_size( size )
+        # post_rank and pre_rank are the ones of proj%(id_shared)s
+"""
+})
+
 weight_matrix = {
     'declare': """
     // LIL weights
@@ -88,24 +133,53 @@ weight_matrix = {
     std::vector< double > get_dendrite_w(int rk) { return std::vector<double>(w[rk].begin(), w[rk].end()); }
     double get_synapse_w(int rk_post, int rk_pre) { return w[rk_post][rk_pre]; }
     void set_w(std::vector<std::vector< double > >value) {
-        w = std::vector< std::vector<%(float_prec)s> >( value.size(), std::vector<%(float_prec)s>() );
+        // assign() keeps the storage when the sizes do not change (views in Python)
+        w.resize(value.size());
         for(int i = 0; i < value.size(); i++) {
-            w[i] = std::vector<%(float_prec)s>(value[i].begin(), value[i].end());
+            w[i].assign(value[i].begin(), value[i].end());
         }
     }
-    void set_dendrite_w(int rk, std::vector< double > value) { w[rk] = std::vector<%(float_prec)s>(value.begin(), value.end()); }
+    void set_dendrite_w(int rk, std::vector< double > value) { w[rk].assign(value.begin(), value.end()); }
     void set_synapse_w(int rk_post, int rk_pre, double value) { w[rk_post][rk_pre] = value; }
+    void flat_w(double* values) {
+        long offset = 0;
+        for(int i = 0; i < w.size(); i++) {
+            std::copy(w[i].begin(), w[i].end(), values + offset);
+            offset += w[i].size();
+        }
+    }
+    void set_flat_w(double* values) {
+        // the attribute may not be allocated yet (initialization)
+        w.resize(pre_rank.size());
+        long offset = 0;
+        for(int i = 0; i < w.size(); i++) {
+            w[i].resize(pre_rank[i].size());
+            std::copy(values + offset, values + offset + w[i].size(), w[i].begin());
+            offset += w[i].size();
+        }
+    }
+    void fill_w(double value) {
+        w.resize(pre_rank.size());
+        for(int i = 0; i < w.size(); i++) {
+            w[i].resize(pre_rank[i].size());
+            std::fill(w[i].begin(), w[i].end(), value);
+        }
+    }
 """,
     'init': """
 """,
     'pyx_struct': """
         # Local variable w
+        vector[vector[%(float_prec)s]] w
         vector[vector[double]] get_w()
         vector[double] get_dendrite_w(int)
         double get_synapse_w(int, int)
         void set_w(vector[vector[double]])
         void set_dendrite_w(int, vector[double])
         void set_synapse_w(int, int, double)
+        void flat_w(double*)
+        void set_flat_w(double*)
+        void fill_w(double)
 """,
     'pyx_wrapper_args': "",
     'pyx_wrapper_init': """
@@ -125,6 +199,24 @@ weight_matrix = {
         return proj%(id_proj)s.get_synapse_w(rank_post, rank_pre)
     def set_synapse_w(self, int rank_post, int rank_pre, double value):
         proj%(id_proj)s.set_synapse_w(rank_post, rank_pre, value)
+    def flat_w(self, double[::1] values):
+        if values.shape[0] > 0:
+            proj%(id_proj)s.flat_w(&values[0])
+    def get_flat_w(self, long size):
+        cdef double[::1] values = np.empty(size, dtype=np.float64)
+        if size > 0:
+            proj%(id_proj)s.flat_w(&values[0])
+        return np.asarray(values)
+    def set_flat_w(self, values):
+        cdef double[::1] data = np.ascontiguousarray(values, dtype=np.float64)
+        if data.shape[0] > 0:
+            proj%(id_proj)s.set_flat_w(&data[0])
+    def fill_w(self, double value):
+        proj%(id_proj)s.fill_w(value)
+    cpdef np.ndarray view_dendrite_w(self, int rank):
+        if proj%(id_proj)s.w[rank].size() == 0:
+            return np.zeros(0, dtype=np.float32 if sizeof(%(float_prec)s) == 4 else np.float64)
+        return np.asarray(<%(float_prec)s[:proj%(id_proj)s.w[rank].size()]> proj%(id_proj)s.w[rank].data())
 """
 }
 
@@ -141,8 +233,8 @@ single_weight_matrix = {
 """,
     'pyx_wrapper_args': "",
     'pyx_wrapper_init': """
-        # Use only the first weight
-        proj%(id_proj)s.w = syn.w[0][0]
+        # Use only the first weight (a projection without synapses has none)
+        proj%(id_proj)s.w = syn.w[0][0] if syn.w.size() > 0 and syn.w[0].size() > 0 else 0.0
 """,
     'pyx_wrapper_accessor': """
     # Local variable w
@@ -208,6 +300,31 @@ attribute_acc = {
     void set_%(name)s(std::vector<std::vector< %(type)s > >value) { %(name)s = value; }
     void set_dendrite_%(name)s(int rk, std::vector<%(type)s> value) { %(name)s[rk] = value; }
     void set_synapse_%(name)s(int rk_post, int rk_pre, %(type)s value) { %(name)s[rk_post][rk_pre] = value; }
+    // Bulk access in CSR order (values holds one element per synapse)
+    void flat_%(name)s(%(type)s* values) {
+        long offset = 0;
+        for(int i = 0; i < %(name)s.size(); i++) {
+            std::copy(%(name)s[i].begin(), %(name)s[i].end(), values + offset);
+            offset += %(name)s[i].size();
+        }
+    }
+    void set_flat_%(name)s(%(type)s* values) {
+        // the attribute may not be allocated yet (initialization)
+        %(name)s.resize(pre_rank.size());
+        long offset = 0;
+        for(int i = 0; i < %(name)s.size(); i++) {
+            %(name)s[i].resize(pre_rank[i].size());
+            std::copy(values + offset, values + offset + %(name)s[i].size(), %(name)s[i].begin());
+            offset += %(name)s[i].size();
+        }
+    }
+    void fill_%(name)s(%(type)s value) {
+        %(name)s.resize(pre_rank.size());
+        for(int i = 0; i < %(name)s.size(); i++) {
+            %(name)s[i].resize(pre_rank[i].size());
+            std::fill(%(name)s[i].begin(), %(name)s[i].end(), value);
+        }
+    }
 """,
     'semiglobal':
 """
@@ -302,6 +419,13 @@ delay = {
         proj%(id_proj)s.max_delay = value
     def update_max_delay(self, value):
         proj%(id_proj)s.update_max_delay(value)
+    def flat_delay(self, int[::1] values):
+        cdef int i
+        cdef long j, offset = 0
+        for i in range(proj%(id_proj)s.delay.size()):
+            for j in range(proj%(id_proj)s.delay[i].size()):
+                values[offset+j] = proj%(id_proj)s.delay[i][j]
+            offset += proj%(id_proj)s.delay[i].size()
 """
     }
 }
@@ -323,9 +447,77 @@ event_driven = {
 """
 }
 
+# Event-driven variables stored once per pre- or post-synaptic neuron
+# (see neuron_traces() in generator/Utils.py). The value of a neuron is only
+# decayed when it is read (_trace_<name>) or incremented (_update_trace_<name>),
+# from the step of its last update. The accessors provide the same interface as
+# local variables.
+#
+# Parameters:
+#
+#    name, type, attr_type: as in attribute_decl
+#    side: 'pre' or 'post'
+#    index: pre-synaptic ("pre_rank[i][j]") or post-synaptic ("post_rank[i]") rank of the synapse
+#    decay: exact decay of _value since _last_event_<name>[_r] (see neuron_trace_decay())
+#    id_pop, init: population storing the trace and initial value
+neuron_trace = {
+    'declare': """
+    // Local %(attr_type)s %(name)s (stored per %(side)s-synaptic neuron)
+    std::vector< %(type)s > %(name)s;
+    std::vector< long int > _last_event_%(name)s;
+    // Value of the neuron _r at the step _t
+    %(type)s _trace_%(name)s(int _r, long int _t) const {
+        %(type)s _value = %(name)s[_r];
+        if(_t > _last_event_%(name)s[_r]) {
+            %(decay)s
+        }
+        return _value;
+    }
+    // Decays the value of the neuron _r until the step _t before it is incremented
+    void _update_trace_%(name)s(int _r, long int _t) {
+        %(name)s[_r] = _trace_%(name)s(_r, _t);
+        _last_event_%(name)s[_r] = t;
+    }
+""",
+    'accessor': """
+    // Local %(attr_type)s %(name)s (stored per %(side)s-synaptic neuron)
+    std::vector<std::vector< %(type)s > > get_%(name)s() {
+        std::vector<std::vector< %(type)s > > values(post_rank.size(), std::vector< %(type)s >());
+        for(int i = 0; i < post_rank.size(); i++)
+            values[i] = get_dendrite_%(name)s(i);
+        return values;
+    }
+    std::vector<%(type)s> get_dendrite_%(name)s(int i) {
+        std::vector< %(type)s > values(pre_rank[i].size());
+        for(int j = 0; j < pre_rank[i].size(); j++)
+            values[j] = _trace_%(name)s(%(index)s, t);
+        return values;
+    }
+    %(type)s get_synapse_%(name)s(int i, int j) { return _trace_%(name)s(%(index)s, t); }
+    void set_%(name)s(std::vector<std::vector< %(type)s > >value) {
+        for(int i = 0; i < post_rank.size(); i++)
+            set_dendrite_%(name)s(i, value[i]);
+    }
+    void set_dendrite_%(name)s(int i, std::vector<%(type)s> value) {
+        for(int j = 0; j < pre_rank[i].size(); j++)
+            set_synapse_%(name)s(i, j, value[j]);
+    }
+    void set_synapse_%(name)s(int i, int j, %(type)s value) {
+        %(name)s[%(index)s] = value;
+        _last_event_%(name)s[%(index)s] = t;
+    }
+""",
+    'init': """
+        // Local %(attr_type)s %(name)s (stored per %(side)s-synaptic neuron)
+        %(name)s = std::vector<%(type)s>(pop%(id_pop)s.size, %(init)s);
+        _last_event_%(name)s = std::vector<long int>(pop%(id_pop)s.size, t);
+"""
+}
+
 conn_templates = {
     # connectivity
     'connectivity_matrix': connectivity_matrix,
+    'shared_connectivity_matrix': shared_connectivity_matrix,
     'inverse_connectivity_matrix': inverse_connectivity_matrix,
     'weight_matrix': weight_matrix,
     'single_weight_matrix': single_weight_matrix,
@@ -335,5 +527,6 @@ conn_templates = {
     'attribute_acc':attribute_acc,
     'attribute_cpp_init': attribute_cpp_init,
     'delay': delay,
-    'event_driven': event_driven
+    'event_driven': event_driven,
+    'neuron_trace': neuron_trace
 }
@@ -27,7 +27,7 @@ from .Connectivity import OpenMPConnectivity
 
 from ANNarchy.core import Global
 from ANNarchy.core.PopulationView import PopulationView
-from ANNarchy.generator.Utils import generate_equation_code, tabify
+from ANNarchy.generator.Utils import generate_equation_code, tabify, neuron_traces, replace_neuron_traces, read_neuron_traces
 
 import re
 from ANNarchy.generator.Projection import OpenMPTemplates
@@ -80,10 +80,11 @@ class OpenMPGenerator(ProjectionGenerator, OpenMPConnectivity):
         else:
             psp_prefix, psp_code = self._computesum_spiking(proj)
 
-        # Detect event-driven variables
+        # Detect event-driven variables (the ones stored per neuron do not need the last event)
+        traces = neuron_traces(proj)
         has_event_driven = False
         for var in proj.synapse_type.description['variables']:
-            if var['method'] == 'event-driven':
+            if var['method'] == 'event-driven' and not var['name'] in traces:
                 has_event_driven = True
 
         # Detect delays to generate the code
@@ -103,6 +104,9 @@ class OpenMPGenerator(ProjectionGenerator, OpenMPConnectivity):
         determine_size_in_bytes = self._determine_size_in_bytes(proj)
         clear_container = self._clear_container(proj)
 
+        # Checkpointing
+        save_state, load_state = self._save_load_state(proj, has_delay, has_event_driven)
+
         # Profiling
         if self._prof_gen:
             include_profile = """#include "Profiling.h"\n"""
@@ -113,12 +117,12 @@ class OpenMPGenerator(ProjectionGenerator, OpenMPConnectivity):
             declare_profile = ""
 
         # Additional info (overwritten)
-        include_additional = ""
+        include_additional = connectivity_matrix['include']
         struct_additional = ""
         init_additional = ""
         access_additional = ""
         if 'include_additional' in proj._specific_template.keys():
-            include_additional = proj._specific_template['include_additional']
+            include_additional += proj._specific_template['include_additional']
         if 'struct_additional' in proj._specific_template.keys():
             struct_additional = proj._specific_template['struct_additional']
         if 'init_additional' in proj._specific_template.keys():
@@ -126,6 +130,10 @@ class OpenMPGenerator(ProjectionGenerator, OpenMPConnectivity):
         if 'access_additional' in proj._specific_template.keys():
             access_additional = proj._specific_template['access_additional']
 
+        # Input schedules are added to the specific templates as well
+        declare_schedules, update_schedules = self._schedules(proj)
+        decl['additional'] += declare_schedules
+
         # Invert the post-to-pre or pre-to-post view
         init_inverse = connectivity_matrix['init_inverse'] % {
             'id_proj': proj.id,
@@ -136,7 +144,7 @@ class OpenMPGenerator(ProjectionGenerator, OpenMPConnectivity):
             'post_size': proj.post.population.size if isinstance(proj.post, PopulationView) else proj.post.size
         }
 
-        final_code = self._templates['projection_header'] % {
+        proj_dict = {
             'id_pre': proj.pre.id,
             'id_post': proj.post.id,
             'id_proj': proj.id,
@@ -174,12 +182,18 @@ class OpenMPGenerator(ProjectionGenerator, OpenMPConnectivity):
             'access_parameters_variables': accessor,
             'access_additional': access_additional,
             'determine_size': determine_size_in_bytes,
-            'clear_container': clear_container
+            'clear_container': clear_container,
+            'save_state': save_state,
+            'load_state': load_state
         }
+        final_code = self._templates['projection_header'] % proj_dict
+        body_code = self._templates['projection_body'] % proj_dict
 
-        # Store file
+        # Store files: the header is included in ANNarchy.h, the simulation kernels are compiled separately
         with open(annarchy_dir+'/generate/net'+str(self._net_id)+'/proj'+str(proj.id)+'.hpp', 'w') as ofile:
             ofile.write(final_code)
+        with open(annarchy_dir+'/generate/net'+str(self._net_id)+'/proj'+str(proj.id)+'.cpp', 'w') as ofile:
+            ofile.write(body_code)
 
         # Dictionary for inclusions in ANNarchy.cpp
         proj_desc = {
@@ -192,21 +206,124 @@ class OpenMPGenerator(ProjectionGenerator, OpenMPConnectivity):
         proj_desc['update'] = "" if update_variables == "" else """    proj%(id)s.update_synapse();\n""" % {'id': proj.id}
         proj_desc['rng_update'] = "" if update_rng == "" else """    proj%(id)s.update_rng();\n""" % {'id': proj.id}
         proj_desc['post_event'] = "" if post_event == "" else """    proj%(id)s.post_event();\n""" % {'id': proj.id}
+        proj_desc['schedule_update'] = "" if update_schedules == "" else """    proj%(id)s.update_schedules();\n""" % {'id': proj.id}
 
         return proj_desc
 
+    def _schedules(self, proj):
+        """
+        Declares the input schedules set with Projection.schedule() and the
+        update_schedules() method assigning their values. A single weight is
+        stored as a global value.
+
+        Returns:
+            * declaration code (struct members and accessors)
+            * update code (empty if nothing is scheduled)
+        """
+        declare = ""
+        update = ""
+        for name in sorted(proj._schedules.keys()):
+            var = [attr for attr in proj.synapse_type.description['parameters'] + proj.synapse_type.description['variables'] if attr['name'] == name][0]
+            locality = 'global' if name == 'w' and proj._has_single_weight() else var['locality']
+            ids = {'name': name, 'type': var['ctype']}
+            declare += self._templates['attribute_schedule']['declare'] % ids
+            update += self._templates['attribute_schedule'][locality] % ids
+
+        if update != "":
+            declare += self._templates['attribute_schedule']['method'] % {'update': update}
+
+        return declare, update
+
+    def _save_load_state(self, proj, has_delay, has_event_driven):
+        """
+        Generate the body of the save_state() and load_state() methods, which
+        (de-)serialize the flags, the connectivity (LIL format only, as it can
+        be changed by structural plasticity), the weights, the synaptic
+        attributes, the delay queues, the event-driven timestamps and the
+        random distributions of the projection.
+
+        Parts overwritten by a specific projection are skipped.
+        """
+        from ANNarchy.generator.Utils import tabify
+
+        members = ['_transmission', '_plasticity', '_update', '_update_period', '_update_offset']
+        text_members = []
+        lil = proj._storage_format == "lil"
+
+        # Connectivity and weights
+        if not 'declare_connectivity_matrix' in proj._specific_template.keys():
+            if lil:
+                members.append('size')
+                # shared ranks are saved by the projection owning them
+                if proj._shared_connectivity is None:
+                    members += ['post_rank', 'pre_rank']
+            members.append('w')
+
+        # Delays
+        if has_delay and lil and not 'declare_delay' in proj._specific_template.keys():
+            members.append('delay')
+            if proj.uniform_delay == -1:
+                members += ['idx_delay', 'max_delay', '_delayed_spikes']
+
+        # Event-driven
+        if has_event_driven and lil and not 'declare_event_driven' in proj._specific_template.keys():
+            members.append('_last_event')
+
+        # Parameters and variables
+        if not 'declare_parameters_variables' in proj._specific_template.keys():
+            for var in proj.synapse_type.description['parameters'] + proj.synapse_type.description['variables']:
+                if not var['name'] in members + ['w']:
+                    members.append(var['name'])
+            for name in sorted(neuron_traces(proj).keys()):
+                members.append('_last_event_' + name)
+
+        # Random distributions
+        if not 'declare_rng' in proj._specific_template.keys():
+            for rd in proj.synapse_type.description['random_distributions']:
+                members.append(rd['name'])
+                text_members.append('dist_' + rd['name'])
+
+        # Input schedules
+        for name in sorted(proj._schedules.keys()):
+            members.append('_schedule_' + name)
+
+        save_code = ""
+        load_code = ""
+        for name in members:
+            save_code += "_write_state(os, %(name)s);\n" % {'name': name}
+            load_code += "_read_state(is, %(name)s);\n" % {'name': name}
+        for name in text_members:
+            save_code += "_write_state_text(os, %(name)s);\n" % {'name': name}
+            load_code += "_read_state_text(is, %(name)s);\n" % {'name': name}
+
+        # The inverse connectivity is rebuilt from the restored one
+        if lil and not 'declare_connectivity_matrix' in proj._specific_template.keys():
+            load_code += "inverse_connectivity_matrix();\n"
+
+        if 'save_state_additional' in proj._specific_template.keys():
+            save_code += proj._specific_template['save_state_additional']
+        if 'load_state_additional' in proj._specific_template.keys():
+            load_code += proj._specific_template['load_state_additional']
+
+        return tabify(save_code, 2), tabify(load_code, 2)
+
     def creating(self, proj):
+        """
+        Creation of synapses. The candidate synapses are proposed in parallel over the dendrites:
+
+        * the existing synapses of a dendrite are marked in a per-thread bitmap (O(1) existence check).
+        * if a probability is given, the candidate pre-synaptic ranks are sampled with geometrically distributed gaps instead of testing all pairs.
+        * each dendrite uses its own random generator, seeded from the global one, so that the result does not depend on the number of threads.
+
+        The proposals are then committed serially in the order of the dendrites and the inverse connectivity of
+        spiking projections is rebuilt.
+        """
         creating_structure = proj.synapse_type.description['creating']
 
-        # Random stuff
-        proba = ""
-        proba_init = ""
-        if 'proba' in creating_structure['bounds'].keys():
-            val = creating_structure['bounds']['proba']
-            proba += '&&(unif(rng)<' + val + ')'
-            proba_init += "std::uniform_real_distribution<double> unif(0.0, 1.0);"
+        # Random stuff: one generator per dendrite
+        rd_init = ""
         if  creating_structure['rd']:
-            proba_init += "\n        " +  creating_structure['rd']['template'] + ' rd(' + creating_structure['rd']['args'] + ');'
+            rd_init += "\n" + " "*16 + creating_structure['rd']['template'] + ' rd(' + creating_structure['rd']['args'] + ');'
 
         # delays
         delay = ""
@@ -222,10 +339,12 @@ class OpenMPGenerator(ProjectionGenerator, OpenMPConnectivity):
                     Global._error('creating: you can not add a delay different from the others if they were constant.')
 
         # OMP
-        if Global.config['num_threads'] > 1:
-            omp_code = '#pragma omp parallel for' if proj.post.size > Global.OMP_MIN_NB_NEURONS else ''
+        if Global.config['num_threads'] > 1 and proj.post.size > Global.OMP_MIN_NB_NEURONS:
+            omp_code = '#pragma omp parallel'
+            omp_for = '#pragma omp for schedule(dynamic, 16)'
         else:
             omp_code = ""
+            omp_for = ""
 
         creating_condition = creating_structure['cpp'] % {
             'id_proj' : proj.id, 'target': proj.target,
@@ -233,58 +352,103 @@ class OpenMPGenerator(ProjectionGenerator, OpenMPConnectivity):
             'post_prefix': 'pop%(id)s.' % {'id':proj.post.id}, 'post_index': '[rk_post]',
             'pre_prefix':  'pop%(id)s.' % {'id':proj.pre.id}, 'pre_index':'[rk_pre]'
         }
+        creating_condition = creating_condition.replace('rd(rng)', 'rd(_rng)')
+
+        # Candidates: all pre-synaptic neurons or a random sample of them
+        if 'proba' in creating_structure['bounds'].keys():
+            candidates = """
+                double _proba = std::min(double(%(proba)s), 1.0);
+                // Geometric gaps drawn by inverse transform in double precision: for a tiny probability,
+                // the gap is compared to the population size before any conversion to an integer rank.
+                double _log_q = std::log1p(-_proba);
+                std::uniform_real_distribution<double> _unif(0.0, 1.0);
+                for(double _next = (_proba > 0.0 ? std::floor(std::log1p(-_unif(_rng)) / _log_q) : pop%(id_pre)s.size); _next < pop%(id_pre)s.size; _next += 1.0 + std::floor(std::log1p(-_unif(_rng)) / _log_q)){
+                    int rk_pre = int(_next);""" % {'proba': creating_structure['bounds']['proba'], 'id_pre': proj.pre.id}
+        else:
+            candidates = """
+                for(int rk_pre = 0; rk_pre < pop%(id_pre)s.size; rk_pre++){""" % {'id_pre': proj.pre.id}
+
+        # Spiking projections use the inverse connectivity to propagate the spikes
+        inverse = ""
+        if proj.synapse_type.type == 'spike':
+            inverse = """
+        if(_modified)
+            proj%(id_proj)s.update_inverse_connectivity();""" % {'id_proj': proj.id}
+
         creation_ids = {
             'id_proj' : proj.id, 'id_pre': proj.pre.id,
             'eq': creating_structure['eq'], 'modulo': '%',
             'condition': creating_condition,
-            'omp_code': omp_code,
+            'omp_code': omp_code, 'omp_for': omp_for,
             'weights': 0.0 if not 'w' in creating_structure['bounds'].keys() else creating_structure['bounds']['w'],
-            'proba' : proba, 'proba_init': proba_init,
-            'delay': delay
+            'candidates': candidates, 'rd_init': rd_init,
+            'delay': delay, 'inverse': inverse
         }
         creating = """
     // proj%(id_proj)s creating: %(eq)s
     if((proj%(id_proj)s._creating)&&((t - proj%(id_proj)s._creating_offset) %(modulo)s proj%(id_proj)s._creating_period == 0)){
-        %(proba_init)s
-        //%(omp_code)s
-        for(int i = 0; i < proj%(id_proj)s.post_rank.size(); i++){
-            int rk_post = proj%(id_proj)s.post_rank[i];
-            for(int rk_pre = 0; rk_pre < pop%(id_pre)s.size; rk_pre++){
-                if(%(condition)s){
-                    // Check if the synapse exists
-                    bool _exists = false;
-                    for(int k=0; k<proj%(id_proj)s.pre_rank[i].size(); k++){
-                        if(proj%(id_proj)s.pre_rank[i][k] == rk_pre){
-                            _exists = true;
-                            break;
-                        }
-                    }
-                    if((!_exists)%(proba)s){
-                        //std::cout << "Creating synapse between " << rk_pre << " and " << rk_post << std::endl;
-                        proj%(id_proj)s.addSynapse(i, rk_pre, %(weights)s%(delay)s);
+        std::vector< std::vector<int> > _proposals(proj%(id_proj)s.post_rank.size(), std::vector<int>());
+        unsigned int _seed = rng();
+
+        // Proposals
+        %(omp_code)s
+        {
+            std::vector<char> _exists(pop%(id_pre)s.size, 0);
+            %(omp_for)s
+            for(int i = 0; i < proj%(id_proj)s.post_rank.size(); i++){
+                int rk_post = proj%(id_proj)s.post_rank[i];
+                std::seed_seq _seq{_seed, (unsigned int)i};
+                std::mt19937 _rng(_seq);%(rd_init)s
+
+                // Mark the existing synapses
+                const std::vector<int> &_pre_ranks = proj%(id_proj)s.pre_rank[i];
+                for(int k = 0; k < _pre_ranks.size(); k++)
+                    _exists[_pre_ranks[k]] = 1;
+%(candidates)s
+                    if((!_exists[rk_pre])&&(%(condition)s)){
+                        _proposals[i].push_back(rk_pre);
                     }
                 }
+
+                // Clear the marks
+                for(int k = 0; k < _pre_ranks.size(); k++)
+                    _exists[_pre_ranks[k]] = 0;
             }
         }
+
+        // Commit
+        bool _modified = false;
+        for(int i = 0; i < _proposals.size(); i++){
+            for(int k = 0; k < _proposals[i].size(); k++){
+                proj%(id_proj)s.addSynapse(i, _proposals[i][k], %(weights)s%(delay)s);
+                _modified = true;
+            }
+        }%(inverse)s
     }
 """ % creation_ids
 
         return creating
 
     def pruning(self, proj):
+        """
+        Pruning of synapses. Each dendrite is processed independently (in parallel): the synapses fulfilling
+        the condition are marked in a bitmap, then all attribute vectors of the dendrite are compacted once.
+        Each dendrite uses its own random generator, seeded from the global one, so that the result does not
+        depend on the number of threads. The inverse connectivity of spiking projections is rebuilt afterwards.
+        """
         pruning_structure = proj.synapse_type.description['pruning']
 
         proba = ""
-        proba_init = ""
+        rd_init = ""
         if 'proba' in pruning_structure['bounds'].keys():
             val = pruning_structure['bounds']['proba']
-            proba = '&&(unif(rng)<' + val + ')'
-            proba_init = "std::uniform_real_distribution<double> unif(0.0, 1.0);"
+            proba = '&&(unif(_rng)<' + val + ')'
+            rd_init = "\n" + " "*12 + "std::uniform_real_distribution<double> unif(0.0, 1.0);"
         if pruning_structure['rd']:
-            proba_init += "\n        " +  pruning_structure['rd']['template'] + ' rd(' + pruning_structure['rd']['args'] + ');'
+            rd_init += "\n" + " "*12 +  pruning_structure['rd']['template'] + ' rd(' + pruning_structure['rd']['args'] + ');'
 
-        if Global.config['num_threads'] > 1:
-            omp_code = '#pragma omp parallel for' if proj.post.size > Global.OMP_MIN_NB_NEURONS else ''
+        if Global.config['num_threads'] > 1 and proj.post.size > Global.OMP_MIN_NB_NEURONS:
+            omp_code = '#pragma omp parallel for schedule(dynamic, 16) reduction(||: _modified)'
         else:
             omp_code = ""
 
@@ -299,6 +463,14 @@ class OpenMPGenerator(ProjectionGenerator, OpenMPConnectivity):
         # HACK:
         for dep in pruning_structure['dependencies']:
             pruning_condition = pruning_condition.replace(dep, 'proj'+str(proj.id)+'.'+dep)
+        pruning_condition = pruning_condition.replace('rd(rng)', 'rd(_rng)')
+
+        # Spiking projections use the inverse connectivity to propagate the spikes
+        inverse = ""
+        if proj.synapse_type.type == 'spike':
+            inverse = """
+        if(_modified)
+            proj%(id_proj)s.update_inverse_connectivity();""" % {'id_proj': proj.id}
 
         pruning_ids = {
             'id_proj' : proj.id,
@@ -307,22 +479,37 @@ class OpenMPGenerator(ProjectionGenerator, OpenMPConnectivity):
             'condition': pruning_condition,
             'omp_code': omp_code,
             'proba' : proba,
-            'proba_init': proba_init
+            'rd_init': rd_init,
+            'inverse': inverse
         }
         pruning = """
     // proj%(id_proj)s pruning: %(eq)s
     if((proj%(id_proj)s._pruning)&&((t - proj%(id_proj)s._pruning_offset) %(modulo)s proj%(id_proj)s._pruning_period == 0)){
-        %(proba_init)s
-        //%(omp_code)s
+        unsigned int _seed = rng();
+        bool _modified = false;
+        %(omp_code)s
         for(int i = 0; i < proj%(id_proj)s.post_rank.size(); i++){
             int rk_post = proj%(id_proj)s.post_rank[i];
+            std::seed_seq _seq{_seed, (unsigned int)i};
+            std::mt19937 _rng(_seq);%(rd_init)s
+
+            // Mark the synapses to remove
+            std::vector<char> _pruned(proj%(id_proj)s.pre_rank[i].size(), 0);
+            bool _any = false;
             for(int j = 0; j < proj%(id_proj)s.pre_rank[i].size(); j++){
                 int rk_pre = proj%(id_proj)s.pre_rank[i][j];
                 if((%(condition)s)%(proba)s){
-                    proj%(id_proj)s.removeSynapse(i, j);
+                    _pruned[j] = 1;
+                    _any = true;
                 }
             }
-        }
+
+            // Remove them at once
+            if(_any){
+                proj%(id_proj)s.removeSynapses(i, _pruned);
+                _modified = true;
+            }
+        }%(inverse)s
     }
 """ % pruning_ids
 
@@ -600,6 +787,9 @@ class OpenMPGenerator(ProjectionGenerator, OpenMPConnectivity):
         else:
             raise NotImplementedError
 
+        # Event-driven variables stored per neuron
+        traces = neuron_traces(proj)
+
         # Determine the mode of synaptic transmission
         continous_transmission = False
         if 'psp' in  proj.synapse_type.description.keys(): # continous
@@ -610,6 +800,7 @@ class OpenMPGenerator(ProjectionGenerator, OpenMPConnectivity):
         ####################################################
         # Strings
         updated_variables_list = []
+        pre_neuron_code = ""
         g_target = ""
         g_target_code = ""
 
@@ -679,6 +870,19 @@ class OpenMPGenerator(ProjectionGenerator, OpenMPConnectivity):
                 pop%(id_post)s.g_%(target)s[post_rank[i]] = %(val)s;
 """ % {'id_post': proj.post.id, 'target': target, 'op': "<" if key == 'min' else '>', 'val': value}
 
+            elif eq['name'] in traces:
+                # pre-synaptic traces are updated once per spike
+                pre_neuron_code += """
+// %(eq)s
+_update_trace_%(name)s(rk_j, t-1);
+%(cpp)s
+%(bounds)s""" % {
+                    'eq': eq['eq'],
+                    'name': eq['name'],
+                    'cpp': replace_neuron_traces(eq['cpp'], traces) % ids,
+                    'bounds': replace_neuron_traces(get_bounds(eq), traces) % ids
+                }
+
             else:
                 # process equations in pre_spike which
                 # are not 'g_target'
@@ -697,8 +901,8 @@ class OpenMPGenerator(ProjectionGenerator, OpenMPConnectivity):
 
                 eq_dict = {
                     'eq': eq['eq'],
-                    'cpp': eq['cpp'] % ids,
-                    'bounds': get_bounds(eq) % ids,
+                    'cpp': read_neuron_traces(eq['cpp'], traces, ids, 't-1') % ids,
+                    'bounds': read_neuron_traces(get_bounds(eq), traces, ids, 't-1') % ids,
                     'condition': condition
                 }
 
@@ -747,7 +951,7 @@ if (%(condition)s) {
         has_exact = False
         event_driven_code = ''
         for var in proj.synapse_type.description['variables']:
-            if var['method'] == 'event-driven':
+            if var['method'] == 'event-driven' and not var['name'] in traces:
                 has_exact = True
                 event_driven_code += """
             // %(eq)s
@@ -835,12 +1039,13 @@ if (%(condition)s) {
 
         # Generate the whole code block
         code = ""
-        if g_target_code != "" or pre_code != "":
+        if g_target_code != "" or pre_code != "" or pre_neuron_code != "":
             code = template % {
                 'id_pre': proj.pre.id,
                 'id_post': proj.post.id,
                 'pre_array': pre_array,
                 'pre_event': pre_code,
+                'pre_event_neuron': tabify(pre_neuron_code, 2),
                 'g_target': g_target_code % {'omp_atomic': omp_atomic},
                 'omp_outer_loop': omp_outer_loop,
                 'omp_inner_loop': omp_inner_loop,
@@ -902,6 +1107,8 @@ if (%(condition)s) {
         extra_args = ""
         add_var_code = ""
         add_var_remove = ""
+        add_var_compact = ""
+        traces = neuron_traces(proj)
         for var in proj.synapse_type.description['parameters'] + proj.synapse_type.description['variables']:
             if not var['name'] in ['w', 'delay'] and  var['name'] in proj.synapse_type.description['local']:
 
@@ -909,24 +1116,33 @@ if (%(condition)s) {
                     init = var['init']
                 else:
                     init = proj.init[var['name']]
+                if isinstance(init, bool):
+                    init = 'true' if init else 'false'
                 extra_args += ', ' + var['ctype'] + ' _' +  var['name'] +'='+str(init)
+                if var['name'] in traces: # stored per neuron, nothing to insert
+                    continue
                 add_var_code += ' '*8 + var['name'] + '[post].insert('+var['name']+'[post].begin() + idx, _' + var['name'] + ');\n'
                 add_var_remove += ' '*8 + var['name'] + '[post].erase(' + var['name'] + '[post].begin() + idx);\n'
+                add_var_compact += ' '*8 + '_compact(' + var['name'] + '[post], pruned);\n'
 
         # Delays
         delay_code = ""
         delay_remove= ""
+        delay_compact = ""
         if proj.max_delay > 1 and proj.uniform_delay == -1:
             delay_code = ' '*8 + "delay[post].insert(delay[post].begin() + idx, _delay);"
             delay_remove = ' '*8 + "delay[post].erase(delay[post].begin() + idx);"
+            delay_compact = ' '*8 + "_compact(delay[post], pruned);"
 
         # Spiking networks must update the inv_pre_rank array
         spiking_addcode = "" if proj.synapse_type.type == 'rate' else header_tpl['spiking_addcode']
         spiking_removecode = "" if proj.synapse_type.type == 'rate' else header_tpl['spiking_removecode']
+        spiking_inverse = "" if proj.synapse_type.type == 'rate' else header_tpl['spiking_inverse']
 
         # Randomdistributions
         rd_addcode = ""
         rd_removecode = ""
+        rd_compact = ""
         for rd in proj.synapse_type.description['random_distributions']:
             rd_addcode += """
         %(name)s[post].insert(%(name)s[post].begin() + idx, 0.0);
@@ -935,6 +1151,7 @@ if (%(condition)s) {
             rd_removecode += """
         %(name)s[post].erase(%(name)s[post].begin() + idx);
 """ % {'name': rd['name']}
+            rd_compact += ' '*8 + '_compact(' + rd['name'] + '[post], pruned);\n'
 
         # Generate the code
         code += header_tpl['header'] % {
@@ -942,7 +1159,9 @@ if (%(condition)s) {
             'delay_code': delay_code, 'delay_remove': delay_remove,
             'add_code': add_var_code, 'add_remove': add_var_remove,
             'spike_add': spiking_addcode, 'spike_remove': spiking_removecode,
-            'rd_add': rd_addcode, 'rd_remove': rd_removecode
+            'rd_add': rd_addcode, 'rd_remove': rd_removecode,
+            'delay_compact': delay_compact, 'add_compact': add_var_compact, 'rd_compact': rd_compact,
+            'spike_inverse': spiking_inverse
         }
 
         return code
@@ -1026,17 +1245,18 @@ if (%(condition)s) {
         else:
             raise NotImplementedError
 
-        # Event-driven integration
+        # Event-driven integration (except for the variables stored per neuron)
+        traces = neuron_traces(proj)
         has_event_driven = False
         for var in proj.synapse_type.description['variables']:
-            if var['method'] == 'event-driven':
+            if var['method'] == 'event-driven' and not var['name'] in traces:
                 has_event_driven = True
 
         # Generate event-driven code
         event_driven_code = ""
         if has_event_driven:
             for var in proj.synapse_type.description['variables']:
-                if var['method'] == 'event-driven':
+                if var['method'] == 'event-driven' and not var['name'] in traces:
                     event_driven_code += '// ' + var['eq'] + '\n'
                     event_driven_code += var['cpp'] % ids + '\n'
             event_driven_code += """
@@ -1046,15 +1266,24 @@ _last_event%(local_index)s = t;
 
             event_driven_code = tabify(event_driven_code, 3)
 
-        # Gather the equations
+        # Gather the equations (post-synaptic traces are updated once per spike)
         post_code = ""
+        post_neuron_code = ""
         for eq in proj.synapse_type.description['post_spike']:
-            post_code += '// ' + eq['eq'] + '\n'
+            eq_code = '// ' + eq['eq'] + '\n'
+            if eq['name'] in traces:
+                eq_code += '_update_trace_' + eq['name'] + '(rk_post, t);\n'
+                eq_code += replace_neuron_traces(eq['cpp'], traces) % ids + '\n'
+                eq_code += replace_neuron_traces(get_bounds(eq), traces) % ids + '\n'
+                post_neuron_code += eq_code
+                continue
             if eq['name'] == 'w':
-                post_code += "if(_plasticity)\n"
-            post_code += eq['cpp'] % ids + '\n'
-            post_code += get_bounds(eq) % ids + '\n'
+                eq_code += "if(_plasticity)\n"
+            eq_code += read_neuron_traces(eq['cpp'], traces, ids, 't') % ids + '\n'
+            eq_code += read_neuron_traces(get_bounds(eq), traces, ids, 't') % ids + '\n'
+            post_code += eq_code
         post_code = tabify(post_code, 3)
+        post_neuron_code = tabify(post_neuron_code, 2)
 
         # OMP code
         if Global.config['num_threads'] > 1:
@@ -1067,6 +1296,7 @@ _last_event%(local_index)s = t;
             psp_lil = {
                 'id_post': proj.post.id,
                 'post_event': post_code,
+                'post_event_neuron': post_neuron_code,
                 'event_driven': event_driven_code,
                 'omp_code': omp_code
             }
@@ -1076,6 +1306,7 @@ if(_transmission && pop%(id_post)s._active){
     for(int _idx_i = 0; _idx_i < pop%(id_post)s.spiked.size(); _idx_i++){
         // Rank of the postsynaptic neuron which fired
         int rk_post = pop%(id_post)s.spiked[_idx_i];
+%(post_event_neuron)s
         // Find its index in the projection
         int i = inv_post_rank.at(rk_post);
         // Leave if the neuron is not part of the projection
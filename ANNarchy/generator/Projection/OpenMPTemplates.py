@@ -85,27 +85,16 @@ struct ProjStruct%(id_proj)s{
     }
 
     // Computes the weighted sum of inputs or updates the conductances
-    void compute_psp() {
-%(psp_prefix)s
-%(psp_code)s
-    }
+    void compute_psp();
 
     // Draws random numbers
-    void update_rng() {
-%(update_rng)s
-    }
+    void update_rng();
 
     // Updates synaptic variables
-    void update_synapse() {
-%(update_prefix)s
-%(update_variables)s
-    }
+    void update_synapse();
 
     // Post-synaptic events
-    void post_event() {
-%(post_event_prefix)s
-%(post_event)s
-    }
+    void post_event();
 
     // Accessors for default attributes
     int get_size() { return size; }
@@ -129,9 +118,55 @@ struct ProjStruct%(id_proj)s{
     #endif
 %(clear_container)s
     }
+
+    // Checkpointing: write/read all containers (see ANNarchy.h)
+    void save_state(std::ostream& os);
+    void load_state(std::istream& is);
 };
 """
 
+# The methods called at each simulation step are compiled in a
+# separate translation unit (projX.cpp), so that a change in the
+# equations only requires to recompile this projection.
+projection_body = """#include "ANNarchy.h"
+
+/////////////////////////////////////////////////////////////////////////////
+// proj%(id_proj)s: %(name_pre)s -> %(name_post)s with target %(target)s
+/////////////////////////////////////////////////////////////////////////////
+
+// Computes the weighted sum of inputs or updates the conductances
+void ProjStruct%(id_proj)s::compute_psp() {
+%(psp_prefix)s
+%(psp_code)s
+}
+
+// Draws random numbers
+void ProjStruct%(id_proj)s::update_rng() {
+%(update_rng)s
+}
+
+// Updates synaptic variables
+void ProjStruct%(id_proj)s::update_synapse() {
+%(update_prefix)s
+%(update_variables)s
+}
+
+// Post-synaptic events
+void ProjStruct%(id_proj)s::post_event() {
+%(post_event_prefix)s
+%(post_event)s
+}
+
+// Checkpointing: write/read all containers (see ANNarchy.h)
+void ProjStruct%(id_proj)s::save_state(std::ostream& os) {
+%(save_state)s
+}
+
+void ProjStruct%(id_proj)s::load_state(std::istream& is) {
+%(load_state)s
+}
+"""
+
 # Definition for the usage of C++11 STL template random
 # number generators
 #
@@ -185,7 +220,7 @@ structural_plasticity = {
         return idx;
     }
     void addSynapse(int post, int pre, double weight, int _delay=0%(extra_args)s){
-        // Find where to put the synapse
+        // Find where to put the synapse (linear search: the connectors do not guarantee sorted pre-synaptic ranks)
         int idx = pre_rank[post].size();
         for(int i=0; i<pre_rank[post].size(); i++){
             if(pre_rank[post][i] > pre){
@@ -208,6 +243,24 @@ structural_plasticity = {
 %(spike_remove)s
 %(rd_remove)s
     };
+    // Removes the synapses marked in pruned (one element per synapse of the dendrite)
+    template<typename T>
+    static void _compact(std::vector<T> &values, const std::vector<char> &pruned){
+        int k = 0;
+        for(int j=0; j<values.size(); j++){
+            if(!pruned[j])
+                values[k++] = values[j];
+        }
+        values.resize(k);
+    }
+    void removeSynapses(int post, const std::vector<char> &pruned){
+        _compact(pre_rank[post], pruned);
+        _compact(w[post], pruned);
+%(delay_compact)s
+%(add_compact)s
+%(rd_compact)s
+    };
+%(spike_inverse)s
 """,
         'pruning': """
     // Pruning
@@ -231,6 +284,17 @@ structural_plasticity = {
             }
         }
         inv_pre_rank[pre].push_back(std::pair<int, int>(idx_post, idx));
+""",
+        'spiking_inverse': """
+    // Rebuilds inv_pre_rank after the removal of synapses
+    void update_inverse_connectivity(){
+        inv_pre_rank.clear();
+        for(int i=0; i<pre_rank.size(); i++){
+            for(int j=0; j<pre_rank[i].size(); j++){
+                inv_pre_rank[pre_rank[i][j]].push_back(std::pair<int, int>(i, j));
+            }
+        }
+    }
 """,
         'spiking_removecode': """
         // Remove the corresponding pair in inv_pre_rank
@@ -483,6 +547,8 @@ if (_transmission && pop%(id_post)s._active){
     for(int _idx_j = 0; _idx_j < %(pre_array)s.size(); _idx_j++){
         // Rank of the presynaptic neuron
         int rk_j = %(pre_array)s[_idx_j];
+        // Pre-synaptic traces (stored per neuron)
+%(pre_event_neuron)s
         // Find the presynaptic neuron in the inverse connectivity matrix
         auto inv_post_ptr = inv_pre_rank.find(rk_j);
         if (inv_post_ptr == inv_pre_rank.end())
@@ -731,7 +797,45 @@ if(_transmission && _update && pop%(id_post)s._active && ( (t - _update_offset)%
 """
 }
 
+# Input schedules of synaptic attributes (Projection.schedule()), applied at the
+# beginning of each step by update_schedules(). A single value is scheduled at
+# each step, it is assigned to all synapses or dendrites for local and semiglobal
+# attributes.
+#
+# Parameters:
+#
+#    type: data type of the variable (double, float, int ...)
+#    name: name of the variable
+#
+attribute_schedule = {
+    'declare': """
+    // Schedule of %(name)s
+    Schedule< %(type)s > _schedule_%(name)s;
+    void set_schedule_%(name)s(std::vector<long int> steps, std::vector< %(type)s > values) { _schedule_%(name)s.set(steps, values, t); }
+""",
+    'local': """
+        if(_schedule_%(name)s.due(t))
+            _schedule_fill(%(name)s, _schedule_%(name)s.current());
+""",
+    'semiglobal': """
+        if(_schedule_%(name)s.due(t))
+            _schedule_fill(%(name)s, _schedule_%(name)s.current());
+""",
+    'global': """
+        if(_schedule_%(name)s.due(t))
+            %(name)s = _schedule_%(name)s.current();
+""",
+    'method': """
+    // Assigns the scheduled values of the current step
+    void update_schedules() {
+%(update)s
+    }
+"""
+}
+
 openmp_templates = {
     'projection_header': projection_header,
+    'projection_body': projection_body,
+    'attribute_schedule': attribute_schedule,
     'rng': cpp_11_rng
 }
@@ -22,6 +22,7 @@
 #
 #===============================================================================
 from ANNarchy.core import Global
+from ANNarchy.generator.Utils import neuron_traces, neuron_trace_decay
 
 class ProjectionGenerator(object):
     """
@@ -109,6 +110,7 @@ class ProjectionGenerator(object):
         accessor = ""
 
         attributes = []
+        traces = neuron_traces(proj)
 
         # Parameters
         for var in proj.synapse_type.description['parameters']:
@@ -131,13 +133,23 @@ class ProjectionGenerator(object):
                 continue
 
             ids = {'type' : var['ctype'], 'name': var['name'], 'attr_type': 'variable'}
+
+            # Event-driven variables stored per neuron
+            if var['name'] in traces:
+                ids['side'] = traces[var['name']]
+                ids['index'] = 'pre_rank[i][j]' if traces[var['name']] == 'pre' else 'post_rank[i]'
+                ids['decay'] = neuron_trace_decay(var)
+                declare_parameters_variables += self._templates['neuron_trace']['declare'] % ids
+                accessor += self._templates['neuron_trace']['accessor'] % ids
+                continue
+
             declare_parameters_variables += decl_template[var['locality']] % ids
             accessor += acc_template[var['locality']] % ids
 
         # If no psp is defined, it's event-driven
         has_event_driven = False
         for var in proj.synapse_type.description['variables']:
-            if var['method'] == 'event-driven':
+            if var['method'] == 'event-driven' and not var['name'] in traces:
                 has_event_driven = True
                 break
         if has_event_driven:
@@ -156,8 +168,8 @@ class ProjectionGenerator(object):
                     'template': rd['template'] % {'float_prec':Global.config['precision']}
                 }
 
-        # Structural plasticity
-        if Global.config['structural_plasticity']:
+        # Structural plasticity (not for specific projections with their own connectivity)
+        if Global.config['structural_plasticity'] and not 'declare_connectivity_matrix' in proj._specific_template.keys():
             declare_parameters_variables += self._header_structural_plasticity(proj)
 
         # Specific projections can overwrite
@@ -259,6 +271,7 @@ class ProjectionGenerator(object):
             }
 
         # Initialize variables
+        traces = neuron_traces(proj)
         for var in proj.synapse_type.description['variables']:
             if var['name'] == 'w':
                 continue
@@ -267,6 +280,16 @@ class ProjectionGenerator(object):
                 continue
 
             init = 'false' if var['ctype'] == 'bool' else ('0' if var['ctype'] == 'int' else '0.0')
+
+            # Event-driven variables stored per neuron
+            if var['name'] in traces:
+                code += self._templates['neuron_trace']['init'] % {
+                    'name': var['name'], 'type': var['ctype'], 'init': init,
+                    'attr_type': 'variable', 'side': traces[var['name']],
+                    'id_pop': proj.pre.id if traces[var['name']] == 'pre' else proj.post.id
+                }
+                continue
+
             code += attr_init_tpl[var['locality']] % {
                 'id': proj.id, 'name': var['name'],
                 'type': var['ctype'], 'init': init,
@@ -326,6 +349,7 @@ class ProjectionGenerator(object):
 
         from ANNarchy.generator.Utils import tabify
         code = ""
+        traces = neuron_traces(proj)
 
         for attr in proj.synapse_type.description['variables']+proj.synapse_type.description['parameters']:
             ids = {'ctype': attr['ctype'], 'name': attr['name'], 'locality': attr['locality']}
@@ -341,7 +365,7 @@ class ProjectionGenerator(object):
 
             if attr['locality'] == "global":
                 code += "size_in_bytes += sizeof(%(ctype)s);\t// %(name)s\n" % ids
-            elif attr['locality'] == "semiglobal":
+            elif attr['locality'] == "semiglobal" or attr['name'] in traces:
                 code += "size_in_bytes += sizeof(%(ctype)s) * %(name)s.capacity();\n" % ids
             else:
                 if proj._storage_format == "lil":
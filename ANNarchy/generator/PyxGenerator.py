@@ -25,6 +25,7 @@ from ANNarchy.core import Global
 from ANNarchy.core.Monitor import BoldMonitor
 
 from ANNarchy.generator.Template import PyxTemplate
+from ANNarchy.generator.Utils import neuron_traces
 
 from ANNarchy.generator.Population import OpenMPTemplates as omp_templates
 from ANNarchy.generator.Population import CUDATemplates as cuda_templates
@@ -62,6 +63,9 @@ class PyxGenerator(object):
         generator struct in the population/projection object. This should be
         changed as in the C++ code generation.
     """
+    # C types exposed without copy to Python and the corresponding NumPy types
+    _view_dtypes = {'double': 'np.float64', 'float': 'np.float32', 'int': 'np.int32'}
+
     def __init__(self, annarchy_dir, populations, projections, net_id):
         """
         Store a list of population und projection objects for later processing.
@@ -146,6 +150,11 @@ class PyxGenerator(object):
                 }
                 monitor_class += mon._specific_template['pyx_wrapper'] % mon_dict
 
+        # Access to the profiler
+        device_specific_wrapper = PyxTemplate.pyx_device_specific[Global.config['paradigm']]['wrapper']
+        if Global.config['profiling'] and Global.config['paradigm'] == "openmp":
+            device_specific_wrapper += PyxTemplate.pyx_profile_wrapper
+
         from .Template.PyxTemplate import pyx_template
         return pyx_template % {
             'custom_functions_export': custom_functions_export,
@@ -162,7 +171,7 @@ class PyxGenerator(object):
             'constants_wrapper': constants_wrapper,
             'float_prec': Global.config['precision'],
             'device_specific_export': PyxTemplate.pyx_device_specific[Global.config['paradigm']]['export'],
-            'device_specific_wrapper': PyxTemplate.pyx_device_specific[Global.config['paradigm']]['wrapper'],
+            'device_specific_wrapper': device_specific_wrapper,
         }
 
     @staticmethod
@@ -189,6 +198,51 @@ class PyxGenerator(object):
         else:
             raise NotImplementedError
 
+    @staticmethod
+    def _attribute_locality(obj, var):
+        """
+        Returns the key of the accessor templates for the attribute var of a population or projection.
+
+        The contiguous arrays of numerical attributes are directly exposed to Python on CPUs ('local_view' and 'semiglobal_view'): for populations and the semiglobal attributes of projections, as well as the local attributes of LIL projections, except the traces stored once per neuron.
+        """
+        if Global.config['paradigm'] != "openmp" or not var['ctype'] in PyxGenerator._view_dtypes.keys():
+            return var['locality']
+        if hasattr(obj, 'neuron_type'): # population
+            return 'local_view' if var['locality'] == 'local' else var['locality']
+        if var['locality'] == 'semiglobal':
+            return 'semiglobal_view'
+        if var['locality'] == 'local' and obj._storage_format == "lil" and not var['name'] in neuron_traces(obj):
+            return 'local_view'
+        return var['locality']
+
+    @staticmethod
+    def _schedules(obj):
+        """
+        Returns the export and the wrapper of the methods setting the input schedules of a population or projection (see Population.schedule()).
+
+        Local attributes of populations receive one value per neuron at each change, the other attributes a single value.
+        """
+        export = ""
+        wrapper = ""
+        if hasattr(obj, 'neuron_type'):
+            instance = 'pop%(id)s' % {'id': obj.id}
+            description = obj.neuron_type.description
+        else:
+            instance = 'proj%(id)s' % {'id': obj.id}
+            description = obj.synapse_type.description
+
+        for name in sorted(obj._schedules.keys()):
+            var = [attr for attr in description['parameters'] + description['variables'] if attr['name'] == name][0]
+            if hasattr(obj, 'neuron_type') and var['locality'] == 'local':
+                values = 'vector[vector[%(type)s]]' % {'type': var['ctype']}
+            else:
+                values = 'vector[%(type)s]' % {'type': var['ctype']}
+            ids = {'obj': instance, 'name': name, 'values': values}
+            export += PyxTemplate.attribute_schedule_cpp_export % ids
+            wrapper += PyxTemplate.attribute_schedule_pyx_wrapper % ids
+
+        return export, wrapper
+
 #######################################################################
 ############## Functions #############################################
 #######################################################################
@@ -273,9 +327,9 @@ def _set_%(name)s(%(float_prec)s value):
         # Parameters and variables
         export_parameters_variables = ""
         for var in pop.neuron_type.description['parameters']:
-            export_parameters_variables += PyxTemplate.pop_attribute_cpp_export[var['locality']] % {'type' : var['ctype'], 'name': var['name'], 'attr_type': 'parameter'}
+            export_parameters_variables += PyxTemplate.pop_attribute_cpp_export[PyxGenerator._attribute_locality(pop, var)] % {'type' : var['ctype'], 'name': var['name'], 'attr_type': 'parameter'}
         for var in pop.neuron_type.description['variables']:
-            export_parameters_variables += PyxTemplate.pop_attribute_cpp_export[var['locality']] % {'type' : var['ctype'], 'name': var['name'], 'attr_type': 'variable'}
+            export_parameters_variables += PyxTemplate.pop_attribute_cpp_export[PyxGenerator._attribute_locality(pop, var)] % {'type' : var['ctype'], 'name': var['name'], 'attr_type': 'variable'}
         if 'export_parameters_variables' in pop._specific_template.keys():
             export_parameters_variables = pop._specific_template['export_parameters_variables']
 
@@ -315,6 +369,7 @@ def _set_%(name)s(%(float_prec)s value):
         export_additional = ""
         if 'export_additional' in pop._specific_template.keys():
             export_additional = pop._specific_template['export_additional']
+        export_additional += PyxGenerator._schedules(pop)[0]
 
         # Finalize the code
         return PyxTemplate.pop_pyx_struct % {
@@ -355,10 +410,10 @@ def _set_%(name)s(%(float_prec)s value):
 
         # Parameters
         for var in pop.neuron_type.description['parameters']:
-            wrapper_access_parameters_variables += PyxTemplate.pop_attribute_pyx_wrapper[var['locality']] % {'id' : pop.id, 'name': var['name'], 'type': var['ctype'], 'attr_type': 'parameter'}
+            wrapper_access_parameters_variables += PyxTemplate.pop_attribute_pyx_wrapper[PyxGenerator._attribute_locality(pop, var)] % {'id' : pop.id, 'name': var['name'], 'type': var['ctype'], 'dtype': PyxGenerator._view_dtypes.get(var['ctype']), 'attr_type': 'parameter'}
 
         for var in pop.neuron_type.description['variables']:
-            wrapper_access_parameters_variables += PyxTemplate.pop_attribute_pyx_wrapper[var['locality']] % {'id' : pop.id, 'name': var['name'], 'type': var['ctype'], 'attr_type': 'variable'}
+            wrapper_access_parameters_variables += PyxTemplate.pop_attribute_pyx_wrapper[PyxGenerator._attribute_locality(pop, var)] % {'id' : pop.id, 'name': var['name'], 'type': var['ctype'], 'dtype': PyxGenerator._view_dtypes.get(var['ctype']), 'attr_type': 'variable'}
 
         # Arrays for the presynaptic sums of rate-coded neurons
         if pop.neuron_type.type == 'rate':
@@ -414,6 +469,7 @@ def _set_%(name)s(%(float_prec)s value):
             wrapper_access_parameters_variables = pop._specific_template['wrapper_access_parameters_variables']
         if 'wrapper_access_additional' in pop._specific_template.keys():
             wrapper_access_additional = pop._specific_template['wrapper_access_additional']
+        wrapper_access_additional += PyxGenerator._schedules(pop)[1]
 
         # Finalize the code
         return PyxTemplate.pop_pyx_wrapper % {
@@ -445,10 +501,11 @@ def _set_%(name)s(%(float_prec)s value):
             delay, exact_integ: variables accessed by the wrapper
 
         """
-        # Check for exact intgeration
+        # Check for exact intgeration (except for the variables stored per neuron)
+        traces = neuron_traces(proj)
         has_event_driven = False
         for var in proj.synapse_type.description['variables']:
-            if var['method'] == 'event-driven':
+            if var['method'] == 'event-driven' and not var['name'] in traces:
                 has_event_driven = True
                 break
 
@@ -514,12 +571,12 @@ def _set_%(name)s(%(float_prec)s value):
         for var in proj.synapse_type.description['parameters']:
             if var['name'] == 'w': # Already defined by the connectivity matrix
                 continue
-            export_parameters_variables += PyxTemplate.attribute_cpp_export[var['locality']] % {'type' : var['ctype'], 'name': var['name'], 'attr_type': 'parameter'}
+            export_parameters_variables += PyxTemplate.attribute_cpp_export[PyxGenerator._attribute_locality(proj, var)] % {'type' : var['ctype'], 'name': var['name'], 'attr_type': 'parameter'}
         # Variables
         for var in proj.synapse_type.description['variables']:
             if var['name'] == 'w': # Already defined by the connectivity matrix
                 continue
-            export_parameters_variables += PyxTemplate.attribute_cpp_export[var['locality']] % {'type' : var['ctype'], 'name': var['name'], 'attr_type': 'variable'}
+            export_parameters_variables += PyxTemplate.attribute_cpp_export[PyxGenerator._attribute_locality(proj, var)] % {'type' : var['ctype'], 'name': var['name'], 'attr_type': 'variable'}
 
         # Local functions
         export_functions = ""
@@ -537,7 +594,7 @@ def _set_%(name)s(%(float_prec)s value):
 
         # Structural plasticity
         structural_plasticity = ""
-        if Global.config['structural_plasticity']:
+        if Global.config['structural_plasticity'] and not 'declare_connectivity_matrix' in proj._specific_template.keys():
             # Pruning in the synapse
             if 'pruning' in proj.synapse_type.description.keys():
                 structural_plasticity += sp_tpl['pruning']
@@ -571,7 +628,7 @@ def _set_%(name)s(%(float_prec)s value):
             'export_parameters_variables': export_parameters_variables,
             'export_functions': export_functions,
             'export_structural_plasticity': structural_plasticity,
-            'export_additional': proj._specific_template['export_additional'] if 'export_additional' in proj._specific_template.keys() else ""
+            'export_additional': (proj._specific_template['export_additional'] if 'export_additional' in proj._specific_template.keys() else "") + PyxGenerator._schedules(proj)[0]
         }
 
     @staticmethod
@@ -590,10 +647,11 @@ def _set_%(name)s(%(float_prec)s value):
             delay, exact_integ: __cinit__ code
 
         """
-        # Check for exact intgeration
+        # Check for exact intgeration (except for the variables stored per neuron)
+        traces = neuron_traces(proj)
         has_event_driven = False
         for var in proj.synapse_type.description['variables']:
-            if var['method'] == 'event-driven':
+            if var['method'] == 'event-driven' and not var['name'] in traces:
                 has_event_driven = True
                 break
 
@@ -619,6 +677,10 @@ def _set_%(name)s(%(float_prec)s value):
         connectivity_tpl = template_dict['connectivity_matrix']
         weight_tpl = template_dict['weight_matrix']
 
+        # The ranks of an identical projection are reused (see Compiler.share_connectivity())
+        if proj._shared_connectivity is not None:
+            connectivity_tpl = template_dict['shared_connectivity_matrix']
+
         # Special case for single weights
         if proj._has_single_weight():
             weight_tpl = template_dict['single_weight_matrix']
@@ -634,7 +696,7 @@ def _set_%(name)s(%(float_prec)s value):
 
         # Wrapper constructor
         csr_type = 'CSRConnectivity' if proj._storage_order == 'post_to_pre' else 'CSRConnectivityPre1st'
-        wrapper_init = connectivity_tpl['pyx_wrapper_init'] % {'id_proj': proj.id, 'csr_type':csr_type}
+        wrapper_init = connectivity_tpl['pyx_wrapper_init'] % {'id_proj': proj.id, 'csr_type':csr_type, 'id_shared': proj._shared_connectivity.id if proj._shared_connectivity is not None else proj.id}
         wrapper_init += weight_tpl['pyx_wrapper_init'] % {'id_proj': proj.id}
 
         # Wrapper access to connectivity matrix
@@ -664,11 +726,13 @@ def _set_%(name)s(%(float_prec)s value):
         for var in proj.synapse_type.description['parameters']:
             if var['name'] == 'w': # Already defined by the connectivity matrix
                 continue
-            wrapper_access_parameters_variables += pyx_acc_tpl[var['locality']] % {'id' : proj.id, 'name': var['name'], 'type': var['ctype'], 'attr_type': 'parameter'}
+            locality = PyxGenerator._attribute_locality(proj, var)
+            wrapper_access_parameters_variables += pyx_acc_tpl[locality] % {'id' : proj.id, 'name': var['name'], 'type': var['ctype'], 'dtype': PyxGenerator._view_dtypes.get(var['ctype']), 'attr_type': 'parameter'}
         for var in proj.synapse_type.description['variables']:
             if var['name'] == 'w': # Already defined by the connectivity matrix
                 continue
-            wrapper_access_parameters_variables += pyx_acc_tpl[var['locality']] % {'id' : proj.id, 'name': var['name'], 'type': var['ctype'], 'attr_type': 'variable'}
+            locality = PyxGenerator._attribute_locality(proj, var)
+            wrapper_access_parameters_variables += pyx_acc_tpl[locality] % {'id' : proj.id, 'name': var['name'], 'type': var['ctype'], 'dtype': PyxGenerator._view_dtypes.get(var['ctype']), 'attr_type': 'variable'}
 
         # Local functions
         wrapper_access_functions = ""
@@ -699,7 +763,7 @@ def _set_%(name)s(%(float_prec)s value):
 
         # Structural plasticity (TODO: not templated yet)
         structural_plasticity = ""
-        if Global.config['structural_plasticity']:
+        if Global.config['structural_plasticity'] and not 'declare_connectivity_matrix' in proj._specific_template.keys():
             # Pruning in the synapse
             if 'pruning' in proj.synapse_type.description.keys():
                 structural_plasticity += sp_tpl['pruning'] % {'id' : proj.id}
@@ -736,6 +800,7 @@ def _set_%(name)s(%(float_prec)s value):
             wrapper_access_parameters_variables = proj._specific_template['wrapper_access_parameters_variables']
         if 'wrapper_access_additional' in proj._specific_template.keys():
             additional_declarations = proj._specific_template['wrapper_access_additional']
+        additional_declarations += PyxGenerator._schedules(proj)[1]
 
         return PyxTemplate.proj_pyx_wrapper % {
             'id_proj': proj.id,
@@ -778,6 +843,10 @@ def _set_%(name)s(%(float_prec)s value):
         vector[vector[%(type)s]] %(name)s
         bool record_%(name)s
 """ % {'name': var['name'], 'type': var['ctype']}
+                if Global.config['paradigm'] == "openmp":
+                    tpl_code += """
+        vector[vector[double]] %(name)s_reduced
+""" % {'name': var['name']}
             elif var['name'] in pop.neuron_type.description['global']:
                 tpl_code += """
         vector[%(type)s] %(name)s
@@ -790,6 +859,10 @@ def _set_%(name)s(%(float_prec)s value):
         bool record_spike
         void clear_spike()
 """
+            if Global.config['paradigm'] == "openmp":
+                tpl_code += """
+        vector[vector[double]] spike_reduced
+"""
 
         # Arrays for the presynaptic sums
         if pop.neuron_type.type == 'rate':
@@ -800,6 +873,10 @@ def _set_%(name)s(%(float_prec)s value):
         vector[vector[%(float_prec)s]] _sum_%(target)s
         bool record__sum_%(target)s
 """ % {'target': target, 'float_prec': Global.config['precision']}
+                if Global.config['paradigm'] == "openmp":
+                    tpl_code += """
+        vector[vector[double]] _sum_%(target)s_reduced
+""" % {'target': target}
 
         return tpl_code % {'id' : pop.id, 'name': pop.name}
 
@@ -837,6 +914,13 @@ cdef class PopRecorder%(id)s_wrapper(Monitor_wrapper):
     def clear_%(name)s(self):
         (<PopRecorder%(id)s *>self.thisptr).%(name)s.clear()
 """ % {'id' : pop.id, 'name': var['name']}
+            if Global.config['paradigm'] == "openmp" and var['name'] in pop.neuron_type.description['local']:
+                tpl_code += """
+    property %(name)s_reduced:
+        def __get__(self): return (<PopRecorder%(id)s *>self.thisptr).%(name)s_reduced
+    def clear_%(name)s_reduced(self):
+        (<PopRecorder%(id)s *>self.thisptr).%(name)s_reduced.clear()
+""" % {'id' : pop.id, 'name': var['name']}
 
         if pop.neuron_type.type == 'spike':
             tpl_code += """
@@ -849,6 +933,13 @@ cdef class PopRecorder%(id)s_wrapper(Monitor_wrapper):
     def clear_spike(self):
         (<PopRecorder%(id)s *>self.thisptr).clear_spike()
 """ % {'id' : pop.id}
+            if Global.config['paradigm'] == "openmp":
+                tpl_code += """
+    property spike_reduced:
+        def __get__(self): return (<PopRecorder%(id)s *>self.thisptr).spike_reduced
+    def clear_spike_reduced(self):
+        (<PopRecorder%(id)s *>self.thisptr).spike_reduced.clear()
+""" % {'id' : pop.id}
 
         # Arrays for the presynaptic sums
         if pop.neuron_type.type == 'rate':
@@ -865,6 +956,13 @@ cdef class PopRecorder%(id)s_wrapper(Monitor_wrapper):
     def clear_%(name)s(self):
         (<PopRecorder%(id)s *>self.thisptr).%(name)s.clear()
 """ % {'id' : pop.id, 'name': '_sum_'+target}
+                if Global.config['paradigm'] == "openmp":
+                    tpl_code += """
+    property %(name)s_reduced:
+        def __get__(self): return (<PopRecorder%(id)s *>self.thisptr).%(name)s_reduced
+    def clear_%(name)s_reduced(self):
+        (<PopRecorder%(id)s *>self.thisptr).%(name)s_reduced.clear()
+""" % {'id' : pop.id, 'name': '_sum_'+target}
 
         return tpl_code % {'id' : pop.id, 'name': pop.name}
 
@@ -14,6 +14,7 @@ omp_header_template = """#pragma once
 #include <string.h>
 #include <cmath>
 #include <random>
+#include <type_traits>
 %(include_omp)s
 
 /*
@@ -34,6 +35,155 @@ omp_header_template = """#pragma once
  */
 %(custom_func)s
 
+/*
+ * Serialization of the simulation state (save_state/load_state)
+ *
+ * Containers are written in native binary format, prefixed by their size. Objects
+ * providing only stream operators (random engines and distributions) are written
+ * as text to preserve their internal state exactly.
+ */
+template<typename T> void _write_state(std::ostream& os, const T& value);
+template<typename T> void _read_state(std::istream& is, T& value);
+template<typename T> void _write_state(std::ostream& os, const std::vector<T>& value);
+template<typename T> void _read_state(std::istream& is, std::vector<T>& value);
+template<typename T> void _write_state(std::ostream& os, const std::deque<T>& value);
+template<typename T> void _read_state(std::istream& is, std::deque<T>& value);
+template<typename T> void _write_state(std::ostream& os, const std::queue<T>& value);
+template<typename T> void _read_state(std::istream& is, std::queue<T>& value);
+template<typename T1, typename T2> void _write_state(std::ostream& os, const std::pair<T1, T2>& value);
+template<typename T1, typename T2> void _read_state(std::istream& is, std::pair<T1, T2>& value);
+template<typename K, typename V> void _write_state(std::ostream& os, const std::map<K, V>& value);
+template<typename K, typename V> void _read_state(std::istream& is, std::map<K, V>& value);
+inline void _write_state(std::ostream& os, const std::string& value);
+inline void _read_state(std::istream& is, std::string& value);
+inline void _write_state(std::ostream& os, const std::vector<bool>& value);
+inline void _read_state(std::istream& is, std::vector<bool>& value);
+
+template<typename T> void _write_state(std::ostream& os, const T& value) {
+    os.write(reinterpret_cast<const char*>(&value), sizeof(T));
+}
+template<typename T> void _read_state(std::istream& is, T& value) {
+    is.read(reinterpret_cast<char*>(&value), sizeof(T));
+}
+inline void _write_state(std::ostream& os, const std::string& value) {
+    _write_state(os, (long int)value.size());
+    os.write(value.data(), value.size());
+}
+inline void _read_state(std::istream& is, std::string& value) {
+    long int size;
+    _read_state(is, size);
+    value.resize(size);
+    is.read(&value[0], size);
+}
+template<typename T> void _write_state_elements(std::ostream& os, const std::vector<T>& value, std::true_type) {
+    os.write(reinterpret_cast<const char*>(value.data()), value.size() * sizeof(T));
+}
+template<typename T> void _write_state_elements(std::ostream& os, const std::vector<T>& value, std::false_type) {
+    for(auto it = value.begin(); it != value.end(); it++)
+        _write_state(os, *it);
+}
+template<typename T> void _read_state_elements(std::istream& is, std::vector<T>& value, std::true_type) {
+    is.read(reinterpret_cast<char*>(value.data()), value.size() * sizeof(T));
+}
+template<typename T> void _read_state_elements(std::istream& is, std::vector<T>& value, std::false_type) {
+    for(auto it = value.begin(); it != value.end(); it++)
+        _read_state(is, *it);
+}
+template<typename T> void _write_state(std::ostream& os, const std::vector<T>& value) {
+    _write_state(os, (long int)value.size());
+    _write_state_elements(os, value, std::is_arithmetic<T>());
+}
+template<typename T> void _read_state(std::istream& is, std::vector<T>& value) {
+    long int size;
+    _read_state(is, size);
+    // resize() keeps the storage of same-sized vectors (views in Python)
+    value.resize(size);
+    _read_state_elements(is, value, std::is_arithmetic<T>());
+}
+// std::vector<bool> is packed and has no data()
+inline void _write_state(std::ostream& os, const std::vector<bool>& value) {
+    _write_state(os, (long int)value.size());
+    for(auto it = value.begin(); it != value.end(); it++)
+        _write_state(os, (bool)*it);
+}
+inline void _read_state(std::istream& is, std::vector<bool>& value) {
+    long int size;
+    _read_state(is, size);
+    value = std::vector<bool>(size);
+    for(long int i = 0; i < size; i++) {
+        bool elem;
+        _read_state(is, elem);
+        value[i] = elem;
+    }
+}
+template<typename T> void _write_state(std::ostream& os, const std::deque<T>& value) {
+    _write_state(os, (long int)value.size());
+    for(auto it = value.begin(); it != value.end(); it++)
+        _write_state(os, *it);
+}
+template<typename T> void _read_state(std::istream& is, std::deque<T>& value) {
+    long int size;
+    _read_state(is, size);
+    value = std::deque<T>(size);
+    for(auto it = value.begin(); it != value.end(); it++)
+        _read_state(is, *it);
+}
+template<typename T> void _write_state(std::ostream& os, const std::queue<T>& value) {
+    std::queue<T> tmp(value);
+    _write_state(os, (long int)tmp.size());
+    while(!tmp.empty()) {
+        _write_state(os, tmp.front());
+        tmp.pop();
+    }
+}
+template<typename T> void _read_state(std::istream& is, std::queue<T>& value) {
+    long int size;
+    _read_state(is, size);
+    value = std::queue<T>();
+    for(long int i = 0; i < size; i++) {
+        T elem;
+        _read_state(is, elem);
+        value.push(elem);
+    }
+}
+template<typename T1, typename T2> void _write_state(std::ostream& os, const std::pair<T1, T2>& value) {
+    _write_state(os, value.first);
+    _write_state(os, value.second);
+}
+template<typename T1, typename T2> void _read_state(std::istream& is, std::pair<T1, T2>& value) {
+    _read_state(is, value.first);
+    _read_state(is, value.second);
+}
+template<typename K, typename V> void _write_state(std::ostream& os, const std::map<K, V>& value) {
+    _write_state(os, (long int)value.size());
+    for(auto it = value.begin(); it != value.end(); it++) {
+        _write_state(os, it->first);
+        _write_state(os, it->second);
+    }
+}
+template<typename K, typename V> void _read_state(std::istream& is, std::map<K, V>& value) {
+    long int size;
+    _read_state(is, size);
+    value.clear();
+    for(long int i = 0; i < size; i++) {
+        K key;
+        _read_state(is, key);
+        _read_state(is, value[key]);
+    }
+}
+template<typename T> void _write_state_text(std::ostream& os, const T& value) {
+    std::ostringstream text;
+    text << value;
+    _write_state(os, text.str());
+}
+template<typename T> void _read_state_text(std::istream& is, T& value) {
+    std::string text;
+    _read_state(is, text);
+    std::istringstream stream(text);
+    stream >> value;
+}
+%(windowed_sum)s
+%(schedule)s
 /*
  * Structures for the populations
  *
@@ -115,6 +265,13 @@ void setNumberThreads(int threads);
 */
 void setSeed(long int seed);
 
+/*
+ * Checkpointing
+ *
+*/
+void saveState(const char* filename);
+int loadState(const char* filename);
+
 """
 
 omp_body_template = """
@@ -207,6 +364,11 @@ void singleStep()
 {
 %(prof_step_pre)s
 
+    ////////////////////////////////
+    // Input schedules
+    ////////////////////////////////
+%(update_schedules)s
+
     ////////////////////////////////
     // Presynaptic events
     ////////////////////////////////
@@ -298,6 +460,50 @@ void setNumberThreads(int threads)
 {
     %(set_number_threads)s
 }
+
+/*
+ * Checkpointing: each population and projection writes its containers
+ * into a separate chunk, identified by the name of the object.
+ *
+*/
+template<typename T> void _save_state_chunk(std::ostream& os, std::string name, T& obj) {
+    std::ostringstream chunk(std::ios::binary);
+    obj.save_state(chunk);
+    _write_state(os, name);
+    _write_state(os, chunk.str());
+}
+template<typename T> bool _load_state_chunk(std::istream& is, std::string name, T& obj) {
+    std::string chunk_name, chunk;
+    _read_state(is, chunk_name);
+    if(!is || chunk_name != name)
+        return false;
+    _read_state(is, chunk);
+    std::istringstream stream(chunk, std::ios::binary);
+    obj.load_state(stream);
+    return bool(stream);
+}
+
+void saveState(const char* filename)
+{
+    std::ofstream ofs(filename, std::ios::binary);
+    ofs.write("ANNSTATE", 8);
+    _write_state(ofs, t);
+    _write_state_text(ofs, rng);
+%(save_state)s
+}
+
+int loadState(const char* filename)
+{
+    std::ifstream ifs(filename, std::ios::binary);
+    char magic[8];
+    ifs.read(magic, 8);
+    if(!ifs || std::string(magic, 8) != "ANNSTATE")
+        return -1;
+    _read_state(ifs, t);
+    _read_state_text(ifs, rng);
+%(load_state)s
+    return 0;
+}
 """
 
 omp_run_until_template = {
@@ -386,7 +592,7 @@ cuda_header_template = """#ifndef __ANNARCHY_H__
  * (available on host-side and interfaced for cython)
  */
 %(custom_func)s
-
+%(windowed_sum)s
 /*
  * Structures for the populations
  *
@@ -904,3 +1110,127 @@ __device__ %(float_prec)s power(double x, unsigned int a) {
     return res;
 }
 """
+
+windowed_sum_template = """
+/*
+ * Sliding-window sums of events (mean firing rates, DecodingProjection, Spike2RatePopulation)
+ *
+ * The events of the last window steps are stored in a ring of bins, one per step, and a running
+ * total is maintained for each rank: expiring the oldest step and adding an event cost O(1)
+ * independently of the window length and of the number of ranks.
+ */
+template<typename T>
+struct WindowedSum {
+    int window;                                             // number of bins (steps)
+    int bin;                                                // bin of the current step
+    std::vector< std::vector< std::pair<int, T> > > bins;   // events (rank, value) of each step
+    std::vector< std::pair<int, T> > expired;               // events removed by the last call to step()
+    std::vector< T > total;                                 // sum of the events in the window for each rank
+
+    void init(int size, int nb_bins) {
+        window = std::max(1, nb_bins);
+        bin = 0;
+        bins = std::vector< std::vector< std::pair<int, T> > >(window, std::vector< std::pair<int, T> >());
+        expired.clear();
+        total = std::vector< T >(size, T(0));
+    }
+
+    // Starts a new step: the events of the oldest bin leave the window and are kept in expired.
+    void step() {
+        bin = (bin + 1) % window;
+        expired.swap(bins[bin]);
+        bins[bin].clear();
+        for(auto it = expired.begin(); it != expired.end(); it++)
+            total[it->first] -= it->second;
+
+        // Floating-point totals are recomputed once per window to avoid the accumulation of rounding errors
+        if(bin == 0 && !std::is_integral<T>::value) {
+            std::fill(total.begin(), total.end(), T(0));
+            for(auto b = bins.begin(); b != bins.end(); b++)
+                for(auto it = b->begin(); it != b->end(); it++)
+                    total[it->first] += it->second;
+        }
+    }
+
+    void add(int rank, T value) {
+        bins[bin].push_back(std::make_pair(rank, value));
+        total[rank] += value;
+    }
+
+};
+"""
+
+windowed_sum_state = """template<typename T> void _write_state(std::ostream& os, const WindowedSum<T>& value) {
+    _write_state(os, value.window);
+    _write_state(os, value.bin);
+    _write_state(os, value.bins);
+    _write_state(os, value.total);
+}
+template<typename T> void _read_state(std::istream& is, WindowedSum<T>& value) {
+    _read_state(is, value.window);
+    _read_state(is, value.bin);
+    _read_state(is, value.bins);
+    _read_state(is, value.total);
+    value.expired.clear();
+}
+"""
+
+schedule_template = """
+/*
+ * Input schedules (Population.schedule(), Projection.schedule())
+ *
+ * The values are assigned to an attribute at the beginning of the steps they are scheduled
+ * for. The index of the next change is kept, so that checking the schedule costs O(1) per
+ * step; it is searched again when the time is set backwards (reset(), set_time()).
+ */
+template<typename V>
+struct Schedule {
+    std::vector<long int> steps;    // sorted steps of the changes
+    std::vector<V> values;          // value assigned at each step
+    int idx = 0;                    // index of the next change
+
+    // Replaces the schedule: the changes scheduled before the current step t are ignored.
+    void set(const std::vector<long int>& s, const std::vector<V>& v, long int t) {
+        steps = s;
+        values = v;
+        idx = std::lower_bound(steps.begin(), steps.end(), t) - steps.begin();
+    }
+
+    // Returns true if changes were reached at the step t, current() being the last of them.
+    bool due(long int t) {
+        // The time was set backwards: the last change up to t is applied again
+        if(idx > 0 && steps[idx-1] > t) {
+            idx = std::upper_bound(steps.begin(), steps.end(), t) - steps.begin();
+            return idx > 0;
+        }
+        int start = idx;
+        while(idx < (int)steps.size() && steps[idx] <= t)
+            idx++;
+        return idx > start;
+    }
+
+    // Returned by value: the elements of std::vector<bool> are proxies
+    V current() const { return values[idx-1]; }
+};
+
+// Assigns a scheduled value to all elements of a local or semiglobal attribute.
+template<typename T> void _schedule_fill(std::vector<T>& target, const T& value) {
+    std::fill(target.begin(), target.end(), value);
+}
+template<typename T> void _schedule_fill(std::vector< std::vector<T> >& target, const T& value) {
+    for(auto it = target.begin(); it != target.end(); it++)
+        std::fill(it->begin(), it->end(), value);
+}
+"""
+
+schedule_state = """template<typename V> void _write_state(std::ostream& os, const Schedule<V>& value) {
+    _write_state(os, value.steps);
+    _write_state(os, value.values);
+    _write_state(os, value.idx);
+}
+template<typename V> void _read_state(std::istream& is, Schedule<V>& value) {
+    _read_state(is, value.steps);
+    _read_state(is, value.values);
+    _read_state(is, value.idx);
+}
+"""
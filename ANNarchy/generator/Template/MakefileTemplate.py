@@ -1,17 +1,31 @@
 # Linux, Seq or OMP
+#
+# Each population, projection and the monitors are compiled in their own
+# object file. The dependencies on the headers are tracked by the compiler
+# (-MMD), so that only the modified objects are recompiled.
 linux_omp_template = """# Makefile generated by ANNarchy
-all:
-\tcython%(cy_major)s -%(py_major)s ANNarchyCore%(net_id)s.pyx --cplus
-\t%(compiler)s %(cpu_flags)s -shared -fPIC -fpermissive -std=c++11 %(openmp)s \\
-        *.cpp -o ANNarchyCore%(net_id)s.so \\
-        %(python_include)s -I%(numpy_include)s \\
-        -I%(cython_ext)s \\
+CXX = %(compiler)s
+CXXFLAGS = %(cpu_flags)s -fPIC -fpermissive -std=c++11 %(openmp)s
+INCLUDES = %(python_include)s -I%(numpy_include)s -I%(cython_ext)s
+OBJECTS = %(objects)s
+
+all: $(OBJECTS)
+\t$(CXX) $(CXXFLAGS) -shared $(OBJECTS) -o ANNarchyCore%(net_id)s.so \\
         %(python_lib)s \\
         %(python_libpath)s %(extra_libs)s
 \tmv ANNarchyCore%(net_id)s.so ../..
 
+ANNarchyCore%(net_id)s.cpp: ANNarchyCore%(net_id)s.pyx Makefile
+\tcython%(cy_major)s -%(py_major)s ANNarchyCore%(net_id)s.pyx --cplus
+
+%%.o: %%.cpp Makefile
+\t$(CXX) $(CXXFLAGS) -MMD -MP $(INCLUDES) -c $< -o $@
+
+-include $(OBJECTS:.o=.d)
+
 clean:
 \trm -rf *.o
+\trm -rf *.d
 \trm -rf *.so
 """
 
@@ -35,17 +49,27 @@ clean:
 
 # OSX, Seq only
 osx_seq_template = """# Makefile generated by ANNarchy
-all:
-\tcython%(cy_major)s -%(py_major)s ANNarchyCore%(net_id)s.pyx --cplus
-\t%(compiler)s -stdlib=libc++ -std=c++11 -dynamiclib -flat_namespace %(cpu_flags)s -fpermissive \\
-        *.cpp -o ANNarchyCore%(net_id)s.so \\
-        %(python_include)s -I%(numpy_include)s \\
-        -I%(cython_ext)s \\
+CXX = %(compiler)s
+CXXFLAGS = -stdlib=libc++ -std=c++11 %(cpu_flags)s -fpermissive
+INCLUDES = %(python_include)s -I%(numpy_include)s -I%(cython_ext)s
+OBJECTS = %(objects)s
+
+all: $(OBJECTS)
+\t$(CXX) $(CXXFLAGS) -dynamiclib -flat_namespace $(OBJECTS) -o ANNarchyCore%(net_id)s.so \\
         %(python_lib)s \\
         %(python_libpath)s  %(extra_libs)s
 \tmv ANNarchyCore%(net_id)s.so ../..
 
+ANNarchyCore%(net_id)s.cpp: ANNarchyCore%(net_id)s.pyx Makefile
+\tcython%(cy_major)s -%(py_major)s ANNarchyCore%(net_id)s.pyx --cplus
+
+%%.o: %%.cpp Makefile
+\t$(CXX) $(CXXFLAGS) -MMD -MP $(INCLUDES) -c $< -o $@
+
+-include $(OBJECTS:.o=.d)
+
 clean:
 \trm -rf *.o
+\trm -rf *.d
 \trm -rf *.so
 """
@@ -30,27 +30,228 @@ class Monitor
 {
 public:
     Monitor(std::vector<int> ranks, int period, int period_offset, long int offset) {
-        this->ranks = ranks;
+        this->set_ranks(ranks);
         this->period_ = period;
         this->period_offset_ = period_offset;
         this->offset_ = offset;
+        this->reduce_ = REDUCE_NONE;
+        this->window_ = 0;
+    };
+
+    /*
+     * Sets the recorded neurons. The membership mask recorded_ avoids
+     * searching the ranks for each spike of partial recordings.
+     */
+    void set_ranks(std::vector<int> ranks) {
+        this->ranks = ranks;
         if(this->ranks.size() ==1 && this->ranks[0]==-1) // All neurons should be recorded
             this->partial = false;
         else
             this->partial = true;
-    };
+        this->recorded_.clear();
+        if(this->partial && !this->ranks.empty()){
+            this->recorded_ = std::vector<bool>(*std::max_element(this->ranks.begin(), this->ranks.end()) + 1, false);
+            for(auto it = this->ranks.begin(); it != this->ranks.end(); it++)
+                this->recorded_[*it] = true;
+        }
+    }
+    bool is_recorded(int rank) const {
+        return !this->partial || (rank < (int)this->recorded_.size() && this->recorded_[rank]);
+    }
 
     virtual void record() = 0;
     virtual void record_targets() = 0;
     virtual long int size_in_bytes() = 0;
     virtual void clear() = 0;
 
+    /*
+     * Codes of reduce_, they must match the REDUCE_* constants of Monitor.py.
+     * The arguments of the histogram are reduce_args_ = [bins, min, max], the
+     * ones of the quantiles the list of quantiles.
+     */
+    enum Reduction {
+        REDUCE_NONE = 0, REDUCE_MEAN = 1, REDUCE_STD = 2, REDUCE_SUM = 3,
+        REDUCE_MIN = 4, REDUCE_MAX = 5, REDUCE_HIST = 6, REDUCE_QUANTILES = 7,
+        REDUCE_COUNT = 8
+    };
+
+    /*
+     * Reduces the values of the recorded neurons to a few statistics.
+     */
+    template<typename T>
+    std::vector<double> reduce(const std::vector<T> &data) {
+        int size = this->partial ? this->ranks.size() : data.size();
+        std::vector<double> values = std::vector<double>(size, 0.0);
+        std::vector<double> result;
+        if(size == 0)
+            return result;
+
+        #pragma omp parallel for if(size > %(omp_min)s)
+        for(int i=0; i<size; i++){
+            values[i] = this->partial ? data[this->ranks[i]] : data[i];
+        }
+
+        switch(this->reduce_){
+            case REDUCE_MEAN:
+            case REDUCE_STD:
+            case REDUCE_SUM:
+            {
+                double sum = 0.0;
+                #pragma omp parallel for reduction(+:sum) if(size > %(omp_min)s)
+                for(int i=0; i<size; i++){
+                    sum += values[i];
+                }
+                if(this->reduce_ == REDUCE_SUM){
+                    result.push_back(sum);
+                    break;
+                }
+                double mean = sum / double(size);
+                if(this->reduce_ == REDUCE_MEAN){
+                    result.push_back(mean);
+                    break;
+                }
+                double var = 0.0;
+                #pragma omp parallel for reduction(+:var) if(size > %(omp_min)s)
+                for(int i=0; i<size; i++){
+                    var += (values[i] - mean) * (values[i] - mean);
+                }
+                result.push_back(sqrt(var / double(size)));
+                break;
+            }
+            case REDUCE_MIN:
+            case REDUCE_MAX:
+            {
+                double val_min = values[0];
+                double val_max = values[0];
+                #pragma omp parallel for reduction(min:val_min) reduction(max:val_max) if(size > %(omp_min)s)
+                for(int i=0; i<size; i++){
+                    val_min = std::min(val_min, values[i]);
+                    val_max = std::max(val_max, values[i]);
+                }
+                result.push_back(this->reduce_ == REDUCE_MIN ? val_min : val_max);
+                break;
+            }
+            case REDUCE_HIST: // the last bin includes the upper bound like numpy.histogram
+            {
+                int bins = int(this->reduce_args_[0]);
+                double lower = this->reduce_args_[1];
+                double upper = this->reduce_args_[2];
+                result = std::vector<double>(bins, 0.0);
+                #pragma omp parallel if(size > %(omp_min)s)
+                {
+                    std::vector<double> local_counts = std::vector<double>(bins, 0.0);
+                    #pragma omp for nowait
+                    for(int i=0; i<size; i++){
+                        if(values[i] < lower || values[i] > upper)
+                            continue;
+                        int idx = int( (values[i] - lower) / (upper - lower) * bins );
+                        local_counts[std::min(idx, bins-1)] += 1.0;
+                    }
+                    #pragma omp critical
+                    for(int b=0; b<bins; b++){
+                        result[b] += local_counts[b];
+                    }
+                }
+                break;
+            }
+            case REDUCE_QUANTILES: // linear interpolation like numpy.percentile
+            {
+                // The quantiles are selected in increasing order, each selection
+                // only partitions the values above the previous one.
+                int nb_quantiles = this->reduce_args_.size();
+                std::vector<int> order(nb_quantiles);
+                for(int q=0; q<nb_quantiles; q++)
+                    order[q] = q;
+                std::sort(order.begin(), order.end(), [this](int a, int b){ return this->reduce_args_[a] < this->reduce_args_[b]; });
+
+                result = std::vector<double>(nb_quantiles, 0.0);
+                int selected = -1;
+                for(int k=0; k<nb_quantiles; k++){
+                    int q = order[k];
+                    double pos = this->reduce_args_[q] * double(size-1);
+                    int lower = int(pos);
+                    if(lower > selected){
+                        std::nth_element(values.begin() + selected + 1, values.begin() + lower, values.end());
+                        selected = lower;
+                    }
+                    result[q] = values[lower];
+                    if(pos > double(lower)){
+                        // the next value is the smallest of the upper partition
+                        double upper = *std::min_element(values.begin() + lower + 1, values.end());
+                        result[q] += (pos - double(lower)) * (upper - values[lower]);
+                    }
+                }
+                break;
+            }
+        }
+        return result;
+    }
+
+    /*
+     * Circular buffers keeping only the recordings of the last window_ steps.
+     *
+     * Each recording is written twice (rows pos and pos + nb_rows), so that the
+     * last recordings are always contiguous in chronological order and can be
+     * copied to Python in one block.
+     *
+     * The buffers are stored in windows_ by name, the recorders keep a pointer
+     * to them (<name>_window) so that no lookup is done while recording.
+     */
+    struct RecordWindow {
+        std::vector<double> data;
+        long int nb_rows;
+        long int width;
+        long int pos;
+        long int count;
+    };
+
+    template<typename T>
+    void push_window(RecordWindow &window, const std::vector<T> &values, bool use_ranks) {
+        long int width = use_ranks && this->partial ? this->ranks.size() : values.size();
+        long int nb_rows = std::max(1, this->window_ / this->period_);
+        if(window.nb_rows != nb_rows || window.width != width){ // first recording or change of shape
+            window.data = std::vector<double>(2 * nb_rows * width, 0.0);
+            window.nb_rows = nb_rows;
+            window.width = width;
+            window.pos = 0;
+            window.count = 0;
+        }
+        double *first = window.data.data() + window.pos * width;
+        double *second = window.data.data() + (window.pos + nb_rows) * width;
+        for(long int i=0; i<width; i++){
+            first[i] = use_ranks && this->partial ? values[this->ranks[i]] : values[i];
+            second[i] = first[i];
+        }
+        window.pos = (window.pos + 1) %% nb_rows;
+        window.count = std::min(window.count + 1, nb_rows);
+    }
+
+    void push_window(RecordWindow &window, double value) {
+        this->push_window(window, std::vector<double>(1, value), false);
+    }
+
+    // Recordings of the window in chronological order
+    double* window_data(std::string name) {
+        RecordWindow &window = this->windows_[name];
+        if(window.count == 0)
+            return NULL;
+        return window.data.data() + (window.pos + window.nb_rows - window.count) * window.width;
+    }
+    long int window_count(std::string name) { return this->windows_[name].count; }
+    long int window_width(std::string name) { return this->windows_[name].width; }
+    void clear_window(std::string name) { this->windows_[name].count = 0; }
+
     // Attributes
     bool partial;
     std::vector<int> ranks;
     int period_;
     int period_offset_;
     long int offset_;
+    std::vector<bool> recorded_;
+    int reduce_;
+    std::vector<double> reduce_args_;
+    int window_;
+    std::map<std::string, RecordWindow> windows_;
 
 };
 %(record_classes)s
@@ -66,13 +267,9 @@ public:
 %(init_code)s
     }
 
-    void record() {
-%(recording_code)s
-    }
+    void record();
 
-    void record_targets() {
-%(recording_target_code)s
-    }
+    void record_targets();
 
     long int size_in_bytes() {
         long int size_in_bytes = 0;
@@ -90,18 +287,38 @@ public:
 
 %(struct_code)s
 };
+""",
+    # Recording methods, compiled in Recorder.cpp
+    'body': """
+void PopRecorder%(id)s::record() {
+%(recording_code)s
+}
+
+void PopRecorder%(id)s::record_targets() {
+%(recording_target_code)s
+}
 """,
     'local': {
     'struct': """
     // Local variable %(name)s
     std::vector< std::vector< %(type)s > > %(name)s ;
+    std::vector< std::vector< double > > %(name)s_reduced ;
+    RecordWindow *%(name)s_window ;
     bool record_%(name)s ; """,
     'init': """
         this->%(name)s = std::vector< std::vector< %(type)s > >();
+        this->%(name)s_reduced = std::vector< std::vector< double > >();
+        this->%(name)s_window = &this->windows_["%(name)s"];
         this->record_%(name)s = false; """,
     'recording': """
         if(this->record_%(name)s && ( (t - this->offset_) %% this->period_ == this->period_offset_ )){
-            if(!this->partial)
+            if(this->window_ > 0 && this->reduce_ != REDUCE_NONE)
+                this->push_window(*this->%(name)s_window, this->reduce(pop%(id)s.%(name)s), false);
+            else if(this->window_ > 0)
+                this->push_window(*this->%(name)s_window, pop%(id)s.%(name)s, true);
+            else if(this->reduce_ != REDUCE_NONE)
+                this->%(name)s_reduced.push_back(this->reduce(pop%(id)s.%(name)s));
+            else if(!this->partial)
                 this->%(name)s.push_back(pop%(id)s.%(name)s); 
             else{
                 std::vector<%(type)s> tmp = std::vector<%(type)s>();
@@ -115,6 +332,7 @@ public:
         for(auto it = this->%(name)s.begin(); it != this->%(name)s.end(); it++)
             it->clear();
         this->%(name)s.clear();
+        this->%(name)s_reduced.clear();
     """
     },
     'semiglobal': { # Does not exist for populations
@@ -127,13 +345,18 @@ public:
         'struct': """
     // Global variable %(name)s
     std::vector< %(type)s > %(name)s ;
+    RecordWindow *%(name)s_window ;
     bool record_%(name)s ; """, 
         'init': """
         this->%(name)s = std::vector< %(type)s >();
+        this->%(name)s_window = &this->windows_["%(name)s"];
         this->record_%(name)s = false; """,
         'recording': """
         if(this->record_%(name)s && ( (t - this->offset_) %% this->period_ == this->period_offset_ )){
-            this->%(name)s.push_back(pop%(id)s.%(name)s); 
+            if(this->window_ > 0)
+                this->push_window(*this->%(name)s_window, pop%(id)s.%(name)s);
+            else
+                this->%(name)s.push_back(pop%(id)s.%(name)s); 
         } """,
         'clear': """
         this->%(name)s.clear();
@@ -236,9 +459,7 @@ public:
 %(init_code)s
     };
 
-    void record() {
-%(recording_code)s
-    };
+    void record();
 
     void record_targets() { /* nothing to do here */ }
     long int size_in_bytes() {
@@ -252,22 +473,39 @@ public:
 
 %(struct_code)s
 };
+""",
+    # Recording methods, compiled in Recorder.cpp
+    'body': """
+void ProjRecorder%(id)s::record() {
+%(recording_code)s
+}
 """,
     'local': {
         'struct': """
     // Local variable %(name)s
     std::vector< std::vector< std::vector< %(type)s > > > %(name)s ;
+    RecordWindow *%(name)s_window ;
     bool record_%(name)s ;
 """,
         'init' : """
         this->%(name)s = std::vector< std::vector< std::vector< %(type)s > > >();
+        this->%(name)s_window = &this->windows_["%(name)s"];
         this->record_%(name)s = false;
 """,
         'recording': """
-        if(this->record_%(name)s && ( (t - this->offset_) %% this->period_ == this->period_offset_ )){
+        if(this->record_%(name)s && ( (t - this->offset_) %% this->period_ == this->period_offset_ ) && this->window_ > 0){
+            // the recorded dendrites are concatenated
+            std::vector< %(type)s > flat;
+            for(int i=0; i<this->ranks.size(); i++){
+                std::vector< %(type)s > dendrite = %(dendrite)s;
+                flat.insert(flat.end(), dendrite.begin(), dendrite.end());
+            }
+            this->push_window(*this->%(name)s_window, flat, false);
+        }
+        else if(this->record_%(name)s && ( (t - this->offset_) %% this->period_ == this->period_offset_ )){
             std::vector< std::vector< %(type)s > > tmp;
             for(int i=0; i<this->ranks.size(); i++){
-                tmp.push_back(proj%(id)s.%(name)s[this->ranks[i]]);
+                tmp.push_back(%(dendrite)s);
             }
             this->%(name)s.push_back(tmp);
             tmp.clear();
@@ -278,14 +516,19 @@ public:
         'struct': """
     // Semiglobal variable %(name)s
     std::vector< std::vector< %(type)s > > %(name)s ;
+    RecordWindow *%(name)s_window ;
     bool record_%(name)s ;
 """,
         'init' : """
         this->%(name)s = std::vector< std::vector< %(type)s > >();
+        this->%(name)s_window = &this->windows_["%(name)s"];
         this->record_%(name)s = false;
 """,
         'recording': """
-        if(this->record_%(name)s && ( (t - this->offset_) %% this->period_ == this->period_offset_ )){
+        if(this->record_%(name)s && ( (t - this->offset_) %% this->period_ == this->period_offset_ ) && this->window_ > 0){
+            this->push_window(*this->%(name)s_window, proj%(id)s.%(name)s, true);
+        }
+        else if(this->record_%(name)s && ( (t - this->offset_) %% this->period_ == this->period_offset_ )){
             std::vector< %(type)s > tmp;
             for(int i=0; i<this->ranks.size(); i++){
                 tmp.push_back(proj%(id)s.%(name)s[this->ranks[i]]);
@@ -299,15 +542,20 @@ public:
         'struct': """
     // Global variable %(name)s
     std::vector< %(type)s > %(name)s ;
+    RecordWindow *%(name)s_window ;
     bool record_%(name)s ;
 """,
         'init' : """
         this->%(name)s = std::vector< %(type)s >();
+        this->%(name)s_window = &this->windows_["%(name)s"];
         this->record_%(name)s = false;
 """,
         'recording': """
         if(this->record_%(name)s && ( (t - this->offset_) %% this->period_ == this->period_offset_ )){
-            this->%(name)s.push_back(proj%(id)s.%(name)s);
+            if(this->window_ > 0)
+                this->push_window(*this->%(name)s_window, proj%(id)s.%(name)s);
+            else
+                this->%(name)s.push_back(proj%(id)s.%(name)s);
         }
 """
     }
@@ -438,7 +686,19 @@ public:
 
 recording_spike_tpl= {
     'openmp' : """
-        if(this->record_spike){
+        if(this->record_spike && this->reduce_ != REDUCE_NONE){
+            // Only the number of spikes is recorded
+            long int count = 0;
+            for(int i=0; i<pop%(id)s.spiked.size(); i++){
+                if( this->is_recorded(pop%(id)s.spiked[i]) )
+                    count++;
+            }
+            if(this->window_ > 0)
+                this->push_window(*this->spike_window, double(count));
+            else
+                this->spike_reduced.push_back(std::vector<double>(1, double(count)));
+        }
+        else if(this->record_spike){
             for(int i=0; i<pop%(id)s.spiked.size(); i++){
                 if(!this->partial){
                     this->spike[pop%(id)s.spiked[i]].push_back(t);
@@ -449,6 +709,12 @@ recording_spike_tpl= {
                     }
                 }
             }
+            // Forget the spikes older than the window (every window_ steps, the exact window is selected in Python)
+            if(this->window_ > 0 && t %% this->window_ == 0){
+                for(auto it = this->spike.begin(); it != this->spike.end(); it++){
+                    it->second.erase(it->second.begin(), std::lower_bound(it->second.begin(), it->second.end(), t - this->window_));
+                }
+            }
         } """,
     'cuda' : """if(this->record_spike){
         for(int i=0; i<pop%(id)s.spike_count; i++){
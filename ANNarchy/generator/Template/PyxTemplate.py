@@ -2,6 +2,7 @@ pyx_template = '''# cython: embedsignature=True
 from cpython.exc cimport PyErr_CheckSignals
 from libcpp.vector cimport vector
 from libcpp.map cimport map, pair
+from libcpp.string cimport string
 from libcpp cimport bool
 import numpy as np
 cimport numpy as np
@@ -25,9 +26,17 @@ cdef extern from "ANNarchy.h":
     # Monitors
     cdef cppclass Monitor:
         vector[int] ranks
+        void set_ranks(vector[int])
         int period_
         int period_offset_
         long offset_
+        int reduce_
+        vector[double] reduce_args_
+        int window_
+        double* window_data(string)
+        long window_count(string)
+        long window_width(string)
+        void clear_window(string)
 
     void addRecorder(Monitor*)
     void removeRecorder(Monitor*)
@@ -68,7 +77,7 @@ cdef class Monitor_wrapper:
         pass
     property ranks:
         def __get__(self): return self.thisptr.ranks
-        def __set__(self, val): self.thisptr.ranks = val
+        def __set__(self, val): self.thisptr.set_ranks(val)
     property period:
         def __get__(self): return self.thisptr.period_
         def __set__(self, val): self.thisptr.period_ = val
@@ -78,6 +87,25 @@ cdef class Monitor_wrapper:
     property period_offset:
         def __get__(self): return self.thisptr.period_offset_
         def __set__(self, val): self.thisptr.period_offset_ = val
+    property reduce:
+        def __get__(self): return self.thisptr.reduce_
+        def __set__(self, val): self.thisptr.reduce_ = val
+    property reduce_args:
+        def __get__(self): return self.thisptr.reduce_args_
+        def __set__(self, val): self.thisptr.reduce_args_ = val
+    property window:
+        def __get__(self): return self.thisptr.window_
+        def __set__(self, val): self.thisptr.window_ = val
+    def get_window(self, name):
+        "Returns a copy of the recordings of the window in chronological order (the buffer is overwritten by the next simulation)."
+        cdef string key = name.encode('utf-8')
+        cdef long count = self.thisptr.window_count(key)
+        cdef long width = self.thisptr.window_width(key)
+        if count == 0 or width == 0:
+            return np.zeros((0, width))
+        return np.array(<double[:count, :width]> self.thisptr.window_data(key))
+    def clear_window(self, name):
+        self.thisptr.clear_window(name.encode('utf-8'))
 
 def add_recorder(Monitor_wrapper recorder):
     addRecorder(recorder.thisptr)
@@ -151,10 +179,20 @@ pyx_device_specific={
 # Set number of threads
 def set_number_threads(int n):
     setNumberThreads(n)
+
+# Checkpointing
+def save_state(str filename):
+    saveState(filename.encode('utf-8'))
+def load_state(str filename):
+    return loadState(filename.encode('utf-8'))
 """,
         'export': """
     # Number of threads
     void setNumberThreads(int)
+
+    # Checkpointing
+    void saveState(const char*)
+    int loadState(const char*)
 """
     },
     'cuda': {
@@ -169,6 +207,35 @@ def set_device(int device_id):
 """
     }
 }
+# Access to the measurements of the CPP11 profiler (compile(profile_enabled=True), openMP only)
+pyx_profile_wrapper = """
+# Profiling
+cdef extern from "Profiling.h":
+    cdef cppclass Profiling:
+        @staticmethod
+        Profiling* get_instance()
+        void reset()
+        void set_enabled(bool)
+        bool is_enabled()
+        vector[vector[string]] get_descriptors()
+        vector[vector[double]] get_statistics()
+        vector[vector[long]] get_histograms()
+
+def profile_descriptors():
+    cdef vector[vector[string]] descriptors = Profiling.get_instance().get_descriptors()
+    return [[item.decode('utf-8') for item in desc] for desc in descriptors]
+def profile_statistics():
+    return Profiling.get_instance().get_statistics()
+def profile_histograms():
+    return Profiling.get_instance().get_histograms()
+def profile_reset():
+    Profiling.get_instance().reset()
+def profile_set_enabled(bool enabled):
+    Profiling.get_instance().set_enabled(enabled)
+def profile_is_enabled():
+    return Profiling.get_instance().is_enabled()
+"""
+
 # export of accessors for parameter members towards python, whereas 'local' is used if values can vary
 # across neurons, consequently 'global' is used if values are common to all neurons.
 #
@@ -186,6 +253,15 @@ pop_attribute_cpp_export = {
         %(type)s get_single_%(name)s(int rk)
         void set_%(name)s(vector[%(type)s])
         void set_single_%(name)s(int, %(type)s)
+""",
+    'local_view':
+"""
+        # Local %(attr_type)s %(name)s
+        vector[%(type)s] %(name)s
+        vector[%(type)s] get_%(name)s()
+        %(type)s get_single_%(name)s(int rk)
+        void set_%(name)s(vector[%(type)s])
+        void set_single_%(name)s(int, %(type)s)
 """,
     'global':
 """
@@ -216,6 +292,37 @@ pop_attribute_pyx_wrapper = {
         return pop%(id)s.get_single_%(name)s(rank)
     cpdef set_single_%(name)s(self, int rank, value):
         pop%(id)s.set_single_%(name)s(rank, value)
+    cpdef np.ndarray get_indexed_%(name)s(self, ranks):
+        return np.array([pop%(id)s.get_single_%(name)s(rank) for rank in ranks])
+    cpdef set_indexed_%(name)s(self, ranks, values):
+        cdef int idx
+        for idx in range(len(ranks)):
+            pop%(id)s.set_single_%(name)s(ranks[idx], values[idx])
+""",
+    # Numerical local attributes on CPUs are exposed without copy
+    'local_view':
+"""
+    # Local %(attr_type)s %(name)s
+    cpdef np.ndarray view_%(name)s(self):
+        return np.asarray(<%(type)s[:pop%(id)s.get_size()]> pop%(id)s.%(name)s.data())
+    cpdef np.ndarray get_%(name)s(self):
+        return self.view_%(name)s().copy()
+    cpdef set_%(name)s(self, np.ndarray value):
+        self.view_%(name)s()[:] = value.reshape(-1)
+    cpdef %(type)s get_single_%(name)s(self, int rank):
+        return pop%(id)s.%(name)s[rank]
+    cpdef set_single_%(name)s(self, int rank, value):
+        pop%(id)s.%(name)s[rank] = value
+    cpdef np.ndarray get_indexed_%(name)s(self, int[::1] ranks):
+        cdef %(type)s[::1] values = np.empty(ranks.shape[0], dtype=%(dtype)s)
+        cdef int idx
+        for idx in range(ranks.shape[0]):
+            values[idx] = pop%(id)s.%(name)s[ranks[idx]]
+        return np.asarray(values)
+    cpdef set_indexed_%(name)s(self, int[::1] ranks, %(type)s[::1] values):
+        cdef int idx
+        for idx in range(ranks.shape[0]):
+            pop%(id)s.%(name)s[ranks[idx]] = values[idx]
 """,
     'global':
 """
@@ -314,6 +421,20 @@ attribute_cpp_export = {
         void set_%(name)s(vector[vector[%(type)s]])
         void set_dendrite_%(name)s(int, vector[%(type)s])
         void set_synapse_%(name)s(int, int, %(type)s)
+""",
+    'local_view':
+"""
+        # Local %(attr_type)s %(name)s
+        vector[vector[%(type)s]] %(name)s
+        vector[vector[%(type)s]] get_%(name)s()
+        vector[%(type)s] get_dendrite_%(name)s(int)
+        %(type)s get_synapse_%(name)s(int, int)
+        void set_%(name)s(vector[vector[%(type)s]])
+        void set_dendrite_%(name)s(int, vector[%(type)s])
+        void set_synapse_%(name)s(int, int, %(type)s)
+        void flat_%(name)s(%(type)s*)
+        void set_flat_%(name)s(%(type)s*)
+        void fill_%(name)s(%(type)s)
 """,
     'semiglobal':
 """
@@ -322,6 +443,15 @@ attribute_cpp_export = {
         %(type)s get_dendrite_%(name)s(int)
         void set_%(name)s(vector[%(type)s])
         void set_dendrite_%(name)s(int, %(type)s)
+""",
+    'semiglobal_view':
+"""
+        # Semiglobal %(attr_type)s %(name)s
+        vector[%(type)s] %(name)s
+        vector[%(type)s] get_%(name)s()
+        %(type)s get_dendrite_%(name)s(int)
+        void set_%(name)s(vector[%(type)s])
+        void set_dendrite_%(name)s(int, %(type)s)
 """,
     'global':
 """
@@ -347,6 +477,38 @@ attribute_pyx_wrapper = {
         return proj%(id)s.get_synapse_%(name)s(rank_post, rank_pre)
     def set_synapse_%(name)s(self, int rank_post, int rank_pre, %(type)s value):
         proj%(id)s.set_synapse_%(name)s(rank_post, rank_pre, value)
+""",
+    # Numerical local attributes of LIL projections on CPUs are exposed without copy
+    'local_view':
+"""
+    # Local %(attr_type)s %(name)s
+    def get_%(name)s(self):
+        return proj%(id)s.get_%(name)s()
+    def set_%(name)s(self, value):
+        proj%(id)s.set_%(name)s( value )
+    cpdef np.ndarray view_dendrite_%(name)s(self, int rank):
+        if proj%(id)s.%(name)s[rank].size() == 0:
+            return np.zeros(0, dtype=%(dtype)s)
+        return np.asarray(<%(type)s[:proj%(id)s.%(name)s[rank].size()]> proj%(id)s.%(name)s[rank].data())
+    def get_dendrite_%(name)s(self, int rank):
+        return proj%(id)s.get_dendrite_%(name)s(rank)
+    def set_dendrite_%(name)s(self, int rank, vector[%(type)s] value):
+        proj%(id)s.set_dendrite_%(name)s(rank, value)
+    def get_synapse_%(name)s(self, int rank_post, int rank_pre):
+        return proj%(id)s.get_synapse_%(name)s(rank_post, rank_pre)
+    def set_synapse_%(name)s(self, int rank_post, int rank_pre, %(type)s value):
+        proj%(id)s.set_synapse_%(name)s(rank_post, rank_pre, value)
+    def get_flat_%(name)s(self, long size):
+        cdef %(type)s[::1] values = np.empty(size, dtype=%(dtype)s)
+        if size > 0:
+            proj%(id)s.flat_%(name)s(&values[0])
+        return np.asarray(values)
+    def set_flat_%(name)s(self, values):
+        cdef %(type)s[::1] data = np.ascontiguousarray(values, dtype=%(dtype)s)
+        if data.shape[0] > 0:
+            proj%(id)s.set_flat_%(name)s(&data[0])
+    def fill_%(name)s(self, %(type)s value):
+        proj%(id)s.fill_%(name)s(value)
 """,
     'semiglobal':
 """
@@ -359,6 +521,20 @@ attribute_pyx_wrapper = {
         return proj%(id)s.get_dendrite_%(name)s(rank)
     def set_dendrite_%(name)s(self, int rank, %(type)s value):
         proj%(id)s.set_dendrite_%(name)s(rank, value)
+""",
+    'semiglobal_view':
+"""
+    # Semiglobal %(attr_type)s %(name)s
+    cpdef np.ndarray view_%(name)s(self):
+        return np.asarray(<%(type)s[:proj%(id)s.%(name)s.size()]> proj%(id)s.%(name)s.data())
+    def get_%(name)s(self):
+        return proj%(id)s.get_%(name)s()
+    def set_%(name)s(self, value):
+        proj%(id)s.set_%(name)s(value)
+    def get_dendrite_%(name)s(self, int rank):
+        return proj%(id)s.get_dendrite_%(name)s(rank)
+    def set_dendrite_%(name)s(self, int rank, %(type)s value):
+        proj%(id)s.set_dendrite_%(name)s(rank, value)
 """,
     'global':
 """
@@ -370,6 +546,24 @@ attribute_pyx_wrapper = {
 """
 }
 
+# Input schedules (Population.schedule(), Projection.schedule()): export of the method
+# replacing the schedule of an attribute and its wrapper.
+#
+# Parameters:
+#
+#    obj: instance of the population or projection (pop0, proj1 ...)
+#    name: name of the variable
+#    values: cython type of the scheduled values (vector[vector[double]] ...)
+attribute_schedule_cpp_export = """
+        # Schedule of %(name)s
+        void set_schedule_%(name)s(vector[long], %(values)s)
+"""
+attribute_schedule_pyx_wrapper = """
+    # Schedule of %(name)s
+    def set_schedule_%(name)s(self, steps, values):
+        %(obj)s.set_schedule_%(name)s(steps, values)
+"""
+
 # Export for projections
 proj_pyx_struct = """
     # Export Projection %(id_proj)s
@@ -182,6 +182,52 @@ def generate_equation_code(pop_id, desc, locality='local', obj='pop', conductanc
 
     return padded_code
 
+def neuron_traces(proj):
+    """
+    Returns the event-driven variables of a spiking projection which are stored once per pre- or post-synaptic neuron instead of once per synapse, as a dictionary {name: 'pre' or 'post'} (see find_neuron_traces() in AnalyseSynapse).
+
+    Only the default LIL format with uniform delays on CPUs benefits from it, the other projections keep one value per synapse.
+    """
+    if Global.config['paradigm'] != "openmp" or proj.synapse_type.type != 'spike':
+        return {}
+    if proj._storage_format != "lil" or len(proj._specific_template) > 0:
+        return {}
+    if proj.max_delay > 1 and proj.uniform_delay == -1:
+        return {}
+    return proj.synapse_type.description.get('traces', {})
+
+def neuron_trace_decay(var):
+    """
+    Returns the exact decay of a trace stored per neuron between its last update (_last_event_<name>[_r]) and the step _t, applied to a copy *_value* of the trace of the neuron _r. This is the same solution as for the synapses, so the traces take the values they would have if they were stored per synapse.
+    """
+    code = var['cpp'].replace('_last_event%(local_index)s', '_last_event_' + var['name'] + '[_r]').replace('(t)', '(_t)')
+    code = re.sub(r'(?<![\w.])' + var['name'] + r'%\(local_index\)s', '_value', code)
+    return code % {'local_index': '', 'semiglobal_index': '', 'global_index': ''}
+
+def read_neuron_traces(code, traces, ids, step):
+    """
+    Replaces the traces stored per neuron which are read in a code template by a call to _trace_<name>(rank, step), which returns their value decayed until *step*. The ranks are the pre- and post-synaptic indices of the synapse in *ids*.
+    """
+    for name, side in traces.items():
+        code = re.sub(
+            r'(?<![\w.])' + name + r'%\(local_index\)s',
+            '_trace_' + name + '(' + ids[side + '_index'][1:-1] + ', ' + step + ')',
+            code
+        )
+    return code
+
+def replace_neuron_traces(code, traces):
+    """
+    Replaces the synaptic index of the traces stored per neuron in a code template: pre-synaptic traces are indexed like pre-synaptic variables, post-synaptic traces like post-synaptic ones. Used for the increments, after the trace was brought to the current step by _update_trace_<name>().
+    """
+    for name, side in traces.items():
+        code = re.sub(
+            r'(?<![\w.])' + name + r'%\(local_index\)s',
+            name + '%(' + side + '_index)s',
+            code
+        )
+    return code
+
 def indentLine(line, spaces=1):
     return (' ' * 4 * spaces) + line
 
@@ -59,6 +59,7 @@ def analyse_synapse(synapse):
     * 'dependencies': dictionary ('pre', 'post') of lists of pre (resp. post) variables accessed by the synapse (used for delaying variables)
     * 'psp': dictionary ('eq' and 'psp') for the psp code to be summed
     * 'pruning' and 'creating': statements for structural plasticity
+    * 'traces': dictionary of event-driven variables which can be stored once per pre- ('pre') or post-synaptic ('post') neuron instead of once per synapse
 
 
     Each parameter is a dictionary with the following elements:
@@ -446,4 +447,69 @@ def analyse_synapse(synapse):
     if synapse.creating:
         description['creating'] = extract_structural_plasticity(synapse.creating, description)
 
+    # Event-driven traces which do not need to be stored per synapse
+    description['traces'] = find_neuron_traces(description) if description['type'] == 'spike' else {}
+
     return description
+
+def find_neuron_traces(description):
+    """
+    Finds the event-driven variables of a spiking synapse which are only incremented by pre-synaptic spikes and whose decay only depends on global parameters, such as the pre-synaptic trace of the STDP rule. All the synapses of a pre-synaptic neuron share the same value for these variables, which can therefore be stored and updated once per neuron.
+
+    Post-synaptic traces are kept per synapse: the pre-synaptic events decay all event-driven variables of a synapse until the previous step but mark them as updated at the current one, so their value also depends on the spikes of the pre-synaptic neuron.
+
+    Returns a dictionary {name: 'pre' or 'post'}.
+    """
+    traces = {}
+    for variable in description['variables']:
+        name = variable['name']
+        if name == 'w' or variable['method'] != 'event-driven' or variable['locality'] != 'local':
+            continue
+
+        # The decay must be the same for all synapses
+        if not _only_global(name, variable['dependencies'], description):
+            continue
+
+        # The variable can only be read in the pre_spike and post_spike statements
+        others = [var for var in description['variables'] if var is not variable]
+        if 'psp' in description.keys():
+            others.append(description['psp'])
+        if any([name in var.get('dependencies', []) for var in others]):
+            continue
+        if any([re.search(r'\b'+name+r'\b', description[struct]['eq']) for struct in ['pruning', 'creating'] if struct in description.keys()]):
+            continue
+
+        # The variable must be modified by only one kind of spike
+        modified_pre = name in [eq['name'] for eq in description['pre_spike']]
+        modified_post = name in [eq['name'] for eq in description['post_spike']]
+        if modified_pre == modified_post:
+            continue
+        if not modified_pre:
+            continue
+        side, other = 'pre', 'post'
+
+        # The increments are executed once per spike, before the synaptic updates:
+        # they can not depend on other synaptic variables, and the statements
+        # placed before them must not read the variable.
+        valid = True
+        updated = False
+        for eq in reversed(description[side+'_spike']):
+            if eq['name'] == name:
+                updated = True
+                if not _only_global(name, eq['dependencies'], description) or \
+                        len(eq['prepost_dependencies'][other]) > 0 or \
+                        'unless_post' in eq['flags']:
+                    valid = False
+            elif name in eq['dependencies'] and (updated or eq['name'] == 'g_target'):
+                valid = False
+        if valid:
+            traces[name] = side
+
+    return traces
+
+def _only_global(name, dependencies, description):
+    "Checks that the dependencies of the variable *name* are only global parameters/variables."
+    for dep in dependencies:
+        if dep != name and not dep in description['global']:
+            return False
+    return True
@@ -24,8 +24,7 @@
 import ANNarchy.core.Global as Global
 from .Equation import Equation
 from .ParserTemplate import create_local_dict, user_functions
-
-from sympy import *
+from . import ParserCache
 
 import re
 
@@ -57,6 +56,8 @@ class CoupledEquations(Equation):
         self.untouched = variables[0]['untouched'] # the same for all eqs
         self.local_functions = [func['name'] for func in self.description['functions']]
 
+    def _create_dictionaries(self):
+        "Creates the Sympy vocabulary. Only needed when the result is not in the parser cache."
         # Copy the default dictionary of built-in symbols or functions
         self.local_dict = create_local_dict(
             self.local_attributes, 
@@ -71,7 +72,25 @@ class CoupledEquations(Equation):
             self.user_functions[var] = var
 
     def parse(self):
-        "Main method called after creating the object."
+        "Main method called after creating the object. Identical systems are only solved once (see ParserCache)."
+        key = ParserCache.cache_key(
+            'CoupledEquations', sorted(self.expression_list.items()), [var['method'] for var in self.variables],
+            list(self.local_attributes), list(self.semiglobal_attributes), list(self.global_attributes),
+            sorted(self.untouched.items()), self.local_functions
+        )
+        result = ParserCache.load(key)
+        if result is None:
+            self._create_dictionaries()
+            self._solve()
+            result = dict([(var['name'], (var['cpp'], var['switch'])) for var in self.variables])
+            ParserCache.store(key, result)
+        else:
+            for var in self.variables:
+                var['cpp'], var['switch'] = result[var['name']]
+        return self.variables
+
+    def _solve(self):
+        "Solves the coupled equations with the common numerical method."
         # Check if the numerical method is the same for all ODEs
         methods = []
         for var in self.variables:
@@ -91,6 +110,7 @@ class CoupledEquations(Equation):
 
     def solve_implicit(self, expression_list):
         "Implicit method"
+        from sympy import Symbol, ccode, collect, solve
 
         equations = {}
         new_vars = {}
@@ -155,6 +175,7 @@ class CoupledEquations(Equation):
 
     def solve_midpoint(self, expression_list):
         "Midpoint method"
+        from sympy import Symbol, ccode, solve
 
         expression_list = {}
         equations = {}
@@ -23,8 +23,8 @@
 #===============================================================================
 import ANNarchy.core.Global as Global
 from .ParserTemplate import create_local_dict, user_functions
+from . import ParserCache
 
-from sympy import *
 import re
 
 class Equation(object):
@@ -62,6 +62,7 @@ class Equation(object):
         self.variables = [var['name'] for var in self.description['variables']]
         self.untouched = untouched
         self.method = method
+        self._dependencies = None
 
         # Determine the type of the equation
         if not type:
@@ -69,6 +70,8 @@ class Equation(object):
         else:
             self.type = type
 
+    def _create_dictionaries(self):
+        "Creates the Sympy vocabulary. Only needed when the result is not in the parser cache."
         # Copy the default dictionary of built-in symbols or functions
         self.local_dict = create_local_dict(
             self.local_attributes,
@@ -83,9 +86,31 @@ class Equation(object):
         for var in self.local_functions:
             self.user_functions[var] = var
 
+    def _cache_key(self):
+        "Key of the equation in the parser cache."
+        untouched = sorted(self.untouched.items()) if isinstance(self.untouched, dict) else list(self.untouched)
+        return ParserCache.cache_key(
+            'Equation', self.name, self.expression, self.type, self.method,
+            list(self.local_attributes), list(self.semiglobal_attributes), list(self.global_attributes),
+            untouched, self.local_functions, self.variables, list(self.attributes)
+        )
 
     def parse(self):
-        "Main method called after creating the object."
+        "Main method called after creating the object. Identical equations are only analysed once (see ParserCache)."
+        key = self._cache_key()
+        result = ParserCache.load(key)
+        if result is not None:
+            code, self._dependencies = result
+            return code
+
+        self._create_dictionaries()
+        code = self._parse()
+        self._dependencies = self._find_dependencies() if hasattr(self, 'analysed') else None
+        ParserCache.store(key, (code, self._dependencies))
+        return code
+
+    def _parse(self):
+        "Analyses the equation depending on its type."
         try:
             if self.type == 'ODE':
                 code = self.analyse_ODE(self.expression)
@@ -143,6 +168,7 @@ class Equation(object):
 
     def c_code(self, equation):
         "Returns the C version of a Sympy expression"
+        from sympy import ccode
         return ccode(
             equation,
             precision=8,
@@ -151,6 +177,7 @@ class Equation(object):
 
     def latex_code(self, equation):
         "Returns the LaTeX version of a Sympy expression"
+        from sympy import latex
         return latex(equation)
 
     def parse_expression(self, expression, local_dict):
@@ -198,6 +225,7 @@ class Equation(object):
 
     def explicit(self, expression):
         " Explicit or backward Euler numerical method"
+        from sympy import Symbol, simplify, solve
 
         expression = expression.replace('d'+self.name+'/dt', '_grad_var_')
         new_var = Symbol('_grad_var_')
@@ -222,6 +250,7 @@ class Equation(object):
 
     def midpoint(self, expression):
         "Midpoint method."
+        from sympy import Symbol, simplify, collect, solve
 
         expression = expression.replace('d'+self.name+'/dt', '_grad_var_')
         new_var = Symbol('_grad_var_')
@@ -256,6 +285,7 @@ class Equation(object):
 
     def implicit(self, expression):
         "Full implicit method, linearising for example (V - E)^2, but this is not desired."
+        from sympy import Symbol, simplify, collect, solve
 
         # print('Expression', expression)
         # Transform the gradient into a difference TODO: more robust...
@@ -300,6 +330,7 @@ class Equation(object):
 
     def semiimplicit(self, expression):
         " Implicit or forward Euler numerical method, but only for the linear part of the equation."
+        from sympy import S, together
         # Standardize the equation
         real_tau, stepsize, steadystate = self.standardize_ODE(expression)
 
@@ -401,6 +432,7 @@ class Equation(object):
 
             * steadystate: the right term of the equation after standardization
         """
+        from sympy import Symbol, S, collect, expand, together
         # Replace the gradient with a temporary variable
         expression = expression.replace('d' + self.name +'/dt', '_gradvar_') # TODO: robust to spaces
 
@@ -493,6 +525,7 @@ class Equation(object):
 
     def analyse_increment(self, expression):
         " Analyzes an incremental assignment (e.g. a += 0.2)."
+        from sympy import simplify
 
         # Get only the right term
         if '+=' in expression:
@@ -568,6 +601,12 @@ class Equation(object):
 
     def dependencies(self):
         "Returns all dependencies of the equation"
+        if self._dependencies is None:
+            return self._find_dependencies()
+        return list(self._dependencies)
+
+    def _find_dependencies(self):
+        "Searches the attributes used in the Sympy expression."
         deps = []
         for att in self.attributes:
             if self.local_dict[att] in self.analysed.atoms():
@@ -21,12 +21,10 @@
     along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 """
+import re
 import ANNarchy.core.Global as Global
 from ANNarchy.parser.Equation import transform_condition
-from .ParserTemplate import parser_dict, functions_dict, user_functions
-
-from sympy import *
-from sympy.parsing.sympy_parser import parse_expr, standard_transformations, convert_xor, auto_number
+from .ParserTemplate import create_functions_dict, user_functions
 
 class FunctionParser(object):
     '''
@@ -55,8 +53,12 @@ class FunctionParser(object):
         self.args = description
         self.eq = expression
 
+    def _create_dictionaries(self):
+        "Creates the Sympy symbols of the arguments and functions (Sympy is imported only when needed)."
+        from sympy import Symbol, Function
+
         # Copy the default functions dictionary
-        self.local_dict = functions_dict.copy()
+        self.local_dict = create_functions_dict()
         # Add the arguments to the dictionary
         for arg in self.args:
             self.local_dict[arg] = Symbol(arg)
@@ -77,6 +79,10 @@ class FunctionParser(object):
             self.local_dict['__conditional__'+str(i)] = Symbol('__conditional__'+str(i))
 
     def parse(self, part=None):
+        from sympy import ccode
+        from sympy.parsing.sympy_parser import parse_expr, convert_xor, auto_number
+
+        self._create_dictionaries()
         if not part:
             part = self.eq
 
@@ -0,0 +1,127 @@
+#===============================================================================
+#
+#     ParserCache.py
+#
+#     This file is part of ANNarchy.
+#
+#     Copyright (C) 2013-2016  Julien Vitay <julien.vitay@gmail.com>,
+#     Helge Uelo Dinkelbach <helge.dinkelbach@gmail.com>
+#
+#     This program is free software: you can redistribute it and/or modify
+#     it under the terms of the GNU General Public License as published by
+#     the Free Software Foundation, either version 3 of the License, or
+#     (at your option) any later version.
+#
+#     ANNarchy is distributed in the hope that it will be useful,
+#     but WITHOUT ANY WARRANTY; without even the implied warranty of
+#     MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#     GNU General Public License for more details.
+#
+#     You should have received a copy of the GNU General Public License
+#     along with this program.  If not, see <http://www.gnu.org/licenses/>.
+#
+#===============================================================================
+"""
+Memoization of the equation parser.
+
+The C++ code produced by Sympy for an equation only depends on the raw
+text of the equation, the numerical method, the vocabulary of the
+neuron/synapse (attributes and their locality, functions, constants) and
+the sources of the parser, which are hashed into the key. The
+results are kept in memory for the current process and stored on the disk
+(by default in ``~/.cache/ANNarchy/parser/``) for the next runs, so that
+identical model definitions do not need Sympy at all.
+"""
+import os
+import copy
+import pickle
+import hashlib
+
+import ANNarchy.core.Global as Global
+
+# Results computed or loaded during this session
+_memory_cache = {}
+
+# Folder where the results are stored, False if the cache is disabled
+_cache_dir = None
+
+# Hash of the sources of the parser, computed once per session
+_source_hash = None
+
+def _directory():
+    "Returns the folder of the disk cache (False if disabled in ~/.config/ANNarchy/annarchy.json)."
+    global _cache_dir
+    if _cache_dir is None:
+        # same configuration as the build cache of the compiler
+        config = Global._load_user_config().get('cache', {})
+        if not config.get('enabled', True):
+            _cache_dir = False
+        else:
+            _cache_dir = os.path.expanduser(config.get('path', '~/.cache/ANNarchy')) + '/parser'
+    return _cache_dir
+
+def _sources():
+    "Hash of the modules of the parser, so that results produced by another version of the code are not reused."
+    global _source_hash
+    if _source_hash is None:
+        folder = os.path.dirname(os.path.abspath(__file__))
+        sha = hashlib.sha256()
+        for filename in sorted(os.listdir(folder)):
+            if filename.endswith('.py'):
+                with open(folder + '/' + filename, 'rb') as rfile:
+                    sha.update(filename.encode('utf-8'))
+                    sha.update(rfile.read())
+        _source_hash = sha.hexdigest()
+    return _source_hash
+
+def cache_key(*args):
+    """
+    Computes the key associated to the arguments of a parser. The sources of the parser, the floating precision, the custom constants and the global functions are added as they influence the generated code.
+    """
+    from ANNarchy import __release__
+    context = (
+        __release__,
+        _sources(),
+        Global.config['precision'],
+        sorted([obj.name for obj in Global._objects['constants']]),
+        sorted([name for name, _ in Global._objects['functions']])
+    )
+    return hashlib.sha256(repr((context, args)).encode('utf-8')).hexdigest()
+
+def load(key):
+    "Returns (a copy of) the result stored for the key, or None if it has never been computed."
+    if key in _memory_cache.keys():
+        return copy.deepcopy(_memory_cache[key])
+
+    cache_dir = _directory()
+    if not cache_dir or not os.path.isfile(cache_dir + '/' + key):
+        return None
+
+    try:
+        with open(cache_dir + '/' + key, 'rb') as rfile:
+            result = pickle.load(rfile)
+    except Exception: # truncated or incompatible file: parse again
+        return None
+
+    _memory_cache[key] = result
+    return copy.deepcopy(result)
+
+def store(key, result):
+    "Stores (a copy of) the result in memory and on the disk. Failures to write are silently ignored."
+    _memory_cache[key] = copy.deepcopy(result)
+
+    cache_dir = _directory()
+    if not cache_dir:
+        return
+
+    tmp_file = cache_dir + '/' + key + '.tmp' + str(os.getpid())
+    try:
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir)
+        with open(tmp_file, 'wb') as wfile:
+            pickle.dump(result, wfile, protocol=2)
+        # atomic, as several processes may parse the same model
+        os.rename(tmp_file, cache_dir + '/' + key)
+    except Exception:
+        if os.path.isfile(tmp_file):
+            os.remove(tmp_file)
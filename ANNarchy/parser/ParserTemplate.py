@@ -1,8 +1,12 @@
-from sympy import Symbol, Function
 import ANNarchy.core.Global as Global
 
-# Dictionary of default elements for the C++ generation
-parser_dict = {
+# Sympy is only imported when an equation has to be parsed, as it
+# dominates the import time of ANNarchy.
+
+def create_parser_dict():
+    "Returns the dictionary of default elements for the C++ generation."
+    from sympy import Symbol
+    return {
       'dt' : Symbol('dt'),
       't' : Symbol('(double(t)*dt)'),
       'w' : Symbol('w%(local_index)s'),
@@ -10,10 +14,12 @@ parser_dict = {
       't_last': Symbol('((double)(last_spike%(local_index)s)*dt)'),
       't_pre': Symbol('((double)(%(pre_prefix)slast_spike[pre_rank%(local_index)s])*dt)'),
       't_post': Symbol('((double)(%(post_prefix)slast_spike[post_rank%(semiglobal_index)s])*dt)'),
-}
+    }
 
-# Dictionary of built-in functions for the C++ generation
-functions_dict = {
+def create_functions_dict():
+    "Returns the dictionary of built-in functions for the C++ generation."
+    from sympy import Symbol, Function
+    return {
       'pos': Function('positive'),
       'positive': Function('positive'),
       'neg': Function('negative'),
@@ -25,7 +31,7 @@ functions_dict = {
       'True': Symbol('true'),
       'False': Symbol('false'),
       'power': Function('power', nargs=2),
-}
+    }
 
 # Built-in functions with their correct name
 user_functions = {
@@ -53,9 +59,11 @@ def create_local_dict(local_attributes, semiglobal_attributes, global_attributes
 
     """
 
+    from sympy import Symbol
+
     # Copy the default dictionary of built-in symbols or functions
-    local_dict = parser_dict.copy()
-    local_dict.update(functions_dict)
+    local_dict = create_parser_dict()
+    local_dict.update(create_functions_dict())
 
     # Add each variable of the neuron depending on its locality
     for var in local_attributes:
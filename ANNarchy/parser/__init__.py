@@ -1,2 +1,15 @@
-from .AnalyseNeuron import analyse_neuron
-from .AnalyseSynapse import analyse_synapse
+import sys
+
+# The analysers (and sympy) are only imported when a neuron or synapse is analysed.
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        if name == 'analyse_neuron':
+            from .AnalyseNeuron import analyse_neuron
+            return analyse_neuron
+        if name == 'analyse_synapse':
+            from .AnalyseSynapse import analyse_synapse
+            return analyse_synapse
+        raise AttributeError("module 'ANNarchy.parser' has no attribute '" + name + "'")
+else: # module-level __getattr__ is not supported
+    from .AnalyseNeuron import analyse_neuron
+    from .AnalyseSynapse import analyse_synapse
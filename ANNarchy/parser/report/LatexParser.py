@@ -4,7 +4,7 @@ from sympy.printing.latex import LatexPrinter
 import re
 
 import ANNarchy.core.Global as Global
-from ANNarchy.core.Random import RandomDistribution
+from ANNarchy.core.ConnectorMethods import _process_random
 from ..Extraction import *
 from ANNarchy.parser.AnalyseSynapse import analyse_synapse
 
@@ -13,13 +13,6 @@ from ANNarchy.parser.AnalyseSynapse import analyse_synapse
 ### Process individual equations
 ##################################
 
-def _process_random(val):
-    "Transforms a connector attribute (weights, delays) into a string representation"
-    if isinstance(val, RandomDistribution):
-        return val.latex()
-    else:
-        return str(val)
-
 # Really crappy...
 # When target has a number (ff1), sympy thinks the 1 is a number
 # the target is replaced by a text to avoid this
@@ -1,30 +1,42 @@
 from ANNarchy.core.Global import _check_paradigm, _check_precision
 
 from .test_BuiltinFunctions import test_BuiltinFunctions
+from .test_BuildCache import test_BuildCache
 from .test_connectivity import TestConnectivity
 from .test_CustomFunc import test_CustomFunc
 from .test_Dendrite import test_Dendrite
+from .test_Estimate import test_Estimate
 from .test_GlobalOperation import test_GlobalOps_1D, test_GlobalOps_2D, test_SynapticAccess
 from .test_ITE import test_ITE
 from .test_neuron_update import TestNeuronUpdate
 from .test_NumericalMethod import test_Explicit, test_Exponential, test_Implicit, test_Midpoint, test_ImplicitCoupled, test_MidpointCoupled, test_Precision
+from .test_ParserCache import test_ParserCache
 from .test_Population import test_Population1D, test_Population2D, test_Population3D, test_Population2x3D
 from .test_PopulationView import test_PopulationView
 from .test_Projection import test_Projection
-from .test_Record import test_Record
+from .test_Record import test_Record, test_RecordReduce, test_RecordWindow
 from .test_RateTransmission import test_RateTransmission, test_RateTransmissionDelayLocalVariable, test_RateTransmissionGlobal
 if _check_paradigm('openmp'):
     from .test_RateTransmission import test_RateTransmissionNonuniformDelayLocalVariable
 
 from .test_SpikingNeuron import test_SpikingCondition
 from .test_Synapse import test_Locality, test_AccessPSP
-from .test_SpikingSynapse import test_PreSpike, test_PostSpike
+from .test_SpikingSynapse import test_PreSpike, test_PostSpike, test_NeuronTraces
 from .test_TimedArray import test_TimedArray
-from .test_SpecificProjections import test_CurrentInjection
+from .test_SpecificProjections import test_CurrentInjection, test_DecodingProjection
 
 if _check_precision('double'):
     from .test_RandomVariables import test_NeuronRandomVariables, test_SynapseRandomVariables
 
 # Some features and accordingly Unittests are only allowed on specific platforms
 if _check_paradigm('openmp'):
-    from .test_StructuralPlasticity import test_StructuralPlasticityEnvironment, test_StructuralPlasticityModel
+    from .test_StructuralPlasticity import test_StructuralPlasticityEnvironment, test_StructuralPlasticityModel, test_StructuralPlasticityCreating, test_StructuralPlasticityPruning
+    from .test_State import test_State, test_StateBool
+    from .test_Views import test_Views
+    from .test_Convolution import test_Convolution
+    from .test_Pooling import test_Pooling
+    from .test_Copy import test_Copy, test_SharedConnectivity
+    from .test_Schedule import test_Schedule, test_ScheduleBool
+    from .test_Profiler import test_Profiler
+    from .test_Makefile import test_Makefile
+    from .test_Benchmarks import test_Benchmarks
@@ -0,0 +1,133 @@
+"""
+
+    test_Benchmarks.py
+
+    This file is part of ANNarchy.
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    ANNarchy is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+import copy
+import unittest
+
+from ANNarchy.benchmarks import run_case, compare_results, format_result, TIME_METRICS, MEMORY_METRICS
+
+class test_Benchmarks(unittest.TestCase):
+    """
+    Tests the benchmark suite: comparison with a baseline (*compare_results()*), summary of a measurement (*format_result()*) and a small run (*run_case()*).
+    """
+    def _result(self, case='coba', size=1000, threads=1, **values):
+        "Measurement of one configuration, all durations are 1 s and all sizes 1 MB unless given in values."
+        result = {
+            'case': case, 'size': size, 'threads': threads, 'neurons': size, 'synapses': 20 * size,
+            'time': {'build': 0.5, 'code_generation': 0.25, 'compilation': 1.0, 'connect': 1.0, 'instantiate': 1.0, 'simulate': 1.0, 'step': 1e-4},
+            'memory': {'populations': 1024**2, 'projections': 1024**2, 'monitors': 1024**2, 'peak_rss': 100 * 1024**2},
+        }
+        for name, value in values.items():
+            category, metric = name.split('__')
+            result[category][metric] = value
+        return result
+
+    def _results(self, *results):
+        "Results as returned by run_benchmarks()."
+        return {'environment': {}, 'settings': {}, 'results': list(results)}
+
+    def test_compare_identical(self):
+        """
+        Identical results contain no regression.
+        """
+        results = self._results(self._result(), self._result(size=4000))
+        self.assertEqual(compare_results(results, copy.deepcopy(results)), [])
+
+    def test_compare_tolerance(self):
+        """
+        Only the increases above the tolerance are regressions.
+        """
+        baseline = self._results(self._result())
+        self.assertEqual(compare_results(self._results(self._result(time__simulate=1.05)), baseline), [])
+
+        regressions = compare_results(self._results(self._result(time__simulate=1.5, memory__projections=3 * 1024**2)), baseline)
+        self.assertEqual(sorted(reg['metric'] for reg in regressions), ['memory.projections', 'time.simulate'])
+        for reg in regressions:
+            self.assertEqual((reg['case'], reg['size'], reg['threads']), ('coba', 1000, 1))
+        simulate = [reg for reg in regressions if reg['metric'] == 'time.simulate'][0]
+        self.assertEqual((simulate['baseline'], simulate['value']), (1.0, 1.5))
+        self.assertAlmostEqual(simulate['ratio'], 1.5)
+
+        self.assertEqual(compare_results(self._results(self._result(time__simulate=1.5)), baseline, tolerance=0.6), [])
+
+    def test_compare_improvement(self):
+        """
+        Faster or smaller results are not regressions, the build and code generation times are not compared.
+        """
+        results = self._results(self._result(time__simulate=0.1, memory__monitors=0, time__build=10.0, time__code_generation=10.0))
+        self.assertEqual(compare_results(results, self._results(self._result())), [])
+
+    def test_compare_min_time(self):
+        """
+        Durations shorter than min_time in the baseline are too noisy to be compared.
+        """
+        baseline = self._results(self._result(time__connect=0.005))
+        results = self._results(self._result(time__connect=0.05))
+        self.assertEqual(compare_results(results, baseline), [])
+        self.assertEqual(len(compare_results(results, baseline, min_time=0.001)), 1)
+
+    def test_compare_mismatch(self):
+        """
+        Configurations (case, size, threads) present in only one of the sets are ignored.
+        """
+        baseline = self._results(self._result(), self._result(case='cuba'))
+        results = self._results(
+            self._result(time__simulate=2.0),
+            self._result(size=4000, time__simulate=2.0),
+            self._result(threads=2, time__simulate=2.0),
+            self._result(case='stdp', time__simulate=2.0)
+        )
+        regressions = compare_results(results, baseline)
+        self.assertEqual(len(regressions), 1)
+        self.assertEqual((regressions[0]['case'], regressions[0]['size'], regressions[0]['threads']), ('coba', 1000, 1))
+
+    def test_format_result(self):
+        """
+        The summary contains the configuration, the durations, the total memory and the peak memory.
+        """
+        line = format_result(self._result(time__simulate=2.5))
+        self.assertEqual(line,
+            'coba         size=1000     threads=1   build=0.500s code_generation=0.250s compilation=1.000s connect=1.000s instantiate=1.000s simulate=2.500s memory=3.0MB peak=100.0MB')
+
+    def test_run_case(self):
+        """
+        A small network is built, compiled and simulated in a separate process.
+        """
+        result = run_case('rate_dense', 10, duration=10.0)
+        self.assertEqual((result['case'], result['size'], result['threads']), ('rate_dense', 10, 1))
+        self.assertEqual(result['neurons'], 10)
+        self.assertEqual(result['synapses'], 90)
+        for metric in ['build', 'code_generation', 'step'] + TIME_METRICS:
+            self.assertGreaterEqual(result['time'][metric], 0.0)
+        self.assertGreater(result['time']['compilation'], 0.0)
+        for metric in MEMORY_METRICS + ['peak_rss']:
+            self.assertGreaterEqual(result['memory'][metric], 0)
+        self.assertGreater(result['memory']['projections'], 0)
+
+        # The result can be compared and printed
+        self.assertEqual(compare_results(self._results(result), self._results(result)), [])
+        self.assertTrue(format_result(result).startswith('rate_dense   size=10 '))
+
+    def test_unknown_case(self):
+        """
+        An unknown case is rejected before starting a process.
+        """
+        with self.assertRaises(ValueError):
+            run_case('unknown', 10)
@@ -0,0 +1,97 @@
+"""
+
+    test_BuildCache.py
+
+    This file is part of ANNarchy.
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    ANNarchy is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+import os
+import filecmp
+import tempfile
+import unittest
+
+from ANNarchy import *
+import ANNarchy.generator.Compiler as Compiler
+
+class test_BuildCache(unittest.TestCase):
+    """
+    Tests the shared build cache, which stores the compiled libraries under a
+    hash of the generated code and of the environment.
+    """
+    @classmethod
+    def setUpClass(self):
+        """
+        Compile the network for this test
+        """
+        pop = Population(5, Neuron(equations="r = 1.0"))
+
+        self.test_net = Network()
+        self.test_net.add([pop])
+        self.test_net.compile(silent=True)
+
+        self.annarchy_dir = os.getcwd() + '/annarchy'
+        self.libname = 'ANNarchyCore' + str(self.test_net.id) + '.so'
+
+    def setUp(self):
+        """
+        Each test uses a new empty cache.
+        """
+        self.compiler = Compiler.Compiler(
+            annarchy_dir=self.annarchy_dir, clean=False, compiler="default", compiler_flags="",
+            silent=True, cuda_config=None, debug_build=False, profile_enabled=False,
+            populations=self.test_net.get_populations(), projections=[],
+            net_id=self.test_net.id)
+        self.cache_root = tempfile.mkdtemp()
+        self.compiler.user_config['cache'] = {'path': self.cache_root}
+
+    def test_key(self):
+        """
+        The folder of a library only depends on the generated code and the environment, including the Cython version.
+        """
+        cache_dir = self.compiler.cache_directory()
+        self.assertEqual(os.path.dirname(cache_dir), self.cache_root)
+        self.assertEqual(self.compiler.cache_directory(), cache_dir)
+
+        cython_version = Compiler.cython_version
+        try:
+            Compiler.cython_version = lambda: 'other'
+            self.assertNotEqual(self.compiler.cache_directory(), cache_dir)
+        finally:
+            Compiler.cython_version = cython_version
+
+    def test_disabled(self):
+        """
+        The cache can be disabled in the configuration or for one compilation.
+        """
+        self.compiler.user_config['cache']['enabled'] = False
+        self.assertIsNone(self.compiler.cache_directory())
+
+        self.compiler.user_config['cache']['enabled'] = True
+        self.compiler.use_cache = False
+        self.assertIsNone(self.compiler.cache_directory())
+
+    def test_hit_miss(self):
+        """
+        A library is only found in the cache once it was stored.
+        """
+        cache_dir = self.compiler.cache_directory()
+        self.assertFalse(self.compiler.load_from_cache(cache_dir))
+
+        self.compiler.store_in_cache(cache_dir)
+        self.assertTrue(filecmp.cmp(cache_dir + '/' + self.libname, self.annarchy_dir + '/' + self.libname, shallow=False))
+
+        self.assertTrue(self.compiler.load_from_cache(cache_dir))
+        self.assertTrue(os.path.isfile(self.annarchy_dir + '/' + self.libname))
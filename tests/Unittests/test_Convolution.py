@@ -0,0 +1,182 @@
+"""
+
+    test_Convolution.py
+
+    This file is part of ANNarchy.
+
+    Copyright (C) 2013-2016 Joseph Gussev <joseph.gussev@s2012.tu-chemnitz.de>,
+    Helge Uelo Dinkelbach <helge.dinkelbach@gmail.com>
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    ANNarchy is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+import unittest
+import numpy
+
+from ANNarchy import *
+from ANNarchy.extensions.convolution import Convolution
+
+def _filter(rates, kernel, padding):
+    "Reference implementation of the 'filter' method on a 2D population."
+    (h, w), (kh, kw) = rates.shape, kernel.shape
+    ch, cw = int(kh/2) if kh%2==1 else int(kh/2)-1, int(kw/2) if kw%2==1 else int(kw/2)-1
+    if padding == 'border':
+        padded = numpy.pad(rates, ((ch, kh-1-ch), (cw, kw-1-cw)), mode='edge')
+    else:
+        padded = numpy.pad(rates, ((ch, kh-1-ch), (cw, kw-1-cw)), mode='constant', constant_values=padding)
+    res = numpy.zeros((h, w))
+    for i in range(h):
+        for j in range(w):
+            res[i, j] = (kernel * padded[i:i+kh, j:j+kw]).sum()
+    return res
+
+numpy.random.seed(1)
+bank = numpy.random.uniform(-1.0, 1.0, (4, 3, 5))
+kernel = numpy.random.uniform(-1.0, 1.0, (3, 3))
+wide = numpy.random.uniform(-1.0, 1.0, (15, 18))
+gaussian = numpy.outer(numpy.exp(-numpy.linspace(-1.0, 1.0, 5)**2), numpy.exp(-numpy.linspace(-1.0, 1.0, 7)**2))
+
+inp = Population((8, 10), Neuron(parameters="r = 0.0"))
+out_bank = Population((8, 10, 4), Neuron(equations="r = sum(exc)"))
+out_border = Population((8, 10), Neuron(equations="r = sum(exc)"))
+out_sub = Population((4, 5), Neuron(equations="r = sum(exc)"))
+out_direct = Population((8, 10), Neuron(equations="r = sum(exc)"))
+out_direct_bank = Population((8, 10, 4), Neuron(equations="r = sum(exc)"))
+out_separable = Population((8, 10), Neuron(equations="r = sum(exc)"))
+out_fft = Population((8, 10), Neuron(equations="r = sum(exc)"))
+out_fft_border = Population((8, 10), Neuron(equations="r = sum(exc)"))
+out_fft_period = Population((8, 10), Neuron(equations="r = sum(exc)"))
+
+proj_bank = Convolution(inp, out_bank, 'exc', bank, multiple=True, padding=0.3, engine='gemm')
+proj_border = Convolution(inp, out_border, 'exc', kernel, method='convolution', padding='border', engine='gemm')
+proj_sub = Convolution(inp, out_sub, 'exc', kernel, engine='gemm')
+proj_direct = Convolution(inp, out_direct, 'exc', kernel, padding=0.3)
+proj_direct_bank = Convolution(inp, out_direct_bank, 'exc', bank, multiple=True, padding=0.3)
+proj_separable = Convolution(inp, out_separable, 'exc', gaussian, method='convolution', padding='border')
+proj_fft = Convolution(inp, out_fft, 'exc', wide, padding=0.3, engine='fft')
+proj_fft_border = Convolution(inp, out_fft_border, 'exc', gaussian, method='convolution', padding='border', engine='fft')
+proj_fft_period = Convolution(inp, out_fft_period, 'exc', kernel, engine='fft', update_period=2.0)
+
+class test_Convolution(unittest.TestCase):
+    """
+    Tests the engines of the *Convolution* projection against a reference implementation.
+    """
+    @classmethod
+    def setUpClass(self):
+        """
+        Compile the network for this test
+        """
+        self.test_net = Network()
+        self.test_net.add([inp, out_bank, out_border, out_sub, out_direct, out_direct_bank, out_separable, out_fft, out_fft_border, out_fft_period, proj_bank, proj_border, proj_sub, proj_direct, proj_direct_bank, proj_separable, proj_fft, proj_fft_border, proj_fft_period])
+        self.test_net.compile(silent=True)
+
+        self.rates = numpy.random.uniform(0.0, 1.0, (8, 10))
+        self.test_net.get(inp).r = self.rates
+
+    def setUp(self):
+        """
+        Restores the weights before each test.
+        """
+        self.test_net.get(proj_sub).cyInstance.set_w(kernel)
+        self.test_net.get(proj_separable).cyInstance.set_w(gaussian)
+        self.test_net.get(proj_fft_period).cyInstance.set_w(kernel)
+
+    def test_gemm_bank(self):
+        """
+        Bank of filters with a constant padding.
+        """
+        self.test_net.simulate(1)
+        r = self.test_net.get(out_bank).r
+        for f in range(4):
+            self.assertTrue(numpy.allclose(r[:, :, f], _filter(self.rates, bank[f], 0.3)))
+
+    def test_gemm_border(self):
+        """
+        Convolution (flipped kernel) with the border values repeated.
+        """
+        self.test_net.simulate(1)
+        self.assertTrue(numpy.allclose(self.test_net.get(out_border).r, _filter(self.rates, kernel[::-1, ::-1], 'border')))
+
+    def test_gemm_subsampling(self):
+        """
+        Sub-sampling deduced from the geometries, after a modification of the weights.
+        """
+        self.test_net.get(proj_sub).cyInstance.set_w(2.0 * kernel)
+        self.test_net.simulate(1)
+        self.assertTrue(numpy.allclose(self.test_net.get(out_sub).r, 2.0 * _filter(self.rates, kernel, 0.0)[::2, ::2]))
+
+    def test_direct(self):
+        """
+        Direct loops, split between interior neurons and border neurons using the padding value.
+        """
+        self.test_net.simulate(1)
+        self.assertTrue(numpy.allclose(self.test_net.get(out_direct).r, _filter(self.rates, kernel, 0.3)))
+
+    def test_direct_bank(self):
+        """
+        Direct loops for a bank of filters.
+        """
+        self.test_net.simulate(1)
+        r = self.test_net.get(out_direct_bank).r
+        for f in range(4):
+            self.assertTrue(numpy.allclose(r[:, :, f], _filter(self.rates, bank[f], 0.3)))
+
+    def test_separable(self):
+        """
+        A Gaussian kernel is applied in two 1D passes. The general loops are used again when the kernel is not separable anymore.
+        """
+        self.test_net.simulate(1)
+        self.assertTrue(numpy.allclose(self.test_net.get(out_separable).r, _filter(self.rates, gaussian[::-1, ::-1], 'border')))
+
+        other = numpy.random.uniform(-1.0, 1.0, (5, 7))
+        self.test_net.get(proj_separable).cyInstance.set_w(other)
+        self.test_net.simulate(1)
+        self.assertTrue(numpy.allclose(self.test_net.get(out_separable).r, _filter(self.rates, other[::-1, ::-1], 'border')))
+
+    def test_fft(self):
+        """
+        FFT engine with a kernel wider than the population and a constant padding.
+        """
+        self.test_net.simulate(1)
+        self.assertTrue(numpy.allclose(self.test_net.get(out_fft).r, _filter(self.rates, wide, 0.3)))
+
+    def test_fft_border(self):
+        """
+        FFT engine for a convolution with the border values repeated.
+        """
+        self.test_net.simulate(1)
+        self.assertTrue(numpy.allclose(self.test_net.get(out_fft_border).r, _filter(self.rates, gaussian[::-1, ::-1], 'border')))
+
+    def test_fft_period(self):
+        """
+        With an update period of 2 ms, the last result is kept for one step.
+        """
+        self.test_net.simulate(1)
+        self.test_net.get(inp).r = 2.0 * self.rates
+        self.test_net.simulate(1)
+        self.assertTrue(numpy.allclose(self.test_net.get(out_fft_period).r, _filter(self.rates, kernel, 0.0)))
+        self.test_net.simulate(1)
+        self.assertTrue(numpy.allclose(self.test_net.get(out_fft_period).r, _filter(2.0 * self.rates, kernel, 0.0)))
+        self.test_net.get(inp).r = self.rates
+
+    def test_fft_reset(self):
+        """
+        reset() discards the result kept by the FFT engine between two updates.
+        """
+        self.test_net.simulate(1)
+        self.test_net.get(inp).r = 2.0 * self.rates
+        self.test_net.get(proj_fft_period).reset()
+        self.test_net.simulate(1)
+        self.assertTrue(numpy.allclose(self.test_net.get(out_fft_period).r, _filter(2.0 * self.rates, kernel, 0.0)))
+        self.test_net.get(inp).r = self.rates
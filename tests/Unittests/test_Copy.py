@@ -0,0 +1,225 @@
+"""
+
+    test_Copy.py
+
+    This file is part of ANNarchy.
+
+    Copyright (C) 2013-2016 Joseph Gussev <joseph.gussev@s2012.tu-chemnitz.de>,
+    Helge Uelo Dinkelbach <helge.dinkelbach@gmail.com>
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    ANNarchy is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+import os
+import unittest
+import numpy
+
+from ANNarchy import *
+import ANNarchy.core.Global as Global
+from ANNarchy.extensions.convolution import CopyProjection
+
+neuron = Neuron(equations="r = sum(exc)")
+
+inp_orig = Population((5, 4), Neuron(parameters="r = 0.0"))
+inp_copy = Population((5, 4), Neuron(parameters="r = 0.0"))
+out_orig = Population(6, neuron)
+out_sum = Population(6, neuron)
+out_max = Population(6, neuron)
+out_single = Population(6, neuron)
+
+proj_orig = Projection(inp_orig, out_orig, 'exc')
+proj_orig.connect_fixed_probability(0.5, weights=Uniform(0.0, 1.0))
+proj_single = Projection(inp_orig, out_orig, 'inh')
+proj_single.connect_all_to_all(weights=0.5)
+
+copy_sum = CopyProjection(inp_copy, out_sum, 'exc', proj_orig)
+copy_max = CopyProjection(inp_copy, out_max, 'exc', proj_orig, operation='max')
+copy_single = CopyProjection(inp_copy, out_single, 'exc', proj_single)
+
+class test_Copy(unittest.TestCase):
+    """
+    Tests the *CopyProjection*, which reuses the connectivity and the weights of another projection.
+    """
+    @classmethod
+    def setUpClass(self):
+        """
+        Compile the network for this test
+        """
+        self.test_net = Network()
+        self.test_net.add([inp_orig, inp_copy, out_orig, out_sum, out_max, out_single, proj_orig, proj_single, copy_sum, copy_max, copy_single])
+        self.test_net.compile(silent=True)
+
+        self.rates = numpy.random.uniform(0.0, 1.0, 20)
+        self.test_net.get(inp_copy).r = self.rates.reshape((5, 4))
+        self.test_net.simulate(2)
+
+        self.proj = self.test_net.get(proj_orig)
+
+    def test_shared_synapses(self):
+        """
+        The copy reports the synapses of the original projection.
+        """
+        self.assertEqual(self.test_net.get(copy_sum).nb_synapses, self.proj.nb_synapses)
+
+    def test_sum(self):
+        """
+        The weighted sum uses the weights of the original projection.
+        """
+        res = self.proj.connectivity_matrix().dot(self.rates)
+        self.assertTrue(numpy.allclose(self.test_net.get(out_sum).r, res))
+
+    def test_max(self):
+        """
+        The operation of the copy can differ from the original one.
+        """
+        res = []
+        for rank in range(6):
+            dendrite = self.proj.dendrite(rank)
+            res.append((numpy.array(dendrite.w) * self.rates[dendrite.pre_ranks]).max())
+        self.assertTrue(numpy.allclose(self.test_net.get(out_max).r, res))
+
+    def test_single_weight(self):
+        """
+        A projection with a single weight can also be copied.
+        """
+        self.assertTrue(numpy.allclose(self.test_net.get(out_single).r, 0.5 * self.rates.sum()))
+
+class test_SharedConnectivity(unittest.TestCase):
+    """
+    Tests the automatic sharing of the ranks between projections built with the same connector and arguments, as in replicated columns. The weights are not shared.
+    """
+    @classmethod
+    def setUpClass(self):
+        """
+        Compile the network for this test
+        """
+        # The ranks are not shared with structural plasticity, it is restored in tearDownClass()
+        self.structural_plasticity = Global.config['structural_plasticity']
+        Global.config['structural_plasticity'] = False
+
+        hebb = Synapse(equations="dw/dt = pre.r")
+        output = Neuron(equations="r = sum(exc) + sum(inh) + sum(rand)")
+
+        self.columns = []
+        objects = []
+        for col in range(3):
+            inp = Population((4, 5), Neuron(parameters="r = 0.0"))
+            out = Population(6, output)
+            learner = Population(6, Neuron(equations="r = sum(hebb)"))
+            column = {
+                'inp': inp, 'out': out,
+                'all': Projection(inp, out, 'exc').connect_all_to_all(weights=Uniform(0.0, 1.0)),
+                'seeded': Projection(inp, out, 'inh').connect_fixed_probability(0.3, weights=1.0, seed=42),
+                'random': Projection(inp, out, 'rand').connect_fixed_probability(0.3, weights=1.0),
+                'hebb': Projection(inp, learner, 'hebb', hebb).connect_fixed_number_pre(5, weights=Uniform(0.0, 1.0), seed=7),
+            }
+            self.columns.append(column)
+            objects += [inp, out, learner] + [column[name] for name in ['all', 'seeded', 'random', 'hebb']]
+
+        self.test_net = Network()
+        self.test_net.add(objects)
+        self.test_net.compile(silent=True)
+
+    @classmethod
+    def tearDownClass(self):
+        """
+        The following networks use structural plasticity again.
+        """
+        Global.config['structural_plasticity'] = self.structural_plasticity
+
+    def _proj(self, col, name):
+        "Projection of a column in the compiled network."
+        return self.test_net.get(self.columns[col][name])
+
+    def test_shared(self):
+        """
+        The projections of the other columns reference the ranks of the first column, except the ones drawn without seed.
+        """
+        for name in ['all', 'seeded', 'hebb']:
+            self.assertIsNone(self._proj(0, name)._shared_connectivity)
+            for col in [1, 2]:
+                self.assertIs(self._proj(col, name)._shared_connectivity, self._proj(0, name))
+        for col in range(3):
+            self.assertIsNone(self._proj(col, 'random')._shared_connectivity)
+
+        with open(os.getcwd() + '/annarchy/generate/net' + str(self.test_net.id) + '/proj' + str(self._proj(1, 'all').id) + '.hpp', 'r') as rfile:
+            self.assertIn('&pre_rank = proj' + str(self._proj(0, 'all').id) + '.pre_rank;', rfile.read())
+
+    def test_ranks(self):
+        """
+        The seeded connectors create the same synapses in all columns.
+        """
+        for name in ['all', 'seeded', 'hebb']:
+            ref = self._proj(0, name)
+            for col in [1, 2]:
+                proj = self._proj(col, name)
+                self.assertEqual(proj.post_ranks, ref.post_ranks)
+                self.assertEqual(proj.nb_synapses, ref.nb_synapses)
+                for rank in ref.post_ranks:
+                    self.assertEqual(proj.dendrite(rank).pre_ranks, ref.dendrite(rank).pre_ranks)
+        self.assertEqual(self._proj(1, 'hebb').nb_synapses, 30)
+
+    def test_transmission(self):
+        """
+        Each column transmits its own rates with its own weights.
+        """
+        for col in range(3):
+            self.test_net.get(self.columns[col]['inp']).r = numpy.random.uniform(0.0, 1.0, (4, 5))
+        self.test_net.simulate(1)
+
+        for col in range(3):
+            rates = self.test_net.get(self.columns[col]['inp']).r.flatten()
+            res = numpy.zeros(6)
+            for name in ['all', 'seeded', 'random']:
+                res += self._proj(col, name).connectivity_matrix().dot(rates)
+            self.assertTrue(numpy.allclose(self.test_net.get(self.columns[col]['out']).r, res))
+
+        # the random weights are drawn for each projection
+        self.assertFalse(numpy.allclose(self._proj(0, 'all').dendrite(0).w, self._proj(1, 'all').dendrite(0).w))
+
+    def test_learning(self):
+        """
+        The weights of plastic projections sharing their ranks are updated separately.
+        """
+        initial = [[numpy.array(self._proj(col, 'hebb').dendrite(rank).w) for rank in range(6)] for col in range(2)]
+        for col in range(3):
+            self.test_net.get(self.columns[col]['inp']).r = 0.0
+        self.test_net.get(self.columns[1]['inp']).r = 1.0
+        self.test_net.simulate(5)
+
+        for rank in range(6):
+            self.assertTrue(numpy.allclose(self._proj(0, 'hebb').dendrite(rank).w, initial[0][rank]))
+            self.assertTrue(numpy.allclose(self._proj(1, 'hebb').dendrite(rank).w, initial[1][rank] + 5.0))
+
+    def test_estimate(self):
+        """
+        The shared ranks are not counted in the memory footprint of the projections.
+        """
+        est = estimate(self.test_net)
+        size = dict(zip(est['name'], est['bytes']))
+        self.assertLess(size[self._proj(1, 'all').name], size[self._proj(0, 'all').name])
+        self.assertEqual(size[self._proj(1, 'random').name], size[self._proj(0, 'random').name])
+
+    def test_key(self):
+        """
+        Random distributions whose attributes can not be compared (e.g. arrays) disable the sharing instead of failing.
+        """
+        inp, out = self.columns[0]['inp'], self.columns[0]['out']
+        key = Projection(inp, out, 'exc').connect_all_to_all(weights=Uniform(0.0, 1.0))._connectivity_key()
+        self.assertIsNotNone(key)
+        self.assertEqual(hash(key), hash(Projection(inp, out, 'exc').connect_all_to_all(weights=Uniform(0.0, 1.0))._connectivity_key()))
+
+        weights = Uniform(0.0, 1.0)
+        weights.max = numpy.ones(6)
+        self.assertIsNone(Projection(inp, out, 'exc').connect_all_to_all(weights=weights)._connectivity_key())
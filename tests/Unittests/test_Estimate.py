@@ -0,0 +1,90 @@
+"""
+
+    test_Estimate.py
+
+    This file is part of ANNarchy.
+
+    Copyright (C) 2013-2016 Joseph Gussev <joseph.gussev@s2012.tu-chemnitz.de>,
+    Helge Uelo Dinkelbach <helge.dinkelbach@gmail.com>
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    ANNarchy is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+import unittest
+import numpy
+
+from ANNarchy import *
+
+neuron = Neuron(
+    parameters = "tau = 10",
+    equations="tau * dr/dt + r = sum(exc)"
+)
+
+pop1 = Population(100, neuron)
+pop2 = Population(50, neuron)
+
+proj_all = Projection(pre=pop1, post=pop1, target="exc")
+proj_all.connect_all_to_all(weights=1.0)
+
+proj_pre = Projection(pre=pop1, post=pop2, target="exc")
+proj_pre.connect_fixed_number_pre(number=10, weights=Uniform(0.0, 1.0))
+
+proj_prob = Projection(pre=pop1, post=pop2, target="exc")
+proj_prob.connect_fixed_probability(probability=0.2, weights=1.0)
+
+class test_Estimate(unittest.TestCase):
+    """
+    Tests the prediction of the number of synapses and of the memory footprint by *estimate()* before the compilation.
+    """
+    @classmethod
+    def setUpClass(self):
+        """
+        Builds the network, which is compiled only in test_compiled_synapses.
+        """
+        self.test_net = Network()
+        self.test_net.add([pop1, pop2, proj_all, proj_pre, proj_prob])
+        self.estimate = estimate(self.test_net)
+
+    def test_objects(self):
+        """
+        One row per population and projection.
+        """
+        self.assertEqual(self.estimate['type'], ['pop', 'pop', 'proj', 'proj', 'proj'])
+        self.assertEqual(list(self.estimate['size'][:2]), [100, 50])
+
+    def test_synapses(self):
+        """
+        The number of synapses is predicted from the connector arguments, without self-connections for all-to-all.
+        """
+        self.assertEqual(self.estimate['size'][2], 100*99)
+        self.assertEqual(self.estimate['size'][3], 10*50)
+        self.assertEqual(self.estimate['size'][4], 0.2*100*50)
+
+    def test_memory(self):
+        """
+        The footprint of a projection grows with the number of synapses and the non-constant weights.
+        """
+        self.assertTrue(numpy.all(self.estimate['bytes'] > 0))
+        self.assertTrue(self.estimate['bytes'][2] > self.estimate['bytes'][4])
+        per_synapse_pre = self.estimate['bytes'][3] / float(self.estimate['size'][3])
+        per_synapse_prob = self.estimate['bytes'][4] / float(self.estimate['size'][4])
+        self.assertTrue(per_synapse_pre > per_synapse_prob)
+
+    def test_compiled_synapses(self):
+        """
+        The prediction is exact for the deterministic connectors.
+        """
+        self.test_net.compile(silent=True)
+        self.assertEqual(self.test_net.get(proj_all).nb_synapses, self.estimate['size'][2])
+        self.assertEqual(self.test_net.get(proj_pre).nb_synapses, self.estimate['size'][3])
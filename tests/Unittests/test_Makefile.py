@@ -0,0 +1,82 @@
+"""
+
+    test_Makefile.py
+
+    This file is part of ANNarchy.
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    ANNarchy is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+import os
+import re
+import subprocess
+import unittest
+
+from ANNarchy import *
+
+class test_Makefile(unittest.TestCase):
+    """
+    Tests the generated Makefile, which compiles each translation unit
+    (core, recorders, populations and projections) into its own object file.
+    """
+    @classmethod
+    def setUpClass(self):
+        """
+        Compile the network for this test
+        """
+        neuron = Neuron(equations="r = 1.0 + sum(exc)")
+        pop1 = Population(5, neuron)
+        pop2 = Population(8, neuron)
+        proj = Projection(pop1, pop2, 'exc').connect_all_to_all(1.0)
+
+        self.test_net = Network()
+        self.test_net.add([pop1, pop2, proj])
+        self.test_net.compile(silent=True)
+
+        self.folder = os.getcwd() + '/annarchy/generate/net' + str(self.test_net.id)
+        with open(self.folder + '/Makefile', 'r') as rfile:
+            self.makefile = rfile.read()
+
+        self.objects = re.search(r'^OBJECTS = (.*)$', self.makefile, re.MULTILINE).group(1).split()
+
+    def test_objects(self):
+        """
+        There is one object file per population and projection, next to the core and the recorders.
+        """
+        expected = ['ANNarchy.o', 'Recorder.o', 'ANNarchyCore' + str(self.test_net.id) + '.o']
+        expected += ['pop' + str(pop.id) + '.o' for pop in self.test_net.get_populations()]
+        expected += ['proj' + str(proj.id) + '.o' for proj in self.test_net.get_projections()]
+        self.assertEqual(sorted(self.objects), sorted(expected))
+
+        # the sources of all objects are generated, the one of the Cython module by the Makefile itself
+        for obj in self.objects:
+            if obj.startswith('ANNarchyCore'):
+                self.assertTrue(os.path.isfile(self.folder + '/' + obj.replace('.o', '.pyx')))
+            else:
+                self.assertTrue(os.path.isfile(self.folder + '/' + obj.replace('.o', '.cpp')))
+
+    def test_rules(self):
+        """
+        The objects are built by a pattern rule which tracks the header dependencies.
+        """
+        self.assertIn('%.o: %.cpp Makefile', self.makefile)
+        self.assertIn('-MMD -MP', self.makefile)
+        self.assertIn('-include $(OBJECTS:.o=.d)', self.makefile)
+        self.assertIn('ANNarchyCore' + str(self.test_net.id) + '.cpp: ANNarchyCore' + str(self.test_net.id) + '.pyx', self.makefile)
+
+        # make knows how to build each object
+        for obj in self.objects:
+            returncode = subprocess.call(['make', '-n', '-C', self.folder, obj],
+                                         stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            self.assertEqual(returncode, 0, 'no rule for ' + obj)
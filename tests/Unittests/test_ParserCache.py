@@ -0,0 +1,143 @@
+"""
+
+    test_ParserCache.py
+
+    This file is part of ANNarchy.
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    ANNarchy is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+import os
+import tempfile
+import unittest
+
+import ANNarchy.core.Global as Global
+from ANNarchy.parser import ParserCache
+from ANNarchy.parser.Equation import Equation
+
+class test_ParserCache(unittest.TestCase):
+    """
+    Tests the memoization of the equation parser, in memory and on the disk.
+    """
+    description = {
+        'attributes': ['tau', 'r', 'baseline'],
+        'local': ['r', 'baseline'],
+        'semiglobal': [],
+        'global': ['tau'],
+        'functions': [],
+        'variables': [{'name': 'r'}],
+    }
+
+    def setUp(self):
+        """
+        Each test uses a new empty cache.
+        """
+        self.state = ParserCache._cache_dir, dict(ParserCache._memory_cache)
+        ParserCache._cache_dir = tempfile.mkdtemp()
+        ParserCache._memory_cache.clear()
+
+    def tearDown(self):
+        """
+        Restores the cache of the other tests.
+        """
+        ParserCache._cache_dir, memory_cache = self.state
+        ParserCache._memory_cache.clear()
+        ParserCache._memory_cache.update(memory_cache)
+
+    def _equation(self, expression='tau * dr/dt + r = baseline', method='explicit'):
+        "Equation of a rate-coded neuron."
+        return Equation('r', expression, self.description, method=method)
+
+    def _no_sympy(self, eq):
+        "Makes the analysis of the equation fail, so that only cached results can be returned."
+        def _parse():
+            self.fail('the equation has been parsed again')
+        eq._parse = _parse
+        return eq
+
+    def test_hit(self):
+        """
+        An identical equation is taken from the memory, or from the disk in a new session.
+        """
+        eq = self._equation()
+        code = eq.parse()
+        dependencies = eq._dependencies
+        key = eq._cache_key()
+        self.assertTrue(os.path.isfile(ParserCache._cache_dir + '/' + key))
+
+        self.assertEqual(self._no_sympy(self._equation()).parse(), code)
+
+        ParserCache._memory_cache.clear()
+        eq = self._no_sympy(self._equation())
+        self.assertEqual(eq.parse(), code)
+        self.assertEqual(eq._dependencies, dependencies)
+        self.assertIn(key, ParserCache._memory_cache)
+
+    def test_invalidation(self):
+        """
+        The key changes with the equation, the numerical method, the floating precision and the sources of the parser.
+        """
+        key = self._equation()._cache_key()
+        self.assertNotEqual(self._equation('tau * dr/dt + r = 2 * baseline')._cache_key(), key)
+        self.assertNotEqual(self._equation(method='exponential')._cache_key(), key)
+
+        precision = Global.config['precision']
+        try:
+            Global.config['precision'] = 'float' if precision == 'double' else 'double'
+            self.assertNotEqual(self._equation()._cache_key(), key)
+        finally:
+            Global.config['precision'] = precision
+        self.assertEqual(self._equation()._cache_key(), key)
+
+        source_hash = ParserCache._sources()
+        try:
+            ParserCache._source_hash = 'modified parser'
+            self.assertNotEqual(self._equation()._cache_key(), key)
+        finally:
+            ParserCache._source_hash = source_hash
+        self.assertEqual(self._equation()._cache_key(), key)
+
+    def test_corrupted(self):
+        """
+        An unreadable file on the disk is ignored and replaced by a new analysis.
+        """
+        code = self._equation().parse()
+        key = self._equation()._cache_key()
+        with open(ParserCache._cache_dir + '/' + key, 'wb') as wfile:
+            wfile.write(b'truncated')
+
+        ParserCache._memory_cache.clear()
+        self.assertIsNone(ParserCache.load(key))
+        self.assertEqual(self._equation().parse(), code)
+        ParserCache._memory_cache.clear()
+        self.assertEqual(ParserCache.load(key)[0], code)
+
+    def test_configuration(self):
+        """
+        The disk cache follows the cache section of the user configuration, it is kept in memory otherwise.
+        """
+        load_user_config = Global._load_user_config
+        try:
+            Global._load_user_config = lambda: {'cache': {'path': '/tmp/annarchy_cache'}}
+            ParserCache._cache_dir = None
+            self.assertEqual(ParserCache._directory(), '/tmp/annarchy_cache/parser')
+
+            Global._load_user_config = lambda: {'cache': {'enabled': False}}
+            ParserCache._cache_dir = None
+            self.assertFalse(ParserCache._directory())
+        finally:
+            Global._load_user_config = load_user_config
+
+        code = self._equation().parse()
+        self.assertEqual(self._no_sympy(self._equation()).parse(), code)
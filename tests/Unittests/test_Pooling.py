@@ -0,0 +1,101 @@
+"""
+
+    test_Pooling.py
+
+    This file is part of ANNarchy.
+
+    Copyright (C) 2013-2016 Joseph Gussev <joseph.gussev@s2012.tu-chemnitz.de>,
+    Helge Uelo Dinkelbach <helge.dinkelbach@gmail.com>
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    ANNarchy is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+import unittest
+import numpy
+
+from ANNarchy import *
+from ANNarchy.extensions.convolution import Pooling
+
+def _pool(rates, operation, extent, stride, shape):
+    "Reference implementation of the pooling, the areas being cut by the end of the population."
+    res = numpy.zeros(shape)
+    for idx in numpy.ndindex(*shape):
+        area = rates[tuple(slice(idx[d]*stride[d], idx[d]*stride[d] + extent[d]) for d in range(len(shape)))]
+        if operation == 'max':
+            res[idx] = area.max()
+        elif operation == 'min':
+            res[idx] = area.min()
+        elif operation == 'sum':
+            res[idx] = area.sum()
+        else:
+            res[idx] = area.sum() / float(numpy.prod(extent))
+    return res
+
+neuron = Neuron(equations="r = sum(exc)")
+
+inp = Population((12, 10), Neuron(parameters="r = 0.0"))
+out_max = Population((6, 5), neuron)
+out_mean = Population((6, 5), neuron)
+out_overlap_max = Population((4, 3), neuron)
+out_overlap_sum = Population((4, 3), neuron)
+out_direct = Population((4, 3), neuron)
+
+proj_max = Pooling(inp, out_max, 'exc', operation='max', engine='separable')
+proj_mean = Pooling(inp, out_mean, 'exc', operation='mean', engine='separable')
+proj_overlap_max = Pooling(inp, out_overlap_max, 'exc', operation='max', extent=(5, 4), stride=(3, 4), engine='separable')
+proj_overlap_sum = Pooling(inp, out_overlap_sum, 'exc', operation='sum', extent=(5, 4), stride=(3, 4), engine='separable')
+proj_direct = Pooling(inp, out_direct, 'exc', operation='min', extent=(5, 4), stride=(3, 4))
+
+class test_Pooling(unittest.TestCase):
+    """
+    Tests the engines of the *Pooling* projection against a reference implementation.
+    """
+    @classmethod
+    def setUpClass(self):
+        """
+        Compile the network for this test
+        """
+        self.test_net = Network()
+        self.test_net.add([inp, out_max, out_mean, out_overlap_max, out_overlap_sum, out_direct, proj_max, proj_mean, proj_overlap_max, proj_overlap_sum, proj_direct])
+        self.test_net.compile(silent=True)
+
+        # negative rates check the initial value of the maximum
+        self.rates = numpy.random.uniform(-1.0, 0.0, (12, 10))
+        self.test_net.get(inp).r = self.rates
+        self.test_net.simulate(1)
+
+    def test_separable_max(self):
+        """
+        Max-pooling on non-overlapping areas deduced from the geometries.
+        """
+        self.assertTrue(numpy.allclose(self.test_net.get(out_max).r, _pool(self.rates, 'max', (2, 2), (2, 2), (6, 5))))
+
+    def test_separable_mean(self):
+        """
+        Mean-pooling on non-overlapping areas.
+        """
+        self.assertTrue(numpy.allclose(self.test_net.get(out_mean).r, _pool(self.rates, 'mean', (2, 2), (2, 2), (6, 5))))
+
+    def test_separable_overlap(self):
+        """
+        Overlapping areas, the last ones being cut by the end of the population, with running maxima and sums.
+        """
+        self.assertTrue(numpy.allclose(self.test_net.get(out_overlap_max).r, _pool(self.rates, 'max', (5, 4), (3, 4), (4, 3))))
+        self.assertTrue(numpy.allclose(self.test_net.get(out_overlap_sum).r, _pool(self.rates, 'sum', (5, 4), (3, 4), (4, 3))))
+
+    def test_direct_stride(self):
+        """
+        The direct loops use the stride too.
+        """
+        self.assertTrue(numpy.allclose(self.test_net.get(out_direct).r, _pool(self.rates, 'min', (5, 4), (3, 4), (4, 3))))
@@ -66,3 +66,25 @@ class test_PopulationView(unittest.TestCase):
         """
         (self.net_pop1[2, 2] + self.net_pop1[3, 3] + self.net_pop1[4, 4]).r = 1.0
         self.assertTrue(numpy.allclose((self.net_pop1[2, 2] + self.net_pop1[3, 3] + self.net_pop1[4, 4]).r, [1.0, 1.0, 1.0]))
+
+    def test_set_array(self):
+        """
+        Tests the setting of *r* with an array of the size of the view, the other neurons being unchanged.
+        """
+        view = self.net_pop1[1:3, :]
+        view.r = numpy.arange(16)
+        res = numpy.zeros((8, 8))
+        res[1:3, :] = numpy.arange(16).reshape((2, 8))
+        self.assertTrue(numpy.allclose(self.net_pop1.r, res))
+        self.assertTrue(numpy.allclose(view.r, numpy.arange(16)))
+
+    def test_set_list_parameter(self):
+        """
+        Tests the setting of the parameter *tau* with a list using *set()*.
+        """
+        view = self.net_pop1[5, 1] + self.net_pop1[0, 7]
+        values = [5.0 if rk == self.net_pop1.rank_from_coordinates((5, 1)) else 2.0 for rk in view.ranks]
+        view.set({'tau': values})
+        self.assertTrue(numpy.allclose(view.tau, values))
+        self.assertEqual(self.net_pop1.neuron(5, 1).tau, 5.0)
+        self.assertEqual(self.net_pop1.neuron(0, 0).tau, 10.0)
@@ -0,0 +1,125 @@
+"""
+
+    test_Profiler.py
+
+    This file is part of ANNarchy.
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    ANNarchy is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+import os
+import tempfile
+import unittest
+import numpy
+
+from ANNarchy import *
+import ANNarchy.core.Global as Global
+
+class test_Profiler(unittest.TestCase):
+    """
+    Tests the statistics of the profiler (*get_profile()*, *reset_profile()*
+    and *enable_profiling()*) of a network compiled with profiling.
+    """
+    @classmethod
+    def setUpClass(self):
+        """
+        Compile the network for this test
+        """
+        neuron = Neuron(
+            parameters="tau = 10.0",
+            equations="tau * dr/dt + r = sum(exc) + mean(r)"
+        )
+        pop = Population(10, neuron, name='profiled')
+        proj = Projection(pop, pop, 'exc').connect_all_to_all(0.1)
+
+        # profiling is a global setting, it is restored in tearDownClass()
+        self.profiling = Global.config['profiling'], Global.config['profile_out']
+        Global.config['profiling'] = True
+        Global.config['profile_out'] = os.path.join(tempfile.mkdtemp(), 'profile.xml')
+
+        self.test_net = Network()
+        self.test_net.add([pop, proj])
+        self.test_net.compile(silent=True)
+
+        self.proj_name = self.test_net.get(proj).name
+
+    @classmethod
+    def tearDownClass(self):
+        """
+        The following networks are compiled without profiling.
+        """
+        Global.config['profiling'], Global.config['profile_out'] = self.profiling
+
+    def setUp(self):
+        """
+        In our *setUp()* function we clear the measurements and enable the profiler.
+        """
+        reset_profile(net_id=self.test_net.id)
+        enable_profiling(True, net_id=self.test_net.id)
+
+    def _count(self, profile, name, function):
+        "Number of measurements of an object for one phase."
+        for idx in range(len(profile['name'])):
+            if profile['name'][idx] == name and profile['function'][idx] == function:
+                return profile['count'][idx]
+        self.fail('no measurement of ' + function + ' for ' + name)
+
+    def test_keys(self):
+        """
+        Tests the columns returned by *get_profile()*.
+        """
+        profile = get_profile(net_id=self.test_net.id)
+        self.assertEqual(set(profile.keys()), set(['type', 'name', 'function', 'label', 'count', 'mean', 'std', 'min', 'max', 'total', 'histogram']))
+        for key in profile.keys():
+            self.assertEqual(len(profile[key]), len(profile['name']))
+        self.assertTrue(set(profile['type']) <= set(['net', 'pop', 'proj']))
+
+    def test_counts(self):
+        """
+        Tests that each phase is measured once per simulation step.
+        """
+        self.test_net.simulate(10.0)
+        profile = get_profile(net_id=self.test_net.id)
+        self.assertEqual(self._count(profile, 'network', 'step'), 10)
+        self.assertEqual(self._count(profile, 'profiled', 'step'), 10)
+        self.assertEqual(self._count(profile, 'profiled', 'gops'), 10)
+        self.assertEqual(self._count(profile, self.proj_name, 'psp'), 10)
+
+        # the histograms contain all measurements
+        for count, histogram in zip(profile['count'], profile['histogram']):
+            self.assertEqual(len(histogram), 32)
+            self.assertEqual(histogram.sum(), count)
+        self.assertTrue(numpy.allclose(profile['total'], profile['mean'] * profile['count']))
+
+    def test_disable(self):
+        """
+        Tests that no measurement is made while the profiler is disabled.
+        """
+        self.test_net.simulate(5.0)
+        enable_profiling(False, net_id=self.test_net.id)
+        self.test_net.simulate(5.0)
+        profile = get_profile(net_id=self.test_net.id)
+        self.assertEqual(self._count(profile, 'network', 'step'), 5)
+
+    def test_reset(self):
+        """
+        Tests that *reset_profile()* clears all measurements.
+        """
+        self.test_net.simulate(5.0)
+        reset_profile(net_id=self.test_net.id)
+        profile = get_profile(net_id=self.test_net.id)
+        self.assertTrue(numpy.all(profile['count'] == 0))
+        self.assertTrue(numpy.all(profile['total'] == 0.0))
+        for histogram in profile['histogram']:
+            self.assertEqual(histogram.sum(), 0)
@@ -58,6 +58,9 @@ proj = Projection(
 
 proj.connect_all_to_all(weights = 1.0)
 
+# single weight and no synapse
+proj_empty = Projection(pop1, pop2, "exc").connect_fixed_probability(0.0, 1.0)
+
 class test_Projection(unittest.TestCase):
     """
     Tests the functionality of the *Projection* object. We test:
@@ -72,10 +75,11 @@ class test_Projection(unittest.TestCase):
         Compile the network for this test
         """
         self.test_net = Network()
-        self.test_net.add([pop1, pop2, proj])
+        self.test_net.add([pop1, pop2, proj, proj_empty])
         self.test_net.compile(silent=True)
 
         self.net_proj = self.test_net.get(proj)
+        self.net_proj_empty = self.test_net.get(proj_empty)
 
     def setUp(self):
         """
@@ -118,3 +122,74 @@ class test_Projection(unittest.TestCase):
         Tests the *post_ranks* method, which returns the ranks of post-synaptic neurons recieving synapses.
         """
         self.assertEqual(self.net_proj.post_ranks, list(range(64)))
+
+    def test_get_flat(self):
+        """
+        Tests the access to all weights as a single array with the *get()* method.
+        """
+        self.net_proj.w = 1.0
+        w = self.net_proj.get('w', flat=True)
+        self.assertEqual(w.shape, (64*64,))
+        self.assertTrue(numpy.allclose(w, 1.0))
+
+    def test_set_flat(self):
+        """
+        Tests the assignment of one value per synapse with the *set()* method. The values are stored dendrite after dendrite.
+        """
+        values = numpy.arange(64*64, dtype=float)
+        self.net_proj.set({'w': values}, flat=True)
+        self.assertTrue(numpy.allclose(self.net_proj.get('w', flat=True), values))
+        self.assertTrue(numpy.allclose(self.net_proj.dendrite(3).w, values[3*64:4*64]))
+
+    def test_set_flat_size(self):
+        """
+        Tests that a flat array must have one value per synapse.
+        """
+        from ANNarchy.core.Global import ANNarchyException
+        with self.assertRaises(ANNarchyException):
+            self.net_proj.set({'w': numpy.zeros(10)}, flat=True)
+
+    def test_set_flat_empty(self):
+        """
+        Tests that an empty flat array can be assigned to a projection with a single weight and no synapse.
+        """
+        self.assertEqual(self.net_proj_empty.get('w', flat=True).shape, (0,))
+        self.net_proj_empty.set({'w': numpy.array([])}, flat=True)
+        self.assertEqual(self.net_proj_empty.get('w', flat=True).shape, (0,))
+
+    def test_fill(self):
+        """
+        Tests the assignment of a single value and of a random distribution to all synapses.
+        """
+        self.net_proj.w = 0.5
+        self.assertTrue(numpy.allclose(self.net_proj.get('w', flat=True), 0.5))
+        self.net_proj.w = Uniform(2.0, 3.0)
+        w = self.net_proj.get('w', flat=True)
+        self.assertTrue(numpy.all(w >= 2.0) and numpy.all(w <= 3.0))
+        self.assertTrue(numpy.allclose(self.net_proj.dendrite(5).w, w[5*64:6*64]))
+
+    def test_to_sparse(self):
+        """
+        Tests the export of the weights as a scipy sparse matrix.
+        """
+        values = numpy.arange(64*64, dtype=float)
+        self.net_proj.set({'w': values}, flat=True)
+        csr = self.net_proj.to_sparse()
+        self.assertEqual(csr.shape, (64, 64))
+        self.assertEqual(csr.nnz, 64*64)
+        self.assertTrue(numpy.allclose(csr.toarray(), values.reshape((64, 64))))
+        coo = self.net_proj.to_sparse(format='coo')
+        self.assertTrue(numpy.allclose(coo.toarray(), csr.toarray()))
+        self.assertTrue(numpy.allclose(self.net_proj.connectivity_matrix(), csr.toarray()))
+
+    def test_receptive_fields(self):
+        """
+        Tests the tiling of the receptive fields in the geometry of the post-synaptic population.
+        """
+        values = numpy.arange(64*64, dtype=float)
+        self.net_proj.set({'w': values}, flat=True)
+        rf = self.net_proj.receptive_fields()
+        self.assertEqual(rf.shape, (64, 64))
+        # post-synaptic neuron (0, 1) has the rank 1
+        self.assertTrue(numpy.allclose(rf[0:8, 8:16], values[64:128].reshape((8, 8))))
+        self.assertTrue(numpy.allclose(rf[0:8, 8:16], self.net_proj.dendrite(1).receptive_field()))
@@ -207,3 +207,150 @@ class test_Record(unittest.TestCase):
         self.test_net.simulate(10)
         datas = self.test_net.get(s).get('spike')
         self.assertEqual(datas[1], [2, 7])
+
+class test_RecordReduce(unittest.TestCase):
+    """
+    This class tests the reduction of the recorded values over the neurons
+    (mean, histogram, quantiles, spike count...) performed during the simulation.
+    """
+    @classmethod
+    def setUpClass(self):
+        """
+        Compile the network for this test
+        """
+        lin_neuron = Neuron(
+            parameters="b = 0.0",
+            equations="r = b + t"
+        )
+        pop_lin = Population(5, lin_neuron)
+        pop_lin.b = [0.0, 1.0, 2.0, 3.0, 4.0]
+        pop_spike = Population(3, neuron2)
+        pop_rand = Population(20, lin_neuron)
+        self.values = numpy.random.permutation(numpy.linspace(0.0, 19.0, 20)**2)
+        pop_rand.b = self.values
+
+        self.m_mean = Monitor(pop_lin, 'r', reduce='mean')
+        self.m_std = Monitor(pop_lin, 'r', reduce='std')
+        self.m_hist = Monitor(pop_lin, 'r', reduce='hist(2, 0.0, 4.0)')
+        self.m_quant = Monitor(pop_lin[1:4], 'r', reduce='quantiles(0.0, 0.5, 1.0)')
+        self.m_count = Monitor(pop_spike, 'spike', reduce='count')
+        self.m_interp = Monitor(pop_rand, 'r', reduce='quantiles(0.9, 0.1, 0.5, 0.35, 0.5)')
+        self.m_count_view = Monitor(pop_spike[1:], 'spike', reduce='count')
+
+        self.test_net = Network()
+        self.test_net.add([pop_lin, pop_spike, pop_rand, self.m_mean, self.m_std, self.m_hist, self.m_quant, self.m_count, self.m_interp, self.m_count_view])
+        self.test_net.compile(silent=True)
+
+    def setUp(self):
+        """
+        In our *setUp()* function we call *reset()* to reset the network.
+        """
+        self.test_net.reset()
+
+    def tearDown(self):
+        """
+        Since all tests are independent, after every test we use the *get()* method for every monitor to clear all recordings.
+        """
+        for mon in [self.m_mean, self.m_std, self.m_hist, self.m_quant, self.m_count, self.m_interp, self.m_count_view]:
+            self.test_net.get(mon).get()
+
+    def test_reductions(self):
+        """
+        Tests the mean, standard deviation, histogram and quantiles over the recorded neurons.
+        """
+        self.test_net.simulate(3)
+        self.assertTrue(numpy.allclose(self.test_net.get(self.m_mean).get('r'), [2.0, 3.0, 4.0]))
+        self.assertTrue(numpy.allclose(self.test_net.get(self.m_std).get('r'), numpy.std([0.0, 1.0, 2.0, 3.0, 4.0]) * numpy.ones(3)))
+        self.assertTrue(numpy.allclose(self.test_net.get(self.m_hist).get('r'), [[2, 3], [1, 3], [0, 3]]))
+        self.assertTrue(numpy.allclose(self.test_net.get(self.m_quant).get('r'), [[1., 2., 3.], [2., 3., 4.], [3., 4., 5.]]))
+
+    def test_quantiles(self):
+        """
+        Tests unsorted and interpolated quantiles against numpy.percentile.
+        """
+        self.test_net.simulate(1)
+        expected = numpy.percentile(self.values, [90., 10., 50., 35., 50.])
+        self.assertTrue(numpy.allclose(self.test_net.get(self.m_interp).get('r'), [expected]))
+
+    def test_spike_count(self):
+        """
+        Tests the number of spikes emitted at each step.
+        """
+        self.test_net.simulate(10)
+        self.assertTrue(numpy.allclose(self.test_net.get(self.m_count).get('spike'), [0, 0, 0, 0, 3, 0, 3, 0, 3, 0]))
+        self.assertTrue(numpy.allclose(self.test_net.get(self.m_count_view).get('spike'), [0, 0, 0, 0, 2, 0, 2, 0, 2, 0]))
+
+    def test_invalid_reduction(self):
+        """
+        Tests the errors raised by unknown or incomplete reductions.
+        """
+        from ANNarchy.core.Global import ANNarchyException
+        with self.assertRaises(ANNarchyException):
+            Monitor(pop1, 'r', reduce='median', net_id=self.test_net.id)
+        with self.assertRaises(ANNarchyException):
+            Monitor(pop1, 'r', reduce='hist(10)', net_id=self.test_net.id)
+
+class test_RecordWindow(unittest.TestCase):
+    """
+    This class tests the recording of the last milliseconds only, using
+    a circular buffer.
+    """
+    @classmethod
+    def setUpClass(self):
+        """
+        Compile the network for this test
+        """
+        lin_neuron = Neuron(
+            parameters="b = 0.0",
+            equations="r = b + t"
+        )
+        pop_lin = Population(3, lin_neuron)
+        pop_lin.b = [0.0, 10.0, 20.0]
+
+        self.m_window = Monitor(pop_lin, 'r', window=3.0)
+        self.m_period = Monitor(pop_lin[1:], 'r', window=4.0, period=2.0)
+
+        self.test_net = Network()
+        self.test_net.add([pop_lin, self.m_window, self.m_period])
+        self.test_net.compile(silent=True)
+
+    def setUp(self):
+        """
+        In our *setUp()* function we call *reset()* to reset the network.
+        """
+        self.test_net.reset()
+
+    def tearDown(self):
+        """
+        Since all tests are independent, after every test we use the *get()* method for every monitor to clear all recordings.
+        """
+        self.test_net.get(self.m_window).get()
+        self.test_net.get(self.m_period).get()
+
+    def test_window(self):
+        """
+        Tests if only the last recordings are returned in chronological order.
+        """
+        self.test_net.simulate(2)
+        self.assertTrue(numpy.allclose(self.test_net.get(self.m_window).get('r', keep=True), [[0., 10., 20.], [1., 11., 21.]]))
+        self.test_net.simulate(5)
+        self.assertTrue(numpy.allclose(self.test_net.get(self.m_window).get('r', keep=True), [[4., 14., 24.], [5., 15., 25.], [6., 16., 26.]]))
+        self.assertTrue(numpy.allclose(self.test_net.get(self.m_period).get('r'), [[14., 24.], [16., 26.]]))
+
+    def test_clear(self):
+        """
+        Tests if get() without keep empties the window.
+        """
+        self.test_net.simulate(5)
+        self.assertEqual(self.test_net.get(self.m_window).get('r').shape, (3, 3))
+        self.assertEqual(self.test_net.get(self.m_window).get('r').shape, (0, 3))
+
+    def test_keep(self):
+        """
+        Tests if the recordings returned with keep=True are not modified by the next simulation.
+        """
+        self.test_net.simulate(3)
+        r = self.test_net.get(self.m_window).get('r', keep=True)
+        self.test_net.simulate(2)
+        self.assertTrue(numpy.allclose(r, [[0., 10., 20.], [1., 11., 21.], [2., 12., 22.]]))
+        self.assertTrue(r.flags['OWNDATA'])
@@ -0,0 +1,204 @@
+"""
+
+    test_Schedule.py
+
+    This file is part of ANNarchy.
+
+    Copyright (C) 2013-2016 Joseph Gussev <joseph.gussev@s2012.tu-chemnitz.de>,
+    Helge Uelo Dinkelbach <helge.dinkelbach@gmail.com>
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    ANNarchy is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+import unittest
+import numpy
+
+from ANNarchy import *
+
+Input = Neuron(
+    parameters = "r = 1.0"
+)
+
+Output = Neuron(
+    parameters = """
+        I = 0.0
+        g = 0.0 : population
+    """,
+    equations = "r = I + g + sum(exc)"
+)
+
+Scaled = Synapse(
+    parameters = "a = 0.0",
+    psp = "a * pre.r"
+)
+
+Gated = Neuron(
+    parameters = """
+        gate = True : population, bool
+        mask = True : bool
+    """,
+    equations = "r = if gate and mask: 1.0 + sum(exc) else: 0.0"
+)
+
+Switched = Synapse(
+    parameters = "on = True : bool",
+    psp = "if on: w * pre.r else: 0.0"
+)
+
+class test_Schedule(unittest.TestCase):
+    """
+    Tests the input schedules of population and projection attributes (*schedule()*), applied at the beginning of each step.
+    """
+    @classmethod
+    def setUpClass(self):
+        """
+        Compile the network for this test.
+        """
+        inp = Population(2, Input)
+        pop = Population(3, Output)
+        pop.schedule('I', times=[10.0, 20.0], values=[1.0, [1.0, 2.0, 3.0]])
+        pop.schedule('g', times=[20.0], values=[10.0])
+
+        proj = Projection(inp, pop, 'exc', Scaled)
+        proj.connect_all_to_all(weights=1.0)
+        proj.schedule('a', times=[30.0, 40.0], values=[0.5, 0.0])
+
+        self.test_net = Network()
+        self.test_net.add([inp, pop, proj])
+        self.test_net.compile(silent=True)
+
+        self.pop = self.test_net.get(pop)
+        self.proj = self.test_net.get(proj)
+
+    def setUp(self):
+        """
+        Automatically called before each test method, basically to reset the network after every test.
+        """
+        self.test_net.reset(populations=True, projections=True)
+
+    def test_population(self):
+        """
+        Local and global attributes take their scheduled values at the given times.
+        """
+        self.test_net.simulate(10.0)
+        self.assertTrue(numpy.allclose(self.pop.r, 0.0))
+        self.test_net.simulate(1.0)
+        self.assertTrue(numpy.allclose(self.pop.I, 1.0))
+        self.assertTrue(numpy.allclose(self.pop.r, 1.0))
+        self.test_net.simulate(10.0)
+        self.assertEqual(self.pop.g, 10.0)
+        self.assertTrue(numpy.allclose(self.pop.r, [11.0, 12.0, 13.0]))
+
+    def test_projection(self):
+        """
+        A local synaptic attribute receives the scheduled value in all synapses.
+        """
+        self.test_net.simulate(31.0)
+        self.assertTrue(numpy.allclose(self.proj.a, 0.5))
+        self.assertTrue(numpy.allclose(self.pop.r, [12.0, 13.0, 14.0]))
+        self.test_net.simulate(10.0)
+        self.assertTrue(numpy.allclose(self.proj.a, 0.0))
+
+    def test_reset(self):
+        """
+        The schedule is applied again when the time is set back to 0.
+        """
+        self.test_net.simulate(21.0)
+        self.test_net.reset()
+        self.test_net.simulate(11.0)
+        self.assertTrue(numpy.allclose(self.pop.r, 1.0))
+
+    def test_replace(self):
+        """
+        After compile(), the schedule can be replaced from the current time.
+        """
+        self.test_net.simulate(10.0)
+        self.pop.schedule('I', times=[5.0, 15.0], values=[5.0, 6.0])
+        self.test_net.simulate(10.0)
+        self.assertTrue(numpy.allclose(self.pop.r, 6.0))
+
+        # Restore the schedule of the other tests
+        self.pop.schedule('I', times=[10.0, 20.0], values=[1.0, [1.0, 2.0, 3.0]])
+
+    def test_set_time(self):
+        """
+        When the time is set backwards, the last value scheduled up to the new time is applied again.
+        """
+        self.test_net.simulate(21.0)
+        self.assertTrue(numpy.allclose(self.pop.I, [1.0, 2.0, 3.0]))
+        self.test_net.set_time(15.0)
+        self.test_net.simulate(1.0)
+        self.assertTrue(numpy.allclose(self.pop.I, 1.0))
+        self.test_net.simulate(5.0)
+        self.assertTrue(numpy.allclose(self.pop.I, [1.0, 2.0, 3.0]))
+
+    def test_not_scheduled(self):
+        """
+        The code of a schedule is generated by compile().
+        """
+        with self.assertRaises(ANNarchyException):
+            self.pop.schedule('r', times=[1.0], values=[1.0])
+
+class test_ScheduleBool(unittest.TestCase):
+    """
+    Tests the schedules of boolean attributes, whose values are stored in packed vectors (std::vector<bool>) by the C++ core.
+    """
+    @classmethod
+    def setUpClass(self):
+        """
+        Compile the network for this test.
+        """
+        inp = Population(2, Input)
+        pop = Population(3, Gated)
+        pop.schedule('gate', times=[20.0, 30.0], values=[False, True])
+        pop.schedule('mask', times=[10.0], values=[[True, False, True]])
+
+        proj = Projection(inp, pop, 'exc', Switched)
+        proj.connect_all_to_all(weights=1.0)
+        proj.schedule('on', times=[40.0], values=[False])
+
+        self.test_net = Network()
+        self.test_net.add([inp, pop, proj])
+        self.test_net.compile(silent=True)
+
+        self.pop = self.test_net.get(pop)
+        self.proj = self.test_net.get(proj)
+
+    def setUp(self):
+        """
+        Automatically called before each test method, basically to reset the network after every test.
+        """
+        self.test_net.reset(populations=True, projections=True)
+
+    def test_global(self):
+        """
+        A global boolean attribute of a population takes its scheduled values.
+        """
+        self.test_net.simulate(21.0)
+        self.assertFalse(self.pop.gate)
+        self.assertTrue(numpy.allclose(self.pop.r, 0.0))
+        self.test_net.simulate(10.0)
+        self.assertTrue(self.pop.gate)
+
+    def test_local(self):
+        """
+        Local boolean attributes of populations and projections take their scheduled values.
+        """
+        self.test_net.simulate(11.0)
+        self.assertTrue(numpy.array_equal(self.pop.mask, [True, False, True]))
+        self.assertTrue(numpy.allclose(self.pop.r, [3.0, 0.0, 3.0]))
+        self.test_net.simulate(30.0)
+        for dendrite in self.proj.on:
+            self.assertFalse(any(dendrite))
+        self.assertTrue(numpy.allclose(self.pop.r, [1.0, 0.0, 1.0]))
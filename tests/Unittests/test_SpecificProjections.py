@@ -23,7 +23,7 @@
 import unittest
 from math import sin
 
-from ANNarchy import Population, Neuron, Network, CurrentInjection, Monitor, np, setup
+from ANNarchy import Population, Neuron, Network, CurrentInjection, DecodingProjection, Monitor, np, setup
 
 class test_CurrentInjection(unittest.TestCase):
     """
@@ -78,4 +78,47 @@ class test_CurrentInjection(unittest.TestCase):
 
         self.assertTrue(np.allclose( rec_data, target))
 
+class test_DecodingProjection(unittest.TestCase):
+    """
+    Test the sliding window of the specialized projection 'DecodingProjection'
+    and of compute_firing_rate() with regularly spiking neurons.
+    """
+    @classmethod
+    def setUpClass(self):
+        """
+        Compile the network for this test. The neurons spike every 4 steps,
+        i.e. at 250 Hz.
+        """
+        Regular = Neuron(
+            equations="v = v + 1",
+            spike="v >= 4",
+            reset="v = 0"
+        )
+
+        inp = Population(10, neuron=Regular)
+        out = Population(1, neuron=Neuron(equations="r=sum(exc)"))
 
+        proj = DecodingProjection(inp, out, 'exc', window=20.0)
+        proj.connect_all_to_all(1.0, force_multiple_weights=True)
+
+        self.test_net = Network()
+        self.test_net.add([inp, out, proj])
+        self.test_net.compile(silent=True)
+
+        self.input = self.test_net.get(inp)
+        self.input.compute_firing_rate(20.0)
+        self.output = self.test_net.get(out)
+
+    def test_firing_rate(self):
+        """
+        After the first window, the windowed spike counts give exactly 250 Hz.
+        """
+        self.test_net.simulate(100)
+        self.assertTrue(np.allclose(self.input.r, 250.0))
+
+    def test_decoding(self):
+        """
+        The decoded rate is averaged over the window and the pre-synaptic neurons.
+        """
+        self.test_net.simulate(100)
+        self.assertTrue(np.allclose(self.output.r, 250.0))
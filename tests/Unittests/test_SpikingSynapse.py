@@ -131,3 +131,120 @@ class test_PostSpike(unittest.TestCase):
         # w should not increase further
         self.test_net.simulate(5)
         self.assertTrue(numpy.allclose(self.test_proj.dendrite(0).w, [10.0, 10.0]))
+
+class test_NeuronTraces(unittest.TestCase):
+    """
+    This class tests the event-driven traces which only depend on the
+    pre- or post-synaptic spikes and are therefore stored once per neuron.
+    """
+    @classmethod
+    def setUpClass(self):
+        # nearest-neighbour STDP with additive updates
+        TraceSynapse = Synapse(
+            parameters="""
+                tau_plus = 20.0 : projection
+                tau_minus = 20.0 : projection
+                A_plus = 0.1 : projection
+                A_minus = 0.1 : projection
+            """,
+            equations="""
+                tau_plus  * dx/dt = -x : event-driven
+                tau_minus * dy/dt = -y : event-driven
+            """,
+            pre_spike="""
+                g_target += w
+                x += A_plus
+                w += y + x
+            """,
+            post_spike="""
+                y -= A_minus
+                w += x
+            """
+        )
+        # pre-synaptic spike 20 ms before the post-synaptic one
+        pre_ltp = SpikeSourceArray(spike_times=[[10.0]])
+        post_ltp = SpikeSourceArray(spike_times=[[30.0]])
+        proj_ltp = Projection(pre_ltp, post_ltp, "exc", synapse=TraceSynapse).connect_all_to_all(0.0)
+
+        # post-synaptic spike 20 ms before the pre-synaptic one
+        pre_ltd = SpikeSourceArray(spike_times=[[30.0]])
+        post_ltd = SpikeSourceArray(spike_times=[[10.0]])
+        proj_ltd = Projection(pre_ltd, post_ltd, "exc", synapse=TraceSynapse).connect_all_to_all(0.0)
+
+        # the same rule with local parameters keeps all its variables per synapse
+        LocalSynapse = Synapse(
+            parameters="""
+                tau_plus = 20.0
+                tau_minus = 20.0
+                A_plus = 0.1
+                A_minus = 0.1
+            """,
+            equations="""
+                tau_plus  * dx/dt = -x : event-driven
+                tau_minus * dy/dt = -y : event-driven
+            """,
+            pre_spike="""
+                g_target += w
+                x += A_plus
+                w += y + x
+            """,
+            post_spike="""
+                y -= A_minus
+                w += x
+            """
+        )
+        patterns = [
+            ([10.0], [11.0]), ([10.0, 30.0], [20.0]), ([20.0], [10.0, 30.0]),
+            ([5.0, 12.0, 40.0], [12.0, 13.0, 41.0])
+        ]
+        objects = [pre_ltp, post_ltp, proj_ltp, pre_ltd, post_ltd, proj_ltd]
+        pairs = []
+        for pre_times, post_times in patterns:
+            pair = []
+            for synapse in [TraceSynapse, LocalSynapse]:
+                pre = SpikeSourceArray(spike_times=[pre_times])
+                post = SpikeSourceArray(spike_times=[post_times])
+                proj = Projection(pre, post, "exc", synapse=synapse).connect_all_to_all(0.0)
+                objects += [pre, post, proj]
+                pair.append(proj)
+            pairs.append(pair)
+
+        self.test_net = Network()
+        self.test_net.add(objects)
+        self.test_net.compile(silent=True)
+
+        self.test_ltp = self.test_net.get(proj_ltp)
+        self.test_ltd = self.test_net.get(proj_ltd)
+        self.test_pairs = [(self.test_net.get(a), self.test_net.get(b)) for a, b in pairs]
+
+    def setUp(self):
+        """
+        In our *setUp()* method we call *reset()* to reset the network. The weights are not reset by *reset()*.
+        """
+        self.test_net.reset(populations=True, projections=True)
+        for proj in [self.test_ltp, self.test_ltd] + [proj for pair in self.test_pairs for proj in pair]:
+            proj.w = 0.0
+
+    def test_traces(self):
+        """
+        Test if only the pre-synaptic trace is stored per neuron.
+        """
+        self.assertEqual(self.test_ltp.synapse_type.description['traces'], {'x': 'pre'})
+        self.assertEqual(self.test_pairs[0][1].synapse_type.description['traces'], {})
+
+    def test_w(self):
+        """
+        Test if the weight change corresponds to the exponential decay of the traces.
+        The pre-synaptic spikes are processed one step after their emission.
+        """
+        self.test_net.simulate(50)
+        self.assertTrue(numpy.allclose(self.test_ltp.dendrite(0).w, [0.1 + 0.1 * numpy.exp(-19.0/20.0)]))
+        self.assertTrue(numpy.allclose(self.test_ltd.dendrite(0).w, [0.1 - 0.1 * numpy.exp(-1.0)]))
+
+    def test_per_synapse(self):
+        """
+        Test if the traces stored per neuron lead to the same weights as the traces stored per synapse.
+        """
+        self.test_net.simulate(50)
+        for neuron, synapse in self.test_pairs:
+            self.assertTrue(numpy.allclose(neuron.dendrite(0).w, synapse.dendrite(0).w))
@@ -0,0 +1,189 @@
+"""
+
+    test_State.py
+
+    This file is part of ANNarchy.
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    ANNarchy is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+import os
+import tempfile
+import unittest
+import numpy
+
+from ANNarchy import *
+
+class test_State(unittest.TestCase):
+    """
+    Tests the checkpointing with *save_state()* and *load_state()*: a
+    restored simulation must be bit-exact, including random numbers,
+    delayed variables, spike history and event-driven variables.
+    """
+    @classmethod
+    def setUpClass(self):
+        """
+        Compile the network for this test
+        """
+        rate_neuron = Neuron(
+            equations="""
+                tau * dr/dt + r = sum(exc) + Normal(0.0, 0.1)
+            """,
+            parameters="tau = 10.0"
+        )
+
+        spike_neuron = Neuron(
+            parameters="I = 15.0",
+            equations="""
+                dv/dt = 0.04*v*v + 5*v + 140 - u + I + Uniform(-5.0, 5.0) + g_exc
+                du/dt = 0.02*(0.2*v - u)
+            """,
+            spike="v >= 30.0",
+            reset="v = -65.0; u += 8.0",
+            refractory=2.0
+        )
+
+        stdp = Synapse(
+            parameters="tau = 20.0",
+            equations="""
+                tau * dx/dt = -x : event-driven
+                tau * dy/dt = -y : event-driven
+            """,
+            pre_spike="g_target += w; x += 0.01; w = clip(w - y, 0.0, 1.0)",
+            post_spike="y += 0.01; w = clip(w + x, 0.0, 1.0)"
+        )
+
+        pop1 = Population(10, rate_neuron)
+        pop2 = Population(20, spike_neuron)
+        pop2.compute_firing_rate(20.0)
+
+        proj1 = Projection(pop1, pop1, 'exc')
+        proj1.connect_fixed_probability(0.5, Uniform(0.0, 0.1), delays=Uniform(1.0, 5.0))
+
+        proj2 = Projection(pop2, pop2, 'exc', stdp)
+        proj2.connect_fixed_probability(0.5, Uniform(0.0, 0.5), delays=2.0)
+
+        self.test_net = Network()
+        self.test_net.add([pop1, pop2, proj1, proj2])
+        self.test_net.compile(silent=True)
+
+        self.net_pop1 = self.test_net.get(pop1)
+        self.net_pop2 = self.test_net.get(pop2)
+        self.net_proj2 = self.test_net.get(proj2)
+
+    def setUp(self):
+        """
+        In our *setUp()* function we reset the network before every test.
+        """
+        self.test_net.reset()
+
+    def _check_restore(self, filename):
+        """
+        Simulates from a checkpoint twice and compares the results.
+        """
+        self.test_net.simulate(100.0)
+        self.test_net.save_state(filename)
+
+        self.test_net.simulate(100.0)
+        r = self.net_pop1.r
+        v = self.net_pop2.v
+        fr = self.net_pop2.r
+        w = self.net_proj2.w
+
+        self.test_net.load_state(filename)
+        self.assertEqual(self.test_net.get_current_step(), 100)
+
+        self.test_net.simulate(100.0)
+        self.assertTrue(numpy.array_equal(self.net_pop1.r, r))
+        self.assertTrue(numpy.array_equal(self.net_pop2.v, v))
+        self.assertTrue(numpy.array_equal(self.net_pop2.r, fr))
+        for w_restored, w_orig in zip(self.net_proj2.w, w):
+            self.assertTrue(numpy.array_equal(w_restored, w_orig))
+
+    def test_restore(self):
+        """
+        Continues a simulation from an uncompressed checkpoint.
+        """
+        self._check_restore(os.path.join(tempfile.mkdtemp(), 'net.state'))
+
+    def test_restore_compressed(self):
+        """
+        Continues a simulation from a gzipped checkpoint.
+        """
+        self._check_restore(os.path.join(tempfile.mkdtemp(), 'net.state.gz'))
+
+class test_StateBool(unittest.TestCase):
+    """
+    Tests the checkpointing of boolean attributes, which are stored in
+    packed vectors (std::vector<bool>) by the C++ core.
+    """
+    @classmethod
+    def setUpClass(self):
+        """
+        Compile the network for this test
+        """
+        neuron = Neuron(
+            parameters="baseline = 0.0",
+            equations="""
+                r = baseline + sum(exc)
+                above = r > 0.5 : bool
+            """
+        )
+
+        synapse = Synapse(
+            parameters="""
+                threshold = 0.5
+                enabled = True : bool
+            """,
+            equations="""
+                strong = pre.r > threshold : bool
+            """,
+            psp="if strong and enabled: w * pre.r else: 0.0"
+        )
+
+        pop = Population(5, neuron)
+        proj = Projection(pop, pop, 'exc', synapse)
+        proj.connect_all_to_all(0.1)
+
+        self.test_net = Network()
+        self.test_net.add([pop, proj])
+        self.test_net.compile(silent=True)
+
+        self.net_pop = self.test_net.get(pop)
+        self.net_proj = self.test_net.get(proj)
+
+    def test_restore(self):
+        """
+        Boolean neural and synaptic attributes are restored by *load_state()*.
+        """
+        self.net_pop.baseline = numpy.linspace(0.0, 1.0, 5)
+        self.net_proj.enabled = [[j % 2 == 0 for j in range(len(dendrite.pre_ranks))] for dendrite in self.net_proj.dendrites]
+        self.test_net.simulate(2.0)
+
+        filename = os.path.join(tempfile.mkdtemp(), 'bool.state')
+        self.test_net.save_state(filename)
+        above = self.net_pop.above
+        strong = self.net_proj.strong
+        enabled = self.net_proj.enabled
+
+        self.net_pop.baseline = 0.0
+        self.net_proj.enabled = False
+        self.test_net.simulate(2.0)
+
+        self.test_net.load_state(filename)
+        self.assertTrue(numpy.array_equal(self.net_pop.above, above))
+        for restored, orig in zip(self.net_proj.strong, strong):
+            self.assertTrue(numpy.array_equal(restored, orig))
+        for restored, orig in zip(self.net_proj.enabled, enabled):
+            self.assertTrue(numpy.array_equal(restored, orig))
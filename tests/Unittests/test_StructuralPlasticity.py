@@ -128,6 +128,157 @@ class test_StructuralPlasticityModelDelay(unittest.TestCase):
         pass
 
 
+class test_StructuralPlasticityCreating(unittest.TestCase):
+    """
+    This class tests the creation of synapses defined by the *creating*
+    argument of the synapse, with and without probability.
+    """
+    @classmethod
+    def setUpClass(self):
+        """
+        Compile the network for this test
+        """
+        neuron = Neuron(parameters="r = 0.0")
+
+        all_synapse = Synapse(
+            equations="",
+            creating="pre.r * post.r > 0.9 : proba = 1.0, w = 0.5"
+        )
+        proba_synapse = Synapse(
+            equations="",
+            creating="pre.r * post.r > 0.9 : proba = 0.2, w = 0.5"
+        )
+        tiny_synapse = Synapse(
+            equations="",
+            creating="pre.r * post.r > 0.9 : proba = 1e-30, w = 0.5"
+        )
+
+        pop1 = Population(10, neuron)
+        pop2 = Population(300, neuron)
+
+        proj = Projection(pop1, pop1, "exc", all_synapse)
+        proj.connect_one_to_one(weights=1.0)
+
+        proj2 = Projection(pop2, pop2, "exc", proba_synapse)
+        proj2.connect_one_to_one(weights=1.0)
+
+        proj3 = Projection(pop2, pop2, "inh", tiny_synapse)
+        proj3.connect_one_to_one(weights=1.0)
+
+        self.test_net = Network()
+        self.test_net.add([pop1, pop2, proj, proj2, proj3])
+        self.test_net.compile(silent=True)
+
+        self.test_pop1 = self.test_net.get(pop1)
+        self.test_pop2 = self.test_net.get(pop2)
+        self.test_proj = self.test_net.get(proj)
+        self.test_proj2 = self.test_net.get(proj2)
+        self.test_proj3 = self.test_net.get(proj3)
+
+    def setUp(self):
+        """
+        In our *setUp()* function we call *reset()* to reset the network.
+        """
+        self.test_net.reset(synapses=True)
+
+    def test_create_all(self):
+        """
+        With a probability of 1, all the pairs fulfilling the condition are
+        connected once, the existing synapses being kept.
+        """
+        self.test_pop1.r = [1.0, 1.0, 1.0, 1.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0]
+        self.test_proj.start_creating()
+        self.test_net.simulate(2)
+        self.test_proj.stop_creating()
+
+        for rk in range(4):
+            self.assertEqual(self.test_proj.dendrite(rk).pre_ranks, [0, 1, 2, 3])
+            self.assertTrue(numpy.allclose(self.test_proj.dendrite(rk).w, [1.0 if r == rk else 0.5 for r in range(4)]))
+        for rk in range(4, 10):
+            self.assertEqual(self.test_proj.dendrite(rk).pre_ranks, [rk])
+
+    def test_create_proba(self):
+        """
+        With a probability of 0.2, about 20% of the eligible pairs are connected.
+        """
+        self.test_pop2.r = numpy.array([1.0] * 200 + [0.0] * 100)
+        self.test_proj2.start_creating()
+        self.test_net.simulate(1)
+        self.test_proj2.stop_creating()
+
+        nb_created = self.test_proj2.nb_synapses - 300
+        self.assertTrue(abs(nb_created - 0.2 * 200 * 199) < 0.05 * 0.2 * 200 * 199)
+        for rk in range(200, 300):
+            self.assertEqual(self.test_proj2.dendrite(rk).pre_ranks, [rk])
+        for rk in range(200):
+            self.assertTrue(max(self.test_proj2.dendrite(rk).pre_ranks) < 200)
+            self.assertEqual(len(set(self.test_proj2.dendrite(rk).pre_ranks)), self.test_proj2.dendrite(rk).size)
+
+    def test_create_tiny_proba(self):
+        """
+        A tiny probability, whose geometric gaps exceed the range of integers, creates no synapse.
+        """
+        self.test_pop2.r = 1.0
+        self.test_proj3.start_creating()
+        self.test_net.simulate(10)
+        self.test_proj3.stop_creating()
+
+        self.assertEqual(self.test_proj3.nb_synapses, 300)
+        for rk in range(300):
+            self.assertEqual(self.test_proj3.dendrite(rk).pre_ranks, [rk])
+
+
+class test_StructuralPlasticityPruning(unittest.TestCase):
+    """
+    This class tests the removal of synapses defined by the *pruning*
+    argument of the synapse.
+    """
+    @classmethod
+    def setUpClass(self):
+        """
+        Compile the network for this test
+        """
+        pruning_synapse = Synapse(
+            parameters="tag = 0.0",
+            equations="",
+            pruning="tag > 0.5 : proba = 1.0"
+        )
+
+        pop1 = Population(20, Neuron(parameters="r = 0.0"))
+
+        proj = Projection(pop1, pop1, "exc", pruning_synapse)
+        proj.connect_all_to_all(weights=Uniform(0.0, 1.0))
+
+        self.test_net = Network()
+        self.test_net.add([pop1, proj])
+        self.test_net.compile(silent=True)
+
+        self.test_proj = self.test_net.get(proj)
+
+    def test_prune_marked(self):
+        """
+        All the marked synapses are removed, including consecutive ones, and the
+        attributes of the remaining synapses are kept.
+        """
+        pre_ranks = []; weights = []
+        for rk in range(20):
+            dendrite = self.test_proj.dendrite(rk)
+            tags = numpy.random.uniform(0.0, 1.0, dendrite.size)
+            dendrite.tag = tags
+            pre_ranks.append(list(numpy.array(dendrite.pre_ranks)[tags <= 0.5]))
+            weights.append(numpy.array(dendrite.w)[tags <= 0.5])
+
+        self.test_proj.start_pruning()
+        self.test_net.simulate(1)
+        self.test_proj.stop_pruning()
+
+        for rk in range(20):
+            dendrite = self.test_proj.dendrite(rk)
+            self.assertEqual(dendrite.pre_ranks, pre_ranks[rk])
+            self.assertTrue(numpy.allclose(dendrite.w, weights[rk]))
+            self.assertTrue(numpy.all(numpy.array(dendrite.tag) <= 0.5))
+
+
 class test_StructuralPlasticityEnvironment(unittest.TestCase):
     """
     This class tests the *Structural Plasticity* feature, which can optinally
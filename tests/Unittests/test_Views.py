@@ -0,0 +1,120 @@
+"""
+
+    test_Views.py
+
+    This file is part of ANNarchy.
+
+    Copyright (C) 2013-2016 Joseph Gussev <joseph.gussev@s2012.tu-chemnitz.de>,
+    Helge Uelo Dinkelbach <helge.dinkelbach@gmail.com>
+
+    This program is free software: you can redistribute it and/or modify
+    it under the terms of the GNU General Public License as published by
+    the Free Software Foundation, either version 3 of the License, or
+    (at your option) any later version.
+
+    ANNarchy is distributed in the hope that it will be useful,
+    but WITHOUT ANY WARRANTY; without even the implied warranty of
+    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+    GNU General Public License for more details.
+
+    You should have received a copy of the GNU General Public License
+    along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+"""
+import unittest
+import numpy
+
+from ANNarchy import *
+
+neuron = Neuron(
+    parameters = """
+        tau = 10.0
+        k = 1 : int
+    """,
+    equations = """
+        tau * dr/dt + r = 1.0
+        spiked = r > 0.5 : bool
+    """
+)
+
+synapse = Synapse(
+    parameters = "eta = 0.1 : postsynaptic",
+    equations = """
+        dw/dt = eta
+        trace = post.r : postsynaptic
+    """
+)
+
+pop1 = Population(5, neuron)
+pop2 = Population((2, 3), neuron)
+
+proj = Projection(pop1, pop2, 'exc', synapse)
+proj.connect_fixed_number_pre(number=2, weights=1.0, force_multiple_weights=True)
+
+class test_Views(unittest.TestCase):
+    """
+    Tests the access without copy to the attributes of populations and projections with *view()*.
+    """
+    @classmethod
+    def setUpClass(self):
+        """
+        Compile the network for this test
+        """
+        self.test_net = Network()
+        self.test_net.add([pop1, pop2, proj])
+        self.test_net.compile(silent=True)
+
+        self.net_pop = self.test_net.get(pop2)
+        self.net_proj = self.test_net.get(proj)
+
+    def setUp(self):
+        """
+        In our *setUp()* function we call *reset()* to reset the network.
+        """
+        self.test_net.reset()
+
+    def test_population_view(self):
+        """
+        The view has the geometry of the population and follows the simulation.
+        """
+        rates = self.net_pop.view('r')
+        self.assertEqual(rates.shape, (2, 3))
+        self.test_net.simulate(5)
+        numpy.testing.assert_allclose(rates, self.net_pop.r)
+        self.assertTrue(numpy.all(rates > 0.0))
+
+    def test_population_read_only(self):
+        """
+        Views are read-only by default, writable views modify the simulation.
+        """
+        with self.assertRaises(ValueError):
+            self.net_pop.view('r')[0, 0] = 1.0
+        self.net_pop.view('r', writable=True)[0, 0] = 2.0
+        self.assertEqual(self.net_pop.r[0, 0], 2.0)
+
+    def test_population_assignment(self):
+        """
+        Assigning the attribute keeps the storage of the view.
+        """
+        rates = self.net_pop.view('r')
+        self.net_pop.r = 3.0
+        numpy.testing.assert_allclose(rates, 3.0)
+        numpy.testing.assert_array_equal(self.test_net.get(pop1).view('k'), [1, 1, 1, 1, 1])
+
+    def test_population_bool(self):
+        """
+        Boolean attributes can not be viewed.
+        """
+        with self.assertRaises(ANNarchyException):
+            self.net_pop.view('spiked')
+
+    def test_projection_views(self):
+        """
+        Local attributes are viewed per dendrite, semiglobal ones as a single array.
+        """
+        weights = self.net_proj.view('w')
+        self.assertEqual(len(weights), 6)
+        self.test_net.simulate(1)
+        for idx, dendrite in enumerate(weights):
+            numpy.testing.assert_allclose(dendrite, self.net_proj.dendrite(self.net_proj.post_ranks[idx]).w)
+        numpy.testing.assert_allclose(self.net_proj.view('trace'), self.net_proj.trace)
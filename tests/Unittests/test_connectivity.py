@@ -23,10 +23,12 @@
     along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 """
+import os
+import tempfile
 import unittest
 import numpy as np
 
-from ANNarchy import Neuron, Population, Projection, Network
+from ANNarchy import Neuron, Population, Projection, Network, Uniform
 
 
 class TestConnectivity(unittest.TestCase):
@@ -52,18 +54,26 @@ class TestConnectivity(unittest.TestCase):
         proj1 = Projection(pre=pop1, post=pop2, target="exc")
         proj2 = Projection(pre=pop1, post=pop2, target="exc")
         proj3 = Projection(pre=pop1, post=pop2, target="exc")
+        proj4 = Projection(pre=pop1, post=pop2, target="exc")
+        proj5 = Projection(pre=pop1, post=pop2, target="exc")
 
         proj1.connect_one_to_one(weights=0.1)
         proj2.connect_all_to_all(weights=0.1)
         proj3.connect_fixed_number_pre(3, weights=0.1)
+        proj4.connect_fixed_number_pre(3, weights=Uniform(0.0, 1.0), delays=Uniform(1.0, 5.0))
+        proj5.connect_fixed_probability(0.5, weights=Uniform(0.0, 1.0), delays=3.0)
 
         cls.test_net = Network()
-        cls.test_net.add([pop1, pop2, proj1, proj2, proj3])
+        cls.test_net.add([pop1, pop2, proj1, proj2, proj3, proj4, proj5])
         cls.test_net.compile(silent=True)
 
         cls.test_proj1 = cls.test_net.get(proj1)
         cls.test_proj2 = cls.test_net.get(proj2)
         cls.test_proj3 = cls.test_net.get(proj3)
+        cls.test_proj4 = cls.test_net.get(proj4)
+        cls.test_proj5 = cls.test_net.get(proj5)
+
+        cls.pop1, cls.pop2 = pop1, pop2
 
     def setUp(self):
         """
@@ -98,3 +108,62 @@ class TestConnectivity(unittest.TestCase):
         """
         tmp = [dend.size for dend in self.test_proj3.dendrites]
         self.assertTrue(np.allclose(tmp, 3))
+
+    def test_save_connectivity_binary(self):
+        """
+        Saves a projection with non-uniform weights and delays in the flat binary
+        format and reads it back into a LIL object.
+        """
+        from ANNarchy.core.IO import _open_binary_file
+        from ANNarchy.core.cython_ext import LILConnectivity
+
+        filename = os.path.join(tempfile.mkdtemp(), 'proj4.bin')
+        self.test_proj4.save_connectivity(filename)
+
+        header, data = _open_binary_file(filename)
+        self.assertEqual(header['nb_synapses'], 27)
+        self.assertEqual(list(data['row_ptr']), list(range(0, 28, 3)))
+
+        lil = LILConnectivity()
+        lil.load_csr(data['post_ranks'], data['row_ptr'], data['pre_ranks'], data['w'], data['delay'])
+        self.assertEqual(list(lil.post_rank), self.test_proj4.post_ranks)
+        for idx, dendrite in enumerate(self.test_proj4.dendrites):
+            self.assertEqual(list(lil.pre_rank[idx]), dendrite.pre_ranks)
+            self.assertTrue(np.allclose(lil.w[idx], dendrite.w))
+            self.assertEqual(list(lil.delay[idx]), list(self.test_proj4.cyInstance.get_dendrite_delay(idx)))
+
+    def test_connect_from_file_binary(self):
+        """
+        Saves projections with non-uniform and uniform delays in the flat binary
+        format and loads them into new projections with *connect_from_file()*.
+        """
+        folder = tempfile.mkdtemp()
+        self.test_proj4.save_connectivity(os.path.join(folder, 'proj4.bin'))
+        self.test_proj5.save_connectivity(os.path.join(folder, 'proj5.bin'))
+
+        proj4 = Projection(pre=self.pop1, post=self.pop2, target="exc")
+        proj4.connect_from_file(os.path.join(folder, 'proj4.bin'))
+        proj5 = Projection(pre=self.pop1, post=self.pop2, target="exc")
+        proj5.connect_from_file(os.path.join(folder, 'proj5.bin'))
+
+        net = Network()
+        net.add([self.pop1, self.pop2, proj4, proj5])
+        net.compile(silent=True)
+
+        for saved, loaded in [(self.test_proj4, net.get(proj4)), (self.test_proj5, net.get(proj5))]:
+            self.assertEqual(loaded.post_ranks, saved.post_ranks)
+            self.assertEqual(loaded.nb_synapses, saved.nb_synapses)
+            for idx in range(len(saved.post_ranks)):
+                self.assertEqual(loaded.dendrite(loaded.post_ranks[idx]).pre_ranks, saved.dendrite(saved.post_ranks[idx]).pre_ranks)
+                self.assertTrue(np.allclose(loaded.dendrite(loaded.post_ranks[idx]).w, saved.dendrite(saved.post_ranks[idx]).w))
+
+        # non-uniform delays are restored per synapse
+        self.assertIsInstance(net.get(proj4).delay, list)
+        for idx in range(len(self.test_proj4.post_ranks)):
+            self.assertEqual(list(net.get(proj4).cyInstance.get_dendrite_delay(idx)),
+                             list(self.test_proj4.cyInstance.get_dendrite_delay(idx)))
+
+        # uniform delays stay uniform
+        self.assertEqual(self.test_proj5.delay, 3.0)
+        self.assertEqual(net.get(proj5).delay, 3.0)
+        self.assertEqual(net.get(proj5).max_delay, self.test_proj5.max_delay)